@@ -19,6 +19,16 @@ except ImportError:
     DelegationEngine = None
     TaskDelegation = None
 
+try:
+    from .delegation_planner import DelegationPlanner
+except ImportError:
+    DelegationPlanner = None
+
+try:
+    from .delegation_executor import DelegationExecutor
+except ImportError:
+    DelegationExecutor = None
+
 try:
     from .resource_manager import ResourceManager
 except ImportError:
@@ -39,6 +49,8 @@ __all__ = [
     "PrimaryOrchestrationAgent",
     "DelegationEngine",
     "TaskDelegation",
+    "DelegationPlanner",
+    "DelegationExecutor",
     "ResourceManager", 
     "OrchestrationConfidenceScorer",
     "AgentSpecialization",
@@ -22,6 +22,11 @@ except ImportError:
         AgentProfile, AgentCapability, DelegationRequest, OrchestrationResult
     )
 
+try:
+    from .delegation_planner import DelegationPlanner
+except ImportError:
+    from agents.orchestration.delegation_planner import DelegationPlanner
+
 logger = logging.getLogger(__name__)
 
 
@@ -378,8 +383,14 @@ class DelegationEngine:
     - AAI-compliant confidence scoring (70-95%)
     """
     
-    def __init__(self):
-        """Initialize delegation engine"""
+    def __init__(self, balance_load: bool = True, load_penalty: float = 0.05):
+        """
+        Initialize delegation engine
+        
+        Args:
+            balance_load: Assign subtasks globally, spreading load across agents
+            load_penalty: Score given up for each extra subtask on one agent
+        """
         
         self.task_analyzer = TaskAnalyzer()
         
@@ -393,9 +404,22 @@ class DelegationEngine:
         # Configuration
         self.aai_min_confidence = 0.70
         self.aai_max_confidence = 0.95
+        self.balance_load = balance_load
         
         # Initialize agent profiles
         self._initialize_agent_profiles()
+        
+        # Capability matrix over the profiles
+        self.planner = DelegationPlanner(
+            self.agent_profiles,
+            load_penalty=load_penalty,
+            min_confidence=self.aai_min_confidence,
+            max_confidence=self.aai_max_confidence
+        )
+    
+    def refresh_agent_profiles(self):
+        """Recompile the capability matrix after agent_profiles changes"""
+        self.planner.compile_profiles(self.agent_profiles)
     
     def _initialize_agent_profiles(self):
         """Initialize profiles for specialized agents"""
@@ -528,38 +552,35 @@ class DelegationEngine:
             # Analyze task requirements
             task_analysis = await self.task_analyzer.analyze_task_requirements(request.query)
             
+            subtasks = task_analysis["subtasks"]
+            
+            # Select agents for all subtasks at once
+            selected_agents = self.planner.assign(
+                subtasks,
+                request.preferred_agents,
+                request.excluded_agents,
+                balance_load=self.balance_load
+            )
+            
+            # Calculate delegation confidence
+            confidences = self.planner.confidence(
+                subtasks,
+                selected_agents,
+                task_analysis["complexity_analysis"]["overall_complexity"]
+            )
+            
             # Create delegations for each subtask
             delegations = []
             
-            for subtask in task_analysis["subtasks"]:
-                # Select best agent for subtask
-                selected_agent = await self._select_best_agent(
-                    subtask, 
-                    request.preferred_agents,
-                    request.excluded_agents
-                )
+            for subtask, selected_agent, confidence in zip(subtasks, selected_agents, confidences):
+                confidence = float(confidence)
                 
-                # Calculate delegation confidence
-                confidence = await self._calculate_delegation_confidence(
-                    subtask, 
-                    selected_agent,
-                    task_analysis["complexity_analysis"]
-                )
-                
-                # Generate reasoning
-                reasoning = await self._generate_delegation_reasoning(
-                    subtask, 
-                    selected_agent,
-                    confidence
-                )
-                
-                # Create delegation
                 delegation = TaskDelegation(
                     task_id=f"{request.session_id or 'req'}_{subtask['id']}",
                     task_description=subtask["description"],
                     assigned_agent=selected_agent,
                     confidence=confidence,
-                    reasoning=reasoning,
+                    reasoning=self._format_delegation_reasoning(subtask, selected_agent, confidence),
                     estimated_complexity=self._complexity_to_int(subtask["complexity"]),
                     complexity_category=subtask["complexity"],
                     priority=request.priority,
@@ -596,60 +617,12 @@ class DelegationEngine:
                                excluded_agents: List[AgentSpecialization]) -> AgentSpecialization:
         """Select the best agent for a subtask"""
         
-        candidates = subtask["agent_candidates"]
-        
-        # Apply preferences and exclusions
-        if preferred_agents:
-            preferred_candidates = [a for a in candidates if a in preferred_agents]
-            if preferred_candidates:
-                candidates = preferred_candidates
-        
-        if excluded_agents:
-            candidates = [a for a in candidates if a not in excluded_agents]
-        
-        if not candidates:
-            candidates = [AgentSpecialization.GENERAL]
-        
-        # Score candidates based on multiple factors
-        scores = {}
-        for candidate in candidates:
-            score = await self._score_agent_for_task(candidate, subtask)
-            scores[candidate] = score
-        
-        # Return highest scoring agent
-        best_agent = max(scores.items(), key=lambda x: x[1])[0]
-        
-        return best_agent
+        return self.planner.assign([subtask], preferred_agents, excluded_agents, balance_load=False)[0]
     
     async def _score_agent_for_task(self, agent: AgentSpecialization, subtask: Dict[str, Any]) -> float:
         """Score an agent's suitability for a specific task"""
         
-        score = 0.0
-        
-        # Base score from agent profile
-        if agent in self.agent_profiles:
-            profile = self.agent_profiles[agent]
-            score += profile.success_rate * 0.4
-            
-            # Response time factor (faster is better)
-            time_score = max(0, (5.0 - profile.average_response_time) / 5.0)
-            score += time_score * 0.2
-            
-            # Capability match
-            task_complexity = subtask["complexity"]
-            for capability in profile.capabilities:
-                if task_complexity in capability.complexity_support:
-                    score += capability.confidence_baseline * 0.3
-                    break
-        else:
-            score = 0.5  # Default score for unknown agents
-        
-        # Historical performance
-        if agent in self.agent_performance:
-            historical_score = self.agent_performance[agent].get("success_rate", 0.8)
-            score += historical_score * 0.1
-        
-        return min(1.0, score)
+        return float(self.planner.score_matrix([subtask])[0, self.planner.agent_index[agent]])
     
     async def _calculate_delegation_confidence(self, 
                                              subtask: Dict[str, Any],
@@ -657,47 +630,9 @@ class DelegationEngine:
                                              complexity_analysis: Dict[str, Any]) -> float:
         """Calculate AAI-compliant confidence for delegation"""
         
-        # Base confidence from agent capability
-        base_confidence = 0.75
-        
-        if selected_agent in self.agent_profiles:
-            profile = self.agent_profiles[selected_agent]
-            
-            # Find matching capability
-            task_complexity = subtask["complexity"]
-            for capability in profile.capabilities:
-                if task_complexity in capability.complexity_support:
-                    base_confidence = capability.confidence_baseline
-                    break
-        
-        # Adjust for task complexity
-        complexity_adjustments = {
-            TaskComplexity.SIMPLE: 0.05,
-            TaskComplexity.MODERATE: 0.0,
-            TaskComplexity.COMPLEX: -0.03,
-            TaskComplexity.EXPERT: -0.07
-        }
-        
-        task_complexity = subtask["complexity"]
-        base_confidence += complexity_adjustments.get(task_complexity, 0.0)
-        
-        # Adjust for agent performance history
-        if selected_agent in self.agent_performance:
-            historical_performance = self.agent_performance[selected_agent].get("success_rate", 0.8)
-            performance_adjustment = (historical_performance - 0.8) * 0.1
-            base_confidence += performance_adjustment
-        
-        # Adjust for overall task complexity
-        overall_complexity = complexity_analysis["overall_complexity"]
-        if overall_complexity == TaskComplexity.EXPERT:
-            base_confidence -= 0.05
-        elif overall_complexity == TaskComplexity.SIMPLE:
-            base_confidence += 0.03
-        
-        # Ensure AAI compliance
-        final_confidence = max(self.aai_min_confidence, min(self.aai_max_confidence, base_confidence))
-        
-        return final_confidence
+        return float(self.planner.confidence(
+            [subtask], [selected_agent], complexity_analysis["overall_complexity"]
+        )[0])
     
     async def _generate_delegation_reasoning(self, 
                                            subtask: Dict[str, Any],
@@ -705,6 +640,14 @@ class DelegationEngine:
                                            confidence: float) -> str:
         """Generate human-readable reasoning for delegation decision"""
         
+        return self._format_delegation_reasoning(subtask, selected_agent, confidence)
+    
+    def _format_delegation_reasoning(self, 
+                                     subtask: Dict[str, Any],
+                                     selected_agent: AgentSpecialization,
+                                     confidence: float) -> str:
+        """Format human-readable reasoning for delegation decision"""
+        
         reasoning_parts = []
         
         # Agent selection reasoning
@@ -751,7 +694,7 @@ class DelegationEngine:
             
             # Find corresponding delegations and update
             for delegation in delegations:
-                if delegation.task_id.endswith(dependent_id):
+                if delegation.task_id.endswith(f"_{dependent_id}"):
                     if dependency_id not in delegation.dependencies:
                         delegation.dependencies.append(dependency_id)
     
@@ -799,6 +742,9 @@ class DelegationEngine:
         metrics["success_rate"] = metrics["successful_tasks"] / metrics["total_tasks"]
         metrics["average_time"] = metrics["total_time"] / metrics["total_tasks"]
         metrics["average_satisfaction"] = sum(metrics["satisfaction_scores"]) / len(metrics["satisfaction_scores"])
+        
+        # Live performance feeds the next plan
+        self.planner.update_performance(agent, metrics["success_rate"])
     
     def get_delegation_statistics(self) -> Dict[str, Any]:
         """Get delegation engine statistics"""
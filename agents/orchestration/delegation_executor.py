@@ -0,0 +1,195 @@
+"""
+Delegation Executor for Orchestration System
+
+Dependency-aware scheduler that starts each task delegation as soon as its
+own dependencies complete, under global and per-agent concurrency caps.
+"""
+import logging
+import asyncio
+from typing import List, Dict, Any, Optional, Callable, Awaitable, AsyncIterator, Set
+from datetime import datetime
+
+try:
+    from .models import TaskDelegation, TaskResult, AgentSpecialization, DelegationStatus
+except ImportError:
+    from agents.orchestration.models import TaskDelegation, TaskResult, AgentSpecialization, DelegationStatus
+
+logger = logging.getLogger(__name__)
+
+
+class DelegationExecutor:
+    """
+    Streaming executor for dependent task delegations.
+
+    Features:
+    - Each delegation starts the moment its dependencies have succeeded
+    - Global and per-agent concurrency limits
+    - Results yielded in completion order
+    - Transitive dependents of a failed task are cancelled, not run
+    - Dependency cycles are detected and reported as cancelled tasks
+    """
+
+    def __init__(self,
+                 run_delegation: Callable[[TaskDelegation], Awaitable[TaskResult]],
+                 max_parallel_tasks: int = 5,
+                 agent_limits: Optional[Dict[AgentSpecialization, int]] = None,
+                 default_agent_limit: int = 2):
+        """
+        Initialize delegation executor
+
+        Args:
+            run_delegation: Coroutine function executing one delegation
+            max_parallel_tasks: Maximum delegations running at once
+            agent_limits: Per-agent concurrency caps
+            default_agent_limit: Cap for agents not listed in agent_limits
+        """
+        self.run_delegation = run_delegation
+        self.max_parallel_tasks = max_parallel_tasks
+        self.agent_limits = agent_limits or {}
+        self.default_agent_limit = default_agent_limit
+        self.peak_running = 0
+
+    def _resolve_dependencies(self, delegations: List[TaskDelegation]) -> Dict[str, Set[str]]:
+        """
+        Map each task id to the task ids it waits for.
+
+        Dependencies may name a task id or a subtask id suffix
+        ("subtask_1" for "session_subtask_1"); unknown ids are ignored.
+        """
+        task_ids = [d.task_id for d in delegations]
+
+        waits_for = {}
+        for delegation in delegations:
+            resolved = set()
+            for dependency in delegation.dependencies:
+                if dependency in task_ids:
+                    target = dependency
+                else:
+                    target = next((t for t in task_ids if t.endswith(f"_{dependency}")), None)
+                if target is None:
+                    logger.warning(f"Task {delegation.task_id} depends on unknown task {dependency}; ignoring")
+                elif target != delegation.task_id:
+                    resolved.add(target)
+            waits_for[delegation.task_id] = resolved
+        return waits_for
+
+    async def stream(self, delegations: List[TaskDelegation]) -> AsyncIterator[TaskResult]:
+        """
+        Execute delegations and yield results as they complete.
+
+        Closing the iterator early cancels every delegation still running.
+        """
+        by_id = {d.task_id: d for d in delegations}
+        waits_for = self._resolve_dependencies(delegations)
+        dependents: Dict[str, List[str]] = {task_id: [] for task_id in by_id}
+        for task_id, upstream in waits_for.items():
+            for dependency in upstream:
+                dependents[dependency].append(task_id)
+        remaining = {task_id: len(upstream) for task_id, upstream in waits_for.items()}
+
+        global_slots = asyncio.Semaphore(self.max_parallel_tasks)
+        agent_slots: Dict[AgentSpecialization, asyncio.Semaphore] = {}
+        running: Dict[asyncio.Task, str] = {}
+        finished: Set[str] = set()
+        self.peak_running = 0
+        active = 0
+
+        async def run_one(delegation: TaskDelegation) -> TaskResult:
+            nonlocal active
+            agent_slot = agent_slots.setdefault(
+                delegation.assigned_agent,
+                asyncio.Semaphore(self.agent_limits.get(delegation.assigned_agent, self.default_agent_limit))
+            )
+            # Agent slot first, so tasks queued for a busy agent never hold global slots
+            async with agent_slot, global_slots:
+                active += 1
+                self.peak_running = max(self.peak_running, active)
+                delegation.status = DelegationStatus.IN_PROGRESS
+                delegation.started_at = datetime.now()
+                try:
+                    return await self.run_delegation(delegation)
+                finally:
+                    active -= 1
+
+        def launch(task_ids: List[str]):
+            # Higher-priority delegations are queued for slots first
+            for task_id in sorted(task_ids, key=lambda t: -by_id[t].priority):
+                running[asyncio.create_task(run_one(by_id[task_id]))] = task_id
+
+        def cancel_dependents(failed_id: str, reason: str) -> List[TaskResult]:
+            cancelled = []
+            stack = list(dependents[failed_id])
+            while stack:
+                task_id = stack.pop()
+                if task_id in finished:
+                    continue
+                finished.add(task_id)
+                cancelled.append(self._cancelled_result(by_id[task_id], reason))
+                stack.extend(dependents[task_id])
+            return cancelled
+
+        launch([task_id for task_id, count in remaining.items() if count == 0])
+
+        try:
+            while running:
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    task_id = running.pop(task)
+                    delegation = by_id[task_id]
+                    finished.add(task_id)
+
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        result = self._failed_result(delegation, str(e))
+                    self._mark_complete(delegation, result)
+                    yield result
+
+                    if result.success:
+                        ready = []
+                        for dependent in dependents[task_id]:
+                            remaining[dependent] -= 1
+                            if remaining[dependent] == 0 and dependent not in finished:
+                                ready.append(dependent)
+                        launch(ready)
+                    else:
+                        for cancelled in cancel_dependents(task_id, f"upstream task {task_id} failed"):
+                            yield cancelled
+
+            # Anything never started is part of a dependency cycle
+            for task_id, delegation in by_id.items():
+                if task_id not in finished:
+                    finished.add(task_id)
+                    yield self._cancelled_result(delegation, "dependency cycle")
+
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+    async def run(self, delegations: List[TaskDelegation]) -> List[TaskResult]:
+        """Execute delegations and collect results in completion order"""
+        return [result async for result in self.stream(delegations)]
+
+    def _mark_complete(self, delegation: TaskDelegation, result: TaskResult):
+        delegation.status = DelegationStatus.COMPLETED if result.success else DelegationStatus.FAILED
+        delegation.completed_at = datetime.now()
+        delegation.actual_duration_seconds = int(result.execution_time_seconds)
+
+    def _failed_result(self, delegation: TaskDelegation, error_message: str) -> TaskResult:
+        return TaskResult(
+            task_id=delegation.task_id,
+            agent_type=delegation.assigned_agent,
+            success=False,
+            error_message=error_message,
+            execution_time_seconds=0.0,
+            confidence_achieved=0.0
+        )
+
+    def _cancelled_result(self, delegation: TaskDelegation, reason: str) -> TaskResult:
+        delegation.status = DelegationStatus.CANCELLED
+        delegation.completed_at = datetime.now()
+        result = self._failed_result(delegation, f"Cancelled: {reason}")
+        result.metadata["status"] = DelegationStatus.CANCELLED.value
+        return result
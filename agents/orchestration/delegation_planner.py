@@ -0,0 +1,255 @@
+"""
+Delegation Planner for Orchestration System
+
+Vectorized agent scoring and batched assignment of subtasks to agents.
+Agent profiles are compiled once into score and confidence matrices, so a
+whole decomposed request is planned with a few array operations.
+"""
+import logging
+from typing import List, Dict, Any, Optional
+
+import numpy as np
+
+try:
+    from .models import AgentSpecialization, TaskComplexity, AgentProfile
+except ImportError:
+    from agents.orchestration.models import AgentSpecialization, TaskComplexity, AgentProfile
+
+logger = logging.getLogger(__name__)
+
+
+class DelegationPlanner:
+    """
+    Batched agent selection over a precomputed capability matrix.
+
+    Features:
+    - Profile, capability and live performance scores as NumPy arrays
+    - All subtasks scored against all agents in one operation
+    - Greedy per-subtask selection or load-balanced global assignment
+    (min-cost flow)
+    - Vectorized AAI-compliant confidence (70-95%)
+    """
+
+    COMPLEXITY_CONFIDENCE_ADJUSTMENTS = {
+        TaskComplexity.SIMPLE: 0.05,
+        TaskComplexity.MODERATE: 0.0,
+        TaskComplexity.COMPLEX: -0.03,
+        TaskComplexity.EXPERT: -0.07
+    }
+
+    def __init__(self,
+                 agent_profiles: Dict[AgentSpecialization, AgentProfile],
+                 load_penalty: float = 0.05,
+                 min_confidence: float = 0.70,
+                 max_confidence: float = 0.95):
+        """
+        Initialize delegation planner
+
+        Args:
+            agent_profiles: Profiles compiled into the capability matrix
+            load_penalty: Score given up for each extra subtask on one agent
+            min_confidence: AAI minimum confidence
+            max_confidence: AAI maximum confidence
+        """
+        self.agents: List[AgentSpecialization] = list(AgentSpecialization)
+        self.agent_index = {agent: i for i, agent in enumerate(self.agents)}
+        self.complexities: List[TaskComplexity] = list(TaskComplexity)
+        self.complexity_index = {complexity: i for i, complexity in enumerate(self.complexities)}
+
+        self.load_penalty = load_penalty
+        self.min_confidence = min_confidence
+        self.max_confidence = max_confidence
+
+        # Live performance, folded in by update_performance()
+        self.historical_success = np.zeros(len(self.agents))
+        self.has_history = np.zeros(len(self.agents), dtype=bool)
+
+        self.compile_profiles(agent_profiles)
+
+    def compile_profiles(self, agent_profiles: Dict[AgentSpecialization, AgentProfile]):
+        """Precompute the agent x complexity score and confidence matrices"""
+
+        shape = (len(self.agents), len(self.complexities))
+        self.profile_scores = np.full(len(self.agents), 0.5)
+        self.capability_scores = np.zeros(shape)
+        self.capability_confidence = np.full(shape, 0.75)
+
+        for agent, profile in agent_profiles.items():
+            a = self.agent_index[agent]
+            time_score = max(0.0, (5.0 - profile.average_response_time) / 5.0)
+            self.profile_scores[a] = profile.success_rate * 0.4 + time_score * 0.2
+
+            # First capability supporting a complexity level wins
+            for c, complexity in enumerate(self.complexities):
+                for capability in profile.capabilities:
+                    if complexity in capability.complexity_support:
+                        self.capability_scores[a, c] = capability.confidence_baseline * 0.3
+                        self.capability_confidence[a, c] = capability.confidence_baseline
+                        break
+
+    def update_performance(self, agent: AgentSpecialization, success_rate: float):
+        """Fold an agent's observed success rate into future scores"""
+
+        a = self.agent_index[agent]
+        self.historical_success[a] = success_rate
+        self.has_history[a] = True
+
+    def score_matrix(self, subtasks: List[Dict[str, Any]]) -> np.ndarray:
+        """Suitability of every agent for every subtask, shape (subtasks, agents)"""
+
+        complexity_ids = self._complexity_ids(subtasks)
+        scores = self.profile_scores[None, :] + self.capability_scores[:, complexity_ids].T
+        scores = scores + np.where(self.has_history, self.historical_success * 0.1, 0.0)[None, :]
+        return np.minimum(scores, 1.0)
+
+    def candidate_ranks(self,
+                        subtasks: List[Dict[str, Any]],
+                        preferred_agents: Optional[List[AgentSpecialization]] = None,
+                        excluded_agents: Optional[List[AgentSpecialization]] = None) -> np.ndarray:
+        """
+        Rank of each agent in each subtask's candidate list after preferences
+        and exclusions, or -1 where the agent is not a candidate.
+        """
+        ranks = np.full((len(subtasks), len(self.agents)), -1, dtype=int)
+
+        for i, subtask in enumerate(subtasks):
+            candidates = subtask["agent_candidates"]
+
+            if preferred_agents:
+                preferred_candidates = [a for a in candidates if a in preferred_agents]
+                if preferred_candidates:
+                    candidates = preferred_candidates
+
+            if excluded_agents:
+                candidates = [a for a in candidates if a not in excluded_agents]
+
+            if not candidates:
+                candidates = [AgentSpecialization.GENERAL]
+
+            for rank, agent in enumerate(candidates):
+                if ranks[i, self.agent_index[agent]] < 0:
+                    ranks[i, self.agent_index[agent]] = rank
+
+        return ranks
+
+    def assign(self,
+               subtasks: List[Dict[str, Any]],
+               preferred_agents: Optional[List[AgentSpecialization]] = None,
+               excluded_agents: Optional[List[AgentSpecialization]] = None,
+               balance_load: bool = True) -> List[AgentSpecialization]:
+        """
+        Assign an agent to every subtask.
+
+        Args:
+            subtasks: Subtasks from task analysis
+            preferred_agents: Agents to prefer among candidates
+            excluded_agents: Agents never to assign
+            balance_load: Solve globally with a per-agent load penalty
+                instead of picking the best candidate per subtask
+
+        Returns:
+            Assigned agent for each subtask, in order
+        """
+        if not subtasks:
+            return []
+
+        scores = self.score_matrix(subtasks)
+        ranks = self.candidate_ranks(subtasks, preferred_agents, excluded_agents)
+        allowed = ranks >= 0
+
+        if not balance_load or len(subtasks) == 1:
+            # Ties go to the earlier candidate, as in candidate-order max()
+            masked = np.where(allowed, scores - ranks * 1e-9, -np.inf)
+            return [self.agents[a] for a in masked.argmax(axis=1)]
+
+        return self._assign_balanced(scores, allowed)
+
+    def _assign_balanced(self, scores: np.ndarray, allowed: np.ndarray) -> List[AgentSpecialization]:
+        """
+        Global assignment maximizing total score minus a load penalty that
+        grows by load_penalty with each extra subtask on the same agent.
+
+        Solved as min-cost flow by successive shortest paths: each subtask
+        is routed to the agent with the cheapest marginal cost, possibly
+        moving already-assigned subtasks along a chain of agents. Paths run
+        over the agent graph only, so each step is a few array operations.
+        """
+        n, agent_count = scores.shape
+        assignment = np.full(n, -1, dtype=int)
+        load = np.zeros(agent_count)
+
+        for i in range(n):
+            # dist[a]: cheapest cost of one extra unit arriving at agent a
+            dist = np.where(allowed[i], -scores[i], np.inf)
+            pred_agent = np.full(agent_count, -1, dtype=int)
+            pred_task = np.full(agent_count, -1, dtype=int)
+
+            assigned = np.flatnonzero(assignment >= 0)
+            if len(assigned):
+                # Cost of moving an assigned subtask from its agent to each other agent
+                current = assignment[assigned]
+                move_cost = scores[assigned, current][:, None] - scores[assigned]
+                move_cost = np.where(allowed[assigned], move_cost, np.inf)
+
+                edge_cost = np.full((agent_count, agent_count), np.inf)
+                edge_task = np.full((agent_count, agent_count), -1, dtype=int)
+                for a in np.unique(current):
+                    rows = np.flatnonzero(current == a)
+                    best = move_cost[rows].argmin(axis=0)
+                    edge_cost[a] = move_cost[rows[best], np.arange(agent_count)]
+                    edge_task[a] = assigned[rows[best]]
+                np.fill_diagonal(edge_cost, np.inf)
+
+                # Bellman-Ford over agents; no negative cycles at an optimum
+                for _ in range(agent_count - 1):
+                    relaxed = dist[:, None] + edge_cost
+                    via = relaxed.argmin(axis=0)
+                    candidate = relaxed[via, np.arange(agent_count)]
+                    improved = candidate < dist - 1e-12
+                    if not improved.any():
+                        break
+                    dist[improved] = candidate[improved]
+                    pred_agent[improved] = via[improved]
+                    pred_task[improved] = edge_task[via[improved], np.flatnonzero(improved)]
+
+            target = int(np.argmin(dist + load * self.load_penalty))
+            load[target] += 1
+
+            # Shift subtasks back along the path, then place the new one
+            agent = target
+            while pred_agent[agent] >= 0:
+                assignment[pred_task[agent]] = agent
+                agent = pred_agent[agent]
+            assignment[i] = agent
+
+        return [self.agents[a] for a in assignment]
+
+    def confidence(self,
+                   subtasks: List[Dict[str, Any]],
+                   agents: List[AgentSpecialization],
+                   overall_complexity: TaskComplexity) -> np.ndarray:
+        """AAI-compliant delegation confidence for each (subtask, agent) pair"""
+
+        if not subtasks:
+            return np.zeros(0)
+
+        complexity_ids = self._complexity_ids(subtasks)
+        agent_ids = np.array([self.agent_index[agent] for agent in agents])
+
+        confidence = self.capability_confidence[agent_ids, complexity_ids]
+        confidence = confidence + np.array([
+            self.COMPLEXITY_CONFIDENCE_ADJUSTMENTS.get(subtask["complexity"], 0.0) for subtask in subtasks
+        ])
+        confidence = confidence + np.where(
+            self.has_history[agent_ids], (self.historical_success[agent_ids] - 0.8) * 0.1, 0.0
+        )
+
+        if overall_complexity == TaskComplexity.EXPERT:
+            confidence = confidence - 0.05
+        elif overall_complexity == TaskComplexity.SIMPLE:
+            confidence = confidence + 0.03
+
+        return np.clip(confidence, self.min_confidence, self.max_confidence)
+
+    def _complexity_ids(self, subtasks: List[Dict[str, Any]]) -> np.ndarray:
+        return np.array([self.complexity_index[subtask["complexity"]] for subtask in subtasks], dtype=int)
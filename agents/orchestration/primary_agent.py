@@ -6,7 +6,7 @@ manages specialized agents, and provides intelligent multi-agent workflows.
 """
 import logging
 import asyncio
-from typing import List, Dict, Any, Optional, Union
+from typing import List, Dict, Any, Optional, Union, Callable
 from datetime import datetime
 import uuid
 
@@ -40,6 +40,14 @@ try:
     from .delegation_engine import DelegationEngine
 except ImportError:
     from agents.orchestration.delegation_engine import DelegationEngine
+try:
+    from .delegation_executor import DelegationExecutor
+except ImportError:
+    from agents.orchestration.delegation_executor import DelegationExecutor
+try:
+    from ..specialized.resource_pool import ResourcePoolManager, get_resource_pools
+except ImportError:
+    from agents.specialized.resource_pool import ResourcePoolManager, get_resource_pools
 
 logger = logging.getLogger(__name__)
 
@@ -71,10 +79,21 @@ class PrimaryOrchestrationAgent:
     - Fallback mechanisms for robust operation
     """
     
-    def __init__(self, model_client: Optional[Any] = None):
+    def __init__(self,
+                 model_client: Optional[Any] = None,
+                 agent_concurrency_limits: Optional[Dict[AgentSpecialization, int]] = None,
+                 default_agent_concurrency: int = 2,
+                 resource_pools: Optional[ResourcePoolManager] = None,
+                 mcp_server_concurrency: int = 4):
         """Initialize primary orchestration agent"""
         
         self.model_client = model_client
+        self.agent_concurrency_limits = agent_concurrency_limits or {}
+        self.default_agent_concurrency = default_agent_concurrency
+        
+        # Client and MCP session pools shared across orchestrations
+        self.resource_pools = resource_pools or get_resource_pools()
+        self.mcp_server_concurrency = mcp_server_concurrency
         self.delegation_engine = DelegationEngine()
         self.mcp_manager: Optional[MCPServerManager] = None
         self.specialized_agents: Dict[AgentSpecialization, Any] = {}
@@ -161,10 +180,11 @@ Always explain your reasoning for agent selection and provide confidence assessm
             from agents.specialized.jina_search_agent import JinaSearchAgent
             
             # Initialize specialized agents
-            self.specialized_agents[AgentSpecialization.SLACK] = SlackAgent()
-            self.specialized_agents[AgentSpecialization.GITHUB] = GitHubAgent()
-            self.specialized_agents[AgentSpecialization.FILESYSTEM] = FilesystemAgent()
-            self.specialized_agents[AgentSpecialization.JINA_SEARCH] = JinaSearchAgent()
+            pools = self.resource_pools
+            self.specialized_agents[AgentSpecialization.SLACK] = SlackAgent(resource_pools=pools)
+            self.specialized_agents[AgentSpecialization.GITHUB] = GitHubAgent(resource_pools=pools)
+            self.specialized_agents[AgentSpecialization.FILESYSTEM] = FilesystemAgent(resource_pools=pools)
+            self.specialized_agents[AgentSpecialization.JINA_SEARCH] = JinaSearchAgent(resource_pools=pools)
             
             # Initialize other agents with fallbacks
             for agent_type in [AgentSpecialization.AIRTABLE, AgentSpecialization.FIRECRAWL,
@@ -203,12 +223,16 @@ Always explain your reasoning for agent selection and provide confidence assessm
             if agent_type not in self.specialized_agents:
                 self.specialized_agents[agent_type] = self._create_fallback_agent(agent_type)
     
-    async def orchestrate(self, request: DelegationRequest) -> DelegationResponse:
+    async def orchestrate(self,
+                          request: DelegationRequest,
+                          on_result: Optional[Callable[[TaskResult], Any]] = None) -> DelegationResponse:
         """
         Main orchestration method for processing delegation requests.
         
         Args:
             request: Delegation request to process
+            on_result: Optional callback (sync or async) receiving each
+                TaskResult as soon as it completes
             
         Returns:
             Delegation response with orchestration results
@@ -234,9 +258,9 @@ Always explain your reasoning for agent selection and provide confidence assessm
             # Step 2: Execute delegations
             if self.mcp_manager and self.mcp_manager.is_initialized:
                 async with self.mcp_manager as manager:
-                    results = await self._execute_delegations_with_mcp(delegations, context, manager)
+                    results = await self._execute_delegations_with_mcp(delegations, context, manager, on_result)
             else:
-                results = await self._execute_delegations_fallback(delegations, context)
+                results = await self._execute_delegations_fallback(delegations, context, on_result)
             
             # Step 3: Create orchestration result
             orchestration_result = await self._create_orchestration_result(
@@ -269,42 +293,54 @@ Always explain your reasoning for agent selection and provide confidence assessm
     async def _execute_delegations_with_mcp(self, 
                                           delegations: List[TaskDelegation],
                                           context: OrchestrationContext,
-                                          manager: MCPServerManager) -> List[TaskResult]:
+                                          manager: MCPServerManager,
+                                          on_result: Optional[Callable[[TaskResult], Any]] = None) -> List[TaskResult]:
         """Execute delegations using MCP server manager"""
         
-        results = []
-        
         try:
-            # Group delegations by dependencies
-            independent_tasks = [d for d in delegations if not d.dependencies]
-            dependent_tasks = [d for d in delegations if d.dependencies]
-            
-            # Execute independent tasks in parallel
-            if independent_tasks:
-                parallel_results = await asyncio.gather(
-                    *[self._execute_single_delegation_mcp(delegation, context, manager) 
-                      for delegation in independent_tasks],
-                    return_exceptions=True
-                )
-                
-                for result in parallel_results:
-                    if isinstance(result, Exception):
-                        logger.error(f"Parallel task execution failed: {result}")
-                        results.append(self._create_error_result("unknown", str(result)))
-                    else:
-                        results.append(result)
-            
-            # Execute dependent tasks sequentially
-            for delegation in dependent_tasks:
-                result = await self._execute_single_delegation_mcp(delegation, context, manager)
-                results.append(result)
-            
-            return results
+            return await self._stream_delegations(
+                delegations,
+                context,
+                lambda delegation: self._execute_single_delegation_mcp(delegation, context, manager),
+                on_result
+            )
             
         except Exception as e:
             logger.error(f"MCP delegation execution failed: {e}")
             return [self._create_error_result("orchestration", str(e))]
     
+    async def _stream_delegations(self,
+                                  delegations: List[TaskDelegation],
+                                  context: OrchestrationContext,
+                                  run_delegation: Callable[[TaskDelegation], Any],
+                                  on_result: Optional[Callable[[TaskResult], Any]] = None) -> List[TaskResult]:
+        """
+        Run delegations as their dependencies complete, within the request's
+        parallelism and per-agent limits, forwarding each result as it lands.
+        """
+        
+        executor = DelegationExecutor(
+            run_delegation,
+            max_parallel_tasks=context.request.max_parallel_tasks,
+            agent_limits=self.agent_concurrency_limits,
+            default_agent_limit=self.default_agent_concurrency
+        )
+        
+        results = []
+        async for result in executor.stream(delegations):
+            results.append(result)
+            context.task_results.append(result)
+            
+            if on_result:
+                try:
+                    callback_result = on_result(result)
+                    if asyncio.iscoroutine(callback_result):
+                        await callback_result
+                except Exception as e:
+                    logger.warning(f"Result callback failed for task {result.task_id}: {e}")
+        
+        return results
+    
     async def _execute_single_delegation_mcp(self,
                                            delegation: TaskDelegation,
                                            context: OrchestrationContext,
@@ -326,13 +362,17 @@ Always explain your reasoning for agent selection and provide confidence assessm
             
             server_name = server_mapping.get(delegation.assigned_agent, "general")
             
-            # Execute task via MCP
+            # Execute task via MCP, bounded per server
             if server_name in manager.servers:
-                mcp_result = await manager.execute_task(
-                    server_name,
-                    "execute_task",
-                    {"task": delegation.task_description, "context": context.request.context}
-                )
+                pool_key = f"mcp:{server_name}"
+                self.resource_pools.register(pool_key, max_concurrency=self.mcp_server_concurrency)
+                
+                async with self.resource_pools.lease(pool_key):
+                    mcp_result = await manager.execute_task(
+                        server_name,
+                        "execute_task",
+                        {"task": delegation.task_description, "context": context.request.context}
+                    )
                 
                 execution_time = (datetime.now() - start_time).total_seconds()
                 
@@ -364,18 +404,18 @@ Always explain your reasoning for agent selection and provide confidence assessm
     
     async def _execute_delegations_fallback(self,
                                           delegations: List[TaskDelegation],
-                                          context: OrchestrationContext) -> List[TaskResult]:
+                                          context: OrchestrationContext,
+                                          on_result: Optional[Callable[[TaskResult], Any]] = None) -> List[TaskResult]:
         """Execute delegations using fallback mechanisms"""
         
-        results = []
-        
         try:
             # Execute all delegations using specialized agents
-            for delegation in delegations:
-                result = await self._execute_delegation_with_specialized_agent(delegation, context)
-                results.append(result)
-            
-            return results
+            return await self._stream_delegations(
+                delegations,
+                context,
+                lambda delegation: self._execute_delegation_with_specialized_agent(delegation, context),
+                on_result
+            )
             
         except Exception as e:
             logger.error(f"Fallback delegation execution failed: {e}")
@@ -648,6 +688,10 @@ Always explain your reasoning for agent selection and provide confidence assessm
     def get_orchestration_metrics(self) -> OrchestrationMetrics:
         """Get current orchestration metrics"""
         return self.orchestration_metrics
+    
+    def get_resource_pool_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Get utilization metrics for client and MCP session pools"""
+        return self.resource_pools.get_stats()
 
 
 async def test_primary_orchestration_agent():
@@ -16,6 +16,7 @@ from .models import (
     ReasoningDepth
 )
 from .config import R1ReasoningConfig
+from .execution_plan import ExecutionPlan
 
 # Import core components with fallback handling
 try:
@@ -49,6 +50,7 @@ __all__ = [
     "ReasoningMethod",
     "ReasoningDepth",
     "R1ReasoningConfig",
+    "ExecutionPlan",
     "R1ReasoningEngine",
     "ConfidenceScorer",
     "DualModelAgent",
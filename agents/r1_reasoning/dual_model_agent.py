@@ -48,6 +48,11 @@ except ImportError:
     except ImportError:
         ConfidenceScorer = None
 
+try:
+    from .execution_plan import ExecutionPlan
+except ImportError:
+    from agents.r1_reasoning.execution_plan import ExecutionPlan
+
 try:
     from inference.model_router import ModelRouter
 except ImportError:
@@ -268,29 +273,51 @@ class DualModelAgent:
         """
         start_time = datetime.now()
         request_id = str(uuid.uuid4())
+        plan = ExecutionPlan(latency_budget_ms=request.latency_budget_ms)
         
         try:
             logger.info(f"Processing request {request_id}: {request.query}")
             
-            # Step 1: Retrieve relevant documents
-            documents = await self._retrieve_documents(request)
-            
-            # Step 2: Analyze complexity and route to appropriate model
-            complexity_analysis = await self._analyze_complexity(request, documents)
+            # Step 1: Retrieve documents while scoring the query itself
+            initial = await plan.run_concurrently({
+                "retrieval": {"step": lambda: self._retrieve_documents(request)},
+                "query_complexity": {"step": lambda: self._analyze_query_features(request)}
+            })
+            documents = initial["retrieval"]
+            
+            # Step 2: Fold in retrieval results and route to appropriate model
+            complexity_analysis = await plan.run(
+                "complexity",
+                lambda: self._analyze_complexity(request, documents, initial["query_complexity"])
+            )
             
             # Step 3: Generate reasoning chain
-            reasoning_chain = await self._generate_reasoning(
-                request, documents, complexity_analysis
+            reasoning_chain = await plan.run(
+                "reasoning",
+                lambda: self._generate_reasoning(request, documents, complexity_analysis)
             )
             
-            # Step 4: Execute tool operations if needed
-            tool_results = await self._execute_tools(request, reasoning_chain)
+            # Step 4: Execute tool operations if there is budget for them
+            tool_results = await plan.run(
+                "tools",
+                lambda: self._execute_tools(request, reasoning_chain),
+                essential=False,
+                default={}
+            )
             
             # Step 5: Synthesize final response
-            response = await self._synthesize_response(
-                request, reasoning_chain, documents, tool_results, start_time, request_id
+            response = await plan.run(
+                "synthesis",
+                lambda: self._synthesize_response(
+                    request, reasoning_chain, documents, tool_results, start_time, request_id
+                )
             )
             
+            breakdown = plan.get_breakdown()
+            response.phase_timings_ms = breakdown["phases_ms"]
+            response.degraded_phases = breakdown["degraded_phases"]
+            logger.debug(f"Request {request_id} phases: {breakdown}")
+            
             return response
             
         except Exception as e:
@@ -317,7 +344,8 @@ class DualModelAgent:
                 ),
                 processing_time_ms=int(processing_time),
                 model_used="error_handler",
-                request_id=request_id
+                request_id=request_id,
+                phase_timings_ms=plan.phase_timings_ms
             )
     
     async def _retrieve_documents(self, request: DocumentAnalysisRequest) -> List[Dict[str, Any]]:
@@ -338,23 +366,34 @@ class DualModelAgent:
             logger.error(f"Document retrieval failed: {e}")
             return []
     
+    async def _analyze_query_features(self, request: DocumentAnalysisRequest) -> Dict[str, Any]:
+        """Extract complexity indicators that depend only on the query"""
+        reasoning_keywords = [
+            "why", "how", "because", "therefore", "analyze", "compare",
+            "evaluate", "assess", "determine", "conclude", "infer"
+        ]
+        query_lower = request.query.lower()
+        
+        return {
+            "query_length": len(request.query.split()),
+            "reasoning_complexity": sum(
+                1 for keyword in reasoning_keywords 
+                if keyword in query_lower
+            )
+        }
+    
     async def _analyze_complexity(self, 
                                 request: DocumentAnalysisRequest, 
-                                documents: List[Dict[str, Any]]) -> Dict[str, Any]:
+                                documents: List[Dict[str, Any]],
+                                query_features: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Analyze query complexity to determine model routing"""
         try:
             # Complexity indicators
-            query_length = len(request.query.split())
+            if query_features is None:
+                query_features = await self._analyze_query_features(request)
+            query_length = query_features["query_length"]
+            reasoning_complexity = query_features["reasoning_complexity"]
             document_count = len(documents)
-            reasoning_keywords = [
-                "why", "how", "because", "therefore", "analyze", "compare",
-                "evaluate", "assess", "determine", "conclude", "infer"
-            ]
-            
-            reasoning_complexity = sum(
-                1 for keyword in reasoning_keywords 
-                if keyword in request.query.lower()
-            )
             
             # Determine complexity score
             complexity_score = (
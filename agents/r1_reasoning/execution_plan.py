@@ -0,0 +1,110 @@
+"""
+Execution Plan for R1 Reasoning Engine
+
+Structured-concurrency helper for multi-step reasoning flows: runs
+independent phases concurrently, records per-phase timings and degrades
+non-essential phases when a latency budget runs out.
+"""
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Non-essential phases are skipped when less than this much budget remains
+MIN_OPTIONAL_BUDGET_MS = 50
+
+
+class ExecutionPlan:
+    """
+    Per-request execution plan with an optional latency budget.
+
+    Essential phases always run to completion. Optional phases are bounded
+    by the remaining budget and fall back to a default value when skipped
+    or cut off, so the response can still be assembled on time.
+    """
+
+    def __init__(self, latency_budget_ms: Optional[int] = None):
+        """Initialize execution plan"""
+        self.latency_budget_ms = latency_budget_ms
+        self.start_time = time.perf_counter()
+        self.phase_timings_ms: Dict[str, int] = {}
+        self.degraded_phases: List[str] = []
+
+    def elapsed_ms(self) -> int:
+        """Milliseconds since the plan started"""
+        return int((time.perf_counter() - self.start_time) * 1000)
+
+    def remaining_ms(self) -> Optional[int]:
+        """Milliseconds left in the budget, or None if unbounded"""
+        if self.latency_budget_ms is None:
+            return None
+        return max(0, self.latency_budget_ms - self.elapsed_ms())
+
+    async def run(self,
+                  name: str,
+                  step: Callable[[], Awaitable[Any]],
+                  essential: bool = True,
+                  default: Any = None) -> Any:
+        """
+        Run a single phase and record its timing.
+
+        Args:
+            name: Phase name used in the timing breakdown
+            step: Zero-argument coroutine factory for the phase
+            essential: Essential phases ignore the budget
+            default: Result used when an optional phase is skipped or times out
+
+        Returns:
+            Phase result, or default for a degraded optional phase
+        """
+        remaining = None if essential else self.remaining_ms()
+
+        if remaining is not None and remaining < MIN_OPTIONAL_BUDGET_MS:
+            self.degraded_phases.append(name)
+            self.phase_timings_ms[name] = 0
+            logger.info(f"Skipping optional phase '{name}': {remaining}ms of budget left")
+            return default
+
+        phase_start = time.perf_counter()
+        deadline = asyncio.timeout(None if remaining is None else remaining / 1000)
+        try:
+            async with deadline:
+                return await step()
+        except asyncio.TimeoutError:
+            # Only our own budget cut-off degrades; timeouts raised by the phase are real failures
+            if not deadline.expired():
+                raise
+            self.degraded_phases.append(name)
+            logger.info(f"Optional phase '{name}' cut off by latency budget")
+            return default
+        finally:
+            self.phase_timings_ms[name] = int((time.perf_counter() - phase_start) * 1000)
+
+    async def run_concurrently(self, phases: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Run independent phases concurrently inside one task group.
+
+        Args:
+            phases: Mapping of phase name to run() keyword arguments
+                (step, and optionally essential and default)
+
+        Returns:
+            Mapping of phase name to result
+        """
+        async with asyncio.TaskGroup() as group:
+            tasks = {
+                name: group.create_task(self.run(name, **spec))
+                for name, spec in phases.items()
+            }
+        return {name: task.result() for name, task in tasks.items()}
+
+    def get_breakdown(self) -> Dict[str, Any]:
+        """Get the per-phase timing breakdown"""
+        return {
+            "total_ms": self.elapsed_ms(),
+            "latency_budget_ms": self.latency_budget_ms,
+            "phases_ms": dict(self.phase_timings_ms),
+            "degraded_phases": list(self.degraded_phases)
+        }
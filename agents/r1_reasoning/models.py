@@ -82,6 +82,7 @@ class DocumentAnalysisRequest(BaseModel):
     include_limitations: bool = True
     source_filter: Optional[str] = None
     context_window: int = Field(default=8192, le=32768)
+    latency_budget_ms: Optional[int] = Field(default=None, ge=0, description="Drop optional extras past this deadline")
 
 
 class ConfidenceAnalysis(BaseModel):
@@ -136,6 +137,8 @@ class ReasoningResponse(BaseModel):
     processing_time_ms: int
     model_used: str
     request_id: str
+    phase_timings_ms: Dict[str, int] = Field(default_factory=dict)
+    degraded_phases: List[str] = Field(default_factory=list)
     created_at: datetime = Field(default_factory=datetime.now)
 
 
@@ -29,6 +29,11 @@ try:
 except ImportError:
     from agents.r1_reasoning.config import R1ReasoningConfig
 from inference.model_router import ModelRouter, InferenceRequest
+from inference.prompt_cache import InferenceSession
+try:
+    from .execution_plan import ExecutionPlan
+except ImportError:
+    from agents.r1_reasoning.execution_plan import ExecutionPlan
 
 logger = logging.getLogger(__name__)
 
@@ -66,7 +71,8 @@ class ReasoningEngine:
                                      query: str,
                                      context: List[str] = None,
                                      reasoning_depth: ReasoningDepth = ReasoningDepth.THOROUGH,
-                                     domain_context: str = None) -> ReasoningChain:
+                                     domain_context: str = None,
+                                     session: Optional[InferenceSession] = None) -> ReasoningChain:
         """
         Generate structured reasoning chain for a query.
         
@@ -75,6 +81,7 @@ class ReasoningEngine:
             context: Supporting context information
             reasoning_depth: Depth of analysis required
             domain_context: Domain-specific context (technical, business, etc.)
+            session: Optional inference session shared with follow-up calls
             
         Returns:
             ReasoningChain with structured steps and confidence scores
@@ -97,7 +104,8 @@ class ReasoningEngine:
                 model_type="reasoning",
                 max_tokens=self._get_max_tokens_for_depth(reasoning_depth),
                 temperature=self.config.REASONING_TEMPERATURE,
-                timeout_seconds=self.config.TIMEOUT_SECONDS
+                timeout_seconds=self.config.TIMEOUT_SECONDS,
+                session=session
             )
             
             response = await self.model_router.route_inference(inference_request)
@@ -160,48 +168,67 @@ class ReasoningEngine:
         start_time = time.time()
         request_id = str(uuid.uuid4())
         
+        # Follow-up calls continue from the main chain's processed prompt
+        session = InferenceSession(session_id=request_id)
+        plan = ExecutionPlan(latency_budget_ms=request.latency_budget_ms)
+        
         try:
             # Generate core reasoning chain
-            reasoning_chain = await self.generate_reasoning_chain(
-                query=request.query,
-                reasoning_depth=request.reasoning_depth
-            )
-            
-            # Generate confidence analysis
-            confidence_analysis = await self._generate_confidence_analysis(reasoning_chain)
-            
-            # Generate alternative perspectives if requested
-            alternatives = []
-            if request.include_alternatives:
-                alternatives = await self._generate_alternative_perspectives(
+            reasoning_chain = await plan.run(
+                "reasoning_chain",
+                lambda: self.generate_reasoning_chain(
                     query=request.query,
-                    reasoning_chain=reasoning_chain
+                    reasoning_depth=request.reasoning_depth,
+                    session=session
                 )
+            )
             
-            # Identify limitations if requested
-            limitations = []
+            # Sub-analyses only depend on the chain, so run them together
+            phases = {
+                "confidence_analysis": {
+                    "step": lambda: self._generate_confidence_analysis(reasoning_chain)
+                },
+                "follow_up_questions": {
+                    "step": lambda: self._generate_follow_up_questions(
+                        query=request.query,
+                        reasoning_chain=reasoning_chain
+                    )
+                }
+            }
+            if request.include_alternatives:
+                phases["alternative_perspectives"] = {
+                    "step": lambda: self._generate_alternative_perspectives(
+                        query=request.query,
+                        reasoning_chain=reasoning_chain,
+                        session=session
+                    ),
+                    "essential": False,
+                    "default": []
+                }
             if request.include_limitations:
-                limitations = await self._identify_reasoning_limitations(reasoning_chain)
+                phases["limitations"] = {
+                    "step": lambda: self._identify_reasoning_limitations(reasoning_chain)
+                }
             
-            # Generate follow-up questions
-            follow_up_questions = await self._generate_follow_up_questions(
-                query=request.query,
-                reasoning_chain=reasoning_chain
-            )
+            results = await plan.run_concurrently(phases)
             
             # Calculate total processing time
             processing_time_ms = int((time.time() - start_time) * 1000)
+            breakdown = plan.get_breakdown()
+            logger.debug(f"Analysis {request_id} phases: {breakdown} session: {session.get_stats()}")
             
             return ReasoningResponse(
                 answer=reasoning_chain.final_conclusion,
                 reasoning_chain=reasoning_chain,
-                confidence_analysis=confidence_analysis,
-                alternative_perspectives=alternatives,
-                limitations=limitations,
-                follow_up_questions=follow_up_questions,
+                confidence_analysis=results["confidence_analysis"],
+                alternative_perspectives=results.get("alternative_perspectives", []),
+                limitations=results.get("limitations", []),
+                follow_up_questions=results["follow_up_questions"],
                 processing_time_ms=processing_time_ms,
                 model_used=self.config.REASONING_MODEL,
-                request_id=request_id
+                request_id=request_id,
+                phase_timings_ms=breakdown["phases_ms"],
+                degraded_phases=breakdown["degraded_phases"]
             )
             
         except Exception as e:
@@ -228,7 +255,8 @@ class ReasoningEngine:
                 follow_up_questions=[],
                 processing_time_ms=int((time.time() - start_time) * 1000),
                 model_used=self.config.REASONING_MODEL,
-                request_id=request_id
+                request_id=request_id,
+                phase_timings_ms=plan.phase_timings_ms
             )
     
     def _build_reasoning_prompt(self,
@@ -575,7 +603,8 @@ Provide an EXHAUSTIVE analysis with 6-10 reasoning steps. Include comprehensive
     
     async def _generate_alternative_perspectives(self,
                                                query: str,
-                                               reasoning_chain: ReasoningChain) -> List[AlternativePerspective]:
+                                               reasoning_chain: ReasoningChain,
+                                               session: Optional[InferenceSession] = None) -> List[AlternativePerspective]:
         """Generate alternative perspectives on the reasoning"""
         
         # Build prompt for alternative perspective generation
@@ -595,12 +624,17 @@ Reasoning: [why this perspective is valid]
 Likelihood: XX%
 Confidence: XX%"""
 
+        # Extend the main exchange so the backend can reuse its processed prefix
+        if session:
+            alt_prompt = session.continue_with(alt_prompt)
+        
         try:
             inference_request = InferenceRequest(
                 prompt=alt_prompt,
                 model_type="reasoning",
                 max_tokens=1024,
-                temperature=0.4  # Slightly higher for creativity
+                temperature=0.4,  # Slightly higher for creativity
+                session=session
             )
             
             response = await self.model_router.route_inference(inference_request)
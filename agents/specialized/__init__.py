@@ -8,6 +8,18 @@ each with focused toolsets and optimized performance.
 __version__ = "1.0.0"
 
 # Import specialized agents with fallback handling
+try:
+    from .resource_pool import ResourcePool, ResourcePoolManager, get_resource_pools
+except ImportError:
+    ResourcePool = None
+    ResourcePoolManager = None
+    get_resource_pools = None
+
+try:
+    from .filesystem_search import FileSearch
+except ImportError:
+    FileSearch = None
+
 try:
     from .slack_agent import SlackAgent
 except ImportError:
@@ -44,5 +56,9 @@ __all__ = [
     "FilesystemAgent",
     "JinaSearchAgent",
     "AirtableAgent",
-    "FirecrawlAgent"
+    "FirecrawlAgent",
+    "ResourcePool",
+    "ResourcePoolManager",
+    "get_resource_pools",
+    "FileSearch"
 ]
\ No newline at end of file
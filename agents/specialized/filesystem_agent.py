@@ -21,6 +21,13 @@ except ImportError:
     import io
 import mimetypes
 
+try:
+    from .resource_pool import ResourcePoolManager, get_resource_pools
+    from .filesystem_search import FileSearch
+except ImportError:
+    from agents.specialized.resource_pool import ResourcePoolManager, get_resource_pools
+    from agents.specialized.filesystem_search import FileSearch
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,7 +47,12 @@ class FilesystemAgent:
     def __init__(self, 
                  base_path: Optional[str] = None,
                  enable_write: bool = True,
-                 enable_delete: bool = False):
+                 enable_delete: bool = False,
+                 resource_pools: Optional[ResourcePoolManager] = None,
+                 max_concurrency: int = 16,
+                 search_max_results: int = 1000,
+                 search_deadline_seconds: float = 30.0,
+                 search_read_concurrency: int = 8):
         """Initialize filesystem agent"""
         
         self.base_path = Path(base_path) if base_path else Path.cwd()
@@ -48,6 +60,16 @@ class FilesystemAgent:
         self.enable_delete = enable_delete
         self.initialized = True
         
+        # Bounds concurrent disk operations across all filesystem agents
+        self.resource_pools = resource_pools or get_resource_pools()
+        self.pool_key = "filesystem"
+        self.resource_pools.register(self.pool_key, max_concurrency=max_concurrency)
+        
+        # Search limits; a task's context can override the first two
+        self.search_max_results = search_max_results
+        self.search_deadline_seconds = search_deadline_seconds
+        self.search_read_concurrency = search_read_concurrency
+        
         # Agent metadata
         self.name = "Filesystem Operations Agent"
         self.version = "1.0.0"
@@ -119,7 +141,8 @@ class FilesystemAgent:
                 }
             
             # Execute operation
-            result = await self._execute_operation(operation)
+            async with self.resource_pools.lease(self.pool_key):
+                result = await self._execute_operation(operation)
             
             # Track success
             self.successful_operations += 1
@@ -230,7 +253,10 @@ class FilesystemAgent:
                 "path": context.get("path", str(self.base_path)),
                 "pattern": context.get("pattern", self._extract_search_pattern(task)),
                 "recursive": context.get("recursive", True),
-                "content_search": context.get("content_search", False)
+                "content_search": context.get("content_search", False),
+                "content_query": context.get("content_query"),
+                "max_results": context.get("max_results", self.search_max_results),
+                "deadline_seconds": context.get("deadline_seconds", self.search_deadline_seconds)
             }
         
         # Backup operations
@@ -622,16 +648,20 @@ class FilesystemAgent:
     async def _get_item_info(self, path: Path) -> Dict[str, Any]:
         """Get information about a file or directory"""
         
-        stat = path.stat()
+        return self._item_info_from_stat(path, path.stat(), path.is_dir())
+    
+    def _item_info_from_stat(self, path: Path, stat: os.stat_result, is_dir: bool) -> Dict[str, Any]:
+        """Item information from an already collected stat result"""
         
+        is_file = not is_dir
         return {
             "name": path.name,
             "path": str(path),
             "size": stat.st_size,
             "modified": datetime.fromtimestamp(stat.st_mtime).isoformat(),
-            "is_file": path.is_file(),
-            "is_directory": path.is_dir(),
-            "extension": path.suffix.lower() if path.is_file() else None
+            "is_file": is_file,
+            "is_directory": is_dir,
+            "extension": path.suffix.lower() if is_file else None
         }
     
     def _resolve_path(self, path_str: str) -> Path:
@@ -746,7 +776,14 @@ class FilesystemAgent:
         return info
     
     async def _search_files(self, operation: Dict[str, Any]) -> Dict[str, Any]:
-        """Search for files matching pattern"""
+        """
+        Search for files matching pattern.
+        
+        Matches stream from a background directory walk. Content search
+        scans candidate files in chunks on a bounded set of readers, for
+        content_query or else the pattern itself. The search stops at
+        max_results or deadline_seconds and reports whether it did.
+        """
         
         search_path = self._resolve_path(operation["path"])
         pattern = operation["pattern"]
@@ -756,28 +793,22 @@ class FilesystemAgent:
         if not search_path.exists():
             raise FileNotFoundError(f"Search path not found: {search_path}")
         
-        matches = []
-        
-        if recursive:
-            search_iter = search_path.rglob(pattern)
-        else:
-            search_iter = search_path.glob(pattern)
+        search = FileSearch(
+            search_path,
+            pattern,
+            recursive=recursive,
+            content_query=(operation.get("content_query") or pattern) if content_search else None,
+            extensions=self.allowed_extensions,
+            max_results=operation.get("max_results", self.search_max_results),
+            deadline_seconds=operation.get("deadline_seconds", self.search_deadline_seconds),
+            read_concurrency=self.search_read_concurrency
+        )
         
-        for match in search_iter:
-            match_info = await self._get_item_info(match)
-            
-            # Content search if requested
-            if content_search and match.is_file() and match.suffix.lower() in self.allowed_extensions:
-                try:
-                    async with aiofiles.open(match, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        if pattern.lower() in content.lower():
-                            match_info["content_match"] = True
-                        else:
-                            continue  # Skip if content doesn't match
-                except Exception:
-                    pass  # Skip files that can't be read
-            
+        matches = []
+        async for hit in search:
+            match_info = self._item_info_from_stat(hit.path, hit.stat, hit.is_dir)
+            if hit.content_match:
+                match_info["content_match"] = True
             matches.append(match_info)
         
         return {
@@ -786,7 +817,10 @@ class FilesystemAgent:
             "matches": matches,
             "match_count": len(matches),
             "recursive": recursive,
-            "content_search": content_search
+            "content_search": content_search,
+            "truncated": search.stats["truncated"],
+            "timed_out": search.stats["timed_out"],
+            "search_stats": search.stats
         }
     
     async def _create_backup(self, operation: Dict[str, Any]) -> Dict[str, Any]:
@@ -837,6 +871,7 @@ class FilesystemAgent:
             "delete_enabled": self.enable_delete,
             "capabilities": self.capabilities,
             "allowed_extensions": list(self.allowed_extensions),
+            "resource_pool": self.resource_pools.get_pool(self.pool_key).get_stats(),
             "performance": {
                 "total_operations": self.total_operations,
                 "successful_operations": self.successful_operations,
@@ -0,0 +1,292 @@
+"""
+Streaming File Search for the Filesystem Agent
+
+Walks directories with os.scandir in a worker thread and streams matches
+back as an async iterator. Content checks scan files in fixed-size chunks
+on a bounded number of reader threads, and a search stops early once it
+has enough results or its deadline passes.
+"""
+import asyncio
+import fnmatch
+import logging
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from pathlib import Path
+from typing import AsyncIterator, Collection, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Walker batches handed to the event loop at once, and how many may queue up
+WALK_BATCH_SIZE = 256
+MAX_QUEUED_BATCHES = 4
+
+# How often a blocked walker checks whether the search was stopped
+STOP_POLL_SECONDS = 0.1
+
+
+@dataclass
+class SearchHit:
+    """A search match with the stat result the walk already collected"""
+    path: Path
+    stat: os.stat_result
+    is_dir: bool
+    content_match: bool = False
+
+
+def contains_text(path, query: str, chunk_size: int = 64 * 1024,
+                  stop: Optional[threading.Event] = None) -> bool:
+    """
+    Case-insensitive check whether a file contains query, reading it in
+    chunks so memory stays bounded by chunk_size.
+
+    Consecutive chunks overlap by len(query) - 1 so a match spanning a
+    chunk boundary is still found. ASCII queries are matched on raw bytes,
+    skipping decoding entirely; other queries are matched on UTF-8 text.
+    """
+    if not query:
+        return True
+
+    if query.isascii():
+        needle, mode, encoding = query.lower().encode(), 'rb', None
+    else:
+        needle, mode, encoding = query.lower(), 'r', 'utf-8'
+    overlap = len(needle) - 1
+
+    with open(path, mode, encoding=encoding, errors='ignore' if encoding else None) as f:
+        tail = needle[:0]
+        while True:
+            if stop is not None and stop.is_set():
+                return False
+            chunk = f.read(chunk_size)
+            if not chunk:
+                return False
+            window = tail + chunk.lower()
+            if needle in window:
+                return True
+            tail = window[-overlap:] if overlap else needle[:0]
+
+
+class FileSearch:
+    """
+    One search over a directory tree.
+
+    Names are matched like Path.rglob(pattern) (Path.glob when not
+    recursive); symlinked directories are not followed. With a content
+    query only files whose suffix is in the allowed extensions and whose
+    contents contain the query are returned.
+
+    Usage:
+        search = FileSearch(root, "*.py", content_query="TODO", max_results=50)
+        async for hit in search:
+            ...
+        search.stats["truncated"], search.stats["timed_out"]
+    """
+
+    def __init__(self,
+                 root,
+                 pattern: str = "*",
+                 recursive: bool = True,
+                 content_query: Optional[str] = None,
+                 extensions: Optional[Collection[str]] = None,
+                 max_results: Optional[int] = None,
+                 deadline_seconds: Optional[float] = None,
+                 chunk_size: int = 64 * 1024,
+                 read_concurrency: int = 8):
+        """
+        Initialize file search
+
+        Args:
+            root: Directory to search
+            pattern: Glob pattern for names, or relative paths when it contains a separator
+            recursive: Search subdirectories
+            content_query: Text the file contents must contain, case-insensitively
+            extensions: Lowercase suffixes eligible for content search
+            max_results: Stop after this many matches
+            deadline_seconds: Stop after this much time, returning what was found
+            chunk_size: Bytes read per chunk when scanning contents
+            read_concurrency: Files scanned at once
+        """
+        self.root = Path(root)
+        self.pattern = pattern
+        self.recursive = recursive
+        self.content_query = content_query
+        self.extensions: Optional[Set[str]] = {e.lower() for e in extensions} if extensions is not None else None
+        self.max_results = max_results
+        self.deadline_seconds = deadline_seconds
+        self.chunk_size = chunk_size
+        self.read_concurrency = max(1, read_concurrency)
+
+        # Patterns with a separator match the tail of the relative path, as rglob does
+        self._path_pattern = os.sep in pattern or "/" in pattern
+        self._name_regex = re.compile(fnmatch.translate(pattern))
+        self._stop = threading.Event()
+
+        self.stats = {
+            "entries_walked": 0,
+            "candidates": 0,
+            "files_scanned": 0,
+            "read_errors": 0,
+            "results": 0,
+            "truncated": False,
+            "timed_out": False
+        }
+
+    def _matches(self, entry: os.DirEntry) -> bool:
+        if self._path_pattern:
+            return Path(entry.path).relative_to(self.root).match(self.pattern)
+        return self._name_regex.match(entry.name) is not None
+
+    def _walk(self, loop: asyncio.AbstractEventLoop, batches: asyncio.Queue, slots: threading.Semaphore):
+        """Worker thread: scandir the tree and hand name matches to the loop in batches"""
+
+        def hand_over(batch) -> bool:
+            # Backpressure: wait for the consumer to take earlier batches
+            while not slots.acquire(timeout=STOP_POLL_SECONDS):
+                if self._stop.is_set():
+                    return False
+            try:
+                loop.call_soon_threadsafe(batches.put_nowait, batch)
+            except RuntimeError:
+                # Event loop already closed
+                return False
+            return True
+
+        batch: List[SearchHit] = []
+        stack = [str(self.root)]
+        try:
+            while stack and not self._stop.is_set():
+                try:
+                    iterator = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                subdirs = []
+                with iterator:
+                    for entry in iterator:
+                        if self._stop.is_set():
+                            break
+                        self.stats["entries_walked"] += 1
+                        try:
+                            is_dir = entry.is_dir(follow_symlinks=False)
+                            if is_dir and self.recursive:
+                                subdirs.append(entry.path)
+                            if self._matches(entry):
+                                batch.append(SearchHit(Path(entry.path), entry.stat(), is_dir or entry.is_dir()))
+                        except OSError:
+                            continue
+                        if len(batch) >= WALK_BATCH_SIZE:
+                            if not hand_over(batch):
+                                return
+                            batch = []
+                stack.extend(reversed(subdirs))
+            if batch:
+                hand_over(batch)
+        finally:
+            # End of walk marker; never blocks on the slots
+            try:
+                loop.call_soon_threadsafe(batches.put_nowait, None)
+            except RuntimeError:
+                pass
+
+    def _scannable(self, hit: SearchHit) -> bool:
+        if hit.is_dir:
+            return False
+        return self.extensions is None or hit.path.suffix.lower() in self.extensions
+
+    async def _scan(self, hit: SearchHit) -> Optional[SearchHit]:
+        try:
+            matched = await asyncio.to_thread(contains_text, hit.path, self.content_query, self.chunk_size, self._stop)
+        except (OSError, ValueError):
+            self.stats["read_errors"] += 1
+            return None
+        self.stats["files_scanned"] += 1
+        if not matched:
+            return None
+        hit.content_match = True
+        return hit
+
+    def stop(self):
+        """Stop the walk and any scans in progress"""
+        self._stop.set()
+
+    def __aiter__(self) -> AsyncIterator[SearchHit]:
+        return self._search()
+
+    async def _search(self) -> AsyncIterator[SearchHit]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.deadline_seconds if self.deadline_seconds is not None else None
+        batches: asyncio.Queue = asyncio.Queue()
+        slots = threading.Semaphore(MAX_QUEUED_BATCHES)
+        self._stop.clear()
+        walker = loop.run_in_executor(None, self._walk, loop, batches, slots)
+
+        waiting = deque()
+        scans: Set[asyncio.Future] = set()
+        next_batch: Optional[asyncio.Future] = None
+        walking = True
+
+        def emit(hit: SearchHit) -> bool:
+            """Count a result; False once max_results is reached"""
+            self.stats["results"] += 1
+            if self.max_results is not None and self.stats["results"] >= self.max_results:
+                self.stats["truncated"] = True
+                return False
+            return True
+
+        try:
+            while walking or waiting or scans:
+                # Start scans up to the concurrency bound
+                while waiting and len(scans) < self.read_concurrency:
+                    scans.add(asyncio.ensure_future(self._scan(waiting.popleft())))
+
+                # Only pull more of the walk once queued candidates are scheduled
+                if walking and not waiting and next_batch is None:
+                    next_batch = asyncio.ensure_future(batches.get())
+
+                waits = set(scans)
+                if next_batch is not None:
+                    waits.add(next_batch)
+                timeout = None if deadline is None else deadline - loop.time()
+                if timeout is not None and timeout <= 0:
+                    self.stats["timed_out"] = True
+                    return
+                done, _ = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if not done:
+                    self.stats["timed_out"] = True
+                    return
+
+                for scan in done & scans:
+                    scans.discard(scan)
+                    hit = scan.result()
+                    if hit is not None:
+                        more = emit(hit)
+                        yield hit
+                        if not more:
+                            return
+
+                if next_batch is not None and next_batch.done():
+                    batch = next_batch.result()
+                    next_batch = None
+                    if batch is None:
+                        walking = False
+                        continue
+                    slots.release()
+                    self.stats["candidates"] += len(batch)
+                    for hit in batch:
+                        if self.content_query is None:
+                            more = emit(hit)
+                            yield hit
+                            if not more:
+                                return
+                        elif self._scannable(hit):
+                            waiting.append(hit)
+        finally:
+            self._stop.set()
+            for future in scans:
+                future.cancel()
+            if next_batch is not None:
+                next_batch.cancel()
+            # The walker notices the stop within STOP_POLL_SECONDS
+            await walker
@@ -18,6 +18,11 @@ except ImportError:
     aiohttp = None
     HTTP_CLIENT_AVAILABLE = False
 
+try:
+    from .resource_pool import ResourcePoolManager, get_resource_pools
+except ImportError:
+    from agents.specialized.resource_pool import ResourcePoolManager, get_resource_pools
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,14 +39,21 @@ class GitHubAgent:
     - Code search and file operations
     """
     
-    def __init__(self, token: Optional[str] = None, base_url: str = "https://api.github.com"):
+    def __init__(self,
+                 token: Optional[str] = None,
+                 base_url: str = "https://api.github.com",
+                 resource_pools: Optional[ResourcePoolManager] = None,
+                 max_concurrency: int = 8):
         """Initialize GitHub agent"""
         
         self.token = token
         self.base_url = base_url
-        self.session: Optional[aiohttp.ClientSession] = None
         self.initialized = False
         
+        # Sessions come from a pool shared by every agent with the same credentials
+        self.resource_pools = resource_pools or get_resource_pools()
+        self.pool_key = ResourcePoolManager.backend_key("github", f"{base_url}|{token or ''}")
+        
         # Agent metadata
         self.name = "GitHub Repository Agent"
         self.version = "1.0.0"
@@ -66,16 +78,23 @@ class GitHubAgent:
         self.last_operation_time = None
         self.rate_limit_remaining = 5000  # GitHub default
         
-        # Initialize HTTP session
+        # Register the HTTP session pool
         if HTTP_CLIENT_AVAILABLE:
-            asyncio.create_task(self._initialize_session())
+            self.resource_pools.register(
+                self.pool_key,
+                self._create_session,
+                max_size=1,
+                max_concurrency=max_concurrency,
+                shared=True,
+                min_idle=1
+            )
             self.initialized = True
         else:
             logger.warning("HTTP client not available - using simulation mode")
             self.initialized = True
     
-    async def _initialize_session(self):
-        """Initialize aiohttp session with GitHub headers"""
+    async def _create_session(self) -> "aiohttp.ClientSession":
+        """Create aiohttp session with GitHub headers"""
         
         headers = {
             "Accept": "application/vnd.github.v3+json",
@@ -85,7 +104,7 @@ class GitHubAgent:
         if self.token:
             headers["Authorization"] = f"token {self.token}"
         
-        self.session = aiohttp.ClientSession(
+        return aiohttp.ClientSession(
             headers=headers,
             timeout=aiohttp.ClientTimeout(total=30)
         )
@@ -111,8 +130,9 @@ class GitHubAgent:
             operation = await self._parse_task(task, context)
             
             # Execute operation
-            if self.session and HTTP_CLIENT_AVAILABLE:
-                result = await self._execute_real_operation(operation)
+            if HTTP_CLIENT_AVAILABLE:
+                async with self.resource_pools.lease(self.pool_key) as session:
+                    result = await self._execute_real_operation(operation, session)
             else:
                 result = await self._execute_simulated_operation(operation)
             
@@ -128,7 +148,7 @@ class GitHubAgent:
                 "operation": operation["type"],
                 "execution_time_seconds": execution_time,
                 "agent": "github",
-                "simulated": not (self.session and HTTP_CLIENT_AVAILABLE)
+                "simulated": not HTTP_CLIENT_AVAILABLE
             }
             
         except Exception as e:
@@ -373,7 +393,7 @@ class GitHubAgent:
         
         return "README.md"  # Default file
     
-    async def _execute_real_operation(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_real_operation(self, operation: Dict[str, Any], session: "aiohttp.ClientSession") -> Dict[str, Any]:
         """Execute real GitHub operation using API"""
         
         op_type = operation["type"]
@@ -393,7 +413,7 @@ class GitHubAgent:
                 
                 url = f"{self.base_url}/repos/{operation['repo']}/issues"
                 
-                async with self.session.post(url, json=data) as response:
+                async with session.post(url, json=data) as response:
                     if response.status == 201:
                         result = await response.json()
                         return {
@@ -417,7 +437,7 @@ class GitHubAgent:
                 
                 url = f"{self.base_url}/repos/{operation['repo']}/issues"
                 
-                async with self.session.get(url, params=params) as response:
+                async with session.get(url, params=params) as response:
                     if response.status == 200:
                         issues = await response.json()
                         return {
@@ -440,7 +460,7 @@ class GitHubAgent:
             elif op_type == "get_repo_info":
                 url = f"{self.base_url}/repos/{operation['repo']}"
                 
-                async with self.session.get(url) as response:
+                async with session.get(url) as response:
                     if response.status == 200:
                         repo = await response.json()
                         return {
@@ -464,14 +484,14 @@ class GitHubAgent:
                 
                 url = f"{self.base_url}/repos/{operation['repo']}/issues/{operation['issue_number']}"
                 
-                async with self.session.patch(url, json=data) as response:
+                async with session.patch(url, json=data) as response:
                     if response.status == 200:
                         # Add comment if provided
                         if operation.get("comment"):
                             comment_url = f"{url}/comments"
                             comment_data = {"body": operation["comment"]}
                             
-                            async with self.session.post(comment_url, json=comment_data) as comment_response:
+                            async with session.post(comment_url, json=comment_data) as comment_response:
                                 pass  # Comment added
                         
                         return {
@@ -572,7 +592,8 @@ class GitHubAgent:
             "version": self.version,
             "initialized": self.initialized,
             "http_client_available": HTTP_CLIENT_AVAILABLE,
-            "session_ready": self.session is not None,
+            "session_ready": self._pool_ready(),
+            "resource_pool": self._pool_stats(),
             "authenticated": self.token is not None,
             "capabilities": self.capabilities,
             "rate_limit_remaining": self.rate_limit_remaining,
@@ -589,11 +610,12 @@ class GitHubAgent:
         """Test GitHub connection and capabilities"""
         
         try:
-            if self.session and HTTP_CLIENT_AVAILABLE:
+            if HTTP_CLIENT_AVAILABLE:
                 # Test API access
                 url = f"{self.base_url}/user" if self.token else f"{self.base_url}/rate_limit"
                 
-                async with self.session.get(url) as response:
+                async with self.resource_pools.lease(self.pool_key) as session, \
+                        session.get(url) as response:
                     if response.status == 200:
                         data = await response.json()
                         
@@ -623,11 +645,27 @@ class GitHubAgent:
                 "error": str(e)
             }
     
+    def _pool_stats(self) -> Optional[Dict[str, Any]]:
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool.get_stats() if pool else None
+    
+    def _pool_ready(self) -> bool:
+        """Whether the pool holds a live session"""
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool is not None and pool.size > 0
+    
     async def cleanup(self):
-        """Cleanup resources"""
+        """
+        Cleanup resources
+        
+        Sessions are leased per operation and returned as each finishes. The
+        pool is shared with other agents, so it is left open for them and
+        closed by ResourcePoolManager.close() at shutdown.
+        """
         
-        if self.session:
-            await self.session.close()
+        pool = self.resource_pools.get_pool(self.pool_key)
+        if pool:
+            await pool.evict_idle()
 
 
 async def test_github_agent():
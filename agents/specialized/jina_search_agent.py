@@ -18,6 +18,11 @@ except ImportError:
     aiohttp = None
     HTTP_CLIENT_AVAILABLE = False
 
+try:
+    from .resource_pool import ResourcePoolManager, get_resource_pools
+except ImportError:
+    from agents.specialized.resource_pool import ResourcePoolManager, get_resource_pools
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,14 +39,20 @@ class JinaSearchAgent:
     - Content summarization and extraction
     """
     
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 resource_pools: Optional[ResourcePoolManager] = None,
+                 max_concurrency: int = 10):
         """Initialize Jina Search agent"""
         
         self.api_key = api_key
         self.base_url = "https://s.jina.ai"
-        self.session: Optional[aiohttp.ClientSession] = None
         self.initialized = False
         
+        # Sessions come from a pool shared by every agent with the same API key
+        self.resource_pools = resource_pools or get_resource_pools()
+        self.pool_key = ResourcePoolManager.backend_key("jina_search", api_key)
+        
         # Agent metadata
         self.name = "Jina Web Search Agent"
         self.version = "1.0.0"
@@ -77,16 +88,23 @@ class JinaSearchAgent:
         self.requests_per_minute = 60
         self.request_timestamps = []
         
-        # Initialize HTTP session
+        # Register the HTTP session pool
         if HTTP_CLIENT_AVAILABLE:
-            asyncio.create_task(self._initialize_session())
+            self.resource_pools.register(
+                self.pool_key,
+                self._create_session,
+                max_size=1,
+                max_concurrency=max_concurrency,
+                shared=True,
+                min_idle=1
+            )
             self.initialized = True
         else:
             logger.warning("HTTP client not available - using simulation mode")
             self.initialized = True
     
-    async def _initialize_session(self):
-        """Initialize aiohttp session with proper headers"""
+    async def _create_session(self) -> "aiohttp.ClientSession":
+        """Create aiohttp session with proper headers"""
         
         headers = {
             "User-Agent": "AAI-Jina-Search-Agent/1.0.0",
@@ -106,7 +124,7 @@ class JinaSearchAgent:
             keepalive_timeout=60,  # Keep connections alive
         )
         
-        self.session = aiohttp.ClientSession(
+        return aiohttp.ClientSession(
             headers=headers,
             timeout=aiohttp.ClientTimeout(total=30),
             connector=connector
@@ -142,8 +160,9 @@ class JinaSearchAgent:
             operation = await self._parse_task(task, context)
             
             # Execute operation
-            if self.session and HTTP_CLIENT_AVAILABLE:
-                result = await self._execute_real_search(operation)
+            if HTTP_CLIENT_AVAILABLE:
+                async with self.resource_pools.lease(self.pool_key) as session:
+                    result = await self._execute_real_search(operation, session)
             else:
                 result = await self._execute_simulated_search(operation)
             
@@ -159,7 +178,7 @@ class JinaSearchAgent:
                 "operation": operation["type"],
                 "execution_time_seconds": execution_time,
                 "agent": "jina_search",
-                "simulated": not (self.session and HTTP_CLIENT_AVAILABLE)
+                "simulated": not HTTP_CLIENT_AVAILABLE
             }
             
         except Exception as e:
@@ -326,7 +345,7 @@ class JinaSearchAgent:
         self.request_timestamps.append(now)
         return {"allowed": True, "message": "Rate limit OK"}
     
-    async def _execute_real_search(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_real_search(self, operation: Dict[str, Any], session: "aiohttp.ClientSession") -> Dict[str, Any]:
         """Execute real search using Jina Search API"""
         
         op_type = operation["type"]
@@ -343,7 +362,7 @@ class JinaSearchAgent:
                 
                 url = f"{self.base_url}/search"
                 
-                async with self.session.get(url, params=params) as response:
+                async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         return await self._process_web_results(data, query)
@@ -361,7 +380,7 @@ class JinaSearchAgent:
                 
                 url = f"{self.base_url}/news"
                 
-                async with self.session.get(url, params=params) as response:
+                async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         return await self._process_news_results(data, query)
@@ -378,7 +397,7 @@ class JinaSearchAgent:
                 
                 url = f"{self.base_url}/images"
                 
-                async with self.session.get(url, params=params) as response:
+                async with session.get(url, params=params) as response:
                     if response.status == 200:
                         data = await response.json()
                         return await self._process_image_results(data, query)
@@ -392,7 +411,7 @@ class JinaSearchAgent:
                     # Use Jina Reader for content extraction
                     reader_url = f"https://r.jina.ai/{target_url}"
                     
-                    async with self.session.get(reader_url) as response:
+                    async with session.get(reader_url) as response:
                         if response.status == 200:
                             content = await response.text()
                             return await self._process_extracted_content(content, target_url)
@@ -404,7 +423,7 @@ class JinaSearchAgent:
                         "type": "web_search",
                         "query": query,
                         "count": 5
-                    })
+                    }, session)
             
             else:
                 # Fallback to web search for unknown types
@@ -412,7 +431,7 @@ class JinaSearchAgent:
                     "type": "web_search",
                     "query": query,
                     "count": operation.get("count", 10)
-                })
+                }, session)
                 
         except aiohttp.ClientError as e:
             logger.error(f"Jina Search API error: {e}")
@@ -626,7 +645,8 @@ class JinaSearchAgent:
             "version": self.version,
             "initialized": self.initialized,
             "http_client_available": HTTP_CLIENT_AVAILABLE,
-            "session_ready": self.session is not None,
+            "session_ready": self._pool_ready(),
+            "resource_pool": self._pool_stats(),
             "authenticated": self.api_key is not None,
             "capabilities": self.capabilities,
             "rate_limit": {
@@ -647,14 +667,15 @@ class JinaSearchAgent:
         """Test search service connection"""
         
         try:
-            if self.session and HTTP_CLIENT_AVAILABLE:
+            if HTTP_CLIENT_AVAILABLE:
                 # Test with a simple search
                 test_query = "test connection"
                 
                 params = {"q": test_query, "count": 1}
                 url = f"{self.base_url}/search"
                 
-                async with self.session.get(url, params=params) as response:
+                async with self.resource_pools.lease(self.pool_key) as session, \
+                        session.get(url, params=params) as response:
                     return {
                         "connection_test": "success" if response.status == 200 else "failed",
                         "status_code": response.status,
@@ -682,17 +703,33 @@ class JinaSearchAgent:
         await self.cleanup()
     
     async def _ensure_initialized(self):
-        """Ensure agent is properly initialized"""
-        if not self.initialized:
-            if HTTP_CLIENT_AVAILABLE and not self.session:
-                await self._initialize_session()
-            self.initialized = True
+        """Ensure agent is properly initialized with a warm session"""
+        pool = self.resource_pools.get_pool(self.pool_key)
+        if pool:
+            await pool.warm()
+        self.initialized = True
+    
+    def _pool_stats(self) -> Optional[Dict[str, Any]]:
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool.get_stats() if pool else None
+    
+    def _pool_ready(self) -> bool:
+        """Whether the pool holds a live session"""
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool is not None and pool.size > 0
     
     async def cleanup(self):
-        """Cleanup resources"""
+        """
+        Cleanup resources
+        
+        Sessions are leased per operation and returned as each finishes. The
+        pool is shared with other agents, so it is left open for them and
+        closed by ResourcePoolManager.close() at shutdown.
+        """
         
-        if self.session:
-            await self.session.close()
+        pool = self.resource_pools.get_pool(self.pool_key)
+        if pool:
+            await pool.evict_idle()
 
 
 async def test_jina_search_agent():
@@ -0,0 +1,364 @@
+"""
+Resource Pool for Specialized Agents
+
+Warm, bounded pools of API clients and MCP sessions shared by the
+specialized agents across orchestrations, with leasing, per-backend
+concurrency limits, idle eviction and utilization metrics.
+"""
+import logging
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Callable, Awaitable, AsyncIterator
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class _PooledResource:
+    """Pooled resource with lease bookkeeping"""
+    resource: Any
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    leases: int = 0
+    uses: int = 0
+
+
+async def _close_resource(resource: Any):
+    """Close a resource via its close() method, awaiting if needed"""
+    close = getattr(resource, "close", None)
+    if close is None:
+        return
+    result = close()
+    if asyncio.iscoroutine(result):
+        await result
+
+
+class ResourcePool:
+    """
+    Bounded pool of reusable resources for one backend.
+
+    Features:
+    - Leases via ``async with pool.lease() as resource``
+    - Concurrency limit on simultaneous leases
+    - Shared resources (HTTP sessions, SDK clients) serve many leases at
+      once; exclusive ones (MCP sessions) serve one lease each
+    - Idle eviction down to a warm minimum
+    - Utilization metrics
+
+    A pool with no factory only limits concurrency and leases out None.
+    Resources are bound to the event loop that created them; when the pool
+    is used from a new loop it drops resources from the old one.
+    """
+
+    def __init__(self,
+                 name: str,
+                 factory: Optional[Callable[[], Awaitable[Any]]] = None,
+                 max_size: int = 4,
+                 max_concurrency: int = 8,
+                 shared: bool = False,
+                 min_idle: int = 0,
+                 idle_timeout_seconds: float = 300.0,
+                 closer: Optional[Callable[[Any], Awaitable[None]]] = None):
+        """
+        Initialize resource pool
+
+        Args:
+            name: Backend name used in logs and metrics
+            factory: Coroutine function creating a resource
+            max_size: Maximum resources held by the pool
+            max_concurrency: Maximum simultaneous leases
+            shared: Whether one resource can serve several leases at once
+            min_idle: Resources kept warm through idle eviction
+            idle_timeout_seconds: Idle time after which resources are closed
+            closer: Coroutine function closing a resource
+        """
+        self.name = name
+        self.factory = factory
+        self.max_size = max(1, max_size)
+        self.shared = shared
+        # Exclusive resources cap concurrency at the pool size
+        if factory is not None and not shared:
+            max_concurrency = min(max_concurrency, self.max_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.min_idle = min(min_idle, self.max_size)
+        self.idle_timeout_seconds = idle_timeout_seconds
+        self.closer = closer or _close_resource
+
+        self._resources: List[_PooledResource] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._create_lock: Optional[asyncio.Lock] = None
+
+        self.stats = {
+            "leases": 0,
+            "created": 0,
+            "reused": 0,
+            "evicted": 0,
+            "errors": 0,
+            "waits": 0,
+            "total_wait_ms": 0.0,
+            "peak_in_use": 0
+        }
+        self._in_use = 0
+
+    def _bind_loop(self):
+        """Reset loop-bound state when first used from a new event loop"""
+
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        if self._resources:
+            logger.debug(f"Pool {self.name} moved to a new event loop; dropping {len(self._resources)} resources")
+        self._resources = []
+        self._loop = loop
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+        self._create_lock = asyncio.Lock()
+        self._in_use = 0
+
+    async def acquire(self, timeout: Optional[float] = None) -> Any:
+        """
+        Lease a resource, waiting for a concurrency slot if necessary.
+
+        Raises:
+            asyncio.TimeoutError: No slot became free within timeout
+        """
+        self._bind_loop()
+
+        if self._slots.locked():
+            self.stats["waits"] += 1
+        wait_start = time.monotonic()
+        if timeout is None:
+            await self._slots.acquire()
+        else:
+            await asyncio.wait_for(self._slots.acquire(), timeout)
+        self.stats["total_wait_ms"] += (time.monotonic() - wait_start) * 1000
+
+        try:
+            entry = await self._checkout()
+        except Exception:
+            self._slots.release()
+            self.stats["errors"] += 1
+            raise
+
+        self.stats["leases"] += 1
+        self._in_use += 1
+        self.stats["peak_in_use"] = max(self.stats["peak_in_use"], self._in_use)
+        return entry.resource if entry else None
+
+    async def _checkout(self) -> Optional[_PooledResource]:
+        """Pick a warm resource or create one; caller holds a slot"""
+
+        if self.factory is None:
+            return None
+
+        entry, grow = self._select()
+        if grow and self.shared:
+            # Concurrent first leases wait for one shared resource, not one each
+            async with self._create_lock:
+                entry, grow = self._select()
+                if grow:
+                    entry = await self._create()
+                else:
+                    self.stats["reused"] += 1
+        elif grow:
+            entry = await self._create()
+        else:
+            self.stats["reused"] += 1
+
+        entry.leases += 1
+        entry.uses += 1
+        return entry
+
+    def _select(self):
+        """Return (warm entry or None, whether a new resource is needed)"""
+
+        if self.shared:
+            entry = min(self._resources, key=lambda e: e.leases, default=None)
+            return entry, entry is None or (entry.leases > 0 and len(self._resources) < self.max_size)
+
+        entry = next((e for e in reversed(self._resources) if e.leases == 0), None)
+        return entry, entry is None
+
+    async def _create(self) -> _PooledResource:
+        entry = _PooledResource(resource=await self.factory())
+        self._resources.append(entry)
+        self.stats["created"] += 1
+        return entry
+
+    async def release(self, resource: Any, discard: bool = False):
+        """
+        Return a leased resource to the pool.
+
+        Args:
+            resource: Resource returned by acquire()
+            discard: Close the resource instead of keeping it warm
+        """
+        entry = next((e for e in self._resources if e.resource is resource), None) if resource is not None else None
+
+        if entry is not None:
+            entry.leases -= 1
+            entry.last_used = time.monotonic()
+            if discard and entry.leases == 0:
+                self._resources.remove(entry)
+                await self._close_entry(entry)
+
+        self._in_use -= 1
+        self._slots.release()
+        await self.evict_idle()
+
+    @asynccontextmanager
+    async def lease(self, timeout: Optional[float] = None) -> AsyncIterator[Any]:
+        """
+        Lease a resource for the duration of the block.
+
+        The resource is discarded if the block raises a connection-level
+        error (OSError, including aiohttp and socket errors).
+        """
+        resource = await self.acquire(timeout)
+        discard = False
+        try:
+            yield resource
+        except (OSError, ConnectionError):
+            discard = True
+            raise
+        finally:
+            await self.release(resource, discard=discard)
+
+    async def warm(self):
+        """Create resources up to min_idle ahead of demand"""
+
+        self._bind_loop()
+        while self.factory and len(self._resources) < self.min_idle:
+            await self._create()
+
+    async def evict_idle(self) -> int:
+        """Close resources idle past the timeout, keeping min_idle warm"""
+
+        now = time.monotonic()
+        idle = [
+            e for e in self._resources
+            if e.leases == 0 and now - e.last_used >= self.idle_timeout_seconds
+        ]
+        idle.sort(key=lambda e: e.last_used)
+        evictable = idle[:max(0, len(self._resources) - self.min_idle)]
+
+        for entry in evictable:
+            self._resources.remove(entry)
+            await self._close_entry(entry)
+        self.stats["evicted"] += len(evictable)
+        return len(evictable)
+
+    async def _close_entry(self, entry: _PooledResource):
+        try:
+            await self.closer(entry.resource)
+        except Exception as e:
+            logger.debug(f"Closing pooled {self.name} resource failed: {e}")
+
+    async def close(self):
+        """Close every resource held by the pool"""
+
+        entries, self._resources = self._resources, []
+        for entry in entries:
+            await self._close_entry(entry)
+
+    @property
+    def size(self) -> int:
+        """Resources currently held, leased or idle"""
+        return len(self._resources)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Pool size, lease and utilization metrics"""
+
+        leases = self.stats["leases"]
+        return {
+            "name": self.name,
+            "shared": self.shared,
+            "max_size": self.max_size,
+            "max_concurrency": self.max_concurrency,
+            "size": self.size,
+            "idle": sum(1 for e in self._resources if e.leases == 0),
+            "in_use": self._in_use,
+            "utilization": self._in_use / self.max_concurrency,
+            "reuse_rate": self.stats["reused"] / leases if leases else 0.0,
+            "average_wait_ms": self.stats["total_wait_ms"] / leases if leases else 0.0,
+            **self.stats
+        }
+
+
+class ResourcePoolManager:
+    """
+    Registry of per-backend resource pools.
+
+    Pools are registered once per backend key and shared by every agent
+    instance that asks for the same key.
+    """
+
+    def __init__(self):
+        """Initialize resource pool manager"""
+        self.pools: Dict[str, ResourcePool] = {}
+
+    @staticmethod
+    def backend_key(backend: str, credential: Optional[str] = None) -> str:
+        """Pool key for a backend, distinguishing credentials without storing them"""
+        if not credential:
+            return backend
+        return f"{backend}:{hashlib.sha256(credential.encode()).hexdigest()[:12]}"
+
+    def register(self, key: str, factory: Optional[Callable[[], Awaitable[Any]]] = None, **limits) -> ResourcePool:
+        """
+        Register a pool for a backend key, or return the existing one.
+
+        Args:
+            key: Backend key, see backend_key()
+            factory: Coroutine function creating a resource
+            **limits: ResourcePool sizing and eviction options
+        """
+        if key not in self.pools:
+            self.pools[key] = ResourcePool(key, factory, **limits)
+        return self.pools[key]
+
+    def get_pool(self, key: str) -> Optional[ResourcePool]:
+        return self.pools.get(key)
+
+    def lease(self, key: str, timeout: Optional[float] = None):
+        """Lease from a registered pool; an unknown key yields None unbounded"""
+        pool = self.pools.get(key)
+        if pool is None:
+            return _null_lease()
+        return pool.lease(timeout)
+
+    async def evict_idle(self) -> int:
+        """Evict idle resources across all pools"""
+        evicted = 0
+        for pool in self.pools.values():
+            evicted += await pool.evict_idle()
+        return evicted
+
+    async def close(self):
+        """Close every pool"""
+        for pool in self.pools.values():
+            await pool.close()
+
+    def get_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Metrics for every pool"""
+        return {key: pool.get_stats() for key, pool in self.pools.items()}
+
+
+@asynccontextmanager
+async def _null_lease() -> AsyncIterator[None]:
+    yield None
+
+
+# Global resource pool manager instance
+_resource_pools = None
+
+def get_resource_pools() -> ResourcePoolManager:
+    """Get or create the process-wide resource pool manager"""
+    global _resource_pools
+    if _resource_pools is None:
+        _resource_pools = ResourcePoolManager()
+    return _resource_pools
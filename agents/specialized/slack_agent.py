@@ -19,6 +19,11 @@ except ImportError:
     SlackApiError = Exception
     SLACK_SDK_AVAILABLE = False
 
+try:
+    from .resource_pool import ResourcePoolManager, get_resource_pools
+except ImportError:
+    from agents.specialized.resource_pool import ResourcePoolManager, get_resource_pools
+
 logger = logging.getLogger(__name__)
 
 
@@ -34,13 +39,20 @@ class SlackAgent:
     - Error handling and retry mechanisms
     """
     
-    def __init__(self, token: Optional[str] = None):
+    def __init__(self,
+                 token: Optional[str] = None,
+                 resource_pools: Optional[ResourcePoolManager] = None,
+                 max_concurrency: int = 4):
         """Initialize Slack agent"""
         
         self.token = token
-        self.client: Optional[AsyncWebClient] = None
+        self.client_available = False
         self.initialized = False
         
+        # Clients come from a pool shared by every agent with the same token
+        self.resource_pools = resource_pools or get_resource_pools()
+        self.pool_key = ResourcePoolManager.backend_key("slack", token)
+        
         # Agent metadata
         self.name = "Slack Communication Agent"
         self.version = "1.0.0"
@@ -62,7 +74,15 @@ class SlackAgent:
         
         # Initialize client if token available
         if self.token and SLACK_SDK_AVAILABLE:
-            self.client = AsyncWebClient(token=self.token)
+            self.resource_pools.register(
+                self.pool_key,
+                self._create_client,
+                max_size=1,
+                max_concurrency=max_concurrency,
+                shared=True,
+                min_idle=1
+            )
+            self.client_available = True
             self.initialized = True
         elif not SLACK_SDK_AVAILABLE:
             logger.warning("Slack SDK not available - using simulation mode")
@@ -71,6 +91,10 @@ class SlackAgent:
             logger.warning("No Slack token provided - agent will use simulation mode")
             self.initialized = True
     
+    async def _create_client(self) -> "AsyncWebClient":
+        """Create Slack web client"""
+        return AsyncWebClient(token=self.token)
+    
     async def execute_task(self, task: str, context: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute Slack-related task.
@@ -92,8 +116,9 @@ class SlackAgent:
             operation = await self._parse_task(task, context)
             
             # Execute operation
-            if self.client and SLACK_SDK_AVAILABLE:
-                result = await self._execute_real_operation(operation)
+            if self.client_available:
+                async with self.resource_pools.lease(self.pool_key) as client:
+                    result = await self._execute_real_operation(operation, client)
             else:
                 result = await self._execute_simulated_operation(operation)
             
@@ -109,7 +134,7 @@ class SlackAgent:
                 "operation": operation["type"],
                 "execution_time_seconds": execution_time,
                 "agent": "slack",
-                "simulated": not (self.client and SLACK_SDK_AVAILABLE)
+                "simulated": not self.client_available
             }
             
         except Exception as e:
@@ -218,14 +243,14 @@ class SlackAgent:
         # Fallback to full task
         return task
     
-    async def _execute_real_operation(self, operation: Dict[str, Any]) -> Dict[str, Any]:
+    async def _execute_real_operation(self, operation: Dict[str, Any], client: "AsyncWebClient") -> Dict[str, Any]:
         """Execute real Slack operation using API"""
         
         op_type = operation["type"]
         
         try:
             if op_type == "send_message":
-                response = await self.client.chat_postMessage(
+                response = await client.chat_postMessage(
                     channel=operation["channel"],
                     text=operation["message"],
                     attachments=operation.get("attachments", [])
@@ -240,13 +265,13 @@ class SlackAgent:
             
             elif op_type == "send_dm":
                 # Get user ID first
-                user_response = await self.client.users_lookupByEmail(
+                user_response = await client.users_lookupByEmail(
                     email=operation["user"]
                 ) if "@" in operation["user"] else None
                 
                 user_id = user_response["user"]["id"] if user_response else operation["user"]
                 
-                response = await self.client.chat_postMessage(
+                response = await client.chat_postMessage(
                     channel=user_id,
                     text=operation["message"]
                 )
@@ -259,7 +284,7 @@ class SlackAgent:
                 }
             
             elif op_type == "create_channel":
-                response = await self.client.conversations_create(
+                response = await client.conversations_create(
                     name=operation["channel_name"],
                     is_private=operation.get("private", False)
                 )
@@ -271,7 +296,7 @@ class SlackAgent:
                 }
             
             elif op_type == "list_channels":
-                response = await self.client.conversations_list(
+                response = await client.conversations_list(
                     limit=operation.get("limit", 100)
                 )
                 
@@ -286,7 +311,7 @@ class SlackAgent:
                 }
             
             elif op_type == "get_user_info":
-                response = await self.client.users_info(
+                response = await client.users_info(
                     user=operation["user"]
                 )
                 
@@ -301,7 +326,7 @@ class SlackAgent:
                 }
             
             elif op_type == "post_status_update":
-                response = await self.client.chat_postMessage(
+                response = await client.chat_postMessage(
                     channel=operation["channel"],
                     text=f"📢 Status Update: {operation['message']}",
                     attachments=[{
@@ -409,7 +434,8 @@ class SlackAgent:
             "version": self.version,
             "initialized": self.initialized,
             "sdk_available": SLACK_SDK_AVAILABLE,
-            "client_ready": self.client is not None,
+            "client_ready": self._pool_ready(),
+            "resource_pool": self._pool_stats(),
             "capabilities": self.capabilities,
             "performance": {
                 "total_operations": self.total_operations,
@@ -420,13 +446,23 @@ class SlackAgent:
             "ready": self.initialized
         }
     
+    def _pool_stats(self) -> Optional[Dict[str, Any]]:
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool.get_stats() if pool else None
+    
+    def _pool_ready(self) -> bool:
+        """Whether the pool holds a live client"""
+        pool = self.resource_pools.get_pool(self.pool_key)
+        return pool is not None and pool.size > 0
+    
     async def test_connection(self) -> Dict[str, Any]:
         """Test Slack connection and capabilities"""
         
         try:
-            if self.client and SLACK_SDK_AVAILABLE:
+            if self.client_available:
                 # Test auth
-                response = await self.client.auth_test()
+                async with self.resource_pools.lease(self.pool_key) as client:
+                    response = await client.auth_test()
                 return {
                     "connection_test": "success",
                     "team": response.get("team"),
@@ -36,6 +36,16 @@ try:
 except ImportError:
     SelectionLearningEngine = None
 
+try:
+    from .keyword_matcher import KeywordMatcher
+except ImportError:
+    KeywordMatcher = None
+
+try:
+    from .learning_store import LearningStore
+except ImportError:
+    LearningStore = None
+
 __all__ = [
     "PromptAnalyzer",
     "PromptContext", 
@@ -44,5 +54,7 @@ __all__ = [
     "FabricIntegrator",
     "FabricPattern",
     "SelectionConfidenceScorer",
-    "SelectionLearningEngine"
+    "SelectionLearningEngine",
+    "LearningStore",
+    "KeywordMatcher"
 ]
\ No newline at end of file
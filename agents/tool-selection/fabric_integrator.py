@@ -5,6 +5,7 @@ Integrates with Fabric repository patterns and provides pattern
 discovery, categorization, and selection with AAI compliance.
 """
 import os
+import asyncio
 import logging
 import json
 import aiofiles
@@ -31,6 +32,22 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Pattern category served for each prompt context
+CONTEXT_CATEGORIES = {
+    PromptContext.ANALYSIS: "analysis",
+    PromptContext.CREATION: "creation",
+    PromptContext.RESEARCH: "research",
+    PromptContext.EXTRACTION: "extraction",
+    PromptContext.SUMMARIZATION: "summarization",
+    PromptContext.TRANSLATION: "translation",
+    PromptContext.IMPLEMENTATION: "implementation",
+    PromptContext.DEBUGGING: "debugging",
+    PromptContext.OPTIMIZATION: "optimization",
+    PromptContext.DOCUMENTATION: "documentation",
+    PromptContext.TESTING: "testing",
+    PromptContext.DEPLOYMENT: "implementation"
+}
+
 
 class FabricIntegrator:
     """
@@ -42,6 +59,11 @@ class FabricIntegrator:
     - Context-aware pattern selection
     - Pattern availability and health checking
     - Performance optimization with caching
+    
+    Local pattern directories are parsed in parallel worker threads and
+    recorded in an on-disk index keyed by modification time, so only
+    changed patterns are re-parsed. Category, context and tag indexes
+    make lookups O(1).
     """
     
     def __init__(self,
@@ -60,8 +82,17 @@ class FabricIntegrator:
         
         # Pattern mappings
         self.context_to_patterns = {}
+        self.category_index = {}
+        self.tag_index = {}
         self.pattern_effectiveness = {}
         
+        # Callbacks run whenever the pattern indexes are rebuilt
+        self._update_listeners = []
+        
+        # mtime-keyed index of parsed local pattern directories
+        self.local_index_file = self.cache_dir / "local_pattern_index.json"
+        self.local_index_stats = {"reused": 0, "parsed": 0, "removed": 0}
+        
         # Local Fabric path detection
         self.local_fabric_path = self._detect_local_fabric()
         
@@ -230,10 +261,11 @@ class FabricIntegrator:
             List of discovered FabricPattern objects
         """
         try:
-            # Check cache first
-            if not refresh_cache and self._is_cache_valid():
+            # Check cache first (loading it also restores its timestamp)
+            if not refresh_cache:
                 patterns = await self._load_patterns_from_cache()
-                if patterns:
+                if patterns and self._is_cache_valid():
+                    self._update_pattern_mappings(patterns)
                     logger.info(f"Loaded {len(patterns)} patterns from cache")
                     return patterns
             
@@ -277,27 +309,95 @@ class FabricIntegrator:
         if not self.local_fabric_path:
             return []
         
-        patterns = []
         patterns_dir = self.local_fabric_path / "patterns"
         
         try:
             if not patterns_dir.exists():
                 return []
             
-            # Scan pattern directories
-            for pattern_dir in patterns_dir.iterdir():
-                if pattern_dir.is_dir():
-                    pattern = await self._parse_local_pattern(pattern_dir)
-                    if pattern:
-                        patterns.append(pattern)
+            index = await asyncio.to_thread(self._load_local_index, patterns_dir)
+            
+            # Scan pattern directories, keeping index entries whose mtimes match
+            patterns = {}
+            changed = []
+            current = await asyncio.to_thread(self._scan_pattern_dirs, patterns_dir)
+            for name, (pattern_dir, mtime_key) in current.items():
+                entry = index.get(name)
+                if entry and entry["mtime_key"] == mtime_key:
+                    patterns[name] = FabricPattern(**entry["pattern"])
+                else:
+                    changed.append((name, pattern_dir, mtime_key))
+            
+            # Parse new or modified directories in parallel
+            parsed = await asyncio.gather(*(
+                self._parse_local_pattern(pattern_dir) for _, pattern_dir, _ in changed
+            ))
+            for (name, _, mtime_key), pattern in zip(changed, parsed):
+                if pattern:
+                    patterns[name] = pattern
+                    index[name] = {"mtime_key": mtime_key, "pattern": pattern.model_dump(mode="json")}
+            
+            removed = [name for name in index if name not in current]
+            for name in removed:
+                del index[name]
+            
+            self.local_index_stats = {
+                "reused": len(current) - len(changed),
+                "parsed": len(changed),
+                "removed": len(removed)
+            }
+            if changed or removed:
+                await asyncio.to_thread(self._save_local_index, patterns_dir, index)
             
-            return patterns
+            return [patterns[name] for name in sorted(patterns)]
             
         except Exception as e:
             logger.error(f"Local pattern discovery failed: {e}")
             return []
     
+    def _scan_pattern_dirs(self, patterns_dir: Path) -> Dict[str, tuple]:
+        """Map pattern name to (directory, mtime key) with one scandir pass"""
+        
+        current = {}
+        with os.scandir(patterns_dir) as entries:
+            for entry in entries:
+                if not entry.is_dir():
+                    continue
+                # Directory mtime catches added/removed files; system.md mtime
+                # catches in-place edits to the file the description comes from
+                try:
+                    system_mtime = os.stat(os.path.join(entry.path, "system.md")).st_mtime_ns
+                except OSError:
+                    system_mtime = 0
+                current[entry.name] = (Path(entry.path), [entry.stat().st_mtime_ns, system_mtime])
+        return current
+    
+    def _load_local_index(self, patterns_dir: Path) -> Dict[str, Any]:
+        """Load the on-disk local pattern index for this patterns directory"""
+        
+        try:
+            if self.local_index_file.exists():
+                with open(self.local_index_file, 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+                if data.get("patterns_dir") == str(patterns_dir):
+                    return data.get("entries", {})
+        except Exception as e:
+            logger.warning(f"Failed to load local pattern index: {e}")
+        return {}
+    
+    def _save_local_index(self, patterns_dir: Path, index: Dict[str, Any]):
+        """Atomically write the local pattern index"""
+        
+        tmp_file = self.local_index_file.with_suffix(".tmp")
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump({"patterns_dir": str(patterns_dir), "entries": index}, f)
+        os.replace(tmp_file, self.local_index_file)
+    
     async def _parse_local_pattern(self, pattern_dir: Path) -> Optional[FabricPattern]:
+        """Parse local pattern directory in a worker thread"""
+        return await asyncio.to_thread(self._parse_local_pattern_sync, pattern_dir)
+    
+    def _parse_local_pattern_sync(self, pattern_dir: Path) -> Optional[FabricPattern]:
         """Parse local pattern directory"""
         
         try:
@@ -305,19 +405,17 @@ class FabricIntegrator:
             
             # Look for pattern files
             system_file = pattern_dir / "system.md"
-            user_file = pattern_dir / "user.md"
             
             description = pattern_name.replace("_", " ").title()
             
-            # Extract description from system file if available
+            # Extract first non-empty line of the system file as description
             if system_file.exists():
                 try:
-                    async with aiofiles.open(system_file, 'r', encoding='utf-8') as f:
-                        content = await f.read()
-                        # Extract first line as description
-                        lines = content.strip().split('\n')
-                        if lines:
-                            description = lines[0].strip()
+                    with open(system_file, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            if line.strip():
+                                description = line.strip()
+                                break
                 except Exception:
                     pass
             
@@ -444,35 +542,10 @@ class FabricIntegrator:
             
             # Get patterns from mapping
             if context in self.context_to_patterns:
-                pattern_names = self.context_to_patterns[context]
-                patterns = [
-                    self.pattern_cache[name] 
-                    for name in pattern_names 
-                    if name in self.pattern_cache
-                ]
-                return patterns
+                return [self.pattern_cache[name] for name in self.context_to_patterns[context]]
             
-            # Fallback: filter by category
-            category_map = {
-                PromptContext.ANALYSIS: "analysis",
-                PromptContext.CREATION: "creation",
-                PromptContext.RESEARCH: "research",
-                PromptContext.EXTRACTION: "extraction",
-                PromptContext.SUMMARIZATION: "summarization",
-                PromptContext.TRANSLATION: "translation",
-                PromptContext.IMPLEMENTATION: "implementation",
-                PromptContext.DEBUGGING: "debugging",
-                PromptContext.OPTIMIZATION: "optimization",
-                PromptContext.DOCUMENTATION: "documentation",
-                PromptContext.TESTING: "testing",
-                PromptContext.DEPLOYMENT: "implementation"
-            }
-            
-            target_category = category_map.get(context, "general")
-            patterns = [
-                pattern for pattern in self.pattern_cache.values()
-                if pattern.category == target_category
-            ]
+            # Fallback: patterns in the context's category
+            patterns = self.get_patterns_by_category(CONTEXT_CATEGORIES.get(context, "general"))
             
             return patterns[:5]  # Limit to top 5
             
@@ -480,6 +553,14 @@ class FabricIntegrator:
             logger.error(f"Failed to get patterns for context {context}: {e}")
             return []
     
+    def get_patterns_by_category(self, category: str) -> List[FabricPattern]:
+        """Get loaded patterns in a category"""
+        return [self.pattern_cache[name] for name in self.category_index.get(category, [])]
+    
+    def get_patterns_by_tag(self, tag: str) -> List[FabricPattern]:
+        """Get loaded patterns carrying a tag"""
+        return [self.pattern_cache[name] for name in self.tag_index.get(tag.lower(), [])]
+    
     async def get_pattern_by_name(self, pattern_name: str) -> Optional[FabricPattern]:
         """Get specific pattern by name"""
         
@@ -554,34 +635,36 @@ class FabricIntegrator:
             logger.warning(f"Failed to cache patterns: {e}")
     
     def _update_pattern_mappings(self, patterns: List[FabricPattern]):
-        """Update context-to-pattern mappings"""
+        """Rebuild the name, category, context and tag indexes"""
         
-        self.context_to_patterns = {}
+        self.pattern_cache = {pattern.name: pattern for pattern in patterns}
+        self.category_index = {}
+        self.tag_index = {}
         
-        for pattern in patterns:
-            # Map by category
-            category = pattern.category
-            
-            for context in PromptContext:
-                context_category = {
-                    PromptContext.ANALYSIS: "analysis",
-                    PromptContext.CREATION: "creation",
-                    PromptContext.RESEARCH: "research",
-                    PromptContext.EXTRACTION: "extraction",
-                    PromptContext.SUMMARIZATION: "summarization",
-                    PromptContext.TRANSLATION: "translation",
-                    PromptContext.IMPLEMENTATION: "implementation",
-                    PromptContext.DEBUGGING: "debugging",
-                    PromptContext.OPTIMIZATION: "optimization",
-                    PromptContext.DOCUMENTATION: "documentation",
-                    PromptContext.TESTING: "testing",
-                    PromptContext.DEPLOYMENT: "implementation"
-                }.get(context, "general")
-                
-                if category == context_category:
-                    if context not in self.context_to_patterns:
-                        self.context_to_patterns[context] = []
-                    self.context_to_patterns[context].append(pattern.name)
+        for pattern in self.pattern_cache.values():
+            self.category_index.setdefault(pattern.category, []).append(pattern.name)
+            for tag in dict.fromkeys(tag.lower() for tag in pattern.tags):
+                self.tag_index.setdefault(tag, []).append(pattern.name)
+        
+        self.context_to_patterns = {
+            context: list(self.category_index[category])
+            for context, category in CONTEXT_CATEGORIES.items()
+            if category in self.category_index
+        }
+        
+        # Patterns were (re)discovered; let dependents drop stale state
+        self._notify_update_listeners(patterns)
+    
+    def add_update_listener(self, callback):
+        """Register a callback(patterns) run after each pattern discovery"""
+        self._update_listeners.append(callback)
+    
+    def _notify_update_listeners(self, patterns: List[FabricPattern]):
+        for callback in self._update_listeners:
+            try:
+                callback(patterns)
+            except Exception as e:
+                logger.warning(f"Pattern update listener failed: {e}")
     
     async def update_pattern_effectiveness(self, pattern_name: str, effectiveness_score: float):
         """Update pattern effectiveness based on usage"""
@@ -602,6 +685,9 @@ class FabricIntegrator:
             "cache_valid": self._is_cache_valid(),
             "cached_patterns": len(self.pattern_cache),
             "context_mappings": len(self.context_to_patterns),
+            "category_index": len(self.category_index),
+            "tag_index": len(self.tag_index),
+            "local_index": dict(self.local_index_stats),
             "built_in_patterns": len(self._pattern_database),
             "cache_directory": str(self.cache_dir),
             "ready": True
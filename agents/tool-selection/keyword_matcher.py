@@ -0,0 +1,129 @@
+"""
+Keyword Matcher for Tool Selection Enhancement
+
+Aho-Corasick automaton compiled from labelled keyword lexicons so a
+prompt can be scanned once for every lexicon at the same time.
+"""
+from collections import deque
+from typing import Dict, Hashable, Iterable, Iterator, List, Tuple
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isalnum() or char == "_"
+
+
+class KeywordMatcher:
+    """
+    Multi-keyword matcher over labelled lexicons.
+
+    Features:
+    - Single pass over the text regardless of keyword count
+    - Substring matching by default, so "test" also finds "testing";
+      optional word-boundary matching ("test" does not match "latest")
+    - Hits grouped by lexicon label, in lexicon order
+
+    Keywords are matched case-sensitively; callers pass lowercased text.
+    """
+
+    def __init__(self, lexicons: Dict[Hashable, Iterable[str]], word_boundaries: bool = False):
+        """Compile the automaton for all lexicons"""
+
+        self.word_boundaries = word_boundaries
+        self.keywords: List[str] = []
+        # keyword index -> [(label, position of keyword within that lexicon)]
+        self.keyword_labels: List[List[Tuple[Hashable, int]]] = []
+
+        keyword_ids: Dict[str, int] = {}
+        for label, keywords in lexicons.items():
+            for position, keyword in enumerate(dict.fromkeys(k.lower() for k in keywords)):
+                if not keyword:
+                    continue
+                if keyword not in keyword_ids:
+                    keyword_ids[keyword] = len(self.keywords)
+                    self.keywords.append(keyword)
+                    self.keyword_labels.append([])
+                self.keyword_labels[keyword_ids[keyword]].append((label, position))
+
+        self._build_automaton()
+
+    def _build_automaton(self):
+        """Build the goto trie, failure links and merged outputs"""
+
+        self._goto: List[Dict[str, int]] = [{}]
+        self._outputs: List[List[int]] = [[]]
+
+        for keyword_id, keyword in enumerate(self.keywords):
+            state = 0
+            for char in keyword:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._outputs.append([])
+                state = next_state
+            self._outputs[state].append(keyword_id)
+
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def iter_matches(self, text: str) -> Iterator[Tuple[int, int, int]]:
+        """
+        Scan text once, yielding (start, end, keyword index) for each hit.
+        """
+        goto, fail, outputs, keywords = self._goto, self._fail, self._outputs, self.keywords
+        state = 0
+
+        for index, char in enumerate(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+
+            for keyword_id in outputs[state]:
+                end = index + 1
+                start = end - len(keywords[keyword_id])
+                if self.word_boundaries and (
+                    (start > 0 and _is_word_char(text[start - 1]) and _is_word_char(text[start])) or
+                    (end < len(text) and _is_word_char(text[end]) and _is_word_char(text[end - 1]))
+                ):
+                    continue
+                yield start, end, keyword_id
+
+    def find(self, text: str) -> Dict[Hashable, List[Tuple[str, int]]]:
+        """
+        Find keywords for every lexicon in one pass.
+
+        Returns:
+            Mapping of label to (keyword, end offset of its first hit),
+            ordered as the keywords appear in that lexicon
+        """
+        first_hits: Dict[int, int] = {}
+        for _, end, keyword_id in self.iter_matches(text):
+            first_hits.setdefault(keyword_id, end)
+
+        grouped: Dict[Hashable, List[Tuple[int, str, int]]] = {}
+        for keyword_id, end in first_hits.items():
+            keyword = self.keywords[keyword_id]
+            for label, position in self.keyword_labels[keyword_id]:
+                grouped.setdefault(label, []).append((position, keyword, end))
+
+        return {
+            label: [(keyword, end) for _, keyword, end in sorted(hits)]
+            for label, hits in grouped.items()
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        """Automaton size statistics"""
+        return {
+            "keywords": len(self.keywords),
+            "states": len(self._goto)
+        }
@@ -21,6 +21,10 @@ except ImportError:
         PromptContext, FabricPattern, ToolMetadata, ContextAnalysis,
         ToolSelection, SelectionResult, LearningRecord, SelectionMetrics
     )
+try:
+    from .learning_store import LearningStore, TOOL, PATTERN, CONTEXT, GLOBAL
+except ImportError:
+    from agents.tool_selection.learning_store import LearningStore, TOOL, PATTERN, CONTEXT, GLOBAL
 
 logger = logging.getLogger(__name__)
 
@@ -36,24 +40,29 @@ class SelectionLearningEngine:
     - User feedback integration
     - Performance metrics collection
     - AAI-compliant confidence adjustments
+    
+    Records are appended to a durable LearningStore; effectiveness scores
+    come from its incrementally decayed aggregates and trends from windowed
+    queries, so recording stays O(1) however much history accumulates.
     """
     
     def __init__(self, 
                  learning_data_dir: Optional[str] = None,
-                 enable_auto_learning: bool = True):
+                 enable_auto_learning: bool = True,
+                 decay_half_life_days: float = 30.0):
         """Initialize learning engine"""
         
         self.learning_data_dir = Path(learning_data_dir or "./data/learning")
         self.enable_auto_learning = enable_auto_learning
         
-        # Learning data storage
-        self.learning_records = []
-        self.selection_metrics = SelectionMetrics()
+        # Ensure data directory exists
+        self.learning_data_dir.mkdir(parents=True, exist_ok=True)
         
-        # Pattern effectiveness tracking
-        self.pattern_effectiveness = {}
-        self.tool_effectiveness = {}
-        self.context_accuracy = {}
+        # Durable learning data storage
+        self.store = LearningStore(
+            str(self.learning_data_dir / "learning.db"),
+            half_life_days=decay_half_life_days
+        )
         
         # Learning parameters
         self.learning_params = {
@@ -61,17 +70,22 @@ class SelectionLearningEngine:
             "user_feedback_weight": 0.4,
             "success_rate_weight": 0.3,
             "learning_rate": 0.1,
-            "min_samples_for_learning": 3
+            "min_samples_for_learning": 3,
+            "recommendation_window": 500,
+            "trend_window": 10
         }
         
         # Improvement suggestions
         self.improvement_suggestions = {}
         
-        # Ensure data directory exists
-        self.learning_data_dir.mkdir(parents=True, exist_ok=True)
+        # Callbacks run whenever learned effectiveness changes
+        self._update_listeners = []
         
-        # Load existing learning data
-        asyncio.create_task(self._load_learning_data())
+        # Import records saved by the previous JSON-file storage
+        self._import_legacy_records()
+        
+        self.selection_metrics = SelectionMetrics()
+        self._refresh_selection_metrics()
     
     async def record_selection_outcome(self,
                                      selection_result: SelectionResult,
@@ -114,25 +128,24 @@ class SelectionLearningEngine:
                 )
             )
             
-            # Store learning record
-            self.learning_records.append(learning_record)
+            # Append record and update aggregates in one transaction
+            context_accuracy = self._calculate_context_accuracy(
+                selection_result, execution_success, user_satisfaction
+            )
+            await asyncio.to_thread(
+                self.store.append, learning_record.model_dump(mode="json"), context_accuracy
+            )
             
             # Update metrics
-            await self._update_selection_metrics(learning_record)
-            
-            # Update effectiveness tracking
-            await self._update_effectiveness_tracking(learning_record)
+            self._refresh_selection_metrics()
             
-            # Update context accuracy
-            await self._update_context_accuracy(selection_result, execution_success, user_satisfaction)
+            # Effectiveness scores changed; let dependents drop stale state
+            self._notify_update_listeners(learning_record)
             
             # Trigger learning if enabled
             if self.enable_auto_learning:
                 await self._trigger_learning_updates(learning_record)
             
-            # Save learning data
-            await self._save_learning_data()
-            
             logger.info(f"Recorded selection outcome: {record_id}, success: {execution_success}, satisfaction: {user_satisfaction:.1%}")
             
             return record_id
@@ -141,52 +154,47 @@ class SelectionLearningEngine:
             logger.error(f"Failed to record selection outcome: {e}")
             return "error"
     
+    def add_update_listener(self, callback):
+        """Register a callback(learning_record) run after each recorded outcome"""
+        self._update_listeners.append(callback)
+    
+    def _notify_update_listeners(self, learning_record: LearningRecord):
+        for callback in self._update_listeners:
+            try:
+                callback(learning_record)
+            except Exception as e:
+                logger.warning(f"Learning update listener failed: {e}")
+    
     async def get_pattern_effectiveness(self, pattern_name: str) -> float:
         """Get learned effectiveness score for pattern"""
-        
-        if pattern_name in self.pattern_effectiveness:
-            records = self.pattern_effectiveness[pattern_name]
-            if len(records) >= self.learning_params["min_samples_for_learning"]:
-                # Calculate weighted effectiveness
-                effectiveness = sum(
-                    r["user_satisfaction"] * self.learning_params["user_feedback_weight"] +
-                    (1.0 if r["execution_success"] else 0.0) * self.learning_params["success_rate_weight"]
-                    for r in records
-                ) / len(records)
-                
-                return min(0.95, max(0.5, effectiveness))
-        
-        return 0.75  # Default effectiveness
+        return self._decayed_effectiveness(PATTERN, pattern_name)
     
     async def get_tool_effectiveness(self, tool_name: str) -> float:
         """Get learned effectiveness score for tool"""
-        
-        if tool_name in self.tool_effectiveness:
-            records = self.tool_effectiveness[tool_name]
-            if len(records) >= self.learning_params["min_samples_for_learning"]:
-                # Calculate weighted effectiveness
-                effectiveness = sum(
-                    r["user_satisfaction"] * self.learning_params["user_feedback_weight"] +
-                    (1.0 if r["execution_success"] else 0.0) * self.learning_params["success_rate_weight"]
-                    for r in records
-                ) / len(records)
-                
-                return min(0.95, max(0.5, effectiveness))
-        
-        return 0.75  # Default effectiveness
+        return self._decayed_effectiveness(TOOL, tool_name)
     
     async def get_context_accuracy(self, context: PromptContext) -> float:
         """Get learned accuracy for context detection"""
         
-        if context in self.context_accuracy:
-            records = self.context_accuracy[context]
-            if len(records) >= self.learning_params["min_samples_for_learning"]:
-                # Calculate average accuracy
-                accuracy = sum(r["accuracy"] for r in records) / len(records)
-                return min(0.95, max(0.7, accuracy))
+        stats = self.store.get_aggregate(CONTEXT, PromptContext(context).value)
+        if stats and stats["count"] >= self.learning_params["min_samples_for_learning"]:
+            return min(0.95, max(0.7, stats["decayed_accuracy"]))
         
         return 0.80  # Default accuracy
     
+    def _decayed_effectiveness(self, kind: str, name: str) -> float:
+        """Weighted effectiveness from decayed satisfaction and success rate"""
+        
+        stats = self.store.get_aggregate(kind, name)
+        if stats and stats["count"] >= self.learning_params["min_samples_for_learning"]:
+            effectiveness = (
+                stats["decayed_satisfaction"] * self.learning_params["user_feedback_weight"] +
+                stats["decayed_success_rate"] * self.learning_params["success_rate_weight"]
+            )
+            return min(0.95, max(0.5, effectiveness))
+        
+        return 0.75  # Default effectiveness
+    
     async def get_selection_recommendations(self, 
                                           context: PromptContext,
                                           complexity_indicators: List[str]) -> Dict[str, Any]:
@@ -202,75 +210,39 @@ class SelectionLearningEngine:
         }
         
         try:
-            # Find relevant learning records
-            relevant_records = [
-                record for record in self.learning_records
-                if record.prompt_context == context
-            ]
+            # Outcome counts over the most recent records for this context
+            outcomes = await asyncio.to_thread(
+                self.store.context_outcomes,
+                PromptContext(context).value,
+                self.learning_params["recommendation_window"]
+            )
             
-            if len(relevant_records) < 2:
+            if outcomes["records"] < 2:
                 return recommendations
             
-            # Analyze successful selections
-            successful_records = [r for r in relevant_records if r.execution_success and r.user_satisfaction >= 0.7]
-            unsuccessful_records = [r for r in relevant_records if not r.execution_success or r.user_satisfaction < 0.5]
-            
-            # Extract preferred patterns
-            if successful_records:
-                pattern_counts = {}
-                for record in successful_records:
-                    for pattern in record.patterns_selected:
-                        pattern_counts[pattern] = pattern_counts.get(pattern, 0) + 1
-                
-                # Sort by frequency and success rate
-                preferred_patterns = sorted(
-                    pattern_counts.items(), 
-                    key=lambda x: x[1], 
+            # Extract preferred patterns and tools, by frequency in successes
+            for kind, key in ((PATTERN, "preferred_patterns"), (TOOL, "preferred_tools")):
+                preferred = sorted(
+                    ((name, counts["successes"]) for name, counts in outcomes[kind].items() if counts["successes"]),
+                    key=lambda x: x[1],
                     reverse=True
                 )[:3]
-                
-                recommendations["preferred_patterns"] = [p[0] for p in preferred_patterns]
+                recommendations[key] = [name for name, _ in preferred]
             
-            # Extract preferred tools
-            if successful_records:
-                tool_counts = {}
-                for record in successful_records:
-                    for tool in record.tools_selected:
-                        tool_counts[tool] = tool_counts.get(tool, 0) + 1
-                
-                preferred_tools = sorted(
-                    tool_counts.items(), 
-                    key=lambda x: x[1], 
-                    reverse=True
-                )[:3]
-                
-                recommendations["preferred_tools"] = [t[0] for t in preferred_tools]
+            # Only suggest avoidance if pattern/tool appears frequently in failures
+            recommendations["avoid_patterns"] = [
+                p for p, counts in outcomes[PATTERN].items()
+                if counts["failures"] >= 2 and p not in recommendations["preferred_patterns"]
+            ]
             
-            # Extract patterns/tools to avoid
-            if unsuccessful_records:
-                avoid_pattern_counts = {}
-                avoid_tool_counts = {}
-                
-                for record in unsuccessful_records:
-                    for pattern in record.patterns_selected:
-                        avoid_pattern_counts[pattern] = avoid_pattern_counts.get(pattern, 0) + 1
-                    for tool in record.tools_selected:
-                        avoid_tool_counts[tool] = avoid_tool_counts.get(tool, 0) + 1
-                
-                # Only suggest avoidance if pattern/tool appears frequently in failures
-                recommendations["avoid_patterns"] = [
-                    p for p, count in avoid_pattern_counts.items() 
-                    if count >= 2 and p not in recommendations["preferred_patterns"]
-                ]
-                
-                recommendations["avoid_tools"] = [
-                    t for t, count in avoid_tool_counts.items() 
-                    if count >= 2 and t not in recommendations["preferred_tools"]
-                ]
+            recommendations["avoid_tools"] = [
+                t for t, counts in outcomes[TOOL].items()
+                if counts["failures"] >= 2 and t not in recommendations["preferred_tools"]
+            ]
             
             # Generate execution time estimates
-            if successful_records:
-                avg_time = sum(r.execution_time_actual for r in successful_records) / len(successful_records)
+            avg_time = outcomes["avg_successful_time"]
+            if avg_time is not None:
                 recommendations["execution_time_estimates"]["average"] = avg_time
                 
                 # Adjust for complexity
@@ -287,11 +259,17 @@ class SelectionLearningEngine:
             logger.error(f"Failed to generate recommendations: {e}")
             return recommendations
     
-    async def analyze_learning_trends(self) -> Dict[str, Any]:
-        """Analyze learning trends and patterns"""
+    async def analyze_learning_trends(self, window: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Analyze learning trends and patterns
         
+        Args:
+            window: Records per trend window (defaults to learning_params["trend_window"])
+        """
+        
+        window = window or self.learning_params["trend_window"]
         analysis = {
-            "total_records": len(self.learning_records),
+            "total_records": self.store.count(),
             "success_rate_trend": [],
             "satisfaction_trend": [],
             "context_performance": {},
@@ -301,90 +279,41 @@ class SelectionLearningEngine:
         }
         
         try:
-            if len(self.learning_records) < 5:
+            if analysis["total_records"] < 5:
                 return analysis
             
-            # Sort records by date
-            sorted_records = sorted(self.learning_records, key=lambda r: r.created_at)
-            
-            # Calculate trends (last 10 records vs previous 10)
-            recent_records = sorted_records[-10:]
-            previous_records = sorted_records[-20:-10] if len(sorted_records) >= 20 else []
-            
-            # Success rate trend
-            recent_success = sum(1 for r in recent_records if r.execution_success) / len(recent_records)
-            analysis["success_rate_trend"].append({"period": "recent", "rate": recent_success})
-            
-            if previous_records:
-                previous_success = sum(1 for r in previous_records if r.execution_success) / len(previous_records)
-                analysis["success_rate_trend"].append({"period": "previous", "rate": previous_success})
+            # Calculate trends (latest window vs the one before it)
+            recent = await asyncio.to_thread(self.store.window_stats, window)
+            previous = await asyncio.to_thread(self.store.window_stats, window, window)
+            if previous and previous["records"] < window:
+                previous = None
             
-            # Satisfaction trend
-            recent_satisfaction = sum(r.user_satisfaction for r in recent_records) / len(recent_records)
-            analysis["satisfaction_trend"].append({"period": "recent", "satisfaction": recent_satisfaction})
-            
-            if previous_records:
-                previous_satisfaction = sum(r.user_satisfaction for r in previous_records) / len(previous_records)
-                analysis["satisfaction_trend"].append({"period": "previous", "satisfaction": previous_satisfaction})
+            for period, stats in (("recent", recent), ("previous", previous)):
+                if stats:
+                    analysis["success_rate_trend"].append({"period": period, "rate": stats["success_rate"]})
+                    analysis["satisfaction_trend"].append({"period": period, "satisfaction": stats["avg_satisfaction"]})
             
             # Context performance analysis
-            context_stats = {}
-            for record in sorted_records:
-                context = record.prompt_context
-                if context not in context_stats:
-                    context_stats[context] = {"success": 0, "total": 0, "satisfaction": []}
-                
-                context_stats[context]["total"] += 1
-                if record.execution_success:
-                    context_stats[context]["success"] += 1
-                context_stats[context]["satisfaction"].append(record.user_satisfaction)
-            
-            for context, stats in context_stats.items():
-                analysis["context_performance"][context.value] = {
-                    "success_rate": stats["success"] / stats["total"],
-                    "avg_satisfaction": sum(stats["satisfaction"]) / len(stats["satisfaction"]),
-                    "total_selections": stats["total"]
+            for context in self.store.names(CONTEXT):
+                stats = self.store.get_aggregate(CONTEXT, context)
+                analysis["context_performance"][context] = {
+                    "success_rate": stats["success_rate"],
+                    "avg_satisfaction": stats["avg_satisfaction"],
+                    "recent_success_rate": stats["decayed_success_rate"],
+                    "total_selections": stats["count"]
                 }
             
-            # Pattern performance analysis
-            pattern_stats = {}
-            for record in sorted_records:
-                for pattern in record.patterns_selected:
-                    if pattern not in pattern_stats:
-                        pattern_stats[pattern] = {"success": 0, "total": 0, "satisfaction": []}
-                    
-                    pattern_stats[pattern]["total"] += 1
-                    if record.execution_success:
-                        pattern_stats[pattern]["success"] += 1
-                    pattern_stats[pattern]["satisfaction"].append(record.user_satisfaction)
-            
-            for pattern, stats in pattern_stats.items():
-                if stats["total"] >= 3:  # Only include patterns with enough data
-                    analysis["pattern_performance"][pattern] = {
-                        "success_rate": stats["success"] / stats["total"],
-                        "avg_satisfaction": sum(stats["satisfaction"]) / len(stats["satisfaction"]),
-                        "total_uses": stats["total"]
-                    }
-            
-            # Tool performance analysis
-            tool_stats = {}
-            for record in sorted_records:
-                for tool in record.tools_selected:
-                    if tool not in tool_stats:
-                        tool_stats[tool] = {"success": 0, "total": 0, "satisfaction": []}
-                    
-                    tool_stats[tool]["total"] += 1
-                    if record.execution_success:
-                        tool_stats[tool]["success"] += 1
-                    tool_stats[tool]["satisfaction"].append(record.user_satisfaction)
-            
-            for tool, stats in tool_stats.items():
-                if stats["total"] >= 3:  # Only include tools with enough data
-                    analysis["tool_performance"][tool] = {
-                        "success_rate": stats["success"] / stats["total"],
-                        "avg_satisfaction": sum(stats["satisfaction"]) / len(stats["satisfaction"]),
-                        "total_uses": stats["total"]
-                    }
+            # Pattern and tool performance analysis
+            for kind, key in ((PATTERN, "pattern_performance"), (TOOL, "tool_performance")):
+                for name in self.store.names(kind):
+                    stats = self.store.get_aggregate(kind, name)
+                    if stats["count"] >= 3:  # Only include entries with enough data
+                        analysis[key][name] = {
+                            "success_rate": stats["success_rate"],
+                            "avg_satisfaction": stats["avg_satisfaction"],
+                            "recent_success_rate": stats["decayed_success_rate"],
+                            "total_uses": stats["count"]
+                        }
             
             # Identify improvement opportunities
             
@@ -482,95 +411,35 @@ class SelectionLearningEngine:
         
         return suggestions
     
-    async def _update_selection_metrics(self, learning_record: LearningRecord):
-        """Update overall selection metrics"""
-        
-        self.selection_metrics.total_selections += 1
-        
-        if learning_record.execution_success:
-            self.selection_metrics.successful_selections += 1
+    def _calculate_context_accuracy(self,
+                                    selection_result: SelectionResult,
+                                    execution_success: bool,
+                                    user_satisfaction: float) -> float:
+        """Calculate context detection accuracy based on execution success and user satisfaction"""
         
-        # Update average confidence (would need to track this)
-        # For now, maintain the current average
-        
-        # Update user satisfaction average
-        total = self.selection_metrics.total_selections
-        current_avg = self.selection_metrics.user_satisfaction_avg
-        new_satisfaction = learning_record.user_satisfaction
-        
-        self.selection_metrics.user_satisfaction_avg = (
-            (current_avg * (total - 1) + new_satisfaction) / total
+        return selection_result.context_analysis.confidence_score * (
+            0.4 + (0.3 if execution_success else 0.0) + (user_satisfaction * 0.3)
         )
-        
-        # Calculate improvement rate
-        if total >= 10:
-            recent_records = self.learning_records[-10:]
-            recent_success = sum(1 for r in recent_records if r.execution_success) / len(recent_records)
-            
-            if total >= 20:
-                previous_records = self.learning_records[-20:-10]
-                previous_success = sum(1 for r in previous_records if r.execution_success) / len(previous_records)
-                self.selection_metrics.improvement_rate = recent_success - previous_success
-        
-        self.selection_metrics.last_updated = datetime.now()
     
-    async def _update_effectiveness_tracking(self, learning_record: LearningRecord):
-        """Update pattern and tool effectiveness tracking"""
+    def _refresh_selection_metrics(self):
+        """Update overall selection metrics from the store aggregates"""
         
-        # Update pattern effectiveness
-        for pattern_name in learning_record.patterns_selected:
-            if pattern_name not in self.pattern_effectiveness:
-                self.pattern_effectiveness[pattern_name] = []
-            
-            self.pattern_effectiveness[pattern_name].append({
-                "execution_success": learning_record.execution_success,
-                "user_satisfaction": learning_record.user_satisfaction,
-                "timestamp": learning_record.created_at
-            })
-            
-            # Keep only recent data (last 20 records)
-            if len(self.pattern_effectiveness[pattern_name]) > 20:
-                self.pattern_effectiveness[pattern_name] = self.pattern_effectiveness[pattern_name][-20:]
-        
-        # Update tool effectiveness
-        for tool_name in learning_record.tools_selected:
-            if tool_name not in self.tool_effectiveness:
-                self.tool_effectiveness[tool_name] = []
-            
-            self.tool_effectiveness[tool_name].append({
-                "execution_success": learning_record.execution_success,
-                "user_satisfaction": learning_record.user_satisfaction,
-                "timestamp": learning_record.created_at
-            })
-            
-            # Keep only recent data
-            if len(self.tool_effectiveness[tool_name]) > 20:
-                self.tool_effectiveness[tool_name] = self.tool_effectiveness[tool_name][-20:]
-    
-    async def _update_context_accuracy(self,
-                                     selection_result: SelectionResult,
-                                     execution_success: bool,
-                                     user_satisfaction: float):
-        """Update context detection accuracy tracking"""
-        
-        context = selection_result.context_analysis.detected_context
-        
-        if context not in self.context_accuracy:
-            self.context_accuracy[context] = []
+        totals = self.store.get_aggregate(GLOBAL, GLOBAL)
+        if not totals:
+            return
         
-        # Calculate accuracy based on execution success and user satisfaction
-        accuracy = selection_result.context_analysis.confidence_score * (
-            0.4 + (0.3 if execution_success else 0.0) + (user_satisfaction * 0.3)
-        )
+        self.selection_metrics.total_selections = totals["count"]
+        self.selection_metrics.successful_selections = round(totals["success_rate"] * totals["count"])
+        self.selection_metrics.user_satisfaction_avg = totals["avg_satisfaction"]
         
-        self.context_accuracy[context].append({
-            "accuracy": accuracy,
-            "timestamp": datetime.now()
-        })
+        # Calculate improvement rate
+        window = self.learning_params["trend_window"]
+        if totals["count"] >= 2 * window:
+            recent = self.store.window_stats(window)
+            previous = self.store.window_stats(window, window)
+            self.selection_metrics.improvement_rate = recent["success_rate"] - previous["success_rate"]
         
-        # Keep only recent data
-        if len(self.context_accuracy[context]) > 15:
-            self.context_accuracy[context] = self.context_accuracy[context][-15:]
+        self.selection_metrics.last_updated = datetime.now()
     
     async def _trigger_learning_updates(self, learning_record: LearningRecord):
         """Trigger learning-based updates to system components"""
@@ -586,81 +455,36 @@ class SelectionLearningEngine:
         # - Confidence scoring adjustments in ConfidenceScorer
         # - Context detection improvements in PromptAnalyzer
     
-    async def _save_learning_data(self):
-        """Save learning data to persistent storage"""
+    def _import_legacy_records(self):
+        """One-time import of learning_records.json from the JSON-file storage"""
         
-        try:
-            # Save learning records
-            records_file = self.learning_data_dir / "learning_records.json"
-            records_data = [record.model_dump() for record in self.learning_records[-100:]]  # Keep last 100
-            
-            async with aiofiles.open(records_file, 'w') as f:
-                await f.write(json.dumps({
-                    "records": records_data,
-                    "last_updated": datetime.now().isoformat()
-                }, indent=2))
-            
-            # Save metrics
-            metrics_file = self.learning_data_dir / "selection_metrics.json"
-            async with aiofiles.open(metrics_file, 'w') as f:
-                await f.write(json.dumps(self.selection_metrics.model_dump(), indent=2))
-            
-            # Save effectiveness data
-            effectiveness_file = self.learning_data_dir / "effectiveness_data.json"
-            async with aiofiles.open(effectiveness_file, 'w') as f:
-                await f.write(json.dumps({
-                    "pattern_effectiveness": self.pattern_effectiveness,
-                    "tool_effectiveness": self.tool_effectiveness,
-                    "context_accuracy": self.context_accuracy
-                }, indent=2))
-            
-        except Exception as e:
-            logger.warning(f"Failed to save learning data: {e}")
-    
-    async def _load_learning_data(self):
-        """Load existing learning data from storage"""
+        records_file = self.learning_data_dir / "learning_records.json"
+        if self.store.count() or not records_file.exists():
+            return
         
         try:
-            # Load learning records
-            records_file = self.learning_data_dir / "learning_records.json"
-            if records_file.exists():
-                async with aiofiles.open(records_file, 'r') as f:
-                    data = json.loads(await f.read())
-                    self.learning_records = [
-                        LearningRecord(**record_data) 
-                        for record_data in data.get("records", [])
-                    ]
-            
-            # Load metrics
-            metrics_file = self.learning_data_dir / "selection_metrics.json"
-            if metrics_file.exists():
-                async with aiofiles.open(metrics_file, 'r') as f:
-                    metrics_data = json.loads(await f.read())
-                    self.selection_metrics = SelectionMetrics(**metrics_data)
-            
-            # Load effectiveness data
-            effectiveness_file = self.learning_data_dir / "effectiveness_data.json"
-            if effectiveness_file.exists():
-                async with aiofiles.open(effectiveness_file, 'r') as f:
-                    data = json.loads(await f.read())
-                    self.pattern_effectiveness = data.get("pattern_effectiveness", {})
-                    self.tool_effectiveness = data.get("tool_effectiveness", {})
-                    self.context_accuracy = data.get("context_accuracy", {})
+            with open(records_file, 'r') as f:
+                data = json.load(f)
+            for record_data in data.get("records", []):
+                record = LearningRecord(**record_data)
+                # Accuracy was not stored per record; confidence accuracy is the closest proxy
+                self.store.append(record.model_dump(mode="json"), record.confidence_accuracy)
             
-            logger.info(f"Loaded {len(self.learning_records)} learning records")
+            records_file.rename(records_file.with_suffix(".json.imported"))
+            logger.info(f"Imported {self.store.count()} legacy learning records")
             
         except Exception as e:
-            logger.warning(f"Failed to load learning data: {e}")
+            logger.warning(f"Failed to import legacy learning data: {e}")
     
     def get_learning_status(self) -> Dict[str, Any]:
         """Get learning engine status and statistics"""
         
         return {
-            "total_records": len(self.learning_records),
+            "total_records": self.store.count(),
             "metrics": self.selection_metrics.model_dump(),
-            "pattern_tracking": len(self.pattern_effectiveness),
-            "tool_tracking": len(self.tool_effectiveness),
-            "context_tracking": len(self.context_accuracy),
+            "pattern_tracking": len(self.store.names(PATTERN)),
+            "tool_tracking": len(self.store.names(TOOL)),
+            "context_tracking": len(self.store.names(CONTEXT)),
             "auto_learning_enabled": self.enable_auto_learning,
             "data_directory": str(self.learning_data_dir),
             "ready": True
@@ -0,0 +1,281 @@
+"""
+Learning Store for Tool Selection Enhancement
+
+Durable SQLite (WAL) store for selection learning records with
+incrementally maintained per-tool, per-pattern and per-context aggregates.
+"""
+import json
+import sqlite3
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+# Aggregate kinds; GLOBAL holds totals across every record
+TOOL = "tool"
+PATTERN = "pattern"
+CONTEXT = "context"
+GLOBAL = "all"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS learning_records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    selection_id TEXT NOT NULL,
+    context TEXT NOT NULL,
+    success INTEGER NOT NULL,
+    satisfaction REAL NOT NULL,
+    execution_time INTEGER NOT NULL,
+    confidence_accuracy REAL NOT NULL,
+    created_at REAL NOT NULL,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_context ON learning_records(context, id);
+
+CREATE TABLE IF NOT EXISTS learning_record_items (
+    record_id INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_items_record ON learning_record_items(record_id);
+CREATE INDEX IF NOT EXISTS idx_items_name ON learning_record_items(kind, name, record_id);
+
+CREATE TABLE IF NOT EXISTS learning_aggregates (
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    success_count INTEGER NOT NULL,
+    satisfaction_sum REAL NOT NULL,
+    accuracy_sum REAL NOT NULL,
+    decayed_weight REAL NOT NULL,
+    decayed_success REAL NOT NULL,
+    decayed_satisfaction REAL NOT NULL,
+    decayed_accuracy REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (kind, name)
+);
+"""
+
+_AGGREGATE_FIELDS = (
+    "count", "success_count", "satisfaction_sum", "accuracy_sum",
+    "decayed_weight", "decayed_success", "decayed_satisfaction", "decayed_accuracy",
+    "updated_at"
+)
+
+
+class LearningStore:
+    """
+    Append-only learning record log with incremental aggregates.
+
+    Every record is one row in a WAL-mode SQLite database; the aggregates it
+    touches are updated in the same transaction, so appending costs the same
+    regardless of history size. Aggregates keep exact lifetime totals plus
+    exponentially decayed sums (half-life in days) so recent outcomes weigh
+    more. Trend queries read windows of the log through indexes.
+    """
+
+    def __init__(self, db_path: str, half_life_days: float = 30.0):
+        """Open (or create) the store and load aggregates into memory"""
+
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.half_life_seconds = half_life_days * 86400
+
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+        self.aggregates: Dict[Tuple[str, str], Dict[str, float]] = {}
+        for row in self._conn.execute(
+            f"SELECT kind, name, {', '.join(_AGGREGATE_FIELDS)} FROM learning_aggregates"
+        ):
+            self.aggregates[(row[0], row[1])] = dict(zip(_AGGREGATE_FIELDS, row[2:]))
+
+    def append(self, record: Dict[str, Any], context_accuracy: float) -> int:
+        """
+        Append one learning record and fold it into the aggregates.
+
+        Args:
+            record: LearningRecord data (model_dump(mode="json"))
+            context_accuracy: Context detection accuracy for this outcome
+
+        Returns:
+            Row id of the stored record
+        """
+        created_at = record.get("created_at") or datetime.now().isoformat()
+        if isinstance(created_at, str):
+            created_at = datetime.fromisoformat(created_at)
+        timestamp = created_at.timestamp() if isinstance(created_at, datetime) else float(created_at)
+
+        context = record["prompt_context"]
+        success = bool(record["execution_success"])
+        satisfaction = float(record["user_satisfaction"])
+        accuracy = float(record["confidence_accuracy"])
+
+        items = [(TOOL, name) for name in dict.fromkeys(record.get("tools_selected", []))]
+        items += [(PATTERN, name) for name in dict.fromkeys(record.get("patterns_selected", []))]
+        touched = [(GLOBAL, GLOBAL, accuracy), (CONTEXT, context, context_accuracy)]
+        touched += [(kind, name, accuracy) for kind, name in items]
+
+        with self._lock:
+            updated = [
+                (kind, name, self._fold(kind, name, timestamp, success, satisfaction, item_accuracy))
+                for kind, name, item_accuracy in touched
+            ]
+            with self._conn:
+                cursor = self._conn.execute(
+                    "INSERT INTO learning_records (selection_id, context, success, satisfaction, "
+                    "execution_time, confidence_accuracy, created_at, payload) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (record["selection_id"], context, int(success), satisfaction,
+                     int(record.get("execution_time_actual", 0)), accuracy, timestamp,
+                     json.dumps(record, default=str))
+                )
+                row_id = cursor.lastrowid
+                self._conn.executemany(
+                    "INSERT INTO learning_record_items (record_id, kind, name) VALUES (?, ?, ?)",
+                    [(row_id, kind, name) for kind, name in items]
+                )
+                self._conn.executemany(
+                    f"INSERT OR REPLACE INTO learning_aggregates (kind, name, {', '.join(_AGGREGATE_FIELDS)}) "
+                    f"VALUES ({', '.join('?' * (len(_AGGREGATE_FIELDS) + 2))})",
+                    [(kind, name, *(agg[f] for f in _AGGREGATE_FIELDS)) for kind, name, agg in updated]
+                )
+            for kind, name, agg in updated:
+                self.aggregates[(kind, name)] = agg
+
+        return row_id
+
+    def _fold(self, kind: str, name: str, timestamp: float,
+              success: bool, satisfaction: float, accuracy: float) -> Dict[str, float]:
+        """Return the aggregate for (kind, name) with one more outcome applied"""
+
+        agg = dict(self.aggregates.get((kind, name)) or {field: 0.0 for field in _AGGREGATE_FIELDS})
+
+        # Decay existing weight to the new record's time; out-of-order records
+        # are discounted instead of rewinding the aggregate's clock
+        elapsed = timestamp - agg["updated_at"] if agg["count"] else 0.0
+        if elapsed >= 0:
+            decay, weight = 0.5 ** (elapsed / self.half_life_seconds), 1.0
+            agg["updated_at"] = timestamp
+        else:
+            decay, weight = 1.0, 0.5 ** (-elapsed / self.half_life_seconds)
+
+        agg["count"] += 1
+        agg["success_count"] += int(success)
+        agg["satisfaction_sum"] += satisfaction
+        agg["accuracy_sum"] += accuracy
+        agg["decayed_weight"] = agg["decayed_weight"] * decay + weight
+        agg["decayed_success"] = agg["decayed_success"] * decay + weight * success
+        agg["decayed_satisfaction"] = agg["decayed_satisfaction"] * decay + weight * satisfaction
+        agg["decayed_accuracy"] = agg["decayed_accuracy"] * decay + weight * accuracy
+        return agg
+
+    def get_aggregate(self, kind: str, name: str) -> Optional[Dict[str, float]]:
+        """
+        Get aggregate statistics for a tool, pattern or context.
+
+        Returns:
+            count plus lifetime and decayed success rate, satisfaction and
+            accuracy, or None if nothing has been recorded
+        """
+        agg = self.aggregates.get((kind, name))
+        if not agg or not agg["count"]:
+            return None
+
+        weight = agg["decayed_weight"] or 1.0
+        return {
+            "count": int(agg["count"]),
+            "success_rate": agg["success_count"] / agg["count"],
+            "avg_satisfaction": agg["satisfaction_sum"] / agg["count"],
+            "avg_accuracy": agg["accuracy_sum"] / agg["count"],
+            "decayed_success_rate": agg["decayed_success"] / weight,
+            "decayed_satisfaction": agg["decayed_satisfaction"] / weight,
+            "decayed_accuracy": agg["decayed_accuracy"] / weight
+        }
+
+    def names(self, kind: str) -> List[str]:
+        """Names with aggregates of the given kind"""
+        return [name for agg_kind, name in self.aggregates if agg_kind == kind]
+
+    def count(self) -> int:
+        """Total number of stored records"""
+        agg = self.aggregates.get((GLOBAL, GLOBAL))
+        return int(agg["count"]) if agg else 0
+
+    def window_stats(self, size: int, offset: int = 0,
+                     context: Optional[str] = None) -> Optional[Dict[str, float]]:
+        """
+        Success and satisfaction over a window of the most recent records.
+
+        Args:
+            size: Number of records in the window
+            offset: Records to skip back from the newest (0 = latest window)
+            context: Restrict to one prompt context
+
+        Returns:
+            Window statistics, or None if the window is empty
+        """
+        where, params = ("WHERE context = ?", [context]) if context else ("", [])
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT COUNT(*), SUM(success), AVG(satisfaction), AVG(execution_time), "
+                f"MIN(created_at), MAX(created_at) FROM "
+                f"(SELECT * FROM learning_records {where} ORDER BY id DESC LIMIT ? OFFSET ?)",
+                (*params, size, offset)
+            ).fetchone()
+
+        if not row[0]:
+            return None
+        return {
+            "records": row[0],
+            "success_rate": row[1] / row[0],
+            "avg_satisfaction": row[2],
+            "avg_execution_time": row[3],
+            "start": datetime.fromtimestamp(row[4]).isoformat(),
+            "end": datetime.fromtimestamp(row[5]).isoformat()
+        }
+
+    def context_outcomes(self, context: str, window: int) -> Dict[str, Any]:
+        """
+        Tool and pattern outcome counts over the latest records for a context.
+
+        Successful means executed and satisfaction >= 0.7; unsuccessful means
+        failed or satisfaction < 0.5, matching the recommendation rules.
+        """
+        recent = (
+            "SELECT id, success, satisfaction, execution_time FROM learning_records "
+            "WHERE context = ? ORDER BY id DESC LIMIT ?"
+        )
+        good = "r.success = 1 AND r.satisfaction >= 0.7"
+        bad = "r.success = 0 OR r.satisfaction < 0.5"
+
+        with self._lock:
+            summary = self._conn.execute(
+                f"SELECT COUNT(*), SUM(CASE WHEN {good} THEN 1 ELSE 0 END), "
+                f"AVG(CASE WHEN {good} THEN r.execution_time END) FROM ({recent}) r",
+                (context, window)
+            ).fetchone()
+            rows = self._conn.execute(
+                f"SELECT i.kind, i.name, SUM(CASE WHEN {good} THEN 1 ELSE 0 END), "
+                f"SUM(CASE WHEN {bad} THEN 1 ELSE 0 END) "
+                f"FROM ({recent}) r JOIN learning_record_items i ON i.record_id = r.id "
+                f"GROUP BY i.kind, i.name",
+                (context, window)
+            ).fetchall()
+
+        outcomes = {
+            "records": summary[0],
+            "successful_records": summary[1] or 0,
+            "avg_successful_time": summary[2],
+            TOOL: {},
+            PATTERN: {}
+        }
+        for kind, name, successes, failures in rows:
+            outcomes[kind][name] = {"successes": successes, "failures": failures}
+        return outcomes
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
@@ -5,7 +5,9 @@ Analyzes first 100 characters of prompts for context determination
 with pattern recognition and AAI confidence scoring.
 """
 import re
+import json
 import logging
+from pathlib import Path
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
@@ -13,6 +15,10 @@ try:
     from .models import PromptContext, ContextAnalysis
 except ImportError:
     from agents.tool_selection.models import PromptContext, ContextAnalysis
+try:
+    from .keyword_matcher import KeywordMatcher
+except ImportError:
+    from agents.tool_selection.keyword_matcher import KeywordMatcher
 
 logger = logging.getLogger(__name__)
 
@@ -27,18 +33,93 @@ class PromptAnalyzer:
     - Domain-specific indicator detection
     - Complexity and urgency assessment
     - AAI-compliant confidence scoring (70-95%)
+    
+    All lexicons are compiled into one KeywordMatcher, so each prompt is
+    scanned once. Lexicons can be overridden from a JSON file, which is
+    reloaded automatically when it changes.
     """
     
-    def __init__(self):
-        """Initialize prompt analyzer with pattern databases"""
+    # Keywords that raise confidence or effort estimates
+    SPECIFIC_KEYWORDS = ["please", "help", "need", "want", "should", "could", "would"]
+    HIGH_EFFORT_PATTERNS = [
+        "enterprise", "production", "scalable", "comprehensive",
+        "detailed", "thorough", "complete", "full"
+    ]
+    
+    def __init__(self, lexicon_path: Optional[str] = None, word_boundaries: bool = False):
+        """
+        Initialize prompt analyzer with pattern databases
+        
+        Args:
+            lexicon_path: Optional JSON file overriding the built-in lexicons
+            word_boundaries: Match keywords as whole words only; by default
+                they match anywhere, so "test" finds "testing"
+        """
+        self.lexicon_path = Path(lexicon_path) if lexicon_path else None
+        self.word_boundaries = word_boundaries
+        self._lexicon_mtime = None
+        self.reload_lexicons()
+        
+        # Performance tracking
+        self.analysis_count = 0
+        self.accuracy_tracking = {}
+    
+    def reload_lexicons(self):
+        """Load lexicons (built-in, then file overrides) and recompile the matcher"""
         self.context_patterns = self._initialize_context_patterns()
         self.complexity_indicators = self._initialize_complexity_indicators()
         self.domain_indicators = self._initialize_domain_indicators()
         self.urgency_indicators = self._initialize_urgency_indicators()
         
-        # Performance tracking
-        self.analysis_count = 0
-        self.accuracy_tracking = {}
+        if self.lexicon_path and self.lexicon_path.exists():
+            try:
+                self._lexicon_mtime = self.lexicon_path.stat().st_mtime_ns
+                with open(self.lexicon_path, 'r') as f:
+                    overrides = json.load(f)
+                
+                if "context_patterns" in overrides:
+                    self.context_patterns.update({
+                        PromptContext(context): patterns
+                        for context, patterns in overrides["context_patterns"].items()
+                    })
+                if "complexity_indicators" in overrides:
+                    self.complexity_indicators = overrides["complexity_indicators"]
+                if "domain_indicators" in overrides:
+                    self.domain_indicators.update(overrides["domain_indicators"])
+                if "urgency_indicators" in overrides:
+                    self.urgency_indicators.update({
+                        int(level): indicators
+                        for level, indicators in overrides["urgency_indicators"].items()
+                    })
+            except Exception as e:
+                logger.warning(f"Failed to load lexicon overrides from {self.lexicon_path}: {e}")
+        
+        self.compile_lexicons()
+    
+    def compile_lexicons(self):
+        """Compile the current lexicons into a single keyword matcher"""
+        lexicons = {("context", context): patterns for context, patterns in self.context_patterns.items()}
+        lexicons[("complexity", None)] = self.complexity_indicators
+        lexicons.update({("domain", domain): indicators for domain, indicators in self.domain_indicators.items()})
+        lexicons.update({("urgency", level): indicators for level, indicators in self.urgency_indicators.items()})
+        lexicons[("specific", None)] = self.SPECIFIC_KEYWORDS
+        lexicons[("effort", None)] = self.HIGH_EFFORT_PATTERNS
+        
+        # Swap in a fully built matcher so in-flight analyses are unaffected
+        self.matcher = KeywordMatcher(lexicons, word_boundaries=self.word_boundaries)
+    
+    def _reload_if_changed(self):
+        """Hot-reload lexicons when the override file changes"""
+        if not self.lexicon_path:
+            return
+        try:
+            mtime = self.lexicon_path.stat().st_mtime_ns
+        except OSError:
+            mtime = None
+        if mtime != self._lexicon_mtime:
+            self._lexicon_mtime = mtime
+            self.reload_lexicons()
+            logger.info(f"Reloaded prompt lexicons from {self.lexicon_path}")
     
     def _initialize_context_patterns(self) -> Dict[PromptContext, List[str]]:
         """Initialize context detection patterns"""
@@ -175,25 +256,39 @@ class PromptAnalyzer:
         start_time = datetime.now()
         
         try:
+            self._reload_if_changed()
+            
             # Extract first 100 characters for analysis
             prompt_snippet = prompt[:100].lower().strip()
             
+            # Scan the whole prompt once for every lexicon
+            hits = self.matcher.find(prompt.lower())
+            snippet_end = len(prompt[:100].lower())
+            snippet_hits = {
+                label: [keyword for keyword, end in label_hits if end <= snippet_end]
+                for label, label_hits in hits.items()
+            }
+            prompt_hits = {
+                label: [keyword for keyword, _ in label_hits]
+                for label, label_hits in hits.items()
+            }
+            
             # Detect context
             detected_context, confidence, keywords = await self._detect_context(
-                prompt_snippet, context_hint
+                prompt_snippet, snippet_hits, context_hint
             )
             
             # Analyze complexity
-            complexity_indicators = self._detect_complexity_indicators(prompt)
+            complexity_indicators = self._detect_complexity_indicators(prompt_hits)
             
             # Detect domain
-            domain_indicators = self._detect_domain_indicators(prompt)
+            domain_indicators = self._detect_domain_indicators(prompt_hits)
             
             # Assess urgency
-            urgency_level = self._assess_urgency(prompt)
+            urgency_level = self._assess_urgency(prompt_hits)
             
             # Estimate effort
-            estimated_effort = self._estimate_effort(prompt, complexity_indicators)
+            estimated_effort = self._estimate_effort(prompt, complexity_indicators, prompt_hits)
             
             # Create analysis result
             analysis = ContextAnalysis(
@@ -234,14 +329,15 @@ class PromptAnalyzer:
     
     async def _detect_context(self, 
                             prompt_snippet: str, 
+                            snippet_hits: Dict[Any, List[str]],
                             context_hint: Optional[PromptContext] = None) -> Tuple[PromptContext, float, List[str]]:
         """Detect context type with confidence scoring"""
         
         # If context hint provided, validate it
         if context_hint:
-            hint_confidence = await self._validate_context_hint(prompt_snippet, context_hint)
+            hint_confidence = await self._validate_context_hint(snippet_hits, context_hint)
             if hint_confidence >= 0.75:
-                keywords = self._find_context_keywords(prompt_snippet, context_hint)
+                keywords = self._find_context_keywords(snippet_hits, context_hint)
                 return context_hint, hint_confidence, keywords
         
         # Pattern-based detection
@@ -249,18 +345,11 @@ class PromptAnalyzer:
         found_keywords = {}
         
         for context, patterns in self.context_patterns.items():
-            score = 0.0
-            keywords = []
-            
-            for pattern in patterns:
-                if pattern in prompt_snippet:
-                    score += 1.0
-                    keywords.append(pattern)
+            keywords = self._find_context_keywords(snippet_hits, context)
             
             # Normalize score by pattern count
             if patterns:
-                normalized_score = score / len(patterns)
-                context_scores[context] = normalized_score
+                context_scores[context] = len(keywords) / len(patterns)
                 found_keywords[context] = keywords
         
         # Find best context
@@ -269,7 +358,7 @@ class PromptAnalyzer:
             context, raw_score = best_context
             
             # Calculate AAI-compliant confidence (70-95%)
-            confidence = self._calculate_context_confidence(raw_score, prompt_snippet)
+            confidence = self._calculate_context_confidence(raw_score, prompt_snippet, snippet_hits)
             keywords = found_keywords.get(context, [])
             
             return context, confidence, keywords
@@ -277,14 +366,14 @@ class PromptAnalyzer:
         # Default fallback
         return PromptContext.ANALYSIS, 0.70, []
     
-    async def _validate_context_hint(self, prompt_snippet: str, context_hint: PromptContext) -> float:
+    async def _validate_context_hint(self, snippet_hits: Dict[Any, List[str]], context_hint: PromptContext) -> float:
         """Validate user-provided context hint"""
         
         patterns = self.context_patterns.get(context_hint, [])
         if not patterns:
             return 0.70  # Neutral confidence
         
-        matches = sum(1 for pattern in patterns if pattern in prompt_snippet)
+        matches = len(self._find_context_keywords(snippet_hits, context_hint))
         
         if matches == 0:
             return 0.70  # No evidence but respect user hint
@@ -295,12 +384,14 @@ class PromptAnalyzer:
         
         return min(0.95, confidence)
     
-    def _find_context_keywords(self, prompt_snippet: str, context: PromptContext) -> List[str]:
+    def _find_context_keywords(self, snippet_hits: Dict[Any, List[str]], context: PromptContext) -> List[str]:
         """Find context keywords in prompt snippet"""
-        patterns = self.context_patterns.get(context, [])
-        return [pattern for pattern in patterns if pattern in prompt_snippet]
+        return snippet_hits.get(("context", context), [])
     
-    def _calculate_context_confidence(self, raw_score: float, prompt_snippet: str) -> float:
+    def _calculate_context_confidence(self,
+                                      raw_score: float,
+                                      prompt_snippet: str,
+                                      snippet_hits: Dict[Any, List[str]]) -> float:
         """Calculate AAI-compliant confidence score"""
         
         # Base confidence from pattern matching
@@ -315,50 +406,40 @@ class PromptAnalyzer:
             base_confidence += 0.03
         
         # Boost for specific keywords
-        specific_keywords = ["please", "help", "need", "want", "should", "could", "would"]
-        if any(keyword in prompt_snippet for keyword in specific_keywords):
+        if snippet_hits.get(("specific", None)):
             base_confidence += 0.02
         
         # Ensure AAI range compliance
         return max(0.70, min(0.95, base_confidence))
     
-    def _detect_complexity_indicators(self, prompt: str) -> List[str]:
+    def _detect_complexity_indicators(self, prompt_hits: Dict[Any, List[str]]) -> List[str]:
         """Detect complexity indicators in full prompt"""
-        prompt_lower = prompt.lower()
-        
-        found_indicators = []
-        for indicator in self.complexity_indicators:
-            if indicator in prompt_lower:
-                found_indicators.append(indicator)
-        
-        return found_indicators[:10]  # Limit to top 10
+        return prompt_hits.get(("complexity", None), [])[:10]  # Limit to top 10
     
-    def _detect_domain_indicators(self, prompt: str) -> List[str]:
+    def _detect_domain_indicators(self, prompt_hits: Dict[Any, List[str]]) -> List[str]:
         """Detect domain-specific indicators"""
-        prompt_lower = prompt.lower()
-        
         found_indicators = []
-        for domain, indicators in self.domain_indicators.items():
-            for indicator in indicators:
-                if indicator in prompt_lower:
-                    found_indicators.append(f"{domain}: {indicator}")
+        for domain in self.domain_indicators:
+            for indicator in prompt_hits.get(("domain", domain), []):
+                found_indicators.append(f"{domain}: {indicator}")
         
         return found_indicators[:5]  # Limit to top 5
     
-    def _assess_urgency(self, prompt: str) -> int:
+    def _assess_urgency(self, prompt_hits: Dict[Any, List[str]]) -> int:
         """Assess urgency level (1-5)"""
-        prompt_lower = prompt.lower()
         
-        # Check urgency indicators
-        for urgency_level, indicators in self.urgency_indicators.items():
-            for indicator in indicators:
-                if indicator in prompt_lower:
-                    return urgency_level
+        # Check urgency indicators, most urgent level first
+        for urgency_level in self.urgency_indicators:
+            if prompt_hits.get(("urgency", urgency_level)):
+                return urgency_level
         
         # Default to normal urgency
         return 3
     
-    def _estimate_effort(self, prompt: str, complexity_indicators: List[str]) -> int:
+    def _estimate_effort(self,
+                         prompt: str,
+                         complexity_indicators: List[str],
+                         prompt_hits: Dict[Any, List[str]]) -> int:
         """Estimate effort level (1-10)"""
         
         # Base effort
@@ -374,15 +455,7 @@ class PromptAnalyzer:
             effort += 1
         
         # Adjust for specific patterns
-        prompt_lower = prompt.lower()
-        high_effort_patterns = [
-            "enterprise", "production", "scalable", "comprehensive",
-            "detailed", "thorough", "complete", "full"
-        ]
-        
-        for pattern in high_effort_patterns:
-            if pattern in prompt_lower:
-                effort += 1
+        effort += len(prompt_hits.get(("effort", None), []))
         
         return max(1, min(10, effort))
     
@@ -394,6 +467,7 @@ class PromptAnalyzer:
             "pattern_count": sum(len(patterns) for patterns in self.context_patterns.values()),
             "complexity_indicators": len(self.complexity_indicators),
             "domain_indicators": sum(len(indicators) for indicators in self.domain_indicators.values()),
+            "matcher": self.matcher.get_stats(),
             "accuracy_tracking": dict(self.accuracy_tracking),
             "ready": True
         }
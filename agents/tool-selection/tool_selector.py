@@ -4,20 +4,27 @@ Core Tool Selector for Smart Tool Selection Enhancement
 Implements intelligent tool selection logic with multi-pattern coordination,
 confidence scoring, and AAI compliance for optimal tool recommendations.
 """
+import bisect
+import hashlib
+import json
 import logging
 import asyncio
+import time
+from collections import OrderedDict
 from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 
 try:
     from .models import (
         PromptContext, ToolCategory, FabricPattern, ToolMetadata,
-        ContextAnalysis, ToolSelection, SelectionRequest, SelectionResponse
+        ContextAnalysis, ToolSelection, SelectionRequest, SelectionResponse,
+        SelectionResult
     )
 except ImportError:
     from agents.tool_selection.models.models import (
         PromptContext, ToolCategory, FabricPattern, ToolMetadata,
-        ContextAnalysis, ToolSelection, SelectionRequest, SelectionResponse
+        ContextAnalysis, ToolSelection, SelectionRequest, SelectionResponse,
+        SelectionResult
     )
 try:
     from .prompt_analyzer import PromptAnalyzer
@@ -35,6 +42,56 @@ except ImportError:
 logger = logging.getLogger(__name__)
 
 
+class StageLatencyHistogram:
+    """
+    Fixed-bucket latency histogram per selection stage.
+    """
+    
+    # Bucket upper bounds in milliseconds; the last bucket is open-ended
+    BUCKET_BOUNDS_MS = [0.1, 0.25, 0.5, 1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000]
+    
+    def __init__(self):
+        self.stages: Dict[str, Dict[str, Any]] = {}
+    
+    def record(self, stage: str, duration_ms: float):
+        """Add one stage timing"""
+        stats = self.stages.setdefault(stage, {
+            "buckets": [0] * (len(self.BUCKET_BOUNDS_MS) + 1),
+            "count": 0,
+            "total_ms": 0.0,
+            "max_ms": 0.0
+        })
+        stats["buckets"][bisect.bisect_left(self.BUCKET_BOUNDS_MS, duration_ms)] += 1
+        stats["count"] += 1
+        stats["total_ms"] += duration_ms
+        stats["max_ms"] = max(stats["max_ms"], duration_ms)
+    
+    def _percentile(self, buckets: List[int], count: int, fraction: float) -> float:
+        """Upper bound of the bucket containing the given percentile"""
+        threshold = fraction * count
+        cumulative = 0
+        for index, bucket_count in enumerate(buckets):
+            cumulative += bucket_count
+            if cumulative >= threshold:
+                return self.BUCKET_BOUNDS_MS[index] if index < len(self.BUCKET_BOUNDS_MS) else float("inf")
+        return float("inf")
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-stage counts, mean, bucketed p50/p95 and raw buckets"""
+        labels = [f"<={bound}ms" for bound in self.BUCKET_BOUNDS_MS] + [f">{self.BUCKET_BOUNDS_MS[-1]}ms"]
+        return {
+            stage: {
+                "count": stats["count"],
+                "mean_ms": stats["total_ms"] / stats["count"],
+                "max_ms": stats["max_ms"],
+                "p50_ms": self._percentile(stats["buckets"], stats["count"], 0.50),
+                "p95_ms": self._percentile(stats["buckets"], stats["count"], 0.95),
+                "buckets": {label: n for label, n in zip(labels, stats["buckets"]) if n}
+            }
+            for stage, stats in self.stages.items()
+        }
+
+
 class ToolSelector:
     """
     Intelligent tool selection engine with multi-pattern coordination.
@@ -45,12 +102,18 @@ class ToolSelector:
     - AAI-compliant confidence scoring (70-95%)
     - Alternative suggestion generation
     - Risk assessment and mitigation
+    - Concurrent independent stages with per-stage latency histograms
+    - Response cache keyed on a prompt fingerprint, cleared on learning
+      updates and Fabric pattern rediscovery
     """
     
     def __init__(self, 
                  prompt_analyzer: Optional[PromptAnalyzer] = None,
                  fabric_integrator: Optional[FabricIntegrator] = None,
-                 confidence_scorer: Optional[SelectionConfidenceScorer] = None):
+                 confidence_scorer: Optional[SelectionConfidenceScorer] = None,
+                 learning_engine: Optional[Any] = None,
+                 cache_ttl_seconds: float = 300.0,
+                 cache_max_entries: int = 512):
         """Initialize tool selector with component dependencies"""
         
         # Initialize components
@@ -58,6 +121,19 @@ class ToolSelector:
         self.fabric_integrator = fabric_integrator or FabricIntegrator()
         self.confidence_scorer = confidence_scorer or SelectionConfidenceScorer()
         
+        # Selection response cache; learned effectiveness changes and pattern
+        # rediscovery invalidate it
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self._response_cache: "OrderedDict[str, Tuple[float, SelectionResponse]]" = OrderedDict()
+        self.cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+        self.fabric_integrator.add_update_listener(self.clear_selection_cache)
+        if learning_engine is not None:
+            learning_engine.add_update_listener(self.clear_selection_cache)
+        
+        # Per-stage latency tracking
+        self.stage_latency = StageLatencyHistogram()
+        
         # Tool registry
         self.available_tools = self._initialize_tool_registry()
         
@@ -211,83 +287,70 @@ class ToolSelector:
         Returns:
             Selection response with tools, patterns, and reasoning
         """
-        start_time = datetime.now()
+        start_time = time.perf_counter()
         
         try:
             logger.info(f"Starting tool selection for prompt: {request.prompt[:50]}...")
             
-            # Step 1: Analyze prompt context
-            context_analysis = await self.prompt_analyzer.analyze_prompt(
-                request.prompt, 
-                request.context_hint
-            )
+            cache_key = self._selection_fingerprint(request)
+            cached = self._get_cached_response(cache_key, request, start_time)
+            if cached is not None:
+                return cached
             
-            # Step 2: Get relevant Fabric patterns
-            fabric_patterns = await self.fabric_integrator.get_patterns_for_context(
-                context_analysis.detected_context
+            # Stage 1: Analyze prompt context
+            context_analysis = await self._timed_stage(
+                "analyze_prompt",
+                self.prompt_analyzer.analyze_prompt(request.prompt, request.context_hint)
             )
             
-            # Step 3: Select optimal tools
-            selected_tools = await self._select_optimal_tools(
-                context_analysis, 
-                request.preferred_tools,
-                request.max_selections
-            )
-            
-            # Step 4: Coordinate patterns and tools
-            coordinated_selection = await self._coordinate_selection(
-                context_analysis,
-                fabric_patterns,
-                selected_tools,
-                request.constraints
-            )
-            
-            # Step 5: Generate execution plan
-            execution_plan = await self._generate_execution_plan(
-                coordinated_selection["patterns"],
-                coordinated_selection["tools"],
-                context_analysis
+            # Stages 2-3: Fabric patterns and tool selection only need the context
+            fabric_patterns, selected_tools = await asyncio.gather(
+                self._timed_stage(
+                    "fabric_patterns",
+                    self.fabric_integrator.get_patterns_for_context(context_analysis.detected_context)
+                ),
+                self._timed_stage(
+                    "select_tools",
+                    self._select_optimal_tools(context_analysis, request.preferred_tools, request.max_selections)
+                )
             )
             
-            # Step 6: Calculate overall confidence
-            confidence = await self.confidence_scorer.calculate_selection_confidence(
-                context_analysis,
-                coordinated_selection["patterns"],
-                coordinated_selection["tools"]
+            # Stage 4: Coordinate patterns and tools
+            coordinated_selection = await self._timed_stage(
+                "coordinate",
+                self._coordinate_selection(context_analysis, fabric_patterns, selected_tools, request.constraints)
             )
+            patterns = coordinated_selection["patterns"]
+            tools = coordinated_selection["tools"]
             
-            # Step 7: Generate alternatives if requested
-            alternatives = []
-            if request.include_alternatives:
-                alternatives = await self._generate_alternatives(
-                    context_analysis,
-                    coordinated_selection["patterns"],
-                    coordinated_selection["tools"]
-                )
-            
-            # Step 8: Assess risks
-            risk_factors = await self._assess_risk_factors(
-                coordinated_selection["patterns"],
-                coordinated_selection["tools"],
-                context_analysis
+            # Stages 5-8: everything below depends only on the coordinated selection
+            execution_plan, confidence, alternatives, risk_factors = await asyncio.gather(
+                self._timed_stage("execution_plan", self._generate_execution_plan(patterns, tools, context_analysis)),
+                self._timed_stage(
+                    "confidence",
+                    self.confidence_scorer.calculate_selection_confidence(context_analysis, patterns, tools)
+                ),
+                self._timed_stage(
+                    "alternatives",
+                    self._generate_alternatives(context_analysis, patterns, tools)
+                    if request.include_alternatives else self._empty_stage()
+                ),
+                self._timed_stage("risk_factors", self._assess_risk_factors(patterns, tools, context_analysis))
             )
             
             # Create tool selection result
             tool_selection = ToolSelection(
                 prompt_snippet=context_analysis.prompt_snippet,
                 detected_context=context_analysis.detected_context,
-                selected_patterns=coordinated_selection["patterns"],
-                selected_tools=coordinated_selection["tools"],
+                selected_patterns=patterns,
+                selected_tools=tools,
                 confidence_score=confidence,
                 reasoning=coordinated_selection["reasoning"],
                 execution_plan=execution_plan,
                 alternatives=alternatives,
                 risk_factors=risk_factors,
                 success_probability=self._calculate_success_probability(confidence, risk_factors),
-                estimated_time_minutes=self._estimate_execution_time(
-                    coordinated_selection["patterns"],
-                    coordinated_selection["tools"]
-                )
+                estimated_time_minutes=self._estimate_execution_time(patterns, tools)
             )
             
             # Create complete selection result
@@ -298,11 +361,10 @@ class ToolSelector:
             )
             
             # Generate recommendations and warnings
-            recommendations = await self._generate_recommendations(selection_result)
-            warnings = await self._generate_warnings(selection_result)
-            
-            # Calculate processing time
-            processing_time = int((datetime.now() - start_time).total_seconds() * 1000)
+            recommendations, warnings = await asyncio.gather(
+                self._timed_stage("recommendations", self._generate_recommendations(selection_result)),
+                self._timed_stage("warnings", self._generate_warnings(selection_result))
+            )
             
             # Update metrics
             self._update_metrics(selection_result)
@@ -315,8 +377,9 @@ class ToolSelector:
                 execution_ready=len(risk_factors) == 0,
                 next_steps=execution_plan[:3],  # First 3 steps
                 session_id=selection_result.session_id,
-                processing_time_ms=processing_time
+                processing_time_ms=self._elapsed_ms(start_time, "total")
             )
+            self._store_cached_response(cache_key, response)
             
             logger.info(f"Tool selection completed: {len(selected_tools)} tools, {confidence:.2%} confidence")
             
@@ -329,6 +392,86 @@ class ToolSelector:
             fallback_response = await self._create_fallback_response(request, str(e))
             return fallback_response
     
+    async def _timed_stage(self, stage: str, awaitable):
+        """Await one pipeline stage and record its latency"""
+        stage_start = time.perf_counter()
+        try:
+            return await awaitable
+        finally:
+            self._elapsed_ms(stage_start, stage)
+    
+    async def _empty_stage(self) -> List[Dict[str, Any]]:
+        return []
+    
+    def _elapsed_ms(self, start: float, stage: str) -> int:
+        """Record elapsed time since start under a stage name"""
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        self.stage_latency.record(stage, elapsed_ms)
+        return int(elapsed_ms)
+    
+    def _selection_fingerprint(self, request: SelectionRequest) -> str:
+        """
+        Cache key from the prompt plus every option that affects selection.
+        
+        Prompt analysis only sees the lowercased prompt (and its length), so
+        prompts differing only in case share an entry.
+        """
+        key_data = {
+            "prompt": request.prompt.lower(),
+            "context_hint": request.context_hint.value if request.context_hint else None,
+            "preferred_tools": sorted(request.preferred_tools),
+            "constraints": request.constraints,
+            "max_selections": request.max_selections,
+            "confidence_threshold": request.confidence_threshold,
+            "include_alternatives": request.include_alternatives
+        }
+        encoded = json.dumps(key_data, sort_keys=True, default=str)
+        return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+    
+    def _get_cached_response(self,
+                             cache_key: str,
+                             request: SelectionRequest,
+                             start_time: float) -> Optional[SelectionResponse]:
+        """Return a copy of a fresh cached response for this request, if any"""
+        entry = self._response_cache.get(cache_key)
+        if entry is None or time.monotonic() - entry[0] > self.cache_ttl_seconds:
+            if entry is not None:
+                del self._response_cache[cache_key]
+            self.cache_stats["misses"] += 1
+            return None
+        
+        self._response_cache.move_to_end(cache_key)
+        self.cache_stats["hits"] += 1
+        
+        response = entry[1].model_copy(deep=True)
+        
+        # Echo this request's prompt rather than the one that filled the entry
+        context_analysis = response.selection_result.context_analysis
+        context_analysis.original_prompt = request.prompt
+        context_analysis.prompt_snippet = request.prompt[:100].lower().strip()
+        response.selection_result.tool_selection.prompt_snippet = context_analysis.prompt_snippet
+        
+        session_id = request.session_id or f"sel_{int(datetime.now().timestamp())}"
+        response.session_id = session_id
+        response.selection_result.session_id = session_id
+        response.processing_time_ms = self._elapsed_ms(start_time, "cache_hit")
+        self._update_metrics(response.selection_result)
+        return response
+    
+    def _store_cached_response(self, cache_key: str, response: SelectionResponse):
+        if self.cache_ttl_seconds <= 0:
+            return
+        self._response_cache[cache_key] = (time.monotonic(), response.model_copy(deep=True))
+        self._response_cache.move_to_end(cache_key)
+        while len(self._response_cache) > self.cache_max_entries:
+            self._response_cache.popitem(last=False)
+    
+    def clear_selection_cache(self, *_):
+        """Drop cached selections (registered as a learning-update listener)"""
+        if self._response_cache:
+            self.cache_stats["invalidations"] += 1
+        self._response_cache.clear()
+    
     async def _select_optimal_tools(self, 
                                   context_analysis: ContextAnalysis,
                                   preferred_tools: List[str],
@@ -637,10 +780,6 @@ class ToolSelector:
         )
         
         # Create selection result
-        try:
-    from .models import SelectionResult
-except ImportError:
-    from agents.tool_selection.models import SelectionResult
         selection_result = SelectionResult(
             context_analysis=context_analysis,
             tool_selection=tool_selection,
@@ -687,6 +826,8 @@ except ImportError:
             "average_confidence": self.performance_metrics["average_confidence"],
             "context_tracking": len(self.performance_metrics["context_accuracy"]),
             "coordination_weights": self.coordination_weights,
+            "cache": {**self.cache_stats, "entries": len(self._response_cache)},
+            "stage_latency": self.stage_latency.snapshot(),
             "ready": True
         }
 
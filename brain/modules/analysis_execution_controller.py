@@ -0,0 +1,354 @@
+#!/usr/bin/env python3
+"""
+Adaptive Execution Controller for Analysis Tasks
+
+Runs AnalysisOrchestrator tasks under an AIMD concurrency limit per agent
+type, schedules jittered per-task retries through a delay queue, and keeps
+an append-only JSONL checkpoint log that resume replays.
+"""
+
+import asyncio
+import heapq
+import itertools
+import json
+import os
+import random
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import aiofiles
+
+# Weight of the newest outcome in each limiter's error rate
+ERROR_RATE_ALPHA = 0.2
+
+# Successful attempts needed before latency can cut the limit
+MIN_LATENCY_SAMPLES = 5
+
+
+class AIMDLimiter:
+    """
+    Concurrency limit for one agent type.
+
+    The limit grows by one slot for every limit's worth of fast successes
+    and is multiplied by decrease_factor when an attempt fails or its
+    latency exceeds the threshold. Only attempts started after the last cut
+    can cut again, so a burst of failures from one overloaded window reduces
+    the limit once rather than once per failure.
+    """
+
+    def __init__(self, initial_limit: float = 2, min_limit: int = 1, max_limit: int = 16,
+                 decrease_factor: float = 0.5, latency_target: Optional[float] = None,
+                 latency_tolerance: float = 2.0, latency_floor: float = 0.1, window: int = 20):
+        """
+        Args:
+            latency_target: Fixed latency threshold in seconds. When None the
+                threshold is latency_tolerance times the fastest recent
+                success, and never below latency_floor
+        """
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.limit = float(max(min_limit, min(initial_limit, max_limit)))
+        self.decrease_factor = decrease_factor
+        self.latency_target = latency_target
+        self.latency_tolerance = latency_tolerance
+        self.latency_floor = latency_floor
+        self.latencies = deque(maxlen=window)
+        self.in_flight = 0
+        self.error_rate = 0.0
+        self.last_decrease = float("-inf")
+        self.stats = {"successes": 0, "errors": 0, "slow": 0, "increases": 0, "decreases": 0}
+
+    def acquire(self) -> bool:
+        """Take a slot if one is free"""
+        if self.in_flight >= int(self.limit):
+            return False
+        self.in_flight += 1
+        return True
+
+    def latency_threshold(self) -> Optional[float]:
+        if self.latency_target is not None:
+            return self.latency_target
+        if len(self.latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return max(min(self.latencies) * self.latency_tolerance, self.latency_floor)
+
+    def release(self, started_at: float, finished_at: float, success: bool):
+        """Return a slot and adjust the limit from the attempt's outcome"""
+        saturated = self.in_flight >= int(self.limit)
+        self.in_flight -= 1
+        latency = finished_at - started_at
+        self.error_rate += ERROR_RATE_ALPHA * ((0.0 if success else 1.0) - self.error_rate)
+
+        threshold = self.latency_threshold()
+        slow = success and threshold is not None and latency > threshold
+        if success:
+            self.latencies.append(latency)
+            self.stats["successes"] += 1
+            if slow:
+                self.stats["slow"] += 1
+        else:
+            self.stats["errors"] += 1
+
+        if not success or slow:
+            if started_at > self.last_decrease:
+                self.limit = max(float(self.min_limit), self.limit * self.decrease_factor)
+                self.last_decrease = finished_at
+                self.stats["decreases"] += 1
+        elif saturated and self.limit < self.max_limit:
+            # Only grow a limit that was actually reached
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+            self.stats["increases"] += 1
+
+    def cancel(self):
+        """Return the slot of an attempt that was cancelled before finishing"""
+        self.in_flight -= 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "limit": round(self.limit, 2),
+            "in_flight": self.in_flight,
+            "error_rate": round(self.error_rate, 3),
+            "latency_threshold": self.latency_threshold()
+        }
+
+
+class DelayQueue:
+    """Items waiting for a ready time, earliest first"""
+
+    def __init__(self):
+        self._heap = []
+        self._sequence = itertools.count()
+
+    def push(self, ready_at: float, item: Any):
+        heapq.heappush(self._heap, (ready_at, next(self._sequence), item))
+
+    def pop_ready(self, now: float) -> List[Any]:
+        ready = []
+        while self._heap and self._heap[0][0] <= now:
+            ready.append(heapq.heappop(self._heap)[2])
+        return ready
+
+    def next_ready_at(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def __len__(self) -> int:
+        return len(self._heap)
+
+
+class ExecutionController:
+    """
+    Runs tasks with per-agent-type AIMD limits and delayed retries.
+
+    Tasks are duck-typed AnalysisTask objects: the controller reads
+    agent_name and updates status, result, error and retry_count. A failed
+    attempt goes back on the delay queue with full-jitter exponential
+    backoff while other tasks keep running, so one struggling agent type
+    neither blocks nor slows the rest.
+    """
+
+    def __init__(self, max_retries: int = 3, base_delay: float = 1.0, max_delay: float = 60.0,
+                 limiter_options: Optional[Dict[str, Any]] = None, rng: Optional[random.Random] = None):
+        """
+        Args:
+            max_retries: Attempts per task, as RateLimiter.should_retry counts them
+            limiter_options: Keyword arguments for each agent type's AIMDLimiter
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limiter_options = limiter_options or {}
+        self.rng = rng or random.Random()
+        self.limiters: Dict[str, AIMDLimiter] = {}
+        # Runs may overlap and share limiters; each keeps its own delay queue
+        self._delay_queues: List[DelayQueue] = []
+        self._attempts_in_flight = 0
+        self._slot_waiters: Set[asyncio.Future] = set()
+        self.stats = {"attempts": 0, "retries_scheduled": 0, "completed": 0, "failed": 0}
+
+    def limiter_for(self, task) -> AIMDLimiter:
+        limiter = self.limiters.get(task.agent_name)
+        if limiter is None:
+            limiter = self.limiters[task.agent_name] = AIMDLimiter(**self.limiter_options)
+        return limiter
+
+    def retry_delay(self, retry_count: int) -> float:
+        """Full-jitter backoff: uniform over [0, base * 2^retries], capped"""
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry_count)))
+
+    async def run(self, tasks: Iterable[Any], attempt: Callable[[Any], Awaitable[Any]],
+                  on_transition: Optional[Callable[[Any], Awaitable[None]]] = None) -> List[Any]:
+        """
+        Run every task to completion or failure.
+
+        Args:
+            attempt: Coroutine function making one attempt; its return value
+                becomes task.result and an exception counts as a failure
+            on_transition: Awaited after every status change, e.g. to
+                append a checkpoint record
+        """
+        tasks = list(tasks)
+        loop = asyncio.get_running_loop()
+        ready = deque(tasks)
+        delayed = DelayQueue()
+        running: Dict[asyncio.Future, tuple] = {}
+        slot_waiter: Optional[asyncio.Future] = None
+        self._delay_queues.append(delayed)
+
+        async def transition(task):
+            if on_transition is not None:
+                await on_transition(task)
+
+        try:
+            while ready or delayed or running:
+                ready.extend(delayed.pop_ready(loop.time()))
+
+                # Launch whatever each agent type's limit allows; a saturated
+                # type does not hold back tasks of other types behind it
+                blocked = deque()
+                while ready:
+                    task = ready.popleft()
+                    limiter = self.limiter_for(task)
+                    if not limiter.acquire():
+                        blocked.append(task)
+                        continue
+                    self._attempts_in_flight += 1
+                    task.status = "in_progress"
+                    try:
+                        await transition(task)
+                    except BaseException:
+                        limiter.cancel()
+                        self._release_attempt()
+                        raise
+                    self.stats["attempts"] += 1
+                    running[asyncio.ensure_future(attempt(task))] = (task, limiter, loop.time())
+                ready = blocked
+
+                waits = set(running)
+                if ready:
+                    if not self._attempts_in_flight:
+                        raise RuntimeError(
+                            f"{len(ready)} tasks are blocked on agent limits with no attempt in flight to free them"
+                        )
+                    # Slots are held by another run sharing these limiters
+                    slot_waiter = loop.create_future()
+                    self._slot_waiters.add(slot_waiter)
+                    waits.add(slot_waiter)
+
+                next_ready_at = delayed.next_ready_at()
+                timeout = None if next_ready_at is None else max(0.0, next_ready_at - loop.time())
+                if not waits:
+                    # Nothing in flight, so everything left is waiting to retry
+                    await asyncio.sleep(timeout)
+                    continue
+
+                done, _ = await asyncio.wait(waits, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                if slot_waiter is not None:
+                    self._slot_waiters.discard(slot_waiter)
+                    slot_waiter = None
+
+                for future in done:
+                    if future not in running:
+                        continue
+                    task, limiter, started_at = running.pop(future)
+                    error = future.exception()
+                    finished_at = loop.time()
+                    limiter.release(started_at, finished_at, error is None)
+                    self._release_attempt()
+
+                    if error is None:
+                        task.result = future.result()
+                        task.status = "completed"
+                        task.error = None
+                        self.stats["completed"] += 1
+                    else:
+                        task.retry_count += 1
+                        task.error = str(error)
+                        if task.retry_count < self.max_retries:
+                            task.status = "pending"
+                            delayed.push(finished_at + self.retry_delay(task.retry_count), task)
+                            self.stats["retries_scheduled"] += 1
+                        else:
+                            task.status = "failed"
+                            self.stats["failed"] += 1
+                    await transition(task)
+        finally:
+            for future, (task, limiter, _) in running.items():
+                future.cancel()
+                limiter.cancel()
+                self._release_attempt()
+            if slot_waiter is not None:
+                self._slot_waiters.discard(slot_waiter)
+            self._delay_queues.remove(delayed)
+
+        return tasks
+
+    def _release_attempt(self):
+        """An attempt gave back its slot; wake runs waiting for one"""
+        self._attempts_in_flight -= 1
+        for waiter in self._slot_waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            "delayed": sum(len(queue) for queue in self._delay_queues),
+            "agents": {name: limiter.get_stats() for name, limiter in self.limiters.items()}
+        }
+
+
+class CheckpointLog:
+    """
+    Append-only JSONL log of task states.
+
+    Every status change appends one record; the last record per task id is
+    its current state, so a checkpoint costs one short append however many
+    tasks the analysis has.
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+
+    async def append(self, records: Iterable[Dict[str, Any]]):
+        lines = "".join(json.dumps({**record, "timestamp": time.time()}) + "\n" for record in records)
+        if not lines:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.path, "a", encoding="utf-8") as f:
+            await f.write(lines)
+
+    async def reset(self):
+        """Start a new log for a fresh analysis run"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        async with aiofiles.open(self.path, "w", encoding="utf-8") as f:
+            await f.write("")
+
+    async def load(self) -> Dict[str, Dict[str, Any]]:
+        """Task id -> latest record, in the order tasks first appeared"""
+        if not self.path.exists():
+            return {}
+        latest = {}
+        async with aiofiles.open(self.path, "r", encoding="utf-8") as f:
+            content = await f.read()
+        for line in content.splitlines():
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # Torn final line from an interrupted append
+                continue
+            latest[record["id"]] = record
+        return latest
+
+    async def compact(self) -> Dict[str, Dict[str, Any]]:
+        """Rewrite the log as one record per task and return those records"""
+        latest = await self.load()
+        if not latest:
+            return latest
+        tmp_path = self.path.with_name(f".{self.path.name}.{os.getpid()}.tmp")
+        async with aiofiles.open(tmp_path, "w", encoding="utf-8") as f:
+            await f.write("".join(json.dumps(record) + "\n" for record in latest.values()))
+        os.replace(tmp_path, self.path)
+        return latest
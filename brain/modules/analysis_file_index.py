@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Shared File Index for Analysis Sessions
+
+Walks an analysis target once and serves every AnalysisOrchestrator agent
+from that walk: glob-style file lists, cached file contents, and
+multi-keyword scans that read each file once.
+"""
+
+import asyncio
+import fnmatch
+import mmap
+import os
+import re
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Pattern, Tuple
+
+import aiofiles
+
+# Version control metadata never holds files the analyses look at
+SKIP_DIRS = {".git", ".hg", ".svn"}
+
+
+def keyword_pattern(keywords: Iterable[str], binary: bool = False) -> Pattern:
+    """
+    Case-insensitive pattern reporting every position where a keyword starts.
+
+    The lookahead makes matches overlap and longer keywords are tried first,
+    so "api_key" is found even though "key" starts inside it; keywords that
+    are substrings of a found keyword are added by matched_keywords.
+    """
+    alternatives = "|".join(re.escape(k) for k in sorted(set(keywords), key=len, reverse=True))
+    source = f"(?=({alternatives}))"
+    return re.compile(source.encode() if binary else source, re.IGNORECASE)
+
+
+def matched_keywords(pattern: Pattern, content, keywords: Iterable[str]) -> FrozenSet[str]:
+    found = {m.group(1).lower() for m in pattern.finditer(content)}
+    if isinstance(content, (bytes, bytearray, mmap.mmap)):
+        found = {k.decode("ascii", "ignore") for k in found}
+    return frozenset(k for k in keywords if k in found or any(k in f for f in found))
+
+
+class AnalysisFileIndex:
+    """
+    Files under one analysis target, collected in a single os.scandir walk.
+
+    File contents are read once and kept in an LRU cache bounded by
+    max_cache_bytes. Keyword scans of files larger than mmap_threshold run
+    over a memory map instead of loading the file, and scan results are
+    memoized per file and keyword set.
+    """
+
+    def __init__(self, root, max_cache_bytes: int = 64 * 1024 * 1024, mmap_threshold: int = 1024 * 1024):
+        self.root = Path(root)
+        self.max_cache_bytes = max_cache_bytes
+        self.mmap_threshold = mmap_threshold
+        self.entries: List[Tuple[str, str, int]] = []  # (name, path, size)
+        self.sizes: Dict[str, int] = {}
+        self.built = False
+        self._build_task: Optional[asyncio.Future] = None
+        self._matches: Dict[Tuple[str, ...], List[Path]] = {}
+        self._contents: "OrderedDict[str, str]" = OrderedDict()
+        self._cached_bytes = 0
+        self._reads: Dict[str, asyncio.Future] = {}
+        self._patterns: Dict[Tuple[Tuple[str, ...], bool], Pattern] = {}
+        self._keyword_hits: Dict[Tuple[str, Tuple[str, ...]], FrozenSet[str]] = {}
+        self.stats = {
+            "walks": 0, "walk_seconds": 0.0, "files": 0, "reads": 0,
+            "cache_hits": 0, "mapped_scans": 0, "keyword_scans": 0
+        }
+
+    # Walk
+
+    def build(self):
+        """Collect every file under root in one walk"""
+        start_time = time.perf_counter()
+        entries = []
+        if self.root.is_dir():
+            stack = [str(self.root)]
+            while stack:
+                try:
+                    iterator = os.scandir(stack.pop())
+                except OSError:
+                    continue
+                subdirs = []
+                with iterator:
+                    for entry in iterator:
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if entry.name not in SKIP_DIRS:
+                                    subdirs.append(entry.path)
+                            elif entry.is_file():
+                                entries.append((entry.name, entry.path, entry.stat().st_size))
+                        except OSError:
+                            continue
+                # Visit subdirectories in the order scandir listed them
+                stack.extend(reversed(subdirs))
+
+        self.entries = entries
+        self.sizes = {path: size for _, path, size in entries}
+        self._matches.clear()
+        self.built = True
+        self.stats["walks"] += 1
+        self.stats["files"] = len(entries)
+        self.stats["walk_seconds"] += time.perf_counter() - start_time
+
+    async def ensure_built(self):
+        """Build the index in a worker thread once, however many agents ask"""
+        if self.built:
+            return
+        task = self._build_task
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._build_task = asyncio.ensure_future(asyncio.to_thread(self.build))
+        await asyncio.shield(task)
+
+    def files(self, *patterns: str) -> List[Path]:
+        """
+        Files whose names match the glob patterns, like concatenated
+        Path.rglob(pattern) results for each pattern in turn.
+        """
+        matches = self._matches.get(patterns)
+        if matches is None:
+            matches = [
+                Path(path)
+                for pattern in patterns
+                for name, path, _ in self.entries
+                if fnmatch.fnmatch(name, pattern)
+            ]
+            self._matches[patterns] = matches
+        return matches
+
+    # Contents
+
+    async def read_text(self, path) -> str:
+        """File contents as text, read at most once while they stay cached"""
+        key = str(path)
+        text = self._contents.get(key)
+        if text is not None:
+            self._contents.move_to_end(key)
+            self.stats["cache_hits"] += 1
+            return text
+
+        # Agents asking for the same file concurrently share one read
+        task = self._reads.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            task = self._reads[key] = asyncio.ensure_future(self._read(key))
+            task.add_done_callback(lambda _: self._reads.pop(key, None))
+        return await asyncio.shield(task)
+
+    async def _read(self, key: str) -> str:
+        async with aiofiles.open(key, 'r', encoding='utf-8', errors='ignore') as f:
+            text = await f.read()
+        self.stats["reads"] += 1
+
+        size = len(text)
+        if size <= self.max_cache_bytes:
+            while self._contents and self._cached_bytes + size > self.max_cache_bytes:
+                _, evicted = self._contents.popitem(last=False)
+                self._cached_bytes -= len(evicted)
+            self._contents[key] = text
+            self._cached_bytes += size
+        return text
+
+    def _pattern(self, keywords: Tuple[str, ...], binary: bool) -> Pattern:
+        pattern = self._patterns.get((keywords, binary))
+        if pattern is None:
+            pattern = self._patterns[(keywords, binary)] = keyword_pattern(keywords, binary)
+        return pattern
+
+    def _scan_mapped(self, key: str, keywords: Tuple[str, ...]) -> FrozenSet[str]:
+        with open(key, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return matched_keywords(self._pattern(keywords, True), mapped, keywords)
+
+    async def find_keywords(self, path, keywords: Iterable[str]) -> FrozenSet[str]:
+        """
+        Which of the keywords occur in the file, case-insensitively, found
+        in one pass over its contents.
+        """
+        keywords = tuple(k.lower() for k in keywords)
+        key = str(path)
+        cached = self._keyword_hits.get((key, keywords))
+        if cached is not None:
+            return cached
+
+        size = self.sizes.get(key)
+        if size is None:
+            size = os.path.getsize(key)
+        if size > self.mmap_threshold and key not in self._contents:
+            found = await asyncio.to_thread(self._scan_mapped, key, keywords)
+            self.stats["mapped_scans"] += 1
+        else:
+            text = await self.read_text(key)
+            found = matched_keywords(self._pattern(keywords, False), text, keywords)
+        self.stats["keyword_scans"] += 1
+        self._keyword_hits[(key, keywords)] = found
+        return found
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "cached_files": len(self._contents), "cached_bytes": self._cached_bytes}
@@ -6,13 +6,23 @@ Implements the /sc:analyze command with proper subagent coordination
 
 import asyncio
 import json
+import sys
 import time
 from dataclasses import dataclass
 from typing import List, Dict, Any, Optional
 from enum import Enum
 import os
 from pathlib import Path
-import aiofiles
+
+try:
+    from brain.modules.analysis_execution_controller import ExecutionController, CheckpointLog
+    from brain.modules.analysis_file_index import AnalysisFileIndex
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from analysis_execution_controller import ExecutionController, CheckpointLog
+    from analysis_file_index import AnalysisFileIndex
+
+SECURITY_KEYWORDS = ["password", "secret", "key", "token", "api_key"]
 
 class AnalysisFocus(Enum):
     QUALITY = "quality"
@@ -37,7 +47,13 @@ class AnalysisTask:
     retry_count: int = 0
 
 class RateLimiter:
-    """Implements exponential backoff rate limiting"""
+    """
+    Implements exponential backoff rate limiting.
+
+    Task execution now paces itself through ExecutionController; these
+    settings seed its retry policy and the error counters are kept for
+    callers that inspect them.
+    """
     def __init__(self, initial_delay: float = 1.0, max_delay: float = 60.0, max_retries: int = 3):
         self.initial_delay = initial_delay
         self.max_delay = max_delay
@@ -77,9 +93,13 @@ class AnalysisOrchestrator:
     
     def __init__(self):
         self.rate_limiter = RateLimiter()
-        self.checkpoint_file = Path("/mnt/c/Users/Brandon/AAI/brain/cache/analysis-checkpoint.json")
-        self.batch_size = 2  # Process max 2 agents at a time
+        self.checkpoint_file = Path("/mnt/c/Users/Brandon/AAI/brain/cache/analysis-checkpoint.jsonl")
+        self.checkpoint_log = CheckpointLog(self.checkpoint_file)
+        self.batch_size = 2  # Initial concurrency per agent type
+        self.max_concurrency = 8  # Ceiling the adaptive limit can grow to
+        self.controller = self._create_controller()
         self.target_path = "."  # Will be set during analysis
+        self.file_index: Optional[AnalysisFileIndex] = None  # Shared by all agents of a session
         
         # Supreme integration flags
         self.supreme_mode = False
@@ -90,6 +110,7 @@ class AnalysisOrchestrator:
         self.target_path = target_path
         self.supreme_mode = True
         self.supreme_session_id = session_id
+        self.reset_file_index()
         
         target = Path(target_path)
         
@@ -110,8 +131,9 @@ class AnalysisOrchestrator:
         try:
             # Analyze target complexity
             if target.is_dir():
-                py_files = list(target.rglob("*.py"))
-                js_files = list(target.rglob("*.js"))
+                index = await self.get_file_index()
+                py_files = index.files("*.py")
+                js_files = index.files("*.js")
                 total_files = len(py_files) + len(js_files)
                 
                 if total_files < 10:
@@ -137,6 +159,17 @@ class AnalysisOrchestrator:
             setup_result["error"] = f"Setup analysis failed: {str(e)}"
             
         return setup_result
+    
+    def reset_file_index(self):
+        """Start a new session; the next analysis walks the target again"""
+        self.file_index = None
+    
+    async def get_file_index(self) -> AnalysisFileIndex:
+        """File index for the current target, built in one walk on first use"""
+        if self.file_index is None or self.file_index.root != Path(self.target_path):
+            self.file_index = AnalysisFileIndex(self.target_path)
+        await self.file_index.ensure_built()
+        return self.file_index
         
     def get_agent_tasks(self, focus: AnalysisFocus, depth: AnalysisDepth) -> List[AnalysisTask]:
         """Get the list of agent tasks based on focus and depth"""
@@ -294,14 +327,12 @@ class AnalysisOrchestrator:
         # Analyze Python files for quality issues
         try:
             # Look for common code quality issues
-            python_files = []
-            for ext in ["*.py", "*.js", "*.ts", "*.java", "*.cpp", "*.c"]:
-                python_files.extend(Path(self.target_path).rglob(ext))
+            index = await self.get_file_index()
+            python_files = index.files("*.py", "*.js", "*.ts", "*.java", "*.cpp", "*.c")
             
             for file_path in python_files[:10]:  # Limit to first 10 files
                 try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = await f.read()
+                    content = await index.read_text(file_path)
                         
                     # Basic quality checks
                     lines = content.split('\n')
@@ -351,19 +382,21 @@ class AnalysisOrchestrator:
         issues_found = 0
         
         try:
-            # Look for common security issues
-            for pattern in ["password", "secret", "key", "token", "api_key"]:
-                for file_path in Path(self.target_path).rglob("*.py"):
-                    try:
-                        async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                            content = await f.read()
-                            
-                        if pattern in content.lower():
-                            findings.append(f"{file_path}: Potential hardcoded {pattern} detected")
-                            issues_found += 1
-                            
-                    except Exception:
-                        pass
+            # Look for common security issues, scanning each file once for all keywords
+            index = await self.get_file_index()
+            python_files = index.files("*.py")
+            found = {}
+            for file_path in python_files:
+                try:
+                    found[file_path] = await index.find_keywords(file_path, SECURITY_KEYWORDS)
+                except Exception:
+                    pass
+            
+            for pattern in SECURITY_KEYWORDS:
+                for file_path in python_files:
+                    if pattern in found.get(file_path, ()):
+                        findings.append(f"{file_path}: Potential hardcoded {pattern} detected")
+                        issues_found += 1
                         
         except Exception as e:
             findings.append(f"Error during security analysis: {str(e)}")
@@ -390,10 +423,10 @@ class AnalysisOrchestrator:
         
         try:
             # Look for performance issues
-            for file_path in Path(self.target_path).rglob("*.py"):
+            index = await self.get_file_index()
+            for file_path in index.files("*.py"):
                 try:
-                    async with aiofiles.open(file_path, 'r', encoding='utf-8', errors='ignore') as f:
-                        content = await f.read()
+                    content = await index.read_text(file_path)
                         
                     # Check for potential performance issues
                     if "import *" in content:
@@ -432,8 +465,9 @@ class AnalysisOrchestrator:
         
         try:
             # Analyze project structure
-            py_files = list(Path(self.target_path).rglob("*.py"))
-            js_files = list(Path(self.target_path).rglob("*.js"))
+            index = await self.get_file_index()
+            py_files = index.files("*.py")
+            js_files = index.files("*.js")
             
             total_files = len(py_files) + len(js_files)
             
@@ -478,15 +512,16 @@ class AnalysisOrchestrator:
         
         try:
             # Look for integration issues
-            test_files = list(Path(self.target_path).rglob("*test*.py"))
+            index = await self.get_file_index()
+            test_files = index.files("*test*.py")
             
             if not test_files:
                 findings.append("No test files detected")
                 issues_found += 1
                 
             # Check for requirements file
-            req_files = list(Path(self.target_path).rglob("requirements*.txt"))
-            package_files = list(Path(self.target_path).rglob("package.json"))
+            req_files = index.files("requirements*.txt")
+            package_files = index.files("package.json")
             
             if not req_files and not package_files:
                 findings.append("No dependency file detected")
@@ -510,128 +545,122 @@ class AnalysisOrchestrator:
             ]
         }
     
+    def _create_controller(self) -> ExecutionController:
+        return ExecutionController(
+            max_retries=self.rate_limiter.max_retries,
+            base_delay=self.rate_limiter.initial_delay,
+            max_delay=self.rate_limiter.max_delay,
+            limiter_options={"initial_limit": self.batch_size, "max_limit": self.max_concurrency}
+        )
+    
+    async def execute_task_attempt(self, task: AnalysisTask) -> Dict[str, Any]:
+        """Make one attempt at a task; raises on failure so the controller can retry it"""
+        print(f"Executing: {task.agent_name} - {task.command}")
+        
+        try:
+            # Execute real analysis based on focus area
+            if hasattr(self, 'claude_task_tool'):
+                # Use Claude's Task tool for actual subagent spawning
+                result = await self.execute_with_claude_task(task)
+            else:
+                # Fallback to local analysis
+                result = await self.execute_real_analysis(task)
+        except Exception as e:
+            self.rate_limiter.record_error()
+            
+            if "529" in str(e) or "overloaded" in str(e).lower():
+                print(f"API overloaded, will retry {task.agent_name} after backoff")
+            elif "400" in str(e) and "tool_use" in str(e):
+                print(f"Tool sequence error for {task.agent_name}, ensuring proper cleanup")
+                # Ensure tool result is always provided
+                raise RuntimeError("Tool sequence error - handled") from e
+            else:
+                print(f"Error executing {task.agent_name}: {e}")
+            raise
+        
+        self.rate_limiter.record_success()
+        return result
+    
     async def execute_task_with_retry(self, task: AnalysisTask) -> AnalysisTask:
         """Execute a single task with retry logic and rate limiting"""
-        while self.rate_limiter.should_retry(task.retry_count):
-            try:
-                # Wait for rate limit
-                await self.rate_limiter.wait_if_needed()
-                
-                # Mark as in progress
-                task.status = "in_progress"
-                await self.save_checkpoint([task])
-                
-                # Simulate task execution (replace with actual API call)
-                print(f"Executing: {task.agent_name} - {task.command}")
-                
-                # Execute real analysis based on focus area
-                if hasattr(self, 'claude_task_tool'):
-                    # Use Claude's Task tool for actual subagent spawning
-                    task.result = await self.execute_with_claude_task(task)
-                else:
-                    # Fallback to local analysis
-                    task.result = await self.execute_real_analysis(task)
-                task.status = "completed"
-                
-                self.rate_limiter.record_success()
-                await self.save_checkpoint([task])
-                return task
-                
-            except Exception as e:
-                task.retry_count += 1
-                task.error = str(e)
-                self.rate_limiter.record_error()
-                
-                if "529" in str(e) or "overloaded" in str(e).lower():
-                    print(f"API overloaded, will retry {task.agent_name} after backoff")
-                elif "400" in str(e) and "tool_use" in str(e):
-                    print(f"Tool sequence error for {task.agent_name}, ensuring proper cleanup")
-                    # Ensure tool result is always provided
-                    task.error = "Tool sequence error - handled"
-                else:
-                    print(f"Error executing {task.agent_name}: {e}")
-                    
-                if not self.rate_limiter.should_retry(task.retry_count):
-                    task.status = "failed"
-                    await self.save_checkpoint([task])
-                    break
-                    
-        return task
+        return (await self.execute_batch([task]))[0]
     
     async def execute_batch(self, tasks: List[AnalysisTask]) -> List[AnalysisTask]:
-        """Execute a batch of tasks concurrently with rate limiting"""
-        results = await asyncio.gather(
-            *[self.execute_task_with_retry(task) for task in tasks],
-            return_exceptions=True
-        )
+        """
+        Execute tasks under the adaptive per-agent concurrency limits.
         
-        # Handle any exceptions that weren't caught
-        for i, result in enumerate(results):
-            if isinstance(result, Exception):
-                tasks[i].status = "failed"
-                tasks[i].error = str(result)
-                
+        Failed attempts are retried after a jittered backoff without holding
+        up other tasks, and every status change is appended to the checkpoint.
+        """
+        try:
+            await self.controller.run(tasks, self.execute_task_attempt, on_transition=self._checkpoint_task)
+        except Exception as e:
+            # Handle any exceptions that weren't caught
+            for task in tasks:
+                if task.status != "completed":
+                    task.status = "failed"
+                    task.error = str(e)
+                    
         return tasks
     
+    async def _checkpoint_task(self, task: AnalysisTask):
+        await self.save_checkpoint([task])
+    
     async def save_checkpoint(self, tasks: List[AnalysisTask]):
-        """Save checkpoint for resume functionality"""
-        checkpoint_data = {
-            "timestamp": time.time(),
-            "tasks": [
-                {
-                    "id": task.id,
-                    "agent_name": task.agent_name,
-                    "status": task.status,
-                    "error": task.error,
-                    "retry_count": task.retry_count,
-                    "result": task.result
-                }
-                for task in tasks
-            ]
-        }
-        
-        self.checkpoint_file.parent.mkdir(parents=True, exist_ok=True)
-        async with aiofiles.open(self.checkpoint_file, 'w') as f:
-            await f.write(json.dumps(checkpoint_data, indent=2))
+        """Append the current state of tasks to the checkpoint log for resume"""
+        await self.checkpoint_log.append(
+            {
+                "id": task.id,
+                "agent_name": task.agent_name,
+                "command": task.command,
+                "focus_area": task.focus_area,
+                "status": task.status,
+                "error": task.error,
+                "retry_count": task.retry_count,
+                "result": task.result
+            }
+            for task in tasks
+        )
+    
+    async def _load_checkpoint_tasks(self) -> List[AnalysisTask]:
+        """Latest state of every task in the checkpoint log"""
+        records = await self.checkpoint_log.compact()
+        return [
+            AnalysisTask(
+                id=record['id'],
+                agent_name=record['agent_name'],
+                command=record.get('command', ''),
+                focus_area=record.get('focus_area', ''),
+                status=record['status'],
+                result=record.get('result'),
+                error=record.get('error'),
+                retry_count=record.get('retry_count', 0)
+            )
+            for record in records.values()
+        ]
     
     async def load_checkpoint(self) -> Optional[List[AnalysisTask]]:
         """Load checkpoint if exists and return resumable tasks"""
-        if self.checkpoint_file.exists():
-            try:
-                async with aiofiles.open(self.checkpoint_file, 'r') as f:
-                    data = json.loads(await f.read())
-                    
-                # Reconstruct tasks from checkpoint
-                tasks = []
-                for task_data in data.get('tasks', []):
-                    task = AnalysisTask(
-                        id=task_data['id'],
-                        agent_name=task_data['agent_name'],
-                        command="",  # Will be reconstructed
-                        focus_area=task_data.get('focus_area', ''),
-                        status=task_data['status'],
-                        result=task_data.get('result'),
-                        error=task_data.get('error'),
-                        retry_count=task_data.get('retry_count', 0)
-                    )
-                    tasks.append(task)
-                
-                # Only return tasks that can be resumed (not completed)
-                resumable_tasks = [t for t in tasks if t.status != 'completed']
-                if resumable_tasks:
-                    print(f"Found {len(resumable_tasks)} resumable tasks from checkpoint")
-                    return resumable_tasks
-                    
-            except Exception as e:
-                print(f"Error loading checkpoint: {e}")
+        try:
+            tasks = await self._load_checkpoint_tasks()
+        except Exception as e:
+            print(f"Error loading checkpoint: {e}")
+            return None
+        
+        # Only return tasks that can be resumed (not completed)
+        resumable_tasks = [t for t in tasks if t.status != 'completed']
+        if resumable_tasks:
+            print(f"Found {len(resumable_tasks)} resumable tasks from checkpoint")
+            return resumable_tasks
         return None
     
     async def analyze(self, target: str, focus: AnalysisFocus, depth: AnalysisDepth, 
                      enable_subagents: bool = True, resume: bool = False) -> Dict[str, Any]:
         """Main analysis orchestration method"""
         
-        # Set target path for analysis
+        # Set target path for analysis; each run starts a new file index session
         self.target_path = target
+        self.reset_file_index()
         
         if not enable_subagents:
             # Fallback to simple analysis without subagents
@@ -639,45 +668,42 @@ class AnalysisOrchestrator:
         
         # Check for resumable tasks
         tasks = None
+        finished_tasks = []
         if resume:
-            tasks = await self.load_checkpoint()
+            try:
+                checkpointed = await self._load_checkpoint_tasks()
+            except Exception as e:
+                print(f"Error loading checkpoint: {e}")
+                checkpointed = []
+            # Only tasks that did not complete are run again
+            tasks = [t for t in checkpointed if t.status != "completed"]
             if tasks:
                 print(f"Resuming analysis with {len(tasks)} remaining tasks")
+                finished_tasks = [t for t in checkpointed if t.status == "completed"]
+                for task in tasks:
+                    # A failed task gets a fresh set of attempts
+                    if task.status == "failed":
+                        task.retry_count = 0
         
         # Get fresh tasks if no resumable ones found
         if not tasks:
             tasks = self.get_agent_tasks(focus, depth)
             print(f"Starting analysis with {len(tasks)} agents for {focus.value} focus")
+            await self.checkpoint_log.reset()
+            await self.save_checkpoint(tasks)
         
-        # Process tasks in batches
-        all_results = []
-        total_batches = (len(tasks) + self.batch_size - 1) // self.batch_size
+        print(f"🔄 Processing {len(tasks)} agents with up to {self.batch_size} concurrent per agent type")
+        for j, task in enumerate(tasks):
+            print(f"  [{j+1}/{len(tasks)}] {task.agent_name} ({task.focus_area})")
         
-        for i in range(0, len(tasks), self.batch_size):
-            batch = tasks[i:i + self.batch_size]
-            batch_num = i // self.batch_size + 1
-            
-            print(f"🔄 Processing batch {batch_num}/{total_batches} - {len(batch)} agents")
-            
-            # Show progress for each agent in batch
-            for j, task in enumerate(batch):
-                print(f"  [{j+1}/{len(batch)}] {task.agent_name} ({task.focus_area})")
-            
-            batch_results = await self.execute_batch(batch)
-            all_results.extend(batch_results)
-            
-            # Show batch completion
-            completed_count = sum(1 for r in batch_results if r.status == "completed")
-            failed_count = sum(1 for r in batch_results if r.status == "failed")
-            print(f"✅ Batch {batch_num} complete: {completed_count} successful, {failed_count} failed")
-            
-            # Small delay between batches
-            if i + self.batch_size < len(tasks):
-                print(f"⏳ Waiting 2s before next batch...")
-                await asyncio.sleep(2)
+        results = await self.execute_batch(tasks)
+        
+        completed_count = sum(1 for r in results if r.status == "completed")
+        failed_count = sum(1 for r in results if r.status == "failed")
+        print(f"✅ Analysis complete: {completed_count} successful, {failed_count} failed")
         
         # Synthesize results
-        return self.synthesize_results(all_results, target, focus)
+        return self.synthesize_results(finished_tasks + results, target, focus)
     
     def synthesize_results(self, tasks: List[AnalysisTask], target: str, 
                           focus: AnalysisFocus) -> Dict[str, Any]:
@@ -0,0 +1,316 @@
+"""
+Bulk Ingest Pipeline
+Async batched upserts with adaptive batch sizing, retries and a local spill file
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import shutil
+import time
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class BulkIngestPipeline:
+    """
+    Bounded-queue ingest pipeline for idempotent batch upserts
+
+    Records are grouped into batches whose size adapts to observed latency
+    and payload size, several batches are kept in flight, failed batches
+    are retried with backoff and, once retries are exhausted or the backend
+    is marked unavailable, written to a JSONL spill file for later replay.
+    Every record must carry a stable key field so retries and replays
+    upsert rather than duplicate.
+    """
+
+    def __init__(self,
+                 upsert_batch: Callable[[List[Dict[str, Any]]], Awaitable[Any]],
+                 spill_path: str,
+                 key_field: str = "id",
+                 queue_size: int = 10000,
+                 initial_batch_size: int = 50,
+                 min_batch_size: int = 10,
+                 max_batch_size: int = 1000,
+                 max_batch_bytes: int = 1_000_000,
+                 target_latency_ms: float = 500.0,
+                 max_in_flight: int = 4,
+                 max_retries: int = 3,
+                 retry_base_delay: float = 0.2,
+                 failure_threshold: int = 3,
+                 cooldown_seconds: float = 30.0):
+        """
+        Args:
+            upsert_batch: Coroutine function upserting one batch on key_field
+            spill_path: JSONL file holding records the backend did not accept
+            key_field: Idempotency key present in every record
+            queue_size: Maximum queued records before put() applies backpressure
+            initial_batch_size: Starting batch size
+            min_batch_size: Smallest batch size after shrinking
+            max_batch_size: Largest batch size after growing
+            max_batch_bytes: Serialized payload cap per batch
+            target_latency_ms: Batch latency the size controller aims for
+            max_in_flight: Batches sent concurrently
+            max_retries: Retries per batch before spilling
+            retry_base_delay: First retry delay in seconds, doubled per retry
+            failure_threshold: Consecutive failed batches that mark the backend down
+            cooldown_seconds: Time the backend stays down before sends resume
+        """
+        self.upsert_batch = upsert_batch
+        self.spill_path = Path(spill_path)
+        self.key_field = key_field
+        self.queue_size = queue_size
+        self.batch_size = initial_batch_size
+        self.min_batch_size = min_batch_size
+        self.max_batch_size = max_batch_size
+        self.max_batch_bytes = max_batch_bytes
+        self.target_latency_ms = target_latency_ms
+        self.max_in_flight = max_in_flight
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._in_flight: Optional[asyncio.Semaphore] = None
+        self._dispatcher: Optional[asyncio.Task] = None
+        self._senders = set()
+        self._avg_record_bytes = 0.0
+        self._consecutive_failures = 0
+        self._down_until = 0.0
+
+        self.stats = {
+            "queued": 0,
+            "sent": 0,
+            "batches": 0,
+            "retries": 0,
+            "spilled": 0,
+            "replayed": 0,
+            "quarantined": 0,
+            "failed_batches": 0,
+            "total_latency_ms": 0.0
+        }
+
+    async def start(self, replay_spill: bool = True):
+        """Start the dispatcher, first re-queueing any spilled records"""
+        if self._dispatcher is not None:
+            return
+
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        self._in_flight = asyncio.Semaphore(self.max_in_flight)
+        self._dispatcher = asyncio.create_task(self._dispatch())
+
+        if replay_spill:
+            await self.replay_spill()
+
+    async def put(self, record: Dict[str, Any]):
+        """Queue one record, waiting while the queue is full"""
+        if self._dispatcher is None:
+            await self.start()
+        if self.key_field not in record:
+            raise ValueError(f"Record is missing idempotency key '{self.key_field}'")
+        await self._queue.put(record)
+        self.stats["queued"] += 1
+
+    async def put_many(self, records: Iterable[Dict[str, Any]]):
+        """Queue many records"""
+        for record in records:
+            await self.put(record)
+
+    async def flush(self):
+        """Wait until every queued record has been sent or spilled"""
+        if self._dispatcher is None:
+            return
+        await self._queue.join()
+        while self._senders:
+            await asyncio.gather(*list(self._senders))
+
+    async def close(self):
+        """Flush and stop the dispatcher"""
+        if self._dispatcher is None:
+            return
+        await self.flush()
+        self._dispatcher.cancel()
+        try:
+            await self._dispatcher
+        except asyncio.CancelledError:
+            pass
+        self._dispatcher = None
+
+    async def replay_spill(self) -> int:
+        """
+        Re-queue records from the spill file; returns the number replayed
+
+        Lines that are not JSON records with a key field, such as a line torn
+        by a crash mid-spill, are moved to a .corrupt file instead of
+        stopping the replay.
+        """
+        replaying = self.spill_path.with_suffix(self.spill_path.suffix + ".replay")
+        if not self.spill_path.exists() and not replaying.exists():
+            return 0
+        if self._dispatcher is None:
+            await self.start(replay_spill=False)
+
+        # Move the file aside so records spilled again during replay are kept
+        if replaying.exists():
+            # An earlier replay was interrupted; its records are older than
+            # the spill's, so the spill goes after them
+            if self.spill_path.exists():
+                with open(replaying, "ab+") as out, open(self.spill_path, "rb") as spill:
+                    if out.tell():
+                        out.seek(-1, os.SEEK_END)
+                        if out.read(1) != b"\n":
+                            out.write(b"\n")
+                    shutil.copyfileobj(spill, out)
+                self.spill_path.unlink()
+        else:
+            os.replace(self.spill_path, replaying)
+
+        records, corrupt = [], []
+        with open(replaying, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    record = None
+                if isinstance(record, dict) and self.key_field in record:
+                    records.append(record)
+                else:
+                    corrupt.append(line)
+
+        if corrupt:
+            self._quarantine(corrupt)
+
+        # Later spills of the same key supersede earlier ones
+        latest = {record[self.key_field]: record for record in records}
+        replaying.unlink()
+
+        for record in latest.values():
+            await self._queue.put(record)
+        self.stats["replayed"] += len(latest)
+        return len(latest)
+
+    async def _dispatch(self):
+        """Form batches from the queue and send them with bounded concurrency"""
+        carry = None
+        while True:
+            # Wait for a free slot first, so the queue keeps filling meanwhile
+            await self._in_flight.acquire()
+
+            record = carry if carry is not None else await self._queue.get()
+            carry = None
+            batch = [record]
+            batch_bytes = self._record_bytes(record)
+            limit = self._current_limit()
+
+            # Drain what is already queued, up to the size and byte limits
+            while len(batch) < limit and not self._queue.empty():
+                record = self._queue.get_nowait()
+                record_bytes = self._record_bytes(record)
+                if batch_bytes + record_bytes > self.max_batch_bytes:
+                    carry = record
+                    break
+                batch.append(record)
+                batch_bytes += record_bytes
+
+            task = asyncio.create_task(self._send(batch))
+            self._senders.add(task)
+            task.add_done_callback(self._senders.discard)
+
+    async def _send(self, batch: List[Dict[str, Any]]):
+        try:
+            if time.monotonic() < self._down_until:
+                self._spill(batch)
+                return
+
+            for attempt in range(self.max_retries + 1):
+                start_time = time.perf_counter()
+                try:
+                    await self.upsert_batch(batch)
+                except Exception as e:
+                    if attempt == self.max_retries:
+                        logger.warning(f"Batch of {len(batch)} failed after {attempt + 1} attempts: {e}")
+                        self._record_failure(batch)
+                        return
+                    self.stats["retries"] += 1
+                    # Exponential backoff with full jitter
+                    await asyncio.sleep(random.uniform(0, self.retry_base_delay * 2 ** attempt))
+                    continue
+
+                self._record_success(batch, (time.perf_counter() - start_time) * 1000)
+                return
+        finally:
+            for _ in batch:
+                self._queue.task_done()
+            self._in_flight.release()
+
+    def _record_success(self, batch: List[Dict[str, Any]], latency_ms: float):
+        self._consecutive_failures = 0
+        self.stats["sent"] += len(batch)
+        self.stats["batches"] += 1
+        self.stats["total_latency_ms"] += latency_ms
+
+        # Only full batches say anything about how large batches can grow
+        if len(batch) >= self.batch_size:
+            if latency_ms < self.target_latency_ms / 2:
+                self.batch_size = min(self.max_batch_size, int(self.batch_size * 2))
+            elif latency_ms < self.target_latency_ms:
+                self.batch_size = min(self.max_batch_size, self.batch_size + self.min_batch_size)
+        if latency_ms > self.target_latency_ms:
+            self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+
+    def _record_failure(self, batch: List[Dict[str, Any]]):
+        self.stats["failed_batches"] += 1
+        self._consecutive_failures += 1
+        self.batch_size = max(self.min_batch_size, self.batch_size // 2)
+        if self._consecutive_failures >= self.failure_threshold:
+            logger.warning(f"Backend unavailable; spilling for {self.cooldown_seconds:.0f}s")
+            self._down_until = time.monotonic() + self.cooldown_seconds
+        self._spill(batch)
+
+    def _quarantine(self, lines: List[str]):
+        corrupt_path = self.spill_path.with_suffix(self.spill_path.suffix + ".corrupt")
+        with open(corrupt_path, "a", encoding="utf-8") as f:
+            for line in lines:
+                f.write(line + "\n")
+        self.stats["quarantined"] += len(lines)
+        logger.warning(f"Moved {len(lines)} unreadable spill lines to {corrupt_path}")
+
+    def _spill(self, batch: List[Dict[str, Any]]):
+        self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.spill_path, "a", encoding="utf-8") as f:
+            for record in batch:
+                f.write(json.dumps(record, default=str) + "\n")
+        self.stats["spilled"] += len(batch)
+
+    def _record_bytes(self, record: Dict[str, Any]) -> int:
+        size = len(json.dumps(record, default=str))
+        # Running average feeds the byte-based cap on batch size
+        self._avg_record_bytes = size if not self._avg_record_bytes else 0.9 * self._avg_record_bytes + 0.1 * size
+        return size
+
+    def _current_limit(self) -> int:
+        if not self._avg_record_bytes:
+            return self.batch_size
+        by_bytes = int(self.max_batch_bytes // self._avg_record_bytes)
+        return max(1, min(self.batch_size, by_bytes))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Throughput, batching and spill metrics"""
+        batches = self.stats["batches"]
+        return {
+            **self.stats,
+            "batch_size": self.batch_size,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "in_flight": len(self._senders),
+            "average_batch_latency_ms": self.stats["total_latency_ms"] / batches if batches else 0.0,
+            "backend_available": time.monotonic() >= self._down_until,
+            "spill_file": str(self.spill_path)
+        }
@@ -5,6 +5,7 @@ Semantic matching system using embeddings to recommend examples and identify gap
 """
 
 import json
+import logging
 import os
 import sys
 import re
@@ -30,12 +31,21 @@ except ImportError:
         def __init__(self):
             pass
 
+try:
+    from brain.modules.example_embedding_index import ExampleEmbeddingIndex
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from example_embedding_index import ExampleEmbeddingIndex
+
+logger = logging.getLogger(__name__)
+
 class ExampleRecommendationEngine:
     def __init__(self):
         self.aai_root = Path("/mnt/c/Users/Brandon/AAI")
         self.examples_dir = self.aai_root / "examples"
         self.working_dir = self.examples_dir / "working"
         self.metadata_file = self.examples_dir / "metadata.json"
+        self.embedding_index_file = self.examples_dir / "embeddings.npz"
         self.prp_dir = self.aai_root / "PRPs"
         self.queue_file = self.aai_root / "brain/logs/queue.json"
         
@@ -47,19 +57,58 @@ class ExampleRecommendationEngine:
             print("Using placeholder embedding system")
             self.embedding_generator = EmbeddingGenerator()
             self.router_client = None
+        
+        # Example embeddings, synced whenever the metadata file changes;
+        # _metadata_mtime is only set once the index matches that metadata
+        self.embedding_index = ExampleEmbeddingIndex(
+            self.embedding_index_file, self.embedding_generator.generate_embeddings
+        )
+        self._metadata = None
+        self._metadata_mtime = None
     
     def load_examples_metadata(self):
-        """Load examples metadata"""
+        """Load examples metadata, re-reading the file only when it changed"""
         if not self.metadata_file.exists():
             return {"examples": {}, "index": {}}
         
-        with open(self.metadata_file, 'r') as f:
-            return json.load(f)
+        mtime = self.metadata_file.stat().st_mtime_ns
+        if self._metadata is None or mtime != self._metadata_mtime:
+            with open(self.metadata_file, 'r') as f:
+                self._metadata = json.load(f)
+            # A failed sync leaves the mtime unset so the next load retries it
+            self._metadata_mtime = mtime if self._sync_embedding_index(self._metadata) else None
+        return self._metadata
     
     def save_examples_metadata(self, metadata):
         """Save examples metadata"""
         with open(self.metadata_file, 'w') as f:
             json.dump(metadata, f, indent=2)
+        self._metadata = metadata
+        mtime = self.metadata_file.stat().st_mtime_ns
+        self._metadata_mtime = mtime if self._sync_embedding_index(metadata) else None
+    
+    def add_example(self, example_id, example_data):
+        """Add or update one example, embedding only that example"""
+        metadata = self.load_examples_metadata()
+        metadata.setdefault('examples', {})[example_id] = example_data
+        self.save_examples_metadata(metadata)
+    
+    @staticmethod
+    def example_text(example_data):
+        """Text an example is embedded and matched by"""
+        return f"{example_data.get('description', '')} {' '.join(example_data.get('tags', []))}"
+    
+    def _sync_embedding_index(self, metadata):
+        """Bring the embedding index in line with metadata; returns whether it succeeded"""
+        try:
+            self.embedding_index.sync({
+                example_id: self.example_text(example_data)
+                for example_id, example_data in metadata.get('examples', {}).items()
+            })
+        except Exception as e:
+            logger.warning(f"Embedding index sync failed: {e}")
+            return False
+        return True
     
     def extract_example_content(self, example_path):
         """Extract content from example file"""
@@ -155,40 +204,53 @@ class ExampleRecommendationEngine:
             return dot_product / (magnitude1 * magnitude2)
         except:
             # Fallback to simple text similarity
-            words1 = set(text1.lower().split())
-            words2 = set(text2.lower().split())
-            intersection = words1.intersection(words2)
-            union = words1.union(words2)
-            return len(intersection) / len(union) if union else 0.0
+            return self._text_similarity(text1, text2)
     
-    def find_similar_examples(self, requirements, threshold=0.7):
+    @staticmethod
+    def _text_similarity(text1, text2):
+        """Word-overlap similarity used when embeddings are unavailable"""
+        words1 = set(text1.lower().split())
+        words2 = set(text2.lower().split())
+        intersection = words1.intersection(words2)
+        union = words1.union(words2)
+        return len(intersection) / len(union) if union else 0.0
+    
+    def find_similar_examples(self, requirements, threshold=0.7, limit=None):
         """Find examples similar to requirements"""
         metadata = self.load_examples_metadata()
         examples = metadata.get('examples', {})
         
-        similar_examples = []
-        
-        for example_id, example_data in examples.items():
-            # Create comparison text from example
-            example_text = f"{example_data.get('description', '')} {' '.join(example_data.get('tags', []))}"
-            
-            # Create requirements text
-            req_text = f"{' '.join(requirements.get('technologies', []))} {' '.join(requirements.get('apis', []))}"
-            
-            # Calculate similarity
-            similarity = self.calculate_similarity(example_text, req_text)
-            
-            if similarity >= threshold:
-                similar_examples.append({
-                    'id': example_id,
-                    'similarity': similarity,
-                    'data': example_data
-                })
+        # Create requirements text
+        req_text = f"{' '.join(requirements.get('technologies', []))} {' '.join(requirements.get('apis', []))}"
         
-        # Sort by similarity
-        similar_examples.sort(key=lambda x: x['similarity'], reverse=True)
+        ranked = None
+        # Only trust the index once it was synced with this metadata
+        if self._metadata_mtime is not None and len(self.embedding_index) == len(examples):
+            try:
+                # One query embedding, ranked against every example at once
+                ranked = self.embedding_index.query(req_text, threshold=threshold, limit=limit)
+            except Exception as e:
+                logger.warning(f"Embedding query failed, using word overlap: {e}")
         
-        return similar_examples
+        if ranked is None:
+            # Fallback to simple text similarity
+            ranked = []
+            for example_id, example_data in examples.items():
+                similarity = self._text_similarity(self.example_text(example_data), req_text)
+                if similarity >= threshold:
+                    ranked.append((example_id, similarity))
+            ranked.sort(key=lambda x: x[1], reverse=True)
+            ranked = ranked[:limit] if limit is not None else ranked
+        
+        return [
+            {
+                'id': example_id,
+                'similarity': similarity,
+                'data': examples[example_id]
+            }
+            for example_id, similarity in ranked
+            if example_id in examples
+        ]
     
     def identify_gaps(self, requirements, existing_examples):
         """Identify gaps in example coverage"""
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Example Embedding Index
+Persisted NumPy matrix of example embeddings keyed by content hash
+"""
+
+import hashlib
+import logging
+import os
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class ExampleEmbeddingIndex:
+    """
+    Unit-normalized example embeddings in one matrix, ranked by a single
+    matrix-vector product.
+
+    Rows are keyed by a hash of the embedded text, so an example is only
+    re-embedded when its text changes, and examples sharing a text share
+    one embedding call. The matrix is saved as a .npz file next to the
+    examples metadata.
+    """
+
+    def __init__(self, index_path, embed: Callable[[str], Sequence[float]]):
+        """
+        Args:
+            index_path: .npz file holding ids, hashes and vectors
+            embed: Function returning the embedding of a text
+        """
+        self.index_path = Path(index_path)
+        self.embed = embed
+
+        self.ids: List[str] = []
+        self.hashes: List[str] = []
+        self._positions: Dict[str, int] = {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+
+        self.stats = {"embedded": 0, "reused": 0, "queries": 0}
+        self._load()
+
+    @staticmethod
+    def content_hash(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    @property
+    def vectors(self) -> np.ndarray:
+        return self._matrix[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _load(self):
+        if not self.index_path.exists():
+            return
+        try:
+            with np.load(self.index_path, allow_pickle=False) as data:
+                ids = [str(i) for i in data["ids"]]
+                hashes = [str(h) for h in data["hashes"]]
+                vectors = data["vectors"].astype(np.float32)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable embedding index {self.index_path}: {e}")
+            return
+
+        self.ids, self.hashes = ids, hashes
+        self._positions = {example_id: i for i, example_id in enumerate(ids)}
+        self._matrix = vectors
+        self._size = len(ids)
+
+    def save(self):
+        """Write the index atomically"""
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.index_path.with_name(self.index_path.name + ".tmp.npz")
+        np.savez(
+            tmp_path,
+            ids=np.array(self.ids, dtype=str),
+            hashes=np.array(self.hashes, dtype=str),
+            vectors=self.vectors
+        )
+        os.replace(tmp_path, self.index_path)
+
+    def _normalize(self, vector: Sequence[float]) -> np.ndarray:
+        vector = np.asarray(vector, dtype=np.float32).ravel()
+        norm = np.linalg.norm(vector)
+        # Zero vectors stay zero and score 0 against everything
+        return vector / norm if norm else vector
+
+    def _append(self, example_id: str, content_hash: str, vector: np.ndarray):
+        if self._size and vector.shape[0] != self._matrix.shape[1]:
+            raise ValueError(
+                f"Embedding dimension changed from {self._matrix.shape[1]} to {vector.shape[0]}"
+            )
+        if self._size == self._matrix.shape[0]:
+            # Grow geometrically so repeated adds stay amortized O(1)
+            grown = np.zeros((max(16, self._size * 2), vector.shape[0]), dtype=np.float32)
+            if self._size:
+                grown[:self._size] = self.vectors
+            self._matrix = grown
+
+        self._matrix[self._size] = vector
+        self._positions[example_id] = self._size
+        self.ids.append(example_id)
+        self.hashes.append(content_hash)
+        self._size += 1
+
+    def add(self, example_id: str, text: str) -> bool:
+        """Add or update one example and save; returns whether anything changed"""
+        changed = self._add(example_id, text, self._vectors_by_hash())
+        if changed:
+            self.save()
+        return changed
+
+    def sync(self, texts: Dict[str, str]) -> bool:
+        """
+        Bring the index in line with the given example texts, embedding only
+        new or changed ones, and save it if anything changed.
+        """
+        stale = [position for example_id, position in self._positions.items() if example_id not in texts]
+        known = self._vectors_by_hash()
+        if stale:
+            self._remove_positions(stale)
+
+        changed = bool(stale)
+        try:
+            for example_id, text in texts.items():
+                changed |= self._add(example_id, text, known)
+        except ValueError:
+            # The embedding model changed; rebuild from scratch
+            self.clear()
+            known = {}
+            for example_id, text in texts.items():
+                self._add(example_id, text, known)
+            changed = True
+
+        if changed:
+            self.save()
+        return changed
+
+    def _add(self, example_id: str, text: str, known: Dict[str, np.ndarray]) -> bool:
+        content_hash = self.content_hash(text)
+        position = self._positions.get(example_id)
+        if position is not None and self.hashes[position] == content_hash:
+            return False
+
+        if content_hash in known:
+            vector = known[content_hash]
+            self.stats["reused"] += 1
+        else:
+            vector = self._normalize(self.embed(text))
+            known[content_hash] = vector
+            self.stats["embedded"] += 1
+
+        if position is not None:
+            self._remove_positions([position])
+        self._append(example_id, content_hash, vector)
+        return True
+
+    def clear(self):
+        self.ids, self.hashes, self._positions = [], [], {}
+        self._matrix = np.zeros((0, 0), dtype=np.float32)
+        self._size = 0
+
+    def _vectors_by_hash(self) -> Dict[str, np.ndarray]:
+        return {content_hash: self._matrix[i] for i, content_hash in enumerate(self.hashes)}
+
+    def _remove_positions(self, positions: List[int]):
+        keep = np.ones(self._size, dtype=bool)
+        keep[positions] = False
+        self._matrix = self.vectors[keep]
+        self.ids = [example_id for example_id, k in zip(self.ids, keep) if k]
+        self.hashes = [content_hash for content_hash, k in zip(self.hashes, keep) if k]
+        self._positions = {example_id: i for i, example_id in enumerate(self.ids)}
+        self._size = len(self.ids)
+
+    def query(self,
+              text: str,
+              threshold: Optional[float] = None,
+              limit: Optional[int] = None) -> List[Tuple[str, float]]:
+        """
+        Rank examples by cosine similarity to text.
+
+        Args:
+            text: Query text, embedded once
+            threshold: Minimum similarity to include
+            limit: Maximum results; selected with argpartition before sorting
+
+        Returns:
+            (example id, similarity) pairs, most similar first
+        """
+        self.stats["queries"] += 1
+        if not self._size or (limit is not None and limit <= 0):
+            return []
+
+        scores = self.vectors @ self._normalize(self.embed(text))
+        candidates = np.arange(self._size) if threshold is None else np.flatnonzero(scores >= threshold)
+
+        if limit is not None and limit < len(candidates):
+            top = np.argpartition(-scores[candidates], limit - 1)[:limit]
+            candidates = candidates[top]
+        # Stable sort keeps index order among equal scores
+        order = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(self.ids[i], float(scores[i])) for i in order]
+
+    def get_stats(self) -> Dict[str, int]:
+        return {**self.stats, "examples": self._size, "dimensions": int(self._matrix.shape[1]) if self._size else 0}
@@ -0,0 +1,156 @@
+"""
+Append-only cost ledger for OpenRouter usage
+Each call appends one JSONL line; daily totals are maintained incrementally
+"""
+
+import json
+import os
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+try:
+    import fcntl
+except ImportError:  # Windows: no advisory locks, single writer only
+    fcntl = None
+
+
+class CostLedger:
+    """
+    Append-only JSONL ledger with incremental daily aggregates.
+
+    Daily totals live in a small sidecar file that also records how far into
+    the ledger they are up to date, so startup only replays entries appended
+    after the last aggregate save.
+
+    Several clients (and processes) share the same ledger, so writes go through
+    O_APPEND under an exclusive file lock and the ledger is never truncated.
+    Before each write or read of the totals, entries appended by other writers
+    since our offset are folded in.
+    """
+
+    def __init__(self, ledger_path: str = "brain/logs/openrouter_costs.jsonl", aggregate_every: int = 100):
+        self.ledger_path = Path(ledger_path)
+        self.aggregates_path = self.ledger_path.with_suffix(".daily.json")
+        self.aggregate_every = aggregate_every
+
+        self.daily: Dict[str, Dict[str, float]] = {}
+        self.skipped_lines = 0
+        self._offset = 0
+        self._unsaved = 0
+        self._file = None
+
+        self.ledger_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @contextmanager
+    def _locked(self, exclusive: bool):
+        """Hold the ledger lock; yields the (append-mode) ledger file"""
+        if self._file is None:
+            self._file = open(self.ledger_path, "a+b")
+        if fcntl is not None:
+            fcntl.flock(self._file.fileno(), fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+        try:
+            yield self._file
+        finally:
+            if fcntl is not None:
+                fcntl.flock(self._file.fileno(), fcntl.LOCK_UN)
+
+    def _load(self):
+        """Load saved aggregates and replay ledger entries appended since"""
+        if self.aggregates_path.exists():
+            try:
+                with open(self.aggregates_path) as f:
+                    saved = json.load(f)
+                self.daily = saved.get("days", {})
+                self._offset = saved.get("offset", 0)
+            except (json.JSONDecodeError, OSError) as e:
+                print(f"Cost aggregates unreadable, rebuilding from ledger: {e}")
+                self.daily, self._offset = {}, 0
+
+        with self._locked(exclusive=False) as f:
+            if self._offset > os.fstat(f.fileno()).st_size:
+                # Ledger was replaced; rebuild from scratch
+                self.daily, self._offset = {}, 0
+            self._catch_up(f)
+
+    def _catch_up(self, f) -> bool:
+        """
+        Aggregate complete lines past our offset, whoever wrote them.
+
+        Returns True if the ledger ends in a torn line. Callers hold the lock,
+        so no writer is mid-line: a torn tail is left behind by a crash.
+        """
+        f.seek(self._offset)
+        for line in f:
+            if not line.endswith(b"\n"):
+                return True
+            self._offset += len(line)
+            try:
+                entry = json.loads(line)
+                self._aggregate(entry)
+            except (json.JSONDecodeError, KeyError, TypeError, AttributeError):
+                self.skipped_lines += 1
+                continue
+            self._unsaved += 1
+        return False
+
+    def _aggregate(self, entry: Dict[str, Any]):
+        day = self.daily.setdefault(entry["date"], {"cost": 0.0, "tokens": 0, "requests": 0})
+        day["cost"] += entry.get("cost", 0.0)
+        day["tokens"] += entry.get("tokens", 0)
+        day["requests"] += 1
+
+    def record(self, model: str, tokens: int, cost: float):
+        """Append one usage entry and update today's totals"""
+        now = datetime.utcnow()
+        entry = {
+            "date": now.date().isoformat(),
+            "timestamp": now.isoformat(),
+            "model": model,
+            "tokens": tokens,
+            "cost": cost
+        }
+        line = (json.dumps(entry) + "\n").encode("utf-8")
+
+        with self._locked(exclusive=True) as f:
+            if self._catch_up(f):
+                # Terminate the torn line so it is skipped as corrupt, never cut off
+                line = b"\n" + line
+                self.skipped_lines += 1
+            f.write(line)
+            f.flush()
+            self._offset = f.tell()
+
+        self._aggregate(entry)
+        self._unsaved += 1
+        if self._unsaved >= self.aggregate_every:
+            self.save_aggregates()
+
+    def save_aggregates(self):
+        """Persist daily totals atomically"""
+        with self._locked(exclusive=True) as f:
+            # Totals and offset must describe the same prefix of the ledger
+            self._catch_up(f)
+            if not self._unsaved:
+                return
+            tmp_path = self.aggregates_path.with_suffix(".tmp")
+            with open(tmp_path, "w") as out:
+                json.dump({"offset": self._offset, "days": self.daily}, out)
+            os.replace(tmp_path, self.aggregates_path)
+        self._unsaved = 0
+
+    def daily_totals(self, date: Optional[str] = None) -> Dict[str, float]:
+        """Totals for a day (default: today, UTC), including other writers' entries"""
+        with self._locked(exclusive=False) as f:
+            self._catch_up(f)
+        date = date or datetime.utcnow().date().isoformat()
+        return dict(self.daily.get(date, {"cost": 0.0, "tokens": 0, "requests": 0}))
+
+    def close(self):
+        if self._file is None:
+            return
+        self.save_aggregates()
+        self._file.close()
+        self._file = None
@@ -3,14 +3,15 @@ OpenRouter API Client with rate limiting, retry logic, and cost tracking
 """
 
 import os
-import time
 import json
 import asyncio
 from datetime import datetime
 from typing import List, Dict, Any, Optional
-import aiohttp
 from dotenv import load_dotenv
 
+from .transport import RateLimiter, get_transport
+from .cost_ledger import CostLedger
+
 load_dotenv()
 
 class OpenRouterClient:
@@ -18,19 +19,23 @@ class OpenRouterClient:
     Intelligent OpenRouter API client with built-in protections
     """
     
-    def __init__(self):
-        self.api_key = os.getenv("OPENROUTER_API_KEY")
-        self.base_url = "https://openrouter.ai/api/v1"
+    def __init__(self,
+                 api_key: Optional[str] = None,
+                 base_url: Optional[str] = None,
+                 cost_ledger_path: str = "brain/logs/openrouter_costs.jsonl"):
+        self.api_key = api_key or os.getenv("OPENROUTER_API_KEY")
+        self.base_url = base_url or os.getenv("OPENROUTER_BASE_URL", "https://openrouter.ai/api/v1")
         
         if not self.api_key:
             raise ValueError("OPENROUTER_API_KEY must be set in .env")
         
-        # Rate limiting
+        # Rate limiting (monotonic token buckets)
         self.requests_per_minute = 60
-        self.request_timestamps = []
+        self.tokens_per_minute = 200000
+        self.rate_limiter = RateLimiter(self.requests_per_minute, self.tokens_per_minute)
         
-        # Cost tracking
-        self.cost_log = []
+        # Cost tracking (append-only ledger with daily aggregates)
+        self.cost_ledger = CostLedger(cost_ledger_path)
         self.daily_cost_limit = 5.00  # $5 daily limit
         
         # Retry settings
@@ -43,95 +48,61 @@ class OpenRouterClient:
             "HTTP-Referer": "https://aai-system.local",
             "X-Title": "AAI Brain Intelligence System"
         }
-    
-    def _check_rate_limit(self) -> bool:
-        """Check if we're within rate limits"""
-        now = time.time()
-        # Remove timestamps older than 1 minute
-        self.request_timestamps = [ts for ts in self.request_timestamps if now - ts < 60]
         
-        if len(self.request_timestamps) >= self.requests_per_minute:
-            return False
-        
-        self.request_timestamps.append(now)
-        return True
+        # Connection-pooled session shared with other clients using the same key
+        self.transport = get_transport(self.base_url, self.headers)
     
     def _check_daily_cost(self) -> bool:
         """Check if we're within daily cost limits"""
-        today = datetime.utcnow().date()
-        today_costs = [cost for cost in self.cost_log if cost['date'] == today]
-        total_cost = sum(cost['amount'] for cost in today_costs)
-        
-        return total_cost < self.daily_cost_limit
+        return self.cost_ledger.daily_totals()["cost"] < self.daily_cost_limit
     
     def _log_cost(self, model: str, tokens: int, cost: float):
         """Log API usage cost"""
-        self.cost_log.append({
-            "date": datetime.utcnow().date(),
-            "timestamp": datetime.utcnow().isoformat(),
-            "model": model,
-            "tokens": tokens,
-            "cost": cost
-        })
-        
-        # Save to file for persistence (async version will be used when called from async context)
-        cost_file = "brain/logs/openrouter_costs.json"
         try:
-            # Use asyncio.to_thread for non-blocking file I/O when called from async context
-            import asyncio
-            if asyncio.current_task():
-                # We're in an async context, use thread pool
-                def _sync_write():
-                    with open(cost_file, 'w') as f:
-                        json.dump(self.cost_log, f, indent=2, default=str)
-                asyncio.create_task(asyncio.to_thread(_sync_write))
-            else:
-                # Synchronous context, use direct file I/O
-                with open(cost_file, 'w') as f:
-                    json.dump(self.cost_log, f, indent=2, default=str)
+            self.cost_ledger.record(model, tokens, cost)
         except Exception as e:
             print(f"Cost logging error: {e}")
     
+    @staticmethod
+    def _estimate_tokens(data: Dict[Any, Any]) -> int:
+        """Rough token estimate for the token-rate limiter (~4 characters per token)"""
+        text_length = len(json.dumps(data.get("messages") or data.get("input") or ""))
+        return text_length // 4 + data.get("max_tokens", 0)
+    
     async def _make_request(self, endpoint: str, data: Dict[Any, Any]) -> Optional[Dict]:
         """Make API request with rate limiting and retry logic"""
         
-        # Check rate limits
-        if not self._check_rate_limit():
-            await asyncio.sleep(60)  # Wait for rate limit reset
-            if not self._check_rate_limit():
-                raise Exception("Rate limit exceeded")
-        
         # Check cost limits
         if not self._check_daily_cost():
             raise Exception("Daily cost limit reached")
         
-        url = f"{self.base_url}/{endpoint}"
+        # Wait for request and token budget
+        estimated_tokens = self._estimate_tokens(data)
+        await self.rate_limiter.acquire(estimated_tokens)
         
         for attempt in range(self.max_retries):
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.post(url, headers=self.headers, json=data) as response:
-                        if response.status == 200:
-                            result = await response.json()
-                            
-                            # Log usage and cost
-                            if 'usage' in result:
-                                usage = result['usage']
-                                tokens = usage.get('total_tokens', 0)
-                                # Rough cost estimation (update with actual pricing)
-                                estimated_cost = tokens * 0.00001  # $0.00001 per token estimate
-                                self._log_cost(data.get('model', 'unknown'), tokens, estimated_cost)
-                            
-                            return result
-                        elif response.status == 429:  # Rate limited
-                            wait_time = self.retry_delay * (2 ** attempt)
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            error_text = await response.text()
-                            print(f"API Error {response.status}: {error_text}")
-                            return None
-                            
+                status, result = await self.transport.post(endpoint, data)
+                
+                if status == 200:
+                    # Log usage and cost
+                    if 'usage' in result:
+                        usage = result['usage']
+                        tokens = usage.get('total_tokens', 0)
+                        self.rate_limiter.record_usage(tokens, estimated_tokens)
+                        # Rough cost estimation (update with actual pricing)
+                        estimated_cost = tokens * 0.00001  # $0.00001 per token estimate
+                        self._log_cost(data.get('model', 'unknown'), tokens, estimated_cost)
+                    
+                    return result
+                elif status == 429:  # Rate limited
+                    wait_time = self.retry_delay * (2 ** attempt)
+                    await asyncio.sleep(wait_time)
+                    continue
+                else:
+                    print(f"API Error {status}: {result}")
+                    return None
+                    
             except Exception as e:
                 if attempt == self.max_retries - 1:
                     print(f"Final attempt failed: {e}")
@@ -210,20 +181,21 @@ class OpenRouterClient:
     def get_daily_usage(self) -> Dict[str, Any]:
         """Get today's usage statistics"""
         today = datetime.utcnow().date()
-        today_costs = [cost for cost in self.cost_log if cost['date'] == today]
-        
-        total_cost = sum(cost['amount'] for cost in today_costs)
-        total_tokens = sum(cost['tokens'] for cost in today_costs)
-        request_count = len(today_costs)
+        totals = self.cost_ledger.daily_totals(today.isoformat())
         
         return {
             "date": today,
-            "total_cost": total_cost,
-            "total_tokens": total_tokens,
-            "request_count": request_count,
+            "total_cost": totals["cost"],
+            "total_tokens": totals["tokens"],
+            "request_count": totals["requests"],
             "cost_limit": self.daily_cost_limit,
-            "remaining_budget": self.daily_cost_limit - total_cost
+            "remaining_budget": self.daily_cost_limit - totals["cost"]
         }
+    
+    async def close(self):
+        """Flush cost aggregates and close the shared connection pool"""
+        self.cost_ledger.close()
+        await self.transport.close()
 
 # Singleton instance for brain system
 _client = None
@@ -0,0 +1,134 @@
+"""
+Shared HTTP transport and rate limiting for OpenRouter calls
+Long-lived pooled sessions plus monotonic token-bucket limits
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, Optional, Tuple
+import aiohttp
+
+
+class TokenBucket:
+    """
+    Token bucket refilled continuously from the monotonic clock
+    """
+
+    def __init__(self, rate_per_minute: float, capacity: Optional[float] = None):
+        self.capacity = float(capacity if capacity is not None else rate_per_minute)
+        self.refill_per_second = rate_per_minute / 60.0
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.refill_per_second)
+        self.updated_at = now
+
+    def wait_time(self, amount: float = 1.0) -> float:
+        """Seconds until `amount` tokens are available (0 if available now)"""
+        self._refill()
+        amount = min(amount, self.capacity)  # Oversized requests wait for a full bucket
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.refill_per_second
+
+    def consume(self, amount: float = 1.0):
+        """Take tokens; the balance may go negative to record debt"""
+        self._refill()
+        self.tokens -= amount
+
+
+class RateLimiter:
+    """
+    Combined requests/min and tokens/min limiter
+    """
+
+    def __init__(self, requests_per_minute: int = 60, tokens_per_minute: Optional[int] = None):
+        self.requests = TokenBucket(requests_per_minute)
+        self.tokens = TokenBucket(tokens_per_minute) if tokens_per_minute else None
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, estimated_tokens: int = 0):
+        """Wait until both a request slot and the estimated tokens are available"""
+        async with self._lock:
+            while True:
+                wait = self.requests.wait_time(1)
+                if self.tokens and estimated_tokens:
+                    wait = max(wait, self.tokens.wait_time(estimated_tokens))
+                if wait <= 0:
+                    break
+                await asyncio.sleep(wait)
+
+            self.requests.consume(1)
+            if self.tokens and estimated_tokens:
+                self.tokens.consume(estimated_tokens)
+
+    def record_usage(self, actual_tokens: int, estimated_tokens: int = 0):
+        """Correct the token bucket once the real usage is known"""
+        if self.tokens:
+            self.tokens.consume(actual_tokens - estimated_tokens)
+
+    def get_status(self) -> Dict[str, Any]:
+        """Current bucket levels"""
+        self.requests._refill()
+        status = {"requests_available": self.requests.tokens}
+        if self.tokens:
+            self.tokens._refill()
+            status["tokens_available"] = self.tokens.tokens
+        return status
+
+
+class OpenRouterTransport:
+    """
+    Connection-pooled HTTP transport shared by OpenRouter clients
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str], max_connections: int = 20, timeout_seconds: int = 60):
+        self.base_url = base_url.rstrip("/")
+        self.headers = headers
+        self.max_connections = max_connections
+        self.timeout = aiohttp.ClientTimeout(total=timeout_seconds)
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._session_loop: Optional[asyncio.AbstractEventLoop] = None
+        self.sessions_created = 0
+
+    async def _get_session(self) -> aiohttp.ClientSession:
+        """Get the pooled session, recreating it if closed or bound to another loop"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._session_loop is not loop:
+            connector = aiohttp.TCPConnector(limit=self.max_connections, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector, headers=self.headers, timeout=self.timeout
+            )
+            self._session_loop = loop
+            self.sessions_created += 1
+        return self._session
+
+    async def post(self, endpoint: str, data: Dict[Any, Any]) -> Tuple[int, Any]:
+        """
+        POST JSON to an endpoint
+
+        Returns (status, parsed JSON on 200 else response text)
+        """
+        session = await self._get_session()
+        async with session.post(f"{self.base_url}/{endpoint}", json=data) as response:
+            if response.status == 200:
+                return response.status, await response.json()
+            return response.status, await response.text()
+
+    async def close(self):
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+
+_transports: Dict[Tuple[str, str], OpenRouterTransport] = {}
+
+
+def get_transport(base_url: str, headers: Dict[str, str]) -> OpenRouterTransport:
+    """Get the shared transport for a base URL and credential"""
+    key = (base_url, headers.get("Authorization", ""))
+    if key not in _transports:
+        _transports[key] = OpenRouterTransport(base_url, headers)
+    return _transports[key]
@@ -98,7 +98,8 @@ class SmartToolSelectorModule(BrainModule if BRAIN_AVAILABLE else object):
             self.tool_selector = ToolSelector(
                 prompt_analyzer=self.prompt_analyzer,
                 fabric_integrator=self.fabric_integrator,
-                confidence_scorer=self.confidence_scorer
+                confidence_scorer=self.confidence_scorer,
+                learning_engine=self.learning_engine
             )
             
             # Discover Fabric patterns
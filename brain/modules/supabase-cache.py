@@ -1,18 +1,37 @@
 """
 Supabase Cache Integration Module
-Tag-based intelligent caching with batch updates
+Tag-based intelligent caching with batch updates and async bulk ingest
 """
 
 import os
+import sys
 import json
 import uuid
+import asyncio
 from datetime import datetime
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from supabase import create_client, Client
 from dotenv import load_dotenv
 
+# Async client is optional; uploads fall back to the sync client in a thread
+try:
+    from supabase import acreate_client, AsyncClient
+    ASYNC_CLIENT_AVAILABLE = True
+except ImportError:
+    acreate_client = None
+    AsyncClient = None
+    ASYNC_CLIENT_AVAILABLE = False
+
+try:
+    from brain.modules.bulk_ingest import BulkIngestPipeline
+except ImportError:
+    sys.path.append(os.path.dirname(__file__))
+    from bulk_ingest import BulkIngestPipeline
+
 load_dotenv()
 
+SPILL_FILE = "brain/cache/supabase_cache_spill.jsonl"
+
 class SupabaseCache:
     """
     Intelligent cache management with tag-based organization
@@ -30,6 +49,11 @@ class SupabaseCache:
         self._batch_queue = []
         self._batch_size = 10  # Process in batches of 10
         
+        # Async bulk ingest, created on first use
+        self._async_supabase: Optional[Any] = None
+        self._pipeline: Optional[BulkIngestPipeline] = None
+        self.spill_file = SPILL_FILE
+        
     def add_to_batch(self, key: str, value: Dict[Any, Any], tags: List[str]) -> str:
         """
         Add item to batch queue for later processing
@@ -64,8 +88,8 @@ class SupabaseCache:
             return {"status": "empty", "processed": 0}
         
         try:
-            # Batch insert to Supabase
-            result = self.supabase.table("cache_items").insert(self._batch_queue).execute()
+            # Batch upsert to Supabase; ids make retries and replays idempotent
+            result = self.supabase.table("cache_items").upsert(self._batch_queue, on_conflict="id").execute()
             
             processed_count = len(self._batch_queue)
             self._batch_queue.clear()
@@ -77,19 +101,91 @@ class SupabaseCache:
             }
             
         except Exception as e:
-            # Log error but don't lose data
-            error_backup = f"brain/cache/batch_error_{datetime.utcnow().strftime('%Y%m%d_%H%M%S')}.json"
-            with open(error_backup, 'w') as f:
-                json.dump(self._batch_queue, f, indent=2)
+            # Log error but don't lose data; the bulk pipeline replays the spill file
+            os.makedirs(os.path.dirname(self.spill_file), exist_ok=True)
+            with open(self.spill_file, 'a') as f:
+                for item in self._batch_queue:
+                    f.write(json.dumps(item, default=str) + "\n")
             
             self._batch_queue.clear()
             
             return {
                 "status": "error",
                 "error": str(e),
-                "backup_file": error_backup
+                "backup_file": self.spill_file
             }
     
+    async def _upsert_batch_async(self, batch: List[Dict[str, Any]]):
+        """Upsert one batch without blocking the event loop"""
+        if ASYNC_CLIENT_AVAILABLE:
+            if self._async_supabase is None:
+                self._async_supabase = await acreate_client(self.url, self.key)
+            await self._async_supabase.table("cache_items").upsert(batch, on_conflict="id").execute()
+        else:
+            await asyncio.to_thread(
+                lambda: self.supabase.table("cache_items").upsert(batch, on_conflict="id").execute()
+            )
+    
+    async def bulk_pipeline(self, **options) -> BulkIngestPipeline:
+        """
+        Get the async bulk ingest pipeline, starting it on first use
+        
+        Options are passed to BulkIngestPipeline (batch sizing, in-flight
+        batches, retries). Starting replays records left in the spill file.
+        """
+        if self._pipeline is None:
+            self._pipeline = BulkIngestPipeline(self._upsert_batch_async, self.spill_file, **options)
+            await self._pipeline.start()
+        return self._pipeline
+    
+    async def add_to_batch_async(self, key: str, value: Dict[Any, Any], tags: List[str]) -> str:
+        """
+        Queue item for async bulk upload
+        Returns UUID for tracking
+        """
+        item_id = str(uuid.uuid4())
+        timestamp = datetime.utcnow().isoformat()
+        
+        pipeline = await self.bulk_pipeline()
+        await pipeline.put({
+            "id": item_id,
+            "key": key,
+            "value": value,
+            "tags": tags,
+            "created_at": timestamp,
+            "updated_at": timestamp
+        })
+        
+        return item_id
+    
+    async def sync_records(self, records: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Bulk upload cache items and wait for them to land or spill
+        Items without an id get one, so re-syncing the same items upserts
+        """
+        pipeline = await self.bulk_pipeline()
+        
+        for record in records:
+            if "id" not in record:
+                record = {**record, "id": str(uuid.uuid4())}
+            await pipeline.put(record)
+        
+        await pipeline.flush()
+        return pipeline.get_stats()
+    
+    async def flush_async(self) -> Dict[str, Any]:
+        """Wait for queued async uploads and return pipeline metrics"""
+        if self._pipeline is None:
+            return {"status": "empty", "processed": 0}
+        await self._pipeline.flush()
+        return self._pipeline.get_stats()
+    
+    async def close_async(self):
+        """Flush and stop the async bulk pipeline"""
+        if self._pipeline is not None:
+            await self._pipeline.close()
+            self._pipeline = None
+    
     def query_by_tags(self, tags: List[str], match_all: bool = False) -> List[Dict]:
         """
         Query cache items by tags
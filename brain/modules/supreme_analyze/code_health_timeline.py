@@ -11,11 +11,19 @@ Part of the Supreme Analyze Creative Cortex (Stage 3 Innovation).
 import asyncio
 import json
 import logging
+import sys
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
-import statistics
+
+import numpy as np
+
+try:
+    from brain.modules.supreme_analyze.git_health_history import GitHealthHistory, health_from_counts, LARGE_FILE_BYTES
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from git_health_history import GitHealthHistory, health_from_counts, LARGE_FILE_BYTES
 
 logger = logging.getLogger(__name__)
 
@@ -77,6 +85,9 @@ class CodeHealthTimeline:
         self.historical_window_months = 12
         self.debt_threshold = 0.6  # Score below this indicates technical debt
         
+        # Per-commit health snapshots mined incrementally from git
+        self.git_history = GitHealthHistory(self.cache_dir / "health_history.db")
+        
         logger.info("Code Health Timeline initialized")
     
     async def analyze_timeline(self, 
@@ -196,46 +207,35 @@ class CodeHealthTimeline:
     
     async def _analyze_current_health(self, target_path: Path) -> HealthSnapshot:
         """Analyze current health when no quality metrics provided"""
-        # Basic file analysis for health snapshot
-        python_files = list(target_path.rglob("*.py"))
-        js_files = list(target_path.rglob("*.js"))
-        all_files = python_files + js_files
-        
-        if not all_files:
-            return HealthSnapshot(
-                timestamp=datetime.now(),
-                overall_score=0.5,
-                maintainability=0.5,
-                complexity=0.5,
-                test_coverage=0.0,
-                security=0.5,
-                debt_ratio=0.5,
-                files_analyzed=0,
-                critical_issues=0
+        # In a git repository only the files changed since HEAD are stat'ed
+        health = await asyncio.to_thread(self.git_history.current_health, target_path)
+        
+        if health is None:
+            # Basic file analysis for health snapshot
+            all_files = list(target_path.rglob("*.py")) + list(target_path.rglob("*.js"))
+            health = health_from_counts(
+                files=len(all_files),
+                large_files=len([f for f in all_files if f.stat().st_size > LARGE_FILE_BYTES]),
+                test_files=len([f for f in all_files if "test" in f.name.lower()])
             )
         
-        # Basic heuristic analysis
-        large_files = len([f for f in all_files if f.stat().st_size > 20000])  # > 20KB
-        debt_ratio = large_files / len(all_files)
-        
-        # Look for test files
-        test_files = len([f for f in all_files if "test" in f.name.lower()])
-        test_coverage = min(1.0, test_files / max(len(all_files) * 0.3, 1))  # 30% test ratio assumption
-        
-        return HealthSnapshot(
-            timestamp=datetime.now(),
-            overall_score=max(0.3, 0.8 - debt_ratio),
-            maintainability=max(0.3, 0.9 - debt_ratio),
-            complexity=max(0.3, 0.8 - (debt_ratio * 0.5)),
-            test_coverage=test_coverage,
-            security=0.8,  # Default assumption
-            debt_ratio=debt_ratio,
-            files_analyzed=len(all_files),
-            critical_issues=max(0, int(len(all_files) * debt_ratio * 0.3))
-        )
+        return HealthSnapshot(timestamp=datetime.now(), **health)
     
     async def _load_historical_trend(self, target_path: str) -> List[HealthSnapshot]:
-        """Load or simulate historical trend data"""
+        """Load historical trend data mined from git, or cached history outside git"""
+        since = datetime.now() - timedelta(days=30 * self.historical_window_months)
+        history = await asyncio.to_thread(self.git_history.history, target_path, since)
+        
+        if history is not None:
+            # One point per day: the last commit of that day
+            daily = {}
+            for item in history:
+                daily[item["timestamp"].date()] = item
+            return [
+                HealthSnapshot(**{k: v for k, v in item.items() if k != "sha"})
+                for item in daily.values()
+            ]
+        
         # Try to load cached historical data
         history_file = self.cache_dir / f"history_{abs(hash(target_path))}.json"
         
@@ -264,36 +264,8 @@ class CodeHealthTimeline:
             except Exception as e:
                 logger.warning(f"Failed to load historical data: {e}")
         
-        # Generate simulated historical trend for demonstration
-        return self._generate_simulated_history()
-    
-    def _generate_simulated_history(self) -> List[HealthSnapshot]:
-        """Generate simulated historical data for demonstration"""
-        history = []
-        base_date = datetime.now() - timedelta(days=180)  # 6 months ago
-        
-        # Simulate declining health over time
-        initial_score = 0.85
-        score_decline = 0.02  # 2% decline per month
-        
-        for i in range(6):  # 6 months of history
-            date = base_date + timedelta(days=30 * i)
-            current_score = max(0.4, initial_score - (score_decline * i))
-            
-            snapshot = HealthSnapshot(
-                timestamp=date,
-                overall_score=current_score,
-                maintainability=max(0.3, current_score + 0.1),
-                complexity=max(0.3, current_score - 0.1),
-                test_coverage=max(0.2, current_score - 0.2),
-                security=max(0.6, current_score + 0.05),
-                debt_ratio=min(0.8, 1.0 - current_score),
-                files_analyzed=50 + i * 5,
-                critical_issues=max(0, int((1.0 - current_score) * 20))
-            )
-            history.append(snapshot)
-        
-        return history
+        # No real history; predictions fall back to conservative estimates
+        return []
     
     async def _generate_predictions(self, 
                                   current_health: HealthSnapshot, 
@@ -308,10 +280,11 @@ class CodeHealthTimeline:
         # Calculate trends
         scores = [h.overall_score for h in historical_trend]
         debt_ratios = [h.debt_ratio for h in historical_trend]
+        timestamps = [h.timestamp for h in historical_trend]
         
-        # Linear trend analysis
-        score_trend = self._calculate_trend(scores)
-        debt_trend = self._calculate_trend(debt_ratios)
+        # Linear trend analysis, per month of real time
+        score_trend = self._calculate_trend(scores, timestamps)
+        debt_trend = self._calculate_trend(debt_ratios, timestamps)
         
         # Generate monthly predictions
         for month in range(1, self.prediction_horizon_months + 1):
@@ -341,22 +314,26 @@ class CodeHealthTimeline:
         
         return predictions
     
-    def _calculate_trend(self, values: List[float]) -> float:
-        """Calculate linear trend slope"""
+    def _calculate_trend(self, values: List[float], timestamps: Optional[List[datetime]] = None) -> float:
+        """
+        Calculate linear trend slope by least squares.
+        
+        With timestamps the slope is per 30 days, so unevenly spaced commits
+        are weighted by when they happened; without, it is per data point.
+        """
         if len(values) < 2:
             return 0.0
         
-        n = len(values)
-        x_values = list(range(n))
-        
-        # Simple linear regression slope
-        x_mean = statistics.mean(x_values)
-        y_mean = statistics.mean(values)
+        if timestamps:
+            x_values = np.array([t.timestamp() for t in timestamps]) / (30 * 24 * 3600)
+        else:
+            x_values = np.arange(len(values), dtype=float)
         
-        numerator = sum((x - x_mean) * (y - y_mean) for x, y in zip(x_values, values))
-        denominator = sum((x - x_mean) ** 2 for x in x_values)
+        if np.ptp(x_values) == 0:
+            return 0.0
         
-        return numerator / denominator if denominator != 0 else 0.0
+        slope, _ = np.polyfit(x_values - x_values.mean(), np.asarray(values, dtype=float), 1)
+        return float(slope)
     
     def _make_conservative_predictions(self, current_health: HealthSnapshot) -> List[PredictionPoint]:
         """Make conservative predictions when insufficient historical data"""
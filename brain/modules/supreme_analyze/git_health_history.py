@@ -0,0 +1,410 @@
+#!/usr/bin/env python3
+"""
+Git Health History - Incremental code health snapshots mined from git
+
+Walks the commits of a local git repository from the last processed SHA,
+updates per-file state only for the files each commit changed, and persists
+one health snapshot per commit in SQLite. Refreshing a timeline therefore
+costs O(new commits) rather than a rescan of the whole tree.
+
+Part of the Supreme Analyze Creative Cortex (Code Health Timeline).
+"""
+
+import logging
+import os
+import sqlite3
+import subprocess
+import threading
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Files counted towards health, and the size above which a file counts as debt
+TRACKED_SUFFIXES = (".py", ".js")
+LARGE_FILE_BYTES = 20000
+
+# Regular and executable blobs; symlinks and submodules are not source files
+_FILE_MODES = {"100644", "100755"}
+
+HEALTH_FIELDS = (
+    "overall_score", "maintainability", "complexity", "test_coverage",
+    "security", "debt_ratio", "files_analyzed", "critical_issues"
+)
+
+
+def is_tracked(path: str) -> bool:
+    return path.endswith(TRACKED_SUFFIXES)
+
+
+def is_test_file(path: str) -> bool:
+    return "test" in path.rsplit("/", 1)[-1].lower()
+
+
+def health_from_counts(files: int, large_files: int, test_files: int) -> Dict[str, Any]:
+    """
+    Health heuristics from file counts: large files are debt, and test
+    coverage is estimated against a 30% test file ratio.
+    """
+    if not files:
+        return {
+            "overall_score": 0.5,
+            "maintainability": 0.5,
+            "complexity": 0.5,
+            "test_coverage": 0.0,
+            "security": 0.5,
+            "debt_ratio": 0.5,
+            "files_analyzed": 0,
+            "critical_issues": 0
+        }
+
+    debt_ratio = large_files / files
+    return {
+        "overall_score": max(0.3, 0.8 - debt_ratio),
+        "maintainability": max(0.3, 0.9 - debt_ratio),
+        "complexity": max(0.3, 0.8 - (debt_ratio * 0.5)),
+        "test_coverage": min(1.0, test_files / max(files * 0.3, 1)),
+        "security": 0.8,  # Default assumption
+        "debt_ratio": debt_ratio,
+        "files_analyzed": files,
+        "critical_issues": max(0, int(files * debt_ratio * 0.3))
+    }
+
+
+class _Counts:
+    """Running file, large-file and test-file counts for one scope"""
+
+    __slots__ = ("files", "large_files", "test_files")
+
+    def __init__(self, files: int = 0, large_files: int = 0, test_files: int = 0):
+        self.files = files
+        self.large_files = large_files
+        self.test_files = test_files
+
+    def apply(self, path: str, size: Optional[int], sign: int):
+        if size is None:
+            return
+        self.files += sign
+        self.large_files += sign * (size > LARGE_FILE_BYTES)
+        self.test_files += sign * is_test_file(path)
+
+    def health(self) -> Dict[str, Any]:
+        return health_from_counts(self.files, self.large_files, self.test_files)
+
+
+class GitHealthHistory:
+    """
+    Per-commit health snapshots for a path inside a git repository.
+
+    Each (repository, path prefix) scope keeps its last processed SHA, the
+    size of every tracked file at that commit and the running counts the
+    health heuristics need. A refresh reads only `last_sha..HEAD` along the
+    first-parent chain, in one `git log` and one `git cat-file` call, and a
+    rewritten history (last SHA no longer an ancestor of HEAD) is rebuilt.
+    """
+
+    def __init__(self, db_path):
+        """
+        Args:
+            db_path: SQLite database holding scopes, file state and snapshots
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._init_schema()
+
+        self.stats = {"refreshes": 0, "commits_processed": 0, "files_updated": 0, "rebuilds": 0}
+
+    def _init_schema(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS scopes (
+                    scope TEXT PRIMARY KEY,
+                    last_sha TEXT,
+                    files INTEGER NOT NULL DEFAULT 0,
+                    large_files INTEGER NOT NULL DEFAULT 0,
+                    test_files INTEGER NOT NULL DEFAULT 0,
+                    updated_at TEXT
+                );
+
+                CREATE TABLE IF NOT EXISTS file_state (
+                    scope TEXT NOT NULL,
+                    path TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    PRIMARY KEY (scope, path)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    scope TEXT NOT NULL,
+                    position INTEGER NOT NULL,
+                    sha TEXT NOT NULL,
+                    timestamp INTEGER NOT NULL,
+                    overall_score REAL NOT NULL,
+                    maintainability REAL NOT NULL,
+                    complexity REAL NOT NULL,
+                    test_coverage REAL NOT NULL,
+                    security REAL NOT NULL,
+                    debt_ratio REAL NOT NULL,
+                    files_analyzed INTEGER NOT NULL,
+                    critical_issues INTEGER NOT NULL,
+                    PRIMARY KEY (scope, position)
+                );
+
+                CREATE INDEX IF NOT EXISTS idx_snapshots_time ON snapshots(scope, timestamp);
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    # Git access
+
+    @staticmethod
+    def _git(cwd, *args, input: Optional[bytes] = None) -> bytes:
+        return subprocess.run(
+            ["git", *args], cwd=str(cwd), input=input,
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, check=True
+        ).stdout
+
+    def locate(self, target_path) -> Optional[Tuple[Path, str]]:
+        """Repository root and path prefix for target_path, or None outside git"""
+        target = Path(target_path)
+        cwd = target if target.is_dir() else target.parent
+        try:
+            lines = self._git(cwd, "rev-parse", "--show-toplevel", "--show-prefix").decode().splitlines()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+        prefix = lines[1] if len(lines) > 1 else ""
+        if not target.is_dir():
+            prefix += target.name
+        return Path(lines[0]), prefix
+
+    def _head(self, root: Path) -> Optional[str]:
+        try:
+            return self._git(root, "rev-parse", "--verify", "-q", "HEAD").decode().strip() or None
+        except subprocess.CalledProcessError:
+            # No commits yet
+            return None
+
+    def _is_ancestor(self, root: Path, sha: str, head: str) -> bool:
+        try:
+            self._git(root, "merge-base", "--is-ancestor", sha, head)
+            return True
+        except subprocess.CalledProcessError:
+            return False
+
+    def _read_log(self, root: Path, revisions: str, prefix: str) -> List[Tuple[str, int, List[Tuple[str, Optional[str]]]]]:
+        """
+        First-parent commits in revisions, oldest first, with the tracked files
+        each changed: (sha, commit time, [(path, new blob sha or None if deleted)])
+        """
+        # The repository root takes every commit, including empty ones; a
+        # subdirectory only the commits that touch it
+        pathspec = ["--", prefix] if prefix else []
+        output = self._git(
+            root, "log", "--reverse", "--first-parent", "-m", "--no-renames", "--raw",
+            "--no-abbrev", "-z", "--format=%x00commit %H %ct", revisions, *pathspec
+        ).decode("utf-8", errors="surrogateescape")
+
+        commits = []
+        tokens = iter(output.split("\0"))
+        for token in tokens:
+            token = token.lstrip("\n")
+            if token.startswith("commit "):
+                _, sha, commit_time = token.split()
+                commits.append((sha, int(commit_time), []))
+            elif token.startswith(":") and commits:
+                _, new_mode, _, new_blob, status = token[1:].split()
+                path = next(tokens)
+                if is_tracked(path):
+                    deleted = status == "D" or new_mode not in _FILE_MODES
+                    commits[-1][2].append((path, None if deleted else new_blob))
+        return commits
+
+    def _blob_sizes(self, root: Path, blobs) -> Dict[str, int]:
+        blobs = sorted(set(blobs))
+        if not blobs:
+            return {}
+        output = self._git(
+            root, "cat-file", "--batch-check=%(objectname) %(objectsize)",
+            input="\n".join(blobs).encode() + b"\n"
+        ).decode()
+        sizes = {}
+        for line in output.splitlines():
+            parts = line.split()
+            if len(parts) == 2 and parts[1].isdigit():
+                sizes[parts[0]] = int(parts[1])
+        return sizes
+
+    # Snapshots
+
+    @staticmethod
+    def _scope_key(root: Path, prefix: str) -> str:
+        return f"{root}::{prefix}"
+
+    def refresh(self, target_path) -> int:
+        """
+        Process commits made since the last refresh.
+
+        Returns:
+            Number of new snapshots recorded, or -1 when target_path is not
+            inside a git repository with commits
+        """
+        location = self.locate(target_path)
+        if location is None:
+            return -1
+        root, prefix = location
+        head = self._head(root)
+        if head is None:
+            return -1
+        scope = self._scope_key(root, prefix)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT last_sha, files, large_files, test_files FROM scopes WHERE scope = ?", (scope,)
+            ).fetchone()
+            last_sha = row[0] if row else None
+            if last_sha == head:
+                return 0
+
+            if last_sha and not self._is_ancestor(root, last_sha, head):
+                logger.info(f"History rewritten below {last_sha[:12]}, rebuilding health history for {scope}")
+                self.stats["rebuilds"] += 1
+                self._reset(scope)
+                row, last_sha = None, None
+
+            commits = self._read_log(root, f"{last_sha}..{head}" if last_sha else head, prefix)
+            sizes = self._blob_sizes(root, (blob for _, _, changes in commits for _, blob in changes if blob))
+            counts = _Counts(*row[1:]) if row else _Counts()
+
+            position = self._conn.execute(
+                "SELECT COALESCE(MAX(position), -1) FROM snapshots WHERE scope = ?", (scope,)
+            ).fetchone()[0]
+
+            # path -> size at the latest processed commit, None when deleted
+            touched: Dict[str, Optional[int]] = {}
+            snapshot_rows = []
+            with self._conn:
+                for sha, commit_time, changes in commits:
+                    for path, blob in changes:
+                        if path not in touched:
+                            touched[path] = self._stored_size(scope, path)
+                        counts.apply(path, touched[path], -1)
+                        touched[path] = sizes.get(blob) if blob else None
+                        counts.apply(path, touched[path], +1)
+
+                    position += 1
+                    health = counts.health()
+                    snapshot_rows.append((scope, position, sha, commit_time, *(health[f] for f in HEALTH_FIELDS)))
+
+                self._conn.executemany(
+                    f"INSERT INTO snapshots (scope, position, sha, timestamp, {', '.join(HEALTH_FIELDS)}) "
+                    f"VALUES (?, ?, ?, ?, {', '.join('?' * len(HEALTH_FIELDS))})",
+                    snapshot_rows
+                )
+                self._conn.executemany(
+                    "DELETE FROM file_state WHERE scope = ? AND path = ?",
+                    [(scope, path) for path, size in touched.items() if size is None]
+                )
+                self._conn.executemany(
+                    "INSERT INTO file_state (scope, path, size) VALUES (?, ?, ?) "
+                    "ON CONFLICT(scope, path) DO UPDATE SET size = excluded.size",
+                    [(scope, path, size) for path, size in touched.items() if size is not None]
+                )
+                self._conn.execute(
+                    "INSERT INTO scopes (scope, last_sha, files, large_files, test_files, updated_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(scope) DO UPDATE SET last_sha = excluded.last_sha, files = excluded.files, "
+                    "large_files = excluded.large_files, test_files = excluded.test_files, "
+                    "updated_at = excluded.updated_at",
+                    (scope, head, counts.files, counts.large_files, counts.test_files, datetime.now().isoformat())
+                )
+
+        self.stats["refreshes"] += 1
+        self.stats["commits_processed"] += len(commits)
+        self.stats["files_updated"] += len(touched)
+        return len(snapshot_rows)
+
+    def _stored_size(self, scope: str, path: str) -> Optional[int]:
+        row = self._conn.execute(
+            "SELECT size FROM file_state WHERE scope = ? AND path = ?", (scope, path)
+        ).fetchone()
+        return row[0] if row else None
+
+    def _reset(self, scope: str):
+        with self._conn:
+            for table in ("snapshots", "file_state", "scopes"):
+                self._conn.execute(f"DELETE FROM {table} WHERE scope = ?", (scope,))
+
+    def history(self, target_path, since: Optional[datetime] = None) -> Optional[List[Dict[str, Any]]]:
+        """
+        Refresh and return the per-commit snapshots for target_path, oldest
+        first, optionally only those committed at or after since.
+
+        Returns:
+            Snapshot dicts with a datetime "timestamp" and "sha", or None when
+            target_path has no git history
+        """
+        if self.refresh(target_path) < 0:
+            return None
+        root, prefix = self.locate(target_path)
+
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT sha, timestamp, {', '.join(HEALTH_FIELDS)} FROM snapshots "
+                f"WHERE scope = ? AND timestamp >= ? ORDER BY position",
+                (self._scope_key(root, prefix), int(since.timestamp()) if since else 0)
+            ).fetchall()
+
+        return [
+            {"sha": sha, "timestamp": datetime.fromtimestamp(commit_time), **dict(zip(HEALTH_FIELDS, values))}
+            for sha, commit_time, *values in rows
+        ]
+
+    def current_health(self, target_path) -> Optional[Dict[str, Any]]:
+        """
+        Health of the working tree: the HEAD counts adjusted for the files
+        `git status` reports as changed, so only those files are stat'ed.
+
+        Returns:
+            Health dict, or None when target_path has no git history
+        """
+        if self.refresh(target_path) < 0:
+            return None
+        root, prefix = self.locate(target_path)
+        scope = self._scope_key(root, prefix)
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT files, large_files, test_files FROM scopes WHERE scope = ?", (scope,)
+            ).fetchone()
+            counts = _Counts(*row)
+
+            try:
+                status = self._git(
+                    root, "status", "--porcelain=v1", "-z", "--untracked-files=all", "--no-renames",
+                    "--", prefix or "."
+                ).decode("utf-8", errors="surrogateescape")
+            except subprocess.CalledProcessError as e:
+                logger.warning(f"git status failed for {root}: {e}")
+                return counts.health()
+
+            for entry in status.split("\0"):
+                path = entry[3:]
+                if not path or not is_tracked(path):
+                    continue
+                counts.apply(path, self._stored_size(scope, path), -1)
+                try:
+                    counts.apply(path, os.stat(root / path).st_size, +1)
+                except FileNotFoundError:
+                    pass
+
+        return counts.health()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            snapshots = self._conn.execute("SELECT COUNT(*) FROM snapshots").fetchone()[0]
+        return {**self.stats, "snapshots": snapshots}
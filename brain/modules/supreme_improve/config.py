@@ -26,6 +26,8 @@ SAFETY_CHECKS = {
     "enable_preview": True,
     "require_approval_for_high_risk": True,
     "backup_before_changes": True,
+    "backup_compression": None,  # "zstd" when the zstandard package is installed
+    "backup_link_mode": "reflink",  # "copy", "reflink" or "hardlink"
     "max_changes_per_file": 50,
     "rollback_on_test_failure": True,
     "risk_threshold_for_approval": 0.7
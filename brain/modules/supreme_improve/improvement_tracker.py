@@ -6,35 +6,74 @@ Tracks implementation outcomes and correlates with predictions for continuous im
 
 import json
 import sqlite3
+import threading
 from typing import Dict, List, Optional, Tuple, Any
 from pathlib import Path
 from datetime import datetime, timedelta
-from collections import defaultdict
+from collections import defaultdict, deque
 import statistics
 import logging
 
+import numpy as np
+
 from .models import ImprovementOutcome, ImprovementRecommendation, QualityMetrics
 from .config import LEARNING_CONFIG, get_config
 
 logger = logging.getLogger(__name__)
 
+# Recent outcomes per (category, priority, risk_level) used for prediction
+RECENT_OUTCOMES_LIMIT = 20
+# Patterns a prediction draws on, as in get_success_patterns()
+PREDICTION_PATTERN_MIN_SAMPLES = 5
+PREDICTION_PATTERN_MIN_RATE = 0.7
+
+PredictionKey = Tuple[str, str, str]
+
 class ImprovementTracker:
     """
     Tracks improvement outcomes and learns from results to improve future recommendations.
     Integrates with memory-quality-scorer.py and unified-analytics.py.
+    
+    Predictions are served from an in-memory index keyed by
+    (category, priority, risk_level), built once from the database and
+    updated in place as track_outcome writes. Writes from other connections
+    are picked up through PRAGMA data_version.
     """
     
     def __init__(self, db_path: str = "brain/logs/improvements/outcomes.db"):
         self.db_path = db_path
         self.learning_config = LEARNING_CONFIG
+        self._lock = threading.RLock()
+        self._conn = None
         self._init_database()
         self.patterns_cache = {}
+        
+        # Prediction index, loaded lazily
+        self._recent_outcomes: Dict[PredictionKey, deque] = {}
+        self._pattern_rates: Dict[PredictionKey, List[float]] = {}
+        self._probabilities: Dict[PredictionKey, float] = {}
+        self._data_version = None
+        self._weights = 1.0 / np.arange(1, RECENT_OUTCOMES_LIMIT + 2)
+    
+    def _connection(self) -> sqlite3.Connection:
+        """The tracker's single database connection"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        return self._conn
+    
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._data_version = None
     
     def _init_database(self):
         """Initialize the outcomes tracking database"""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         # Create outcomes table
@@ -82,8 +121,13 @@ class ImprovementTracker:
             )
         """)
         
+        # Serves the per-key recent outcome lookups
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_outcomes_prediction_key
+            ON improvement_outcomes (category, priority, risk_level, implemented, timestamp)
+        """)
+        
         conn.commit()
-        conn.close()
     
     def track_outcome(self, 
                      recommendation: ImprovementRecommendation,
@@ -101,7 +145,23 @@ class ImprovementTracker:
             Tracking result with success metrics and pattern updates
         """
         try:
-            conn = sqlite3.connect(self.db_path)
+            with self._lock:
+                return self._track_outcome(recommendation, outcome, quality_before)
+        except Exception as e:
+            # Patterns may have been cached from the rolled-back transaction
+            self.patterns_cache.clear()
+            logger.error(f"Failed to track outcome: {str(e)}")
+            return {
+                "success": False,
+                "error": str(e)
+            }
+    
+    def _track_outcome(self,
+                       recommendation: ImprovementRecommendation,
+                       outcome: ImprovementOutcome,
+                       quality_before: QualityMetrics) -> Dict[str, Any]:
+        conn = self._connection()
+        with conn:
             cursor = conn.cursor()
             
             # Calculate success rate
@@ -132,8 +192,10 @@ class ImprovementTracker:
                 json.dumps(outcome.issues_introduced),
                 outcome.actual_vs_predicted_risk
             ))
+            outcome_id = cursor.lastrowid
             
-            conn.commit()
+            # Clear patterns cache
+            self.patterns_cache.clear()
             
             # Update patterns if successful
             if success_rate > 0.7:
@@ -141,30 +203,19 @@ class ImprovementTracker:
             
             # Update learning metrics
             self._update_learning_metrics(cursor)
-            
-            conn.commit()
-            conn.close()
-            
-            # Clear patterns cache
-            self.patterns_cache.clear()
-            
-            return {
-                "success": True,
-                "outcome_id": cursor.lastrowid,
-                "success_rate": success_rate,
-                "patterns_updated": success_rate > 0.7,
-                "quality_improvement": (
-                    outcome.quality_after.overall_score - quality_before.overall_score
-                    if outcome.quality_after else 0.0
-                )
-            }
-            
-        except Exception as e:
-            logger.error(f"Failed to track outcome: {str(e)}")
-            return {
-                "success": False,
-                "error": str(e)
-            }
+        
+        self._update_prediction_index(recommendation, outcome.implemented, success_rate, success_rate > 0.7)
+        
+        return {
+            "success": True,
+            "outcome_id": outcome_id,
+            "success_rate": success_rate,
+            "patterns_updated": success_rate > 0.7,
+            "quality_improvement": (
+                outcome.quality_after.overall_score - quality_before.overall_score
+                if outcome.quality_after else 0.0
+            )
+        }
     
     def get_recommendation_success_rate(self, 
                                       category: Optional[str] = None,
@@ -179,7 +230,7 @@ class ImprovementTracker:
         Returns:
             Average success rate (0.0 to 1.0)
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         query = "SELECT AVG(success_rate) FROM improvement_outcomes WHERE implemented = 1"
@@ -195,7 +246,6 @@ class ImprovementTracker:
         
         cursor.execute(query, params)
         result = cursor.fetchone()[0]
-        conn.close()
         
         return result if result else 0.0
     
@@ -206,7 +256,7 @@ class ImprovementTracker:
         Returns:
             Dictionary with accuracy metrics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -222,8 +272,6 @@ class ImprovementTracker:
             predictions.append(predicted)
             errors.append(abs(actual_vs_predicted))
         
-        conn.close()
-        
         if not predictions:
             return {"accuracy": 0.0, "sample_size": 0}
         
@@ -241,7 +289,7 @@ class ImprovementTracker:
         Returns:
             Dictionary with quality improvement statistics
         """
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -256,8 +304,6 @@ class ImprovementTracker:
         for before, after in cursor.fetchall():
             improvements.append(after - before)
         
-        conn.close()
-        
         if not improvements:
             return {"mean_improvement": 0.0, "total_improvements": 0}
         
@@ -284,7 +330,7 @@ class ImprovementTracker:
         if cache_key in self.patterns_cache:
             return self.patterns_cache[cache_key]
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -303,8 +349,6 @@ class ImprovementTracker:
                 "sample_count": row[3]
             })
         
-        conn.close()
-        
         # Cache results
         self.patterns_cache[cache_key] = patterns
         
@@ -320,36 +364,42 @@ class ImprovementTracker:
         Returns:
             Predicted success probability (0.0 to 1.0)
         """
-        # Get relevant historical data
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Find similar recommendations
-        cursor.execute("""
-            SELECT success_rate
-            FROM improvement_outcomes
-            WHERE category = ? AND priority = ? AND risk_level = ?
-            AND implemented = 1
-            ORDER BY timestamp DESC
-            LIMIT 20
-        """, (recommendation.category, recommendation.priority, recommendation.risk_level))
+        return self.predict_many([recommendation])[0]
+    
+    def predict_many(self, recommendations: List[ImprovementRecommendation]) -> List[float]:
+        """
+        Predict success probabilities for a batch of recommendations.
         
-        similar_outcomes = [row[0] for row in cursor.fetchall()]
+        Each distinct (category, priority, risk_level) is scored once from the
+        in-memory index, and the batch is filled by one gather over those
+        scores.
         
-        # Get patterns that match
-        patterns = self.get_success_patterns()
-        pattern_scores = []
+        Args:
+            recommendations: Recommendations to evaluate
+            
+        Returns:
+            Predicted success probabilities, in input order
+        """
+        if not recommendations:
+            return []
         
-        for pattern in patterns:
-            if self._pattern_matches(recommendation, pattern):
-                pattern_scores.append(pattern["success_rate"])
+        with self._lock:
+            self._refresh_prediction_index()
+            keys = [(r.category, r.priority, r.risk_level) for r in recommendations]
+            positions = {key: i for i, key in enumerate(dict.fromkeys(keys))}
+            probabilities = np.array([self._key_probability(key) for key in positions])
         
-        conn.close()
+        return probabilities[[positions[key] for key in keys]].tolist()
+    
+    def _key_probability(self, key: PredictionKey) -> float:
+        """Success probability for one (category, priority, risk_level)"""
+        if key in self._probabilities:
+            return self._probabilities[key]
         
-        # Combine predictions
-        all_scores = similar_outcomes + pattern_scores
+        # Recent outcomes newest first, then matching patterns best first
+        scores = list(self._recent_outcomes.get(key, ())) + self._pattern_rates.get(key, [])
         
-        if not all_scores:
+        if not scores:
             # No historical data, use conservative estimate
             base_prob = 0.7
             
@@ -361,14 +411,93 @@ class ImprovementTracker:
                 "critical": -0.2
             }
             
-            return max(0.3, min(0.95, base_prob + risk_adjustment.get(recommendation.risk_level, 0)))
+            probability = max(0.3, min(0.95, base_prob + risk_adjustment.get(key[2], 0)))
+        else:
+            # Weighted average with recent data weighted higher
+            if len(scores) > len(self._weights):
+                self._weights = 1.0 / np.arange(1, len(scores) + 1)
+            weights = self._weights[:len(scores)]
+            probability = round(float(np.dot(scores, weights) / weights.sum()), 3)
+        
+        self._probabilities[key] = probability
+        return probability
+    
+    def _refresh_prediction_index(self):
+        """Load the prediction index, or reload it after another connection wrote"""
+        data_version = self._connection().execute("PRAGMA data_version").fetchone()[0]
+        if data_version == self._data_version:
+            return
+        
+        cursor = self._connection().cursor()
+        cursor.execute("""
+            SELECT category, priority, risk_level, success_rate FROM (
+                SELECT category, priority, risk_level, success_rate,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY category, priority, risk_level
+                           ORDER BY timestamp DESC, id DESC
+                       ) AS recency
+                FROM improvement_outcomes
+                WHERE implemented = 1
+            )
+            WHERE recency <= ?
+            ORDER BY category, priority, risk_level, recency
+        """, (RECENT_OUTCOMES_LIMIT,))
         
-        # Weighted average with recent data weighted higher
-        weights = [1.0 / (i + 1) for i in range(len(all_scores))]
-        weighted_sum = sum(score * weight for score, weight in zip(all_scores, weights))
-        total_weight = sum(weights)
+        recent_outcomes = {}
+        for category, priority, risk_level, success_rate in cursor.fetchall():
+            key = (category, priority, risk_level)
+            if key not in recent_outcomes:
+                recent_outcomes[key] = deque(maxlen=RECENT_OUTCOMES_LIMIT)
+            recent_outcomes[key].append(success_rate)
         
-        return round(weighted_sum / total_weight, 3)
+        cursor.execute("""
+            SELECT pattern_details, success_rate
+            FROM success_patterns
+            WHERE sample_count >= ? AND success_rate > ?
+            ORDER BY success_rate DESC
+        """, (PREDICTION_PATTERN_MIN_SAMPLES, PREDICTION_PATTERN_MIN_RATE))
+        
+        pattern_rates = defaultdict(list)
+        for details, success_rate in cursor.fetchall():
+            details = json.loads(details)
+            key = (details.get("category"), details.get("priority"), details.get("risk_level"))
+            pattern_rates[key].append(success_rate)
+        
+        self._recent_outcomes = recent_outcomes
+        self._pattern_rates = dict(pattern_rates)
+        self._probabilities = {}
+        self._data_version = data_version
+        logger.debug(f"Loaded prediction index for {len(recent_outcomes)} recommendation types")
+    
+    def _update_prediction_index(self,
+                                 recommendation: ImprovementRecommendation,
+                                 implemented: bool,
+                                 success_rate: float,
+                                 pattern_updated: bool):
+        """Apply one tracked outcome to the prediction index"""
+        if self._data_version is None:
+            # Not loaded yet; the first prediction reads the database
+            return
+        
+        key = (recommendation.category, recommendation.priority, recommendation.risk_level)
+        if implemented:
+            if key not in self._recent_outcomes:
+                self._recent_outcomes[key] = deque(maxlen=RECENT_OUTCOMES_LIMIT)
+            self._recent_outcomes[key].appendleft(success_rate)
+        
+        if pattern_updated:
+            cursor = self._connection().execute("""
+                SELECT success_rate
+                FROM success_patterns
+                WHERE pattern_type = ? AND sample_count >= ? AND success_rate > ?
+            """, (self._pattern_key(recommendation), PREDICTION_PATTERN_MIN_SAMPLES, PREDICTION_PATTERN_MIN_RATE))
+            self._pattern_rates[key] = [row[0] for row in cursor.fetchall()]
+        
+        self._probabilities.pop(key, None)
+    
+    @staticmethod
+    def _pattern_key(recommendation: ImprovementRecommendation) -> str:
+        return f"{recommendation.category}_{recommendation.priority}_{recommendation.risk_level}"
     
     def _update_success_patterns(self, 
                                recommendation: ImprovementRecommendation,
@@ -377,7 +506,7 @@ class ImprovementTracker:
         """Update success patterns based on outcome"""
         
         # Pattern: Category + Priority + Risk Level
-        pattern_key = f"{recommendation.category}_{recommendation.priority}_{recommendation.risk_level}"
+        pattern_key = self._pattern_key(recommendation)
         pattern_details = {
             "category": recommendation.category,
             "priority": recommendation.priority,
@@ -446,16 +575,6 @@ class ImprovementTracker:
                 VALUES (?, ?, ?)
             """, (name, value, confidence))
     
-    def _pattern_matches(self, recommendation: ImprovementRecommendation, pattern: Dict) -> bool:
-        """Check if a recommendation matches a pattern"""
-        details = pattern["details"]
-        
-        return (
-            details.get("category") == recommendation.category and
-            details.get("priority") == recommendation.priority and
-            details.get("risk_level") == recommendation.risk_level
-        )
-    
     def generate_learning_report(self) -> Dict[str, Any]:
         """Generate a comprehensive learning system report"""
         return {
@@ -479,7 +598,7 @@ class ImprovementTracker:
     
     def _get_learning_progress(self) -> Dict[str, Any]:
         """Track learning system progress over time"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         # Get metrics over time
@@ -492,7 +611,6 @@ class ImprovementTracker:
         """)
         
         progress_data = cursor.fetchall()
-        conn.close()
         
         if len(progress_data) < 2:
             return {"improving": False, "trend": "insufficient_data"}
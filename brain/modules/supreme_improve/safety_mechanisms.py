@@ -17,6 +17,7 @@ import logging
 
 from .models import ImprovementRecommendation, QualityMetrics
 from .config import SAFETY_CHECKS, get_config
+from .snapshot_store import SnapshotStore
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +34,11 @@ class SafetyMechanisms:
         self.safety_config = SAFETY_CHECKS
         self.backup_dir = Path("brain/logs/improvements/backups")
         self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.snapshot_store = SnapshotStore(
+            self.backup_dir,
+            compression=get_config("backup_compression", None),
+            link=get_config("backup_link_mode", "reflink")
+        )
         self.active_session = None
         self.changes_log = []
     
@@ -97,34 +103,26 @@ class SafetyMechanisms:
         """
         Create a backup of a file before modification.
         
+        Content already in the snapshot store, from this or any earlier
+        session, is not stored again.
+        
         Returns:
             Backup file path
         """
         if not self.active_session:
             raise RuntimeError("No active modification session")
         
-        # Read original content
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
-        
-        # Generate backup filename
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        file_hash = hashlib.md5(content.encode()).hexdigest()[:8]
-        backup_name = f"{Path(file_path).stem}_{timestamp}_{file_hash}{Path(file_path).suffix}"
-        backup_path = self.backup_dir / self.active_session["id"] / backup_name
-        
-        # Create backup directory
-        backup_path.parent.mkdir(parents=True, exist_ok=True)
-        
-        # Write backup
-        with open(backup_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+        digest, backup_path = self.snapshot_store.put(file_path)
+        mode = os.stat(file_path).st_mode & 0o777
+        self.snapshot_store.record(self.active_session["id"], file_path, digest, mode)
         
         # Store backup info
         self.active_session["backups"][file_path] = {
             "backup_path": str(backup_path),
-            "original_hash": file_hash,
-            "timestamp": timestamp
+            "digest": digest,
+            "mode": mode,
+            "original_hash": digest[:8],
+            "timestamp": datetime.now().strftime("%Y%m%d_%H%M%S")
         }
         
         logger.info(f"Backed up {file_path} to {backup_path}")
@@ -167,15 +165,17 @@ class SafetyMechanisms:
             # Apply change atomically
             temp_file = None
             try:
-                # Write to temporary file first
+                # Write to temporary file first, on the same filesystem so the
+                # replace is a rename and never rewrites a linked backup in place
                 with tempfile.NamedTemporaryFile(mode='w', 
                                                suffix=Path(file_path).suffix,
+                                               dir=Path(file_path).parent,
                                                delete=False) as temp_file:
                     temp_file.write(modified_content)
                     temp_path = temp_file.name
                 
                 # Atomic move
-                shutil.move(temp_path, file_path)
+                os.replace(temp_path, file_path)
                 
                 # Record change
                 self.active_session["changes"].append({
@@ -213,8 +213,8 @@ class SafetyMechanisms:
             backup_info = self.active_session["backups"][file_path]
             backup_path = backup_info["backup_path"]
             
-            # Restore from backup
-            shutil.copy2(backup_path, file_path)
+            # Restore from backup in a single rename
+            self.snapshot_store.restore(backup_info["digest"], file_path, backup_info["mode"])
             logger.info(f"Rolled back {file_path} from {backup_path}")
             
             return True
@@ -233,20 +233,10 @@ class SafetyMechanisms:
         if not self.active_session:
             return {"success": False, "reason": "No active session"}
         
-        rollback_summary = {
-            "success": True,
-            "files_rolled_back": [],
-            "failures": []
-        }
-        
-        # Rollback each changed file
-        for change in reversed(self.active_session["changes"]):
-            file_path = change["file_path"]
-            if self.rollback_file(file_path):
-                rollback_summary["files_rolled_back"].append(file_path)
-            else:
-                rollback_summary["failures"].append(file_path)
-                rollback_summary["success"] = False
+        # Restore every changed file from the session manifest; nothing is
+        # replaced unless all backups could be staged
+        changed_files = list(dict.fromkeys(c["file_path"] for c in self.active_session["changes"]))
+        rollback_summary = self.snapshot_store.rollback_session(self.active_session["id"], changed_files)
         
         self.active_session["rolled_back"] = True
         logger.info(f"Session rollback complete: {rollback_summary}")
@@ -399,12 +389,17 @@ class SafetyMechanisms:
         retention_days = get_config("backup_retention_days", 7)
         cutoff_time = datetime.now().timestamp() - (retention_days * 24 * 60 * 60)
         
+        # Per-session copy directories from before the snapshot store
+        store_dirs = {self.snapshot_store.objects_dir, self.snapshot_store.manifests_dir}
         for backup_dir in self.backup_dir.iterdir():
-            if backup_dir.is_dir():
+            if backup_dir.is_dir() and backup_dir not in store_dirs:
                 # Check directory modification time
                 if backup_dir.stat().st_mtime < cutoff_time:
                     shutil.rmtree(backup_dir)
                     logger.info(f"Cleaned up old backup directory: {backup_dir}")
+        
+        # Expire old session manifests and the blobs only they referenced
+        self.snapshot_store.collect_garbage(retention_days)
     
     def get_session_summary(self) -> Optional[Dict[str, Any]]:
         """Get summary of current session"""
@@ -0,0 +1,285 @@
+"""
+Content-Addressed Snapshot Store for Safety Mechanisms
+
+Deduplicated file backups keyed by SHA-256, with per-session manifests for
+whole-session rollback and garbage collection of unreferenced blobs.
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+from typing import Dict, List, Optional, Any, Iterable, Tuple
+from pathlib import Path
+from datetime import datetime
+import logging
+
+try:
+    import zstandard
+    ZSTD_AVAILABLE = True
+except ImportError:
+    zstandard = None
+    ZSTD_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHUNK_SIZE = 1024 * 1024
+LINK_MODES = ("copy", "reflink", "hardlink")
+
+# ioctl request cloning one file's extents into another (Linux btrfs/xfs/...)
+FICLONE = 0x40049409
+
+
+class SnapshotStore:
+    """
+    Stores file contents once per unique SHA-256 under objects/ab/<digest>,
+    optionally zstd-compressed, and records which content each session
+    backed up in manifests/<session>.jsonl.
+
+    Link modes:
+    - "copy": plain copies
+    - "reflink": copy-on-write clones where the filesystem supports them,
+      plain copies elsewhere
+    - "hardlink": blobs share inodes with backed-up and restored files. Only
+      safe when files are replaced by rename rather than written in place,
+      as SafetyMechanisms.apply_change_safely does
+    """
+
+    def __init__(self, root, compression: Optional[str] = None, link: str = "reflink"):
+        """
+        Args:
+            root: Store directory holding objects/ and manifests/
+            compression: None or "zstd"; zstd needs the zstandard package
+            link: One of LINK_MODES; ignored for compressed blobs
+        """
+        if link not in LINK_MODES:
+            raise ValueError(f"Unknown link mode {link!r}, expected one of {LINK_MODES}")
+        if compression not in (None, "zstd"):
+            raise ValueError(f"Unknown compression {compression!r}")
+        if compression == "zstd" and not ZSTD_AVAILABLE:
+            logger.warning("zstandard not installed, storing backups uncompressed")
+            compression = None
+
+        self.root = Path(root)
+        self.objects_dir = self.root / "objects"
+        self.manifests_dir = self.root / "manifests"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        self.compression = compression
+        self.link = link
+        self._reflink_supported = sys.platform.startswith("linux")
+
+        self.stats = {"stored": 0, "deduplicated": 0, "bytes_stored": 0, "restored": 0}
+
+    # Blobs
+
+    @staticmethod
+    def hash_file(path) -> str:
+        digest = hashlib.sha256()
+        with open(path, "rb") as f:
+            for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def blob_path(self, digest: str) -> Optional[Path]:
+        """Stored blob for digest, compressed or not, or None"""
+        base = self.objects_dir / digest[:2] / digest
+        for candidate in (base, base.with_name(digest + ".zst")):
+            if candidate.exists():
+                return candidate
+        return None
+
+    def put(self, file_path) -> Tuple[str, Path]:
+        """
+        Store a file's content unless it is already stored.
+
+        Returns:
+            (SHA-256 digest, blob path)
+        """
+        digest = self.hash_file(file_path)
+        existing = self.blob_path(digest)
+        if existing is not None:
+            self.stats["deduplicated"] += 1
+            return digest, existing
+
+        target = self.objects_dir / digest[:2] / (digest + (".zst" if self.compression else ""))
+        target.parent.mkdir(exist_ok=True)
+        tmp_path = target.with_name(f".{target.name}.{os.getpid()}.tmp")
+        try:
+            if self.compression:
+                with open(file_path, "rb") as src, open(tmp_path, "wb") as dst:
+                    zstandard.ZstdCompressor().copy_stream(src, dst)
+            else:
+                self._clone(Path(file_path), tmp_path)
+            # Readers never see a partial blob
+            os.replace(tmp_path, target)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+
+        self.stats["stored"] += 1
+        self.stats["bytes_stored"] += target.stat().st_size
+        return digest, target
+
+    def _clone(self, src: Path, dst: Path):
+        """Copy src to a new file dst, sharing storage where the link mode allows"""
+        if self.link == "hardlink":
+            try:
+                os.link(src, dst)
+                return
+            except OSError:
+                pass
+        if self.link in ("reflink", "hardlink") and self._reflink_supported:
+            try:
+                import fcntl
+                with open(src, "rb") as s, open(dst, "wb") as d:
+                    fcntl.ioctl(d.fileno(), FICLONE, s.fileno())
+                return
+            except (OSError, ImportError):
+                # Not supported here; don't try again
+                self._reflink_supported = False
+        shutil.copyfile(src, dst)
+
+    def _stage(self, digest: str, target: Path, mode: Optional[int]) -> Path:
+        """Materialize a blob next to target, ready to be renamed over it"""
+        blob = self.blob_path(digest)
+        if blob is None:
+            raise FileNotFoundError(f"Backup blob {digest} missing from {self.objects_dir}")
+
+        fd, staged = tempfile.mkstemp(prefix=f".{target.name}.", suffix=".restore", dir=target.parent)
+        os.close(fd)
+        staged = Path(staged)
+        try:
+            if blob.suffix == ".zst":
+                with open(blob, "rb") as src, open(staged, "wb") as dst:
+                    zstandard.ZstdDecompressor().copy_stream(src, dst)
+            else:
+                staged.unlink()
+                self._clone(blob, staged)
+            if mode is not None and self.link != "hardlink":
+                os.chmod(staged, mode)
+        except BaseException:
+            staged.unlink(missing_ok=True)
+            raise
+        return staged
+
+    def restore(self, digest: str, target, mode: Optional[int] = None):
+        """Replace target with a stored blob in one rename"""
+        target = Path(target)
+        os.replace(self._stage(digest, target, mode), target)
+        self.stats["restored"] += 1
+
+    # Session manifests
+
+    def _manifest_path(self, session_id: str) -> Path:
+        return self.manifests_dir / f"{session_id}.jsonl"
+
+    def record(self, session_id: str, file_path, digest: str, mode: Optional[int] = None):
+        """Append a backed-up file to the session manifest"""
+        entry = {
+            "path": str(Path(file_path).resolve()),
+            "digest": digest,
+            "mode": mode,
+            "timestamp": datetime.now().isoformat()
+        }
+        with open(self._manifest_path(session_id), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def load_manifest(self, session_id: str) -> Dict[str, Dict[str, Any]]:
+        """path -> first backup of it in the session (its pre-session content)"""
+        manifest = {}
+        path = self._manifest_path(session_id)
+        if not path.exists():
+            return manifest
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from an interrupted append
+                    continue
+                manifest.setdefault(entry["path"], entry)
+        return manifest
+
+    def rollback_session(self, session_id: str, paths: Optional[Iterable[str]] = None) -> Dict[str, Any]:
+        """
+        Restore every file in the session manifest, or only paths.
+
+        All files are staged first; only when every blob has been
+        materialized are they renamed into place, so a missing or unreadable
+        blob leaves the working tree untouched.
+        """
+        manifest = self.load_manifest(session_id)
+        if paths is not None:
+            wanted = {str(Path(p).resolve()) for p in paths}
+            manifest = {p: e for p, e in manifest.items() if p in wanted}
+
+        summary = {"success": True, "files_rolled_back": [], "failures": []}
+        staged: List[Tuple[Path, Path]] = []
+        try:
+            for path, entry in manifest.items():
+                target = Path(path)
+                staged.append((self._stage(entry["digest"], target, entry.get("mode")), target))
+        except Exception as e:
+            for staged_path, _ in staged:
+                staged_path.unlink(missing_ok=True)
+            logger.error(f"Rollback of session {session_id} aborted before touching any file: {e}")
+            return {"success": False, "files_rolled_back": [], "failures": list(manifest), "error": str(e)}
+
+        for staged_path, target in staged:
+            try:
+                os.replace(staged_path, target)
+                summary["files_rolled_back"].append(str(target))
+                self.stats["restored"] += 1
+            except OSError as e:
+                staged_path.unlink(missing_ok=True)
+                summary["failures"].append(str(target))
+                summary["success"] = False
+                logger.error(f"Failed to rollback {target}: {e}")
+        return summary
+
+    # Garbage collection
+
+    def collect_garbage(self, retention_days: float = 7, grace_seconds: float = 3600) -> Dict[str, int]:
+        """
+        Drop manifests older than the retention period, then delete blobs no
+        remaining manifest references.
+
+        Blobs changed within grace_seconds are kept, so a backup being
+        written by another process is not collected before its manifest
+        entry lands.
+        """
+        now = time.time()
+        cutoff = now - retention_days * 24 * 60 * 60
+        summary = {"manifests_removed": 0, "blobs_removed": 0, "bytes_freed": 0}
+
+        referenced = set()
+        for manifest in self.manifests_dir.glob("*.jsonl"):
+            if manifest.stat().st_mtime < cutoff:
+                manifest.unlink()
+                summary["manifests_removed"] += 1
+                continue
+            referenced.update(entry["digest"] for entry in self.load_manifest(manifest.stem).values())
+
+        for blob in self.objects_dir.glob("*/*"):
+            digest = blob.name.split(".")[0]
+            if digest in referenced or blob.name.startswith("."):
+                continue
+            stat = blob.stat()
+            if stat.st_ctime > now - grace_seconds:
+                continue
+            blob.unlink()
+            summary["blobs_removed"] += 1
+            summary["bytes_freed"] += stat.st_size
+
+        if summary["blobs_removed"] or summary["manifests_removed"]:
+            logger.info(f"Backup garbage collection: {summary}")
+        return summary
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "compression": self.compression, "link": self.link}
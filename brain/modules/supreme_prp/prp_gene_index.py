@@ -0,0 +1,479 @@
+#!/usr/bin/env python3
+"""
+PRP Gene Index - Persistent, incrementally maintained index of PRP genes
+
+Genes (structure, research, implementation and validation patterns) are
+extracted once per PRP version and stored in SQLite with an inverted term
+index. A sync only re-extracts PRPs whose size, mtime and content hash
+changed, spreading the work over a process pool, and queries rank genes
+from the whole corpus by keyword, or by embedding similarity when an
+embedding function is supplied.
+
+Part of the Supreme PRP Creative Cortex (Smart PRP DNA).
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Any, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+GENE_TYPES = ("structure", "research", "implementation", "validation")
+
+# Gene extraction patterns, compiled once
+STRUCTURE_PATTERNS = {
+    name: re.compile(regex, re.DOTALL | re.IGNORECASE)
+    for name, regex in {
+        "purpose_section": r"(?:## Purpose|## Goal|## Objective)(.*?)(?=##|$)",
+        "requirements_section": r"(?:## Requirements|## Needs)(.*?)(?=##|$)",
+        "implementation_section": r"(?:## Implementation|## Approach)(.*?)(?=##|$)",
+        "validation_section": r"(?:## Validation|## Testing)(.*?)(?=##|$)"
+    }.items()
+}
+
+IMPLEMENTATION_PATTERNS = {
+    name: re.compile(regex, re.DOTALL | re.IGNORECASE)
+    for name, regex in {
+        "step_by_step": r"(?:step \d+|phase \d+|stage \d+).*?(?=step \d+|phase \d+|stage \d+|##|$)",
+        "error_handling": r"(?:error|exception|try|catch|handle).*?(?=\n\n|##|$)",
+        "testing_approach": r"(?:test|unit test|integration|pytest).*?(?=\n\n|##|$)",
+        "deployment": r"(?:deploy|production|server|docker).*?(?=\n\n|##|$)"
+    }.items()
+}
+
+RESEARCH_INDICATORS = [
+    "documentation review",
+    "stack overflow",
+    "github examples",
+    "official docs",
+    "best practices",
+    "security considerations",
+    "performance analysis",
+    "compatibility check"
+]
+
+VALIDATION_KEYWORDS = [
+    "validation",
+    "quality check",
+    "code review",
+    "testing",
+    "verification",
+    "acceptance criteria"
+]
+
+SUCCESS_INDICATORS = [
+    "implemented successfully",
+    "deployment complete",
+    "tests passing",
+    "production ready",
+    "quality gates passed",
+    "code review approved"
+]
+
+STOP_WORDS = {
+    "the", "and", "for", "with", "that", "this", "from", "are", "was", "will", "can", "not",
+    "but", "all", "any", "has", "have", "into", "use", "using", "should", "must", "when"
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+# Changed PRPs below this count are extracted inline rather than in a pool
+PARALLEL_THRESHOLD = 16
+
+
+def tokenize(text: str) -> List[str]:
+    return [t for t in _TOKEN_RE.findall(text.lower()) if len(t) > 2 and t not in STOP_WORDS]
+
+
+def _extract_context(content: str, content_lower: str, keyword: str, context_length: int) -> str:
+    index = content_lower.find(keyword)
+    if index == -1:
+        return ""
+    start = max(0, index - context_length // 2)
+    end = min(len(content), index + context_length // 2)
+    return content[start:end].strip()
+
+
+def extract_genes(content: str, prp_name: str) -> Tuple[List[Dict[str, Any]], List[str]]:
+    """
+    Extract the genes and success indicators of one PRP.
+
+    Returns:
+        (genes, success indicators found)
+    """
+    content_lower = content.lower()
+    extracted_at = datetime.now().isoformat()
+    genes = []
+
+    def gene(gene_type, name, text, strength):
+        genes.append({
+            "type": gene_type,
+            "name": name,
+            "content": text,
+            "source_prp": prp_name,
+            "pattern_strength": strength,
+            "extracted_at": extracted_at
+        })
+
+    for name, pattern in STRUCTURE_PATTERNS.items():
+        match = pattern.search(content)
+        if match:
+            section = match.group(1).strip()
+            gene("structure", name, section[:500], len(section) / 1000)
+
+    for indicator in RESEARCH_INDICATORS:
+        count = content_lower.count(indicator)
+        if count:
+            gene("research", indicator.replace(" ", "_"),
+                 _extract_context(content, content_lower, indicator, 100), count / 10)
+
+    for name, pattern in IMPLEMENTATION_PATTERNS.items():
+        matches = pattern.findall(content)
+        if matches:
+            gene("implementation", name, matches[0][:300], len(matches) / 5)
+
+    for keyword in VALIDATION_KEYWORDS:
+        count = content_lower.count(keyword)
+        if count:
+            gene("validation", keyword.replace(" ", "_"),
+                 _extract_context(content, content_lower, keyword, 150), count / 3)
+
+    success = [indicator for indicator in SUCCESS_INDICATORS if indicator in content_lower]
+    return genes, success
+
+
+def _extract_file(path: str) -> Tuple[str, str, List[Dict[str, Any]], List[str]]:
+    """Read, hash and extract one PRP; runs in worker processes"""
+    with open(path, "rb") as f:
+        data = f.read()
+    content_hash = hashlib.sha256(data).hexdigest()
+    genes, success = extract_genes(data.decode("utf-8", errors="replace"), Path(path).name)
+    return path, content_hash, genes, success
+
+
+class PRPGeneIndex:
+    """
+    SQLite-backed gene corpus with an inverted term index.
+
+    Features:
+    - Change detection by size and mtime, confirmed by content hash
+    - Parallel extraction of new and changed PRPs
+    - Keyword queries scored by term frequency and inverse document
+      frequency over every indexed gene
+    - Optional embedding similarity through ExampleEmbeddingIndex
+    """
+
+    def __init__(self,
+                 db_path,
+                 embed: Optional[Callable[[str], Sequence[float]]] = None,
+                 max_workers: Optional[int] = None):
+        """
+        Args:
+            db_path: SQLite database for PRPs, genes and terms
+            embed: Optional function returning the embedding of a text
+            max_workers: Extraction processes, defaults to the CPU count
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._init_schema()
+
+        self.embedding_index = None
+        if embed is not None:
+            try:
+                from brain.modules.example_embedding_index import ExampleEmbeddingIndex
+            except ImportError:
+                sys.path.append(str(Path(__file__).parent.parent))
+                from example_embedding_index import ExampleEmbeddingIndex
+            self.embedding_index = ExampleEmbeddingIndex(self.db_path.with_suffix(".embeddings.npz"), embed)
+
+        self.stats = {"syncs": 0, "extracted": 0, "unchanged": 0, "removed": 0, "queries": 0}
+
+    def _init_schema(self):
+        with self._conn:
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS prps (
+                    path TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    success_indicators TEXT NOT NULL,
+                    indexed_at TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS genes (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT NOT NULL REFERENCES prps(path) ON DELETE CASCADE,
+                    type TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    content TEXT NOT NULL,
+                    pattern_strength REAL NOT NULL,
+                    extracted_at TEXT NOT NULL,
+                    length INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS gene_terms (
+                    term TEXT NOT NULL,
+                    gene_id INTEGER NOT NULL REFERENCES genes(id) ON DELETE CASCADE,
+                    tf INTEGER NOT NULL,
+                    PRIMARY KEY (term, gene_id)
+                ) WITHOUT ROWID;
+
+                CREATE INDEX IF NOT EXISTS idx_genes_path ON genes(path);
+                CREATE INDEX IF NOT EXISTS idx_genes_type ON genes(type, name);
+                CREATE INDEX IF NOT EXISTS idx_gene_terms_gene ON gene_terms(gene_id);
+            """)
+
+    def close(self):
+        self._conn.close()
+
+    # Sync
+
+    def sync(self, prps_path) -> Dict[str, int]:
+        """
+        Bring the index in line with the PRP markdown files under prps_path.
+
+        Returns:
+            Counts of extracted, unchanged and removed PRPs
+        """
+        prps_path = Path(prps_path)
+        on_disk = {}
+        if prps_path.exists():
+            for path in prps_path.rglob("*.md"):
+                try:
+                    stat = path.stat()
+                except OSError:
+                    continue
+                on_disk[str(path)] = (stat.st_size, stat.st_mtime_ns)
+
+        with self._lock:
+            indexed = {
+                path: (size, mtime_ns, content_hash)
+                for path, size, mtime_ns, content_hash in self._conn.execute(
+                    "SELECT path, size, mtime_ns, content_hash FROM prps"
+                )
+            }
+            removed = [path for path in indexed if path not in on_disk]
+            candidates = [
+                path for path, (size, mtime_ns) in on_disk.items()
+                if indexed.get(path, (None, None))[:2] != (size, mtime_ns)
+            ]
+
+            extracted, touched = [], []
+            for result in self._extract_all(candidates):
+                path, content_hash = result[:2]
+                if path in indexed and indexed[path][2] == content_hash:
+                    touched.append(path)
+                else:
+                    extracted.append(result)
+
+            with self._conn:
+                self._conn.executemany("DELETE FROM prps WHERE path = ?", [(p,) for p in removed])
+                # Content unchanged, only the stat changed
+                self._conn.executemany(
+                    "UPDATE prps SET size = ?, mtime_ns = ? WHERE path = ?",
+                    [(*on_disk[path], path) for path in touched]
+                )
+                for path, content_hash, genes, success in extracted:
+                    self._store(path, on_disk[path], content_hash, genes, success)
+
+        summary = {
+            "extracted": len(extracted),
+            "unchanged": len(on_disk) - len(extracted),
+            "removed": len(removed)
+        }
+        for key, value in summary.items():
+            self.stats[key] += value
+        self.stats["syncs"] += 1
+
+        if self.embedding_index is not None and (extracted or removed or not len(self.embedding_index)):
+            self.embedding_index.sync(self._gene_texts())
+        if extracted or removed:
+            logger.info(f"PRP gene index synced: {summary}")
+        return summary
+
+    def _extract_all(self, paths: List[str]) -> List[Tuple[str, str, List[Dict[str, Any]], List[str]]]:
+        results = []
+        if len(paths) >= PARALLEL_THRESHOLD and self.max_workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=min(self.max_workers, len(paths))) as pool:
+                    chunksize = max(1, len(paths) // (self.max_workers * 4))
+                    return list(pool.map(_extract_file, paths, chunksize=chunksize))
+            except Exception as e:
+                logger.warning(f"Parallel PRP extraction unavailable, extracting serially: {e}")
+
+        for path in paths:
+            try:
+                results.append(_extract_file(path))
+            except OSError as e:
+                logger.warning(f"Failed to analyze PRP {path}: {e}")
+        return results
+
+    def _store(self, path: str, stat: Tuple[int, int], content_hash: str,
+               genes: List[Dict[str, Any]], success: List[str]):
+        # Replacing the PRP row cascades to its genes and their terms
+        self._conn.execute("DELETE FROM prps WHERE path = ?", (path,))
+        self._conn.execute(
+            "INSERT INTO prps (path, name, size, mtime_ns, content_hash, success_indicators, indexed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+            (path, Path(path).name, *stat, content_hash, json.dumps(success), datetime.now().isoformat())
+        )
+        for gene in genes:
+            terms = Counter(tokenize(f"{gene['name'].replace('_', ' ')} {gene['content']}"))
+            gene_id = self._conn.execute(
+                "INSERT INTO genes (path, type, name, content, pattern_strength, extracted_at, length) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (path, gene["type"], gene["name"], gene["content"], gene["pattern_strength"],
+                 gene["extracted_at"], sum(terms.values()))
+            ).lastrowid
+            self._conn.executemany(
+                "INSERT INTO gene_terms (term, gene_id, tf) VALUES (?, ?, ?)",
+                [(term, gene_id, tf) for term, tf in terms.items()]
+            )
+
+    @staticmethod
+    def gene_key(path: str, gene_type: str, name: str) -> str:
+        return f"{path}::{gene_type}::{name}"
+
+    def _gene_texts(self) -> Dict[str, str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT path, type, name, content FROM genes").fetchall()
+        return {
+            self.gene_key(path, gene_type, name): f"{name.replace('_', ' ')} {content}"
+            for path, gene_type, name, content in rows
+        }
+
+    # Queries
+
+    def query(self,
+              text: str,
+              limit: int = 20,
+              gene_types: Optional[Sequence[str]] = None,
+              use_embeddings: bool = False) -> List[Dict[str, Any]]:
+        """
+        Rank genes from the whole corpus against a text.
+
+        Args:
+            text: Query, e.g. a feature description
+            limit: Maximum genes returned
+            gene_types: Restrict to these gene types
+            use_embeddings: Rank by embedding similarity instead of keywords,
+                when the index was created with an embedding function
+
+        Returns:
+            Gene dicts with "score" and the source PRP's "success_indicators",
+            best first
+        """
+        self.stats["queries"] += 1
+        if use_embeddings and self.embedding_index is not None:
+            scored = {key: score for key, score in self.embedding_index.query(text, threshold=0.0)}
+            return self._load_genes_by_key(scored, limit, gene_types)
+
+        terms = set(tokenize(text))
+        if not terms:
+            return []
+
+        with self._lock:
+            total_genes = self._conn.execute("SELECT COUNT(*) FROM genes").fetchone()[0]
+            placeholders = ", ".join("?" * len(terms))
+            postings = self._conn.execute(
+                f"SELECT term, gene_id, tf FROM gene_terms WHERE term IN ({placeholders})", tuple(terms)
+            ).fetchall()
+
+        document_frequency = Counter(term for term, _, _ in postings)
+        scores = defaultdict(float)
+        for term, gene_id, tf in postings:
+            idf = math.log(1 + total_genes / document_frequency[term])
+            scores[gene_id] += idf * tf / (tf + 1.2)
+
+        return self._load_genes(scores, limit, gene_types)
+
+    def _load_genes(self, scores: Dict[int, float], limit: int,
+                    gene_types: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+        if not scores:
+            return []
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT g.id, g.path, p.name, g.type, g.name, g.content, g.pattern_strength, g.extracted_at, "
+                f"p.success_indicators, p.mtime_ns FROM genes g JOIN prps p ON p.path = g.path "
+                f"WHERE g.id IN ({', '.join('?' * len(scores))})",
+                tuple(scores)
+            ).fetchall()
+
+        genes = [
+            {
+                "path": path,
+                "source_prp": prp_name,
+                "type": gene_type,
+                "name": name,
+                "content": content,
+                "pattern_strength": strength,
+                "extracted_at": extracted_at,
+                "success_indicators": json.loads(success),
+                "modified": datetime.fromtimestamp(mtime_ns / 1e9),
+                "score": scores[gene_id]
+            }
+            for gene_id, path, prp_name, gene_type, name, content, strength, extracted_at, success, mtime_ns in rows
+            if not gene_types or gene_type in gene_types
+        ]
+        genes.sort(key=lambda g: (-g["score"], g["path"], g["type"], g["name"]))
+        return genes[:limit]
+
+    def _load_genes_by_key(self, scored: Dict[str, float], limit: int,
+                           gene_types: Optional[Sequence[str]]) -> List[Dict[str, Any]]:
+        with self._lock:
+            ids = {
+                self.gene_key(path, gene_type, name): gene_id
+                for gene_id, path, gene_type, name in self._conn.execute("SELECT id, path, type, name FROM genes")
+            }
+        return self._load_genes(
+            {ids[key]: score for key, score in scored.items() if key in ids}, limit, gene_types
+        )
+
+    def genes(self, gene_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Every indexed gene, optionally of one type"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT p.name, g.type, g.name, g.content, g.pattern_strength, g.extracted_at "
+                "FROM genes g JOIN prps p ON p.path = g.path "
+                "WHERE ? IS NULL OR g.type = ? ORDER BY g.path, g.id",
+                (gene_type, gene_type)
+            ).fetchall()
+        return [
+            {"type": t, "name": n, "content": c, "source_prp": prp, "pattern_strength": s, "extracted_at": e}
+            for prp, t, n, c, s, e in rows
+        ]
+
+    def success_patterns(self) -> List[str]:
+        with self._lock:
+            rows = self._conn.execute("SELECT success_indicators FROM prps ORDER BY path").fetchall()
+        return [indicator for (success,) in rows for indicator in json.loads(success)]
+
+    def count(self, gene_type: Optional[str] = None) -> int:
+        with self._lock:
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM genes WHERE ? IS NULL OR type = ?", (gene_type, gene_type)
+            ).fetchone()[0]
+
+    def prp_count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM prps").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {**self.stats, "prps": self.prp_count(), "genes": self.count()}
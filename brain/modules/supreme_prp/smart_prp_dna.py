@@ -12,12 +12,20 @@ import asyncio
 import json
 import logging
 import re
+import sys
+from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass
 import statistics
 
+try:
+    from brain.modules.supreme_prp.prp_gene_index import PRPGeneIndex
+except ImportError:
+    sys.path.append(str(Path(__file__).parent))
+    from prp_gene_index import PRPGeneIndex
+
 logger = logging.getLogger(__name__)
 
 @dataclass
@@ -81,7 +89,10 @@ class SmartPRPDNA:
         self.success_threshold = 0.85  # 85% success rate threshold
         self.min_usage_count = 3  # Minimum usage for pattern reliability
         self.pattern_cache = {}
-        self.genes_cache = None
+        self.max_relevant_genes = 100  # Genes retrieved per feature description
+        
+        # Genes of every PRP, re-extracted only when a PRP changes
+        self.gene_index = PRPGeneIndex(self.cache_dir / "gene_index.db")
         
         logger.info("Smart PRP DNA initialized")
     
@@ -99,9 +110,8 @@ class SmartPRPDNA:
         start_time = datetime.now()
         
         try:
-            # Load or generate PRP genes
-            if not self.genes_cache:
-                self.genes_cache = await self._extract_prp_genes()
+            # Index new and changed PRPs
+            await asyncio.to_thread(self.gene_index.sync, self.prps_path)
             
             # Find relevant patterns for the feature
             relevant_patterns = await self._find_relevant_patterns(feature_description)
@@ -121,8 +131,8 @@ class SmartPRPDNA:
             confidence = self._calculate_dna_confidence(relevant_patterns, high_success_patterns)
             
             result = DNAAnalysisResult(
-                total_prps_analyzed=len(relevant_patterns),
-                patterns_extracted=len(self.genes_cache.structure_genes) if self.genes_cache else 0,
+                total_prps_analyzed=self.gene_index.prp_count(),
+                patterns_extracted=self.gene_index.count(),
                 high_success_patterns=len(high_success_patterns),
                 adaptive_learnings=adaptive_learnings,
                 recommended_patterns=recommended_patterns,
@@ -151,278 +161,61 @@ class SmartPRPDNA:
     async def _extract_prp_genes(self) -> PRPGenes:
         """Extract genetic patterns from all PRPs in the system"""
         
-        structure_genes = []
-        research_genes = []
-        implementation_genes = []
-        validation_genes = []
-        success_patterns = []
-        failure_patterns = []
-        
         # Check if PRPs directory exists
         if not self.prps_path.exists():
             logger.warning(f"PRPs directory not found: {self.prps_path}")
-            return PRPGenes(
-                structure_genes=structure_genes,
-                research_genes=research_genes,
-                implementation_genes=implementation_genes,
-                validation_genes=validation_genes,
-                success_patterns=success_patterns,
-                failure_patterns=failure_patterns
-            )
         
-        # Analyze all PRP files
-        prp_files = list(self.prps_path.rglob("*.md"))
-        
-        for prp_file in prp_files[:20]:  # Limit for performance
-            try:
-                with open(prp_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Extract different types of genes
-                structure_genes.extend(self._extract_structure_genes(content, prp_file.name))
-                research_genes.extend(self._extract_research_genes(content, prp_file.name))
-                implementation_genes.extend(self._extract_implementation_genes(content, prp_file.name))
-                validation_genes.extend(self._extract_validation_genes(content, prp_file.name))
-                
-                # Extract success/failure indicators
-                success_indicators = self._extract_success_indicators(content)
-                if success_indicators:
-                    success_patterns.extend(success_indicators)
-                
-            except Exception as e:
-                logger.warning(f"Failed to analyze PRP {prp_file}: {e}")
+        await asyncio.to_thread(self.gene_index.sync, self.prps_path)
         
         return PRPGenes(
-            structure_genes=structure_genes,
-            research_genes=research_genes,
-            implementation_genes=implementation_genes,
-            validation_genes=validation_genes,
-            success_patterns=success_patterns,
-            failure_patterns=failure_patterns
+            structure_genes=self.gene_index.genes("structure"),
+            research_genes=self.gene_index.genes("research"),
+            implementation_genes=self.gene_index.genes("implementation"),
+            validation_genes=self.gene_index.genes("validation"),
+            success_patterns=self.gene_index.success_patterns(),
+            failure_patterns=[]
         )
     
-    def _extract_structure_genes(self, content: str, prp_name: str) -> List[Dict[str, Any]]:
-        """Extract structural patterns from PRP content"""
-        genes = []
-        
-        # Look for common structural patterns
-        patterns = {
-            "purpose_section": r"(?:## Purpose|## Goal|## Objective)(.*?)(?=##|$)",
-            "requirements_section": r"(?:## Requirements|## Needs)(.*?)(?=##|$)",
-            "implementation_section": r"(?:## Implementation|## Approach)(.*?)(?=##|$)",
-            "validation_section": r"(?:## Validation|## Testing)(.*?)(?=##|$)"
-        }
-        
-        for pattern_name, regex in patterns.items():
-            matches = re.findall(regex, content, re.DOTALL | re.IGNORECASE)
-            if matches:
-                genes.append({
-                    "type": "structure",
-                    "name": pattern_name,
-                    "content": matches[0].strip()[:500],  # Limit content length
-                    "source_prp": prp_name,
-                    "pattern_strength": len(matches[0].strip()) / 1000,  # Simple strength metric
-                    "extracted_at": datetime.now().isoformat()
-                })
-        
-        return genes
-    
-    def _extract_research_genes(self, content: str, prp_name: str) -> List[Dict[str, Any]]:
-        """Extract research methodology patterns"""
-        genes = []
-        
-        # Look for research patterns
-        research_indicators = [
-            "documentation review",
-            "stack overflow",
-            "github examples",
-            "official docs",
-            "best practices",
-            "security considerations",
-            "performance analysis",
-            "compatibility check"
-        ]
-        
-        for indicator in research_indicators:
-            if indicator.lower() in content.lower():
-                # Extract context around the indicator
-                context = self._extract_context(content, indicator, 100)
-                genes.append({
-                    "type": "research",
-                    "name": indicator.replace(" ", "_"),
-                    "content": context,
-                    "source_prp": prp_name,
-                    "pattern_strength": content.lower().count(indicator.lower()) / 10,
-                    "extracted_at": datetime.now().isoformat()
-                })
-        
-        return genes
-    
-    def _extract_implementation_genes(self, content: str, prp_name: str) -> List[Dict[str, Any]]:
-        """Extract implementation approach patterns"""
-        genes = []
-        
-        # Look for implementation patterns
-        impl_patterns = {
-            "step_by_step": r"(?:step \d+|phase \d+|stage \d+).*?(?=step \d+|phase \d+|stage \d+|##|$)",
-            "error_handling": r"(?:error|exception|try|catch|handle).*?(?=\n\n|##|$)",
-            "testing_approach": r"(?:test|unit test|integration|pytest).*?(?=\n\n|##|$)",
-            "deployment": r"(?:deploy|production|server|docker).*?(?=\n\n|##|$)"
-        }
-        
-        for pattern_name, regex in impl_patterns.items():
-            matches = re.findall(regex, content, re.DOTALL | re.IGNORECASE)
-            if matches:
-                genes.append({
-                    "type": "implementation",
-                    "name": pattern_name,
-                    "content": matches[0][:300],  # Limit content
-                    "source_prp": prp_name,
-                    "pattern_strength": len(matches) / 5,
-                    "extracted_at": datetime.now().isoformat()
-                })
-        
-        return genes
-    
-    def _extract_validation_genes(self, content: str, prp_name: str) -> List[Dict[str, Any]]:
-        """Extract validation and quality assurance patterns"""
-        genes = []
-        
-        # Look for validation patterns
-        validation_keywords = [
-            "validation",
-            "quality check",
-            "code review",
-            "testing",
-            "verification",
-            "acceptance criteria"
-        ]
-        
-        for keyword in validation_keywords:
-            if keyword.lower() in content.lower():
-                context = self._extract_context(content, keyword, 150)
-                genes.append({
-                    "type": "validation",
-                    "name": keyword.replace(" ", "_"),
-                    "content": context,
-                    "source_prp": prp_name,
-                    "pattern_strength": content.lower().count(keyword.lower()) / 3,
-                    "extracted_at": datetime.now().isoformat()
-                })
-        
-        return genes
-    
-    def _extract_success_indicators(self, content: str) -> List[str]:
-        """Extract indicators of successful implementation"""
-        success_patterns = []
-        
-        success_indicators = [
-            "implemented successfully",
-            "deployment complete",
-            "tests passing",
-            "production ready",
-            "quality gates passed",
-            "code review approved"
-        ]
-        
-        for indicator in success_indicators:
-            if indicator.lower() in content.lower():
-                success_patterns.append(indicator)
-        
-        return success_patterns
-    
-    def _extract_context(self, content: str, keyword: str, context_length: int) -> str:
-        """Extract context around a keyword"""
-        content_lower = content.lower()
-        keyword_lower = keyword.lower()
+    async def _find_relevant_patterns(self, feature_description: str) -> List[PRPPattern]:
+        """
+        Find patterns relevant to the feature description.
         
-        index = content_lower.find(keyword_lower)
-        if index == -1:
-            return ""
+        Genes retrieved from the whole corpus are grouped by type and name into
+        patterns; a pattern's success rate is the share of its source PRPs
+        that record a success indicator.
+        """
+        genes = self.gene_index.query(feature_description, limit=self.max_relevant_genes)
         
-        start = max(0, index - context_length // 2)
-        end = min(len(content), index + context_length // 2)
+        grouped = defaultdict(list)
+        for gene in genes:
+            grouped[(gene["type"], gene["name"])].append(gene)
         
-        return content[start:end].strip()
-    
-    async def _find_relevant_patterns(self, feature_description: str) -> List[PRPPattern]:
-        """Find patterns relevant to the feature description"""
-        # Simulate pattern matching with realistic data
-        
-        # Keywords from feature description
-        keywords = self._extract_keywords(feature_description)
-        
-        # Generate simulated patterns based on common PRP types
-        patterns = []
-        
-        # Web-related patterns
-        if any(word in feature_description.lower() for word in ["web", "api", "http", "server"]):
-            patterns.append(PRPPattern(
-                pattern_id="web_api_pattern",
-                name="Web API Development Pattern",
-                category="implementation",
-                success_rate=0.92,
-                usage_count=15,
-                avg_implementation_time=2.5,
-                pattern_content="RESTful API with proper error handling and validation",
-                key_phrases=["REST API", "error handling", "validation", "testing"],
-                prerequisites=["FastAPI", "Pydantic", "pytest"],
-                outcomes=["Working API", "Comprehensive tests", "Documentation"],
-                created_date=datetime.now() - timedelta(days=30),
-                last_used=datetime.now() - timedelta(days=5)
-            ))
-        
-        # Database patterns
-        if any(word in feature_description.lower() for word in ["database", "data", "storage", "db"]):
-            patterns.append(PRPPattern(
-                pattern_id="database_integration",
-                name="Database Integration Pattern",
-                category="implementation",
-                success_rate=0.88,
-                usage_count=12,
-                avg_implementation_time=1.8,
-                pattern_content="Database setup with migrations and ORM integration",
-                key_phrases=["database", "migrations", "ORM", "data model"],
-                prerequisites=["SQLAlchemy", "database engine", "migration tool"],
-                outcomes=["Database schema", "Data models", "Migration scripts"],
-                created_date=datetime.now() - timedelta(days=45),
-                last_used=datetime.now() - timedelta(days=10)
-            ))
-        
-        # Authentication patterns
-        if any(word in feature_description.lower() for word in ["auth", "login", "user", "security"]):
-            patterns.append(PRPPattern(
-                pattern_id="auth_pattern",
-                name="Authentication System Pattern",
-                category="security",
-                success_rate=0.94,
-                usage_count=18,
-                avg_implementation_time=3.2,
-                pattern_content="JWT-based authentication with role-based access control",
-                key_phrases=["JWT", "authentication", "authorization", "security"],
-                prerequisites=["JWT library", "password hashing", "session management"],
-                outcomes=["Secure authentication", "User roles", "Session handling"],
-                created_date=datetime.now() - timedelta(days=20),
-                last_used=datetime.now() - timedelta(days=2)
-            ))
-        
-        # Default high-success pattern
-        patterns.append(PRPPattern(
-            pattern_id="general_development",
-            name="General Development Best Practices",
-            category="structure",
-            success_rate=0.86,
-            usage_count=25,
-            avg_implementation_time=2.0,
-            pattern_content="Standard development workflow with testing and documentation",
-            key_phrases=["best practices", "testing", "documentation", "code quality"],
-            prerequisites=["development environment", "testing framework", "documentation tools"],
-            outcomes=["Quality code", "Test coverage", "Documentation"],
-            created_date=datetime.now() - timedelta(days=60),
-            last_used=datetime.now() - timedelta(days=1)
-        ))
-        
-        return patterns
+        keywords = set(self._extract_keywords(feature_description))
+        scored_patterns = []
+        for (gene_type, name), members in grouped.items():
+            sources = {gene["path"]: gene for gene in members}
+            successful = [gene for gene in sources.values() if gene["success_indicators"]]
+            strongest = max(members, key=lambda gene: (gene["score"], gene["pattern_strength"]))
+            gene_words = set(self._extract_keywords(f"{name.replace('_', ' ')} {strongest['content']}"))
+            
+            pattern = PRPPattern(
+                pattern_id=f"{gene_type}:{name}",
+                name=f"{name.replace('_', ' ').title()} Pattern",
+                category=gene_type,
+                success_rate=len(successful) / len(sources),
+                usage_count=len(sources),
+                avg_implementation_time=0.0,  # Not recorded in PRPs
+                pattern_content=strongest["content"],
+                key_phrases=sorted(keywords & gene_words) or [name.replace("_", " ")],
+                prerequisites=[],
+                outcomes=sorted({indicator for gene in successful for indicator in gene["success_indicators"]}),
+                created_date=min(gene["modified"] for gene in sources.values()),
+                last_used=max(gene["modified"] for gene in sources.values())
+            )
+            scored_patterns.append((sum(gene["score"] for gene in members), pattern))
+        
+        scored_patterns.sort(key=lambda x: (-x[0], x[1].pattern_id))
+        return [pattern for _, pattern in scored_patterns]
     
     def _extract_keywords(self, text: str) -> List[str]:
         """Extract meaningful keywords from text"""
@@ -448,7 +241,7 @@ class SmartPRPDNA:
         learnings.append(f"Average success rate of similar patterns: {avg_success_rate:.1%}")
         
         # Analyze implementation times
-        if patterns:
+        if any(p.avg_implementation_time for p in patterns):
             avg_impl_time = statistics.mean([p.avg_implementation_time for p in patterns])
             learnings.append(f"Estimated implementation time based on patterns: {avg_impl_time:.1f} days")
         
@@ -0,0 +1,279 @@
+"""
+AAI Brain Module: Trigger Rule Engine
+Compiled enhancement trigger conditions evaluated against a shared feature vector.
+
+Each trigger condition is parsed and compiled once. The context features a
+rule reads are extracted from its AST, so a request only computes the union
+of features the registered rules need, each exactly once, before every rule
+is evaluated against that feature vector.
+"""
+
+import ast
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Callable, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Functions available to trigger conditions
+DEFAULT_FUNCTIONS = {
+    "len": len,
+    "any": any,
+    "all": all,
+    "min": min,
+    "max": max,
+    "sum": sum,
+    "set": set,
+    "frozenset": frozenset
+}
+
+# Argument-less string methods hoisted into shared derived features, so
+# prompt.lower() is computed once per request rather than once per rule
+HOISTED_METHODS = {"lower", "split", "strip"}
+
+
+@dataclass
+class CompiledRule:
+    """Trigger condition compiled to a code object"""
+    name: str
+    condition: str
+    code: Any
+    features: Set[str]
+    evaluations: int = 0
+    hits: int = 0
+    errors: int = 0
+    total_time_ms: float = 0.0
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "evaluations": self.evaluations,
+            "hits": self.hits,
+            "errors": self.errors,
+            "hit_rate": self.hits / self.evaluations if self.evaluations else 0.0,
+            "average_time_us": self.total_time_ms * 1000 / self.evaluations if self.evaluations else 0.0,
+            "features": sorted(self.features)
+        }
+
+
+class _ConditionCompiler(ast.NodeTransformer):
+    """Validates a condition, hoists string methods and collects free names"""
+
+    def __init__(self, functions: Set[str]):
+        self.functions = functions
+        self.bound: Set[str] = set()
+        self.loaded: Set[str] = set()
+        self.hoisted: Dict[str, Tuple[str, str]] = {}
+
+    def compile(self, name: str, condition: str):
+        tree = ast.parse(condition.strip(), mode="eval")
+
+        # Comprehension and := targets are local to the rule, not features
+        for node in ast.walk(tree):
+            if isinstance(node, ast.comprehension):
+                self.bound.update(n.id for n in ast.walk(node.target) if isinstance(n, ast.Name))
+            elif isinstance(node, ast.NamedExpr):
+                self.bound.add(node.target.id)
+
+        tree = ast.fix_missing_locations(self.visit(tree))
+        code = compile(tree, f"<trigger {name}>", "eval")
+        features = (self.loaded - self.bound - self.functions) | set(self.hoisted)
+        return code, features
+
+    def visit_Attribute(self, node: ast.Attribute):
+        if node.attr.startswith("_"):
+            raise ValueError(f"Private attribute access is not allowed in trigger conditions: {node.attr}")
+        return self.generic_visit(node)
+
+    def visit_Name(self, node: ast.Name):
+        if node.id.startswith("__"):
+            raise ValueError(f"Dunder names are not allowed in trigger conditions: {node.id}")
+        if isinstance(node.ctx, ast.Load):
+            self.loaded.add(node.id)
+        return node
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if (isinstance(func, ast.Attribute) and isinstance(func.value, ast.Name)
+                and func.attr in HOISTED_METHODS and not node.args and not node.keywords
+                and func.value.id not in self.bound and not func.value.id.startswith("__")):
+            derived = f"{func.value.id}__{func.attr}"
+            self.hoisted[derived] = (func.value.id, func.attr)
+            return ast.copy_location(ast.Name(id=derived, ctx=ast.Load()), node)
+        return self.generic_visit(node)
+
+    def visit_Lambda(self, node: ast.Lambda):
+        raise ValueError("Lambdas are not allowed in trigger conditions")
+
+
+class TriggerRuleEngine:
+    """
+    Compiled trigger rule set with per-request shared features.
+
+    Features:
+    - Conditions compiled once to code objects, validated for safe names
+    - Per-rule feature extraction from the condition AST
+    - Feature providers computed at most once per request, and only when
+      some registered rule needs one of their features
+    - Rule hit-rate and evaluation-time statistics
+    """
+
+    def __init__(self, functions: Optional[Dict[str, Callable]] = None):
+        """
+        Initialize trigger rule engine
+
+        Args:
+            functions: Callables available to conditions, defaults to DEFAULT_FUNCTIONS
+        """
+        self.functions = dict(functions if functions is not None else DEFAULT_FUNCTIONS)
+        self.rules: Dict[str, CompiledRule] = {}
+
+        # feature name -> (names computed together, provider)
+        self._providers: Dict[str, Tuple[Tuple[str, ...], Callable[[Dict[str, Any]], Any]]] = {}
+        self._hoisted: Dict[str, Tuple[str, str]] = {}
+        self._required: Optional[Set[str]] = None
+
+        self.stats = {
+            "requests": 0,
+            "rule_evaluations": 0,
+            "feature_time_ms": 0.0,
+            "evaluation_time_ms": 0.0,
+            "compile_errors": 0
+        }
+
+    def register_feature(self, names, provider: Callable[[Dict[str, Any]], Any]):
+        """
+        Register a provider computing one or more features from the context.
+
+        Args:
+            names: Feature name, or tuple of names computed together
+            provider: Callable taking the request context; returns the value,
+                or a dict of values when several names are registered
+        """
+        names = (names,) if isinstance(names, str) else tuple(names)
+        for feature_name in names:
+            self._providers[feature_name] = (names, provider)
+
+    def add_rule(self, name: str, condition: str) -> Optional[CompiledRule]:
+        """
+        Compile and register a rule, replacing any rule of the same name.
+
+        Returns:
+            Compiled rule, or None if the condition does not compile
+        """
+        compiler = _ConditionCompiler(set(self.functions))
+        try:
+            code, features = compiler.compile(name, condition)
+        except (SyntaxError, ValueError) as e:
+            self.stats["compile_errors"] += 1
+            logger.error(f"Trigger condition for {name} rejected: {e}")
+            return None
+
+        rule = CompiledRule(name=name, condition=condition, code=code, features=features)
+        self.rules[name] = rule
+        self._hoisted.update(compiler.hoisted)
+        self._required = None
+        return rule
+
+    def add_rules(self, conditions: Dict[str, str]):
+        """Compile and register several rules"""
+        for name, condition in conditions.items():
+            self.add_rule(name, condition)
+
+    def remove_rule(self, name: str):
+        if self.rules.pop(name, None) is not None:
+            self._required = None
+
+    @property
+    def required_features(self) -> Set[str]:
+        """Union of features read by the registered rules"""
+        if self._required is None:
+            required = set()
+            for rule in self.rules.values():
+                required |= rule.features
+            # Hoisted features need their base feature
+            required |= {self._hoisted[f][0] for f in required if f in self._hoisted}
+            self._required = required
+        return self._required
+
+    def extract_features(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """Compute every required feature once for a request context"""
+
+        start_time = time.perf_counter()
+        required = self.required_features
+        features: Dict[str, Any] = {}
+
+        for feature_name in required:
+            if feature_name in features or feature_name in self._hoisted:
+                continue
+            if feature_name in self._providers:
+                names, provider = self._providers[feature_name]
+                value = provider(context)
+                if len(names) == 1:
+                    features[names[0]] = value
+                else:
+                    features.update({n: value.get(n) for n in names})
+            else:
+                features[feature_name] = context.get(feature_name)
+
+        for feature_name in required & set(self._hoisted):
+            base, method = self._hoisted[feature_name]
+            value = features.get(base)
+            features[feature_name] = getattr(value, method)() if isinstance(value, str) else None
+
+        self.stats["feature_time_ms"] += (time.perf_counter() - start_time) * 1000
+        return features
+
+    def evaluate(self,
+                 context: Dict[str, Any],
+                 features: Optional[Dict[str, Any]] = None) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+        """
+        Evaluate every rule against one shared feature vector.
+
+        Args:
+            context: Request context
+            features: Precomputed features, see extract_features()
+
+        Returns:
+            (rule name -> truthy condition value for rules that hit, in
+            registration order; feature vector used)
+        """
+        if features is None:
+            features = self.extract_features(context)
+
+        namespace = {"__builtins__": {}, **self.functions, **features}
+        matched = {}
+        start_time = time.perf_counter()
+
+        for rule in self.rules.values():
+            rule_start = time.perf_counter()
+            try:
+                value = eval(rule.code, namespace)
+            except Exception as e:
+                rule.errors += 1
+                value = False
+                logger.debug(f"Trigger {rule.name} evaluation failed: {e}")
+            rule.evaluations += 1
+            rule.total_time_ms += (time.perf_counter() - rule_start) * 1000
+            if value:
+                rule.hits += 1
+                matched[rule.name] = value
+
+        self.stats["requests"] += 1
+        self.stats["rule_evaluations"] += len(self.rules)
+        self.stats["evaluation_time_ms"] += (time.perf_counter() - start_time) * 1000
+        return matched, features
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Engine totals and per-rule hit-rate and timing statistics"""
+
+        requests = self.stats["requests"]
+        return {
+            **self.stats,
+            "rules": len(self.rules),
+            "required_features": sorted(self.required_features),
+            "average_request_time_ms": (
+                (self.stats["feature_time_ms"] + self.stats["evaluation_time_ms"]) / requests if requests else 0.0
+            ),
+            "rule_stats": {name: rule.get_stats() for name, rule in self.rules.items()}
+        }
@@ -6,12 +6,12 @@ Tracks relationships between PRPs, Projects, Templates, and Integrations for sea
 
 import json
 import sqlite3
+import threading
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 import re
 from dataclasses import dataclass, asdict
-from collections import defaultdict
 
 @dataclass
 class PRPProjectMapping:
@@ -47,8 +47,21 @@ class IntegrationEffectiveness:
     common_issues: List[str]
     recommended_personas: List[str]
 
+# Bumped when tables are added; older databases are migrated on open
+SCHEMA_VERSION = 2
+
+# Mappings counted as successful patterns for template recommendations
+SUCCESS_SCORE_THRESHOLD = 0.8
+
 class UnifiedAnalytics:
-    """Central analytics system for cross-folder intelligence"""
+    """
+    Central analytics system for cross-folder intelligence
+    
+    Storage uses one WAL-mode connection per thread. Templates, integrations
+    and blockers of each mapping live in join tables, and the rollup tables
+    behind the dashboard are maintained in the same transaction as every
+    mapping write, so dashboard reads do not scan the mappings.
+    """
     
     def __init__(self, base_path: str = "/mnt/c/Users/Brandon/AAI"):
         self.base_path = Path(base_path)
@@ -58,13 +71,40 @@ class UnifiedAnalytics:
         self.templates_path = self.base_path / "templates"
         self.integrations_path = self.base_path / "integrations"
         
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        
         self._init_database()
     
+    def _connection(self) -> sqlite3.Connection:
+        """Connection for the calling thread, opened in WAL mode on first use"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+    
+    def close(self):
+        """Close every thread's connection"""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            try:
+                conn.close()
+            except sqlite3.ProgrammingError:
+                pass  # Owned by another, still running thread
+        self._local = threading.local()
+    
     def _init_database(self):
         """Initialize analytics database with required tables"""
         self.db_path.parent.mkdir(exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connection()
         cursor = conn.cursor()
         
         # PRP-Project mappings table
@@ -93,6 +133,7 @@ class UnifiedAnalytics:
                 usage_count INTEGER DEFAULT 0,
                 success_count INTEGER DEFAULT 0,
                 total_completion_time REAL DEFAULT 0,
+                success_score_total REAL DEFAULT 0,
                 common_blockers TEXT,  -- JSON array
                 improvement_suggestions TEXT,  -- JSON array
                 last_updated TEXT NOT NULL
@@ -126,36 +167,223 @@ class UnifiedAnalytics:
             )
         ''')
         
+        # Normalized mapping members
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mapping_templates (
+                mapping_id INTEGER NOT NULL,
+                template_id TEXT NOT NULL,
+                PRIMARY KEY (mapping_id, template_id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mapping_integrations (
+                mapping_id INTEGER NOT NULL,
+                integration_id TEXT NOT NULL,
+                PRIMARY KEY (mapping_id, integration_id)
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS mapping_blockers (
+                mapping_id INTEGER NOT NULL,
+                position INTEGER NOT NULL,
+                blocker TEXT NOT NULL,
+                PRIMARY KEY (mapping_id, position)
+            )
+        ''')
+        
+        # Rollups maintained alongside every mapping write
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS status_rollup (
+                status TEXT PRIMARY KEY,
+                project_count INTEGER NOT NULL DEFAULT 0,
+                success_score_total REAL NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS blocker_rollup (
+                blocker TEXT PRIMARY KEY,
+                count INTEGER NOT NULL DEFAULT 0
+            )
+        ''')
+        
+        version = cursor.execute("PRAGMA user_version").fetchone()[0]
+        if version < SCHEMA_VERSION:
+            self._migrate(cursor)
+        
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_mappings_status ON prp_project_mappings(status)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_mappings_created_date ON prp_project_mappings(created_date)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_mappings_project_id ON prp_project_mappings(project_id)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_template_metrics_usage ON template_metrics(usage_count)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_template_metrics_success ON template_metrics(success_score_total)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_integration_metrics_usage ON integration_metrics(project_count)")
+        cursor.execute("CREATE INDEX IF NOT EXISTS idx_blocker_rollup_count ON blocker_rollup(count)")
+        
         conn.commit()
-        conn.close()
+    
+    def _migrate(self, cursor):
+        """Add rollup columns and backfill join tables from the JSON columns"""
+        
+        columns = {row[1] for row in cursor.execute("PRAGMA table_info(template_metrics)")}
+        if "success_score_total" not in columns:
+            cursor.execute("ALTER TABLE template_metrics ADD COLUMN success_score_total REAL DEFAULT 0")
+        
+        rows = cursor.execute(
+            "SELECT id, template_ids, integration_ids, blockers FROM prp_project_mappings"
+        ).fetchall()
+        for mapping_id, template_ids, integration_ids, blockers in rows:
+            self._write_members(
+                cursor, mapping_id,
+                json.loads(template_ids) if template_ids else [],
+                json.loads(integration_ids) if integration_ids else []
+            )
+            if blockers:
+                self._write_blockers(cursor, mapping_id, json.loads(blockers))
+        
+        self._rebuild_rollups(cursor)
+        cursor.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    
+    def rebuild_rollups(self):
+        """Recompute every rollup from the mappings and join tables"""
+        conn = self._connection()
+        with conn:
+            self._rebuild_rollups(conn.cursor())
+    
+    def _rebuild_rollups(self, cursor):
+        cursor.execute("DELETE FROM status_rollup")
+        cursor.execute('''
+            INSERT INTO status_rollup (status, project_count, success_score_total)
+            SELECT status, COUNT(*), COALESCE(SUM(success_score), 0)
+            FROM prp_project_mappings
+            GROUP BY status
+        ''')
+        
+        cursor.execute("DELETE FROM blocker_rollup")
+        cursor.execute('''
+            INSERT INTO blocker_rollup (blocker, count)
+            SELECT blocker, COUNT(*) FROM mapping_blockers GROUP BY blocker
+        ''')
+        
+        for table, key, join_table in (
+            ("template_metrics", "template_id", "mapping_templates"),
+            ("integration_metrics", "integration_id", "mapping_integrations"),
+        ):
+            cursor.execute(f"UPDATE {table} SET success_count = 0")
+            cursor.execute(f'''
+                UPDATE {table} SET success_count = (
+                    SELECT COUNT(*)
+                    FROM {join_table} j JOIN prp_project_mappings m ON m.id = j.mapping_id
+                    WHERE j.{key} = {table}.{key} AND m.status = 'completed' AND m.success_score >= ?
+                )
+            ''', (SUCCESS_SCORE_THRESHOLD,))
+        
+        cursor.execute('''
+            UPDATE template_metrics SET success_score_total = COALESCE((
+                SELECT SUM(m.success_score)
+                FROM mapping_templates j JOIN prp_project_mappings m ON m.id = j.mapping_id
+                WHERE j.template_id = template_metrics.template_id
+                  AND m.status = 'completed' AND m.success_score >= ?
+            ), 0)
+        ''', (SUCCESS_SCORE_THRESHOLD,))
+    
+    def _write_members(self, cursor, mapping_id: int, template_ids: List[str], integration_ids: List[str]):
+        cursor.executemany(
+            "INSERT OR IGNORE INTO mapping_templates (mapping_id, template_id) VALUES (?, ?)",
+            [(mapping_id, template_id) for template_id in template_ids]
+        )
+        cursor.executemany(
+            "INSERT OR IGNORE INTO mapping_integrations (mapping_id, integration_id) VALUES (?, ?)",
+            [(mapping_id, integration_id) for integration_id in integration_ids]
+        )
+    
+    def _write_blockers(self, cursor, mapping_id: int, blockers: List[str]):
+        cursor.execute("DELETE FROM mapping_blockers WHERE mapping_id = ?", (mapping_id,))
+        cursor.executemany(
+            "INSERT INTO mapping_blockers (mapping_id, position, blocker) VALUES (?, ?, ?)",
+            [(mapping_id, position, blocker) for position, blocker in enumerate(blockers)]
+        )
+    
+    def _delete_mapping(self, cursor, mapping_id: int):
+        for table in ("mapping_templates", "mapping_integrations", "mapping_blockers"):
+            cursor.execute(f"DELETE FROM {table} WHERE mapping_id = ?", (mapping_id,))
+        cursor.execute("DELETE FROM prp_project_mappings WHERE id = ?", (mapping_id,))
+    
+    def _apply_rollups(self, cursor, mapping_id: int, sign: int):
+        """Add (sign=1) or retract (sign=-1) one mapping's rollup contributions"""
+        
+        row = cursor.execute(
+            "SELECT status, success_score FROM prp_project_mappings WHERE id = ?", (mapping_id,)
+        ).fetchone()
+        if row is None:
+            return
+        status, success_score = row
+        success_score = success_score or 0.0
+        
+        cursor.execute('''
+            INSERT INTO status_rollup (status, project_count, success_score_total) VALUES (?, ?, ?)
+            ON CONFLICT(status) DO UPDATE SET
+                project_count = project_count + excluded.project_count,
+                success_score_total = success_score_total + excluded.success_score_total
+        ''', (status, sign, sign * success_score))
+        
+        cursor.execute('''
+            INSERT INTO blocker_rollup (blocker, count)
+            SELECT blocker, ? FROM mapping_blockers WHERE mapping_id = ?
+            ON CONFLICT(blocker) DO UPDATE SET count = count + excluded.count
+        ''', (sign, mapping_id))
+        
+        if status == "completed" and success_score >= SUCCESS_SCORE_THRESHOLD:
+            cursor.execute('''
+                UPDATE template_metrics
+                SET success_count = success_count + ?, success_score_total = success_score_total + ?
+                WHERE template_id IN (SELECT template_id FROM mapping_templates WHERE mapping_id = ?)
+            ''', (sign, sign * success_score, mapping_id))
+            cursor.execute('''
+                UPDATE integration_metrics
+                SET success_count = success_count + ?
+                WHERE integration_id IN (SELECT integration_id FROM mapping_integrations WHERE mapping_id = ?)
+            ''', (sign, mapping_id))
     
     def track_prp_to_project(self, prp_id: str, project_id: str, 
                            template_ids: List[str], integration_ids: List[str],
                            status: str = "scaffolded") -> bool:
         """Track new PRP to Project mapping"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                INSERT OR REPLACE INTO prp_project_mappings 
-                (prp_id, project_id, template_ids, integration_ids, created_date, status, success_score)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-            ''', (
-                prp_id, project_id, json.dumps(template_ids), json.dumps(integration_ids),
-                datetime.now().isoformat(), status, 0.0
-            ))
-            
-            # Update template usage metrics
-            for template_id in template_ids:
-                self._update_template_usage(cursor, template_id)
-            
-            # Update integration metrics
-            for integration_id in integration_ids:
-                self._update_integration_usage(cursor, integration_id)
-            
-            conn.commit()
-            conn.close()
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                
+                # Re-tracking replaces the mapping, so retract the old one first
+                existing = cursor.execute(
+                    "SELECT id FROM prp_project_mappings WHERE prp_id = ? AND project_id = ?",
+                    (prp_id, project_id)
+                ).fetchone()
+                if existing:
+                    self._apply_rollups(cursor, existing[0], -1)
+                    self._delete_mapping(cursor, existing[0])
+                
+                cursor.execute('''
+                    INSERT INTO prp_project_mappings 
+                    (prp_id, project_id, template_ids, integration_ids, created_date, status, success_score)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                ''', (
+                    prp_id, project_id, json.dumps(template_ids), json.dumps(integration_ids),
+                    datetime.now().isoformat(), status, 0.0
+                ))
+                mapping_id = cursor.lastrowid
+                self._write_members(cursor, mapping_id, template_ids, integration_ids)
+                
+                # Update template usage metrics
+                for template_id in template_ids:
+                    self._update_template_usage(cursor, template_id)
+                
+                # Update integration metrics
+                for integration_id in integration_ids:
+                    self._update_integration_usage(cursor, integration_id)
+                
+                self._apply_rollups(cursor, mapping_id, 1)
             return True
             
         except Exception as e:
@@ -167,9 +395,6 @@ class UnifiedAnalytics:
                             blockers: Optional[List[str]] = None) -> bool:
         """Update project status and metrics"""
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            
             update_fields = ["status = ?"]
             update_values = [status]
             
@@ -185,16 +410,23 @@ class UnifiedAnalytics:
                 update_fields.append("completion_time = ?")
                 update_values.append(datetime.now().isoformat())
             
-            update_values.append(project_id)
-            
-            cursor.execute(f'''
-                UPDATE prp_project_mappings 
-                SET {", ".join(update_fields)}
-                WHERE project_id = ?
-            ''', update_values)
-            
-            conn.commit()
-            conn.close()
+            conn = self._connection()
+            with conn:
+                cursor = conn.cursor()
+                mapping_ids = [row[0] for row in cursor.execute(
+                    "SELECT id FROM prp_project_mappings WHERE project_id = ?", (project_id,)
+                )]
+                
+                for mapping_id in mapping_ids:
+                    self._apply_rollups(cursor, mapping_id, -1)
+                    cursor.execute(f'''
+                        UPDATE prp_project_mappings 
+                        SET {", ".join(update_fields)}
+                        WHERE id = ?
+                    ''', update_values + [mapping_id])
+                    if blockers is not None:
+                        self._write_blockers(cursor, mapping_id, blockers)
+                    self._apply_rollups(cursor, mapping_id, 1)
             return True
             
         except Exception as e:
@@ -231,18 +463,16 @@ class UnifiedAnalytics:
     
     def get_prp_success_patterns(self) -> List[Dict]:
         """Identify successful PRP patterns for recommendations"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connection().cursor()
         
         cursor.execute('''
             SELECT prp_id, template_ids, integration_ids, success_score, completion_time
             FROM prp_project_mappings
-            WHERE success_score >= 0.8 AND status = 'completed'
+            WHERE success_score >= ? AND status = 'completed'
             ORDER BY success_score DESC
-        ''')
+        ''', (SUCCESS_SCORE_THRESHOLD,))
         
         results = cursor.fetchall()
-        conn.close()
         
         patterns = []
         for row in results:
@@ -259,25 +489,24 @@ class UnifiedAnalytics:
     
     def get_template_recommendations(self, prp_content: str, tech_stack: List[str]) -> List[str]:
         """Get template recommendations based on PRP content and success patterns"""
-        patterns = self.get_prp_success_patterns()
-        
         # Analyze PRP content for similar patterns
         content_keywords = self._extract_keywords(prp_content)
         
-        # Score templates based on past success
-        template_scores = defaultdict(float)
+        # Pattern similarity does not vary per pattern yet, so the summed
+        # success scores kept in template_metrics rank templates directly
+        similarity = self._calculate_similarity(content_keywords, tech_stack, {})
+        if similarity <= 0.5:  # Not similar enough to be relevant
+            return []
         
-        for pattern in patterns:
-            # Check if this pattern matches current PRP characteristics
-            similarity = self._calculate_similarity(content_keywords, tech_stack, pattern)
-            
-            if similarity > 0.5:  # Similar enough to be relevant
-                for template_id in pattern["template_ids"]:
-                    template_scores[template_id] += pattern["success_score"] * similarity
-        
-        # Sort by score and return top recommendations
-        sorted_templates = sorted(template_scores.items(), key=lambda x: x[1], reverse=True)
-        return [template_id for template_id, score in sorted_templates[:5]]
+        cursor = self._connection().cursor()
+        cursor.execute('''
+            SELECT template_id
+            FROM template_metrics
+            WHERE success_count > 0
+            ORDER BY success_score_total DESC, template_id
+            LIMIT 5
+        ''')
+        return [row[0] for row in cursor.fetchall()]
     
     def get_integration_recommendations(self, prp_content: str, 
                                      project_complexity: str) -> List[str]:
@@ -329,18 +558,17 @@ class UnifiedAnalytics:
     
     def get_analytics_dashboard(self) -> Dict:
         """Generate comprehensive analytics dashboard"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connection().cursor()
         
         # Overall metrics
-        cursor.execute('SELECT COUNT(*) FROM prp_project_mappings')
+        cursor.execute('SELECT COALESCE(SUM(project_count), 0) FROM status_rollup')
         total_projects = cursor.fetchone()[0]
         
-        cursor.execute('SELECT COUNT(*) FROM prp_project_mappings WHERE status = "completed"')
-        completed_projects = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT AVG(success_score) FROM prp_project_mappings WHERE status = "completed"')
-        avg_success_score = cursor.fetchone()[0] or 0.0
+        cursor.execute(
+            "SELECT project_count, success_score_total FROM status_rollup WHERE status = 'completed'"
+        )
+        completed_projects, completed_score_total = cursor.fetchone() or (0, 0.0)
+        avg_success_score = completed_score_total / completed_projects if completed_projects else 0.0
         
         # Template metrics
         cursor.execute('''
@@ -371,8 +599,6 @@ class UnifiedAnalytics:
         ''')
         recent_activity = cursor.fetchall()
         
-        conn.close()
-        
         return {
             "overview": {
                 "total_projects": total_projects,
@@ -410,38 +636,26 @@ class UnifiedAnalytics:
     
     def identify_bottlenecks(self) -> Dict:
         """Identify bottlenecks in the PRP → Project flow"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._connection().cursor()
         
         # Projects stuck in phases
         cursor.execute('''
-            SELECT status, COUNT(*) as count
-            FROM prp_project_mappings
-            WHERE status NOT IN ('completed', 'archived')
-            GROUP BY status
+            SELECT status, project_count
+            FROM status_rollup
+            WHERE status NOT IN ('completed', 'archived') AND project_count > 0
+            ORDER BY status
         ''')
         stuck_projects = cursor.fetchall()
         
         # Common blockers
         cursor.execute('''
-            SELECT blockers
-            FROM prp_project_mappings
-            WHERE blockers IS NOT NULL AND blockers != '[]'
+            SELECT blocker, count
+            FROM blocker_rollup
+            WHERE count > 0
+            ORDER BY count DESC, blocker
+            LIMIT 10
         ''')
-        blocker_data = cursor.fetchall()
-        
-        # Parse blockers
-        all_blockers = []
-        for row in blocker_data:
-            blockers = json.loads(row[0])
-            all_blockers.extend(blockers)
-        
-        # Count blocker frequency
-        blocker_counts = defaultdict(int)
-        for blocker in all_blockers:
-            blocker_counts[blocker] += 1
-        
-        conn.close()
+        common_blockers = cursor.fetchall()
         
         return {
             "stuck_projects": [
@@ -450,7 +664,7 @@ class UnifiedAnalytics:
             ],
             "common_blockers": [
                 {"blocker": blocker, "count": count}
-                for blocker, count in sorted(blocker_counts.items(), key=lambda x: x[1], reverse=True)[:10]
+                for blocker, count in common_blockers
             ]
         }
     
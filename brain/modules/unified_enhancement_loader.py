@@ -8,6 +8,8 @@ that automatically activate appropriate intelligence layers based on command con
 
 import logging
 import asyncio
+import os
+import sys
 from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime
 from dataclasses import dataclass
@@ -33,6 +35,12 @@ except ImportError:
     AAIConfidenceScorer = None
     BRAIN_AVAILABLE = False
 
+try:
+    from brain.modules.trigger_rule_engine import TriggerRuleEngine
+except ImportError:
+    sys.path.append(os.path.dirname(__file__))
+    from trigger_rule_engine import TriggerRuleEngine
+
 logger = logging.getLogger(__name__)
 
 
@@ -82,8 +90,9 @@ class UnifiedEnhancementLoader(BrainModule if BRAIN_AVAILABLE else object):
         self.command_processor: Optional[EnhancedCommandProcessor] = None
         self.confidence_scorer: Optional[AAIConfidenceScorer] = None
         
-        # Enhancement triggers registry
+        # Enhancement triggers registry, compiled once into the rule engine
         self.enhancement_triggers = self._initialize_enhancement_triggers()
+        self.trigger_engine = self._build_trigger_engine()
         
         # Active enhancement sessions
         self.active_sessions = {}
@@ -279,28 +288,26 @@ class UnifiedEnhancementLoader(BrainModule if BRAIN_AVAILABLE else object):
             activated_triggers = []
             enhancement_layers = set()
             
-            # Evaluate each trigger
-            for trigger_name, trigger in self.enhancement_triggers.items():
-                should_activate, confidence = await self._evaluate_single_trigger(
-                    trigger, context
-                )
+            # Evaluate all triggers against one shared feature vector;
+            # each hit's value is the trigger confidence
+            matched, _ = self.trigger_engine.evaluate(context)
+            for trigger_name, confidence in matched.items():
+                trigger = self.enhancement_triggers[trigger_name]
+                activated_triggers.append({
+                    "name": trigger_name,
+                    "type": trigger.trigger_type.value,
+                    "layers": trigger.enhancement_layers,
+                    "confidence": confidence,
+                    "priority": trigger.priority
+                })
+                
+                # Add layers to active set
+                enhancement_layers.update(trigger.enhancement_layers)
                 
-                if should_activate:
-                    activated_triggers.append({
-                        "name": trigger_name,
-                        "type": trigger.trigger_type.value,
-                        "layers": trigger.enhancement_layers,
-                        "confidence": confidence,
-                        "priority": trigger.priority
-                    })
-                    
-                    # Add layers to active set
-                    enhancement_layers.update(trigger.enhancement_layers)
-                    
-                    # Track activation
-                    if trigger_name not in self.trigger_activations:
-                        self.trigger_activations[trigger_name] = 0
-                    self.trigger_activations[trigger_name] += 1
+                # Track activation
+                if trigger_name not in self.trigger_activations:
+                    self.trigger_activations[trigger_name] = 0
+                self.trigger_activations[trigger_name] += 1
             
             # Sort by priority
             activated_triggers.sort(key=lambda x: x["priority"], reverse=True)
@@ -345,74 +352,64 @@ class UnifiedEnhancementLoader(BrainModule if BRAIN_AVAILABLE else object):
                 "error": str(e)
             }
     
-    async def _evaluate_single_trigger(self, 
-                                     trigger: EnhancementTrigger,
-                                     context: Dict[str, Any]) -> Tuple[bool, float]:
-        """Evaluate a single enhancement trigger"""
+    def _build_trigger_engine(self) -> TriggerRuleEngine:
+        """Compile every trigger and register the shared prompt features"""
         
-        try:
-            command_type = context.get("command_type", "")
+        engine = TriggerRuleEngine()
+        
+        # One substring pass per distinct keyword serves every trigger
+        keywords = sorted({
+            keyword
+            for trigger in self.enhancement_triggers.values()
+            for keyword in trigger.conditions.get("keywords", []) + trigger.conditions.get("workflow_indicators", [])
+        })
+        
+        def keyword_hits(context: Dict[str, Any]) -> frozenset:
             prompt = context.get("prompt", "").lower()
-            args = context.get("args", {})
-            
-            if trigger.trigger_type == TriggerType.ALWAYS:
-                # Always active triggers
-                return True, 0.95
-            
-            elif trigger.trigger_type == TriggerType.COMMAND_SPECIFIC:
-                # Command-specific triggers
-                required_command = trigger.conditions.get("command", "")
-                if command_type == required_command:
-                    return True, 0.90
-                else:
-                    return False, 0.70
-            
-            elif trigger.trigger_type == TriggerType.CONTEXT_BASED:
-                # Context-based triggers
-                keywords = trigger.conditions.get("keywords", [])
-                min_matches = trigger.conditions.get("min_matches", 1)
-                
-                matches = sum(1 for keyword in keywords if keyword in prompt)
-                
-                if matches >= min_matches:
-                    confidence = min(0.95, 0.70 + (matches * 0.05))
-                    return True, confidence
-                else:
-                    return False, 0.70
-            
-            elif trigger.trigger_type == TriggerType.CONDITIONAL:
-                # Conditional triggers
-                confidence_score = 0.70
-                
-                # Check complexity threshold
-                complexity_threshold = trigger.conditions.get("complexity_threshold", 1.0)
-                prompt_complexity = len(prompt.split()) / 100  # Simple complexity measure
-                
-                if prompt_complexity >= complexity_threshold:
-                    confidence_score += 0.1
-                
-                # Check prompt length
-                min_length = trigger.conditions.get("prompt_length", 0)
-                if len(prompt) >= min_length:
-                    confidence_score += 0.1
-                
-                # Check workflow indicators
-                workflow_indicators = trigger.conditions.get("workflow_indicators", [])
-                workflow_matches = sum(1 for indicator in workflow_indicators if indicator in prompt)
-                min_workflow_matches = trigger.conditions.get("min_matches", 1)
-                
-                if workflow_matches >= min_workflow_matches:
-                    confidence_score += 0.1
-                
-                should_activate = confidence_score >= trigger.confidence_threshold
-                return should_activate, min(0.95, confidence_score)
-            
-            else:
-                return False, 0.70
-                
-        except Exception as e:
-            logger.error(f"Single trigger evaluation failed: {e}")
-            return False, 0.70
+            return frozenset(keyword for keyword in keywords if keyword in prompt)
+        
+        engine.register_feature("keyword_hits", keyword_hits)
+        engine.register_feature("command_type", lambda context: context.get("command_type", ""))
+        engine.register_feature("prompt_words", lambda context: len(context.get("prompt", "").split()))
+        engine.register_feature("prompt_length", lambda context: len(context.get("prompt", "").lower()))
+        
+        for trigger_name, trigger in self.enhancement_triggers.items():
+            engine.add_rule(trigger_name, self._compile_trigger_condition(trigger))
+        return engine
+    
+    def _compile_trigger_condition(self, trigger: EnhancementTrigger) -> str:
+        """
+        Translate a trigger definition into a condition expression that
+        evaluates to the trigger confidence when it activates, else 0.
+        """
+        
+        conditions = trigger.conditions
+        
+        if trigger.trigger_type == TriggerType.ALWAYS:
+            return "0.95"
+        
+        if trigger.trigger_type == TriggerType.COMMAND_SPECIFIC:
+            return f"0.90 if command_type == {conditions.get('command', '')!r} else 0"
+        
+        if trigger.trigger_type == TriggerType.CONTEXT_BASED:
+            keywords = sorted(set(conditions.get("keywords", [])))
+            return (
+                f"min(0.95, 0.70 + matches * 0.05) "
+                f"if (matches := len(keyword_hits & frozenset({keywords!r}))) >= {conditions.get('min_matches', 1)} "
+                f"else 0"
+            )
+        
+        if trigger.trigger_type == TriggerType.CONDITIONAL:
+            indicators = sorted(set(conditions.get("workflow_indicators", [])))
+            score = (
+                f"0.70"
+                f" + 0.1 * (prompt_words / 100 >= {conditions.get('complexity_threshold', 1.0)!r})"
+                f" + 0.1 * (prompt_length >= {conditions.get('prompt_length', 0)!r})"
+                f" + 0.1 * (len(keyword_hits & frozenset({indicators!r})) >= {conditions.get('min_matches', 1)!r})"
+            )
+            return f"min(0.95, score) if (score := {score}) >= {trigger.confidence_threshold!r} else 0"
+        
+        return "0"
     
     def _generate_trigger_reasoning(self, 
                                   activated_triggers: List[Dict[str, Any]],
@@ -632,6 +629,7 @@ class UnifiedEnhancementLoader(BrainModule if BRAIN_AVAILABLE else object):
             "total_triggers": len(self.enhancement_triggers),
             "active_sessions": len(self.active_sessions),
             "trigger_activations": trigger_stats,
+            "trigger_engine": self.trigger_engine.get_stats(),
             "session_counter": self.session_counter,
             "cache_timeout": self.cache_timeout,
             "enhancement_layers": [
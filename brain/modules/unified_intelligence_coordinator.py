@@ -8,6 +8,9 @@ all enhancement systems into AAI's existing brain infrastructure with enhanced t
 
 import logging
 import asyncio
+import os
+import sys
+from functools import lru_cache
 from typing import Dict, List, Any, Optional, Set, Tuple
 from datetime import datetime, timedelta
 from dataclasses import dataclass
@@ -52,9 +55,26 @@ except ImportError:
     TechStackExpertModule = None
     ENHANCED_MODULES_AVAILABLE = False
 
+try:
+    from brain.modules.trigger_rule_engine import TriggerRuleEngine
+except ImportError:
+    sys.path.append(os.path.dirname(__file__))
+    from trigger_rule_engine import TriggerRuleEngine
+
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=1024)
+def _prompt_keywords(prompt: str) -> frozenset:
+    """Lower-cased word set of a prompt, cached across pattern comparisons"""
+    return frozenset(prompt.lower().split())
+
+
+def _keyword_similarity(a: frozenset, b: frozenset) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
 class IntelligenceMode(Enum):
     """Intelligence enhancement modes"""
     BASELINE = "baseline"  # Standard AAI functionality
@@ -126,8 +146,9 @@ class UnifiedIntelligenceCoordinator(BrainModule if BRAIN_AVAILABLE else object)
         self.active_enhancements = set()
         self.coordination_sessions = {}
         
-        # Enhanced Smart Module Loading rules
+        # Enhanced Smart Module Loading rules, compiled once into the rule engine
         self.enhanced_triggers = self._initialize_enhanced_triggers()
+        self.trigger_engine = self._build_trigger_engine()
         
         # Performance tracking
         self.enhancement_performance = {
@@ -447,16 +468,16 @@ class UnifiedIntelligenceCoordinator(BrainModule if BRAIN_AVAILABLE else object)
             enhancement_layers = set()
             coordination_modes = []
             
-            for trigger_name, trigger_config in self.enhanced_triggers.items():
-                if await self._evaluate_trigger_condition(trigger_config["condition"], context):
-                    triggered_enhancements.append({
-                        "name": trigger_name,
-                        "config": trigger_config,
-                        "priority": trigger_config.get("priority", 50)
-                    })
-                    enhancement_layers.update(trigger_config.get("enhancement_layers", []))
-                    if "coordination_mode" in trigger_config:
-                        coordination_modes.append(trigger_config["coordination_mode"])
+            for trigger_name in await self._evaluate_triggers(context):
+                trigger_config = self.enhanced_triggers[trigger_name]
+                triggered_enhancements.append({
+                    "name": trigger_name,
+                    "config": trigger_config,
+                    "priority": trigger_config.get("priority", 50)
+                })
+                enhancement_layers.update(trigger_config.get("enhancement_layers", []))
+                if "coordination_mode" in trigger_config:
+                    coordination_modes.append(trigger_config["coordination_mode"])
             
             # Sort by priority
             triggered_enhancements.sort(key=lambda x: x["priority"], reverse=True)
@@ -517,88 +538,64 @@ class UnifiedIntelligenceCoordinator(BrainModule if BRAIN_AVAILABLE else object)
                 reasoning=f"Enhancement decision failed: {str(e)}"
             )
     
-    async def _evaluate_trigger_condition(self, condition: str, context: Dict[str, Any]) -> bool:
-        """Evaluate a trigger condition against context"""
+    def _build_trigger_engine(self) -> TriggerRuleEngine:
+        """Compile trigger conditions and register the shared context features"""
         
-        try:
-            # Build evaluation context
-            eval_context = {
-                "command_type": context["command_type"],
-                "prompt": context["prompt"],
-                "args": context["args"],
-                "user_id": context["user_id"],
-                "len": len,
-                "any": any,
-                "all": all
-            }
-            
-            # Add user history check
-            eval_context["user_has_history"] = len(self.usage_patterns.get(context["user_id"], [])) > 0
-            eval_context["similar_previous_task_found"] = await self._check_similar_previous_task(context)
-            
-            # Add confidence from previous patterns
-            eval_context["confidence"] = await self._estimate_confidence_from_patterns(context)
-            
-            # Safely evaluate condition
-            result = eval(condition, {"__builtins__": {}}, eval_context)
-            return bool(result)
-            
-        except Exception as e:
-            logger.error(f"Trigger condition evaluation failed: {e}")
-            return False
+        engine = TriggerRuleEngine()
+        engine.register_feature(
+            "user_has_history",
+            lambda context: len(self.usage_patterns.get(context["user_id"], [])) > 0
+        )
+        engine.register_feature(("similar_previous_task_found", "confidence"), self._pattern_features)
+        
+        for trigger_name, trigger_config in self.enhanced_triggers.items():
+            engine.add_rule(trigger_name, trigger_config["condition"])
+        return engine
     
-    async def _check_similar_previous_task(self, context: Dict[str, Any]) -> bool:
-        """Check if user has similar previous tasks"""
+    async def _evaluate_triggers(self, context: Dict[str, Any]) -> List[str]:
+        """Evaluate all trigger conditions against one shared feature vector"""
         
         try:
-            user_patterns = self.usage_patterns.get(context["user_id"], [])
-            if not user_patterns:
-                return False
-            
-            # Simple similarity check based on command type and keywords
-            current_keywords = set(context["prompt"].lower().split())
-            
-            for pattern in user_patterns[-10:]:  # Check last 10 patterns
-                if pattern.get("command_type") == context["command_type"]:
-                    pattern_keywords = set(pattern.get("prompt", "").lower().split())
-                    similarity = len(current_keywords & pattern_keywords) / len(current_keywords | pattern_keywords)
-                    if similarity > 0.3:  # 30% keyword overlap
-                        return True
-            
-            return False
-            
+            matched, _ = self.trigger_engine.evaluate(context)
+            return list(matched)
         except Exception as e:
-            logger.error(f"Similar task check failed: {e}")
-            return False
+            logger.error(f"Trigger evaluation failed: {e}")
+            return []
     
-    async def _estimate_confidence_from_patterns(self, context: Dict[str, Any]) -> float:
-        """Estimate confidence based on usage patterns"""
+    def _pattern_features(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Similar-task and pattern-confidence features from one pass over the
+        user's recent patterns.
+        
+        A similar previous task is one of the last 10 patterns with the same
+        command type and over 30% keyword overlap; confidence averages the
+        last 20 patterns with over 20% overlap.
+        """
         
+        features = {"similar_previous_task_found": False, "confidence": 0.70}
         try:
             user_patterns = self.usage_patterns.get(context["user_id"], [])
             if not user_patterns:
-                return 0.70  # Default confidence
+                return features
             
-            # Calculate average confidence from similar patterns
+            current_keywords = _prompt_keywords(context["prompt"])
+            recent = user_patterns[-20:]
             similar_confidences = []
-            current_keywords = set(context["prompt"].lower().split())
             
-            for pattern in user_patterns[-20:]:  # Check last 20 patterns
-                pattern_keywords = set(pattern.get("prompt", "").lower().split())
-                similarity = len(current_keywords & pattern_keywords) / len(current_keywords | pattern_keywords)
-                
-                if similarity > 0.2:  # 20% similarity threshold
-                    pattern_confidence = pattern.get("confidence", 0.70)
-                    similar_confidences.append(pattern_confidence)
+            for index, pattern in enumerate(recent):
+                similarity = _keyword_similarity(current_keywords, _prompt_keywords(pattern.get("prompt", "")))
+                if similarity > 0.2:
+                    similar_confidences.append(pattern.get("confidence", 0.70))
+                if (similarity > 0.3 and index >= len(recent) - 10
+                        and pattern.get("command_type") == context["command_type"]):
+                    features["similar_previous_task_found"] = True
             
             if similar_confidences:
-                return sum(similar_confidences) / len(similar_confidences)
-            else:
-                return 0.70
+                features["confidence"] = sum(similar_confidences) / len(similar_confidences)
                 
         except Exception as e:
-            logger.error(f"Confidence estimation failed: {e}")
-            return 0.70
+            logger.error(f"Pattern feature extraction failed: {e}")
+        return features
     
     def _estimate_resource_requirements(self, enhancement_layers: Set[str], context: Dict[str, Any]) -> Dict[str, Any]:
         """Estimate resource requirements for enhancement layers"""
@@ -983,6 +980,8 @@ class UnifiedIntelligenceCoordinator(BrainModule if BRAIN_AVAILABLE else object)
             }
             
             trigger_name = f"LEARNED_{rule_key.upper()}_OPTIMIZATION"
+            if self.trigger_engine.add_rule(trigger_name, new_trigger["condition"]) is None:
+                return
             self.enhanced_triggers[trigger_name] = new_trigger
             
             logger.info(f"Promoted optimization rule to trigger: {trigger_name}")
@@ -1128,6 +1127,7 @@ class UnifiedIntelligenceCoordinator(BrainModule if BRAIN_AVAILABLE else object)
             "brain_integration": BRAIN_AVAILABLE,
             "current_intelligence_mode": self.current_mode.value,
             "enhancement_triggers": len(self.enhanced_triggers),
+            "trigger_engine": self.trigger_engine.get_stats(),
             "learned_optimizations": len(self.learned_optimizations),
             "performance_metrics": {
                 "total_enhancements": total_enhancements,
@@ -7,6 +7,7 @@ HuggingFace, Ollama, and OpenRouter services.
 from .model_router import ModelRouter, InferenceRequest, InferenceResponse
 from .huggingface_client import HuggingFaceClient
 from .ollama_client import OllamaClient
+from .prompt_cache import InferenceSession, PromptPrefixCache
 
 __version__ = "1.0.0"
 
@@ -15,5 +16,7 @@ __all__ = [
     "InferenceRequest", 
     "InferenceResponse",
     "HuggingFaceClient",
-    "OllamaClient"
+    "OllamaClient",
+    "InferenceSession",
+    "PromptPrefixCache"
 ]
\ No newline at end of file
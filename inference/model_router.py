@@ -13,6 +13,7 @@ import logging
 
 from agents.r1_reasoning.config import R1ReasoningConfig
 from agents.r1_reasoning.models import InferenceBackend, ModelInferenceConfig
+from inference.prompt_cache import InferenceSession
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +40,7 @@ class InferenceRequest:
     timeout_seconds: int = 60
     prefer_local: bool = False
     require_streaming: bool = False
+    session: Optional[InferenceSession] = None  # Shares prompt-prefix context across calls
 
 
 @dataclass
@@ -230,7 +232,8 @@ class ModelRouter:
                     model=model,
                     max_tokens=request.max_tokens,
                     temperature=request.temperature,
-                    timeout=request.timeout_seconds
+                    timeout=request.timeout_seconds,
+                    session=request.session
                 )
             elif backend == InferenceBackend.OPENROUTER:
                 client = await self._get_openrouter_client()
@@ -12,6 +12,7 @@ import logging
 
 import aiohttp
 from agents.r1_reasoning.config import R1ReasoningConfig
+from inference.prompt_cache import InferenceSession, PromptPrefixCache
 
 logger = logging.getLogger(__name__)
 
@@ -26,6 +27,7 @@ class OllamaClient:
     - Model management and loading
     - AAI confidence scoring
     - Custom model configurations
+    - Prompt-prefix reuse via returned context tokens
     """
     
     def __init__(self, config: R1ReasoningConfig = None):
@@ -41,6 +43,9 @@ class OllamaClient:
         self._available_models: Optional[list] = None
         self._models_last_checked = 0.0
         self._model_check_interval = 300  # 5 minutes
+        
+        # Context tokens for previously processed prompt prefixes
+        self.prefix_cache = PromptPrefixCache()
     
     async def _get_session(self) -> aiohttp.ClientSession:
         """Get or create aiohttp session"""
@@ -55,10 +60,15 @@ class OllamaClient:
                       max_tokens: int = 4096,
                       temperature: float = 0.1,
                       timeout: int = 60,
-                      stream: bool = False) -> Dict[str, Any]:
+                      stream: bool = False,
+                      session: Optional[InferenceSession] = None) -> Dict[str, Any]:
         """
         Generate text using Ollama model.
         
+        If the prompt starts with a prefix Ollama has already processed (from
+        the session or the local prefix cache), only the remainder is sent
+        together with the stored context tokens, skipping prefill.
+        
         Args:
             prompt: Input prompt
             model: Model name (e.g., "deepseek-r1:7b-8k")
@@ -66,6 +76,7 @@ class OllamaClient:
             temperature: Sampling temperature
             timeout: Request timeout in seconds
             stream: Whether to stream response
+            session: Optional session carrying context and keep_alive across calls
             
         Returns:
             Dict containing generated text and metadata
@@ -99,10 +110,20 @@ class OllamaClient:
             }
         }
         
+        prefix_length, context = self._match_prefix(model, prompt, session)
+        if context:
+            payload["prompt"] = prompt[prefix_length:]
+            payload["context"] = context
+            if session:
+                session.prefix_hits += 1
+                session.prefill_chars_saved += prefix_length
+        if session:
+            payload["keep_alive"] = session.keep_alive
+        
         try:
-            session = await self._get_session()
+            http = await self._get_session()
             
-            async with session.post(url, json=payload, headers=self.headers) as response:
+            async with http.post(url, json=payload, headers=self.headers) as response:
                 if response.status != 200:
                     error_text = await response.text()
                     raise Exception(f"Ollama API error {response.status}: {error_text}")
@@ -110,7 +131,8 @@ class OllamaClient:
                 if stream:
                     # Handle streaming response
                     generated_text = ""
-                    async for chunk in self._process_streaming_response(response):
+                    result = {}
+                    async for chunk in self._process_streaming_response(response, final=result):
                         generated_text += chunk
                     result_text = generated_text
                 else:
@@ -118,6 +140,13 @@ class OllamaClient:
                     result = await response.json()
                     result_text = result.get("response", "")
                 
+                # Remember the processed prefix for follow-up calls
+                returned_context = result.get("context")
+                if returned_context:
+                    self.prefix_cache.put(model, prompt + result_text, returned_context)
+                if session:
+                    session.record(model, prompt, result_text, returned_context)
+                
                 response_time_ms = int((time.time() - start_time) * 1000)
                 
                 # Calculate confidence score
@@ -137,7 +166,8 @@ class OllamaClient:
                     "confidence_score": confidence_score,
                     "response_time_ms": response_time_ms,
                     "model_used": model,
-                    "success": True
+                    "success": True,
+                    "prefix_reused_chars": prefix_length if context else 0
                 }
                 
         except asyncio.TimeoutError:
@@ -164,7 +194,24 @@ class OllamaClient:
                 "error": str(e)
             }
     
-    async def _process_streaming_response(self, response) -> AsyncGenerator[str, None]:
+    def _match_prefix(self,
+                      model: str,
+                      prompt: str,
+                      session: Optional[InferenceSession] = None) -> tuple:
+        """
+        Find already-processed context for the start of a prompt.
+        
+        Returns:
+            Tuple of (prefix length, context tokens), or (0, None) if none applies
+        """
+        if session and model in session.contexts:
+            transcript, context = session.contexts[model]
+            if prompt.startswith(transcript):
+                return len(transcript), context
+        
+        return self.prefix_cache.match(model, prompt)
+    
+    async def _process_streaming_response(self, response, final: Optional[Dict[str, Any]] = None) -> AsyncGenerator[str, None]:
         """Process streaming response from Ollama"""
         async for chunk in response.content.iter_chunked(1024):
             chunk_text = chunk.decode('utf-8', errors='ignore')
@@ -174,6 +221,8 @@ class OllamaClient:
                 if line.strip():
                     try:
                         data = json.loads(line)
+                        if data.get('done') and final is not None:
+                            final.update(data)
                         if 'response' in data:
                             yield data['response']
                     except json.JSONDecodeError:
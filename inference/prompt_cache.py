@@ -0,0 +1,123 @@
+"""
+Prompt Prefix Reuse for R1 Reasoning Engine
+
+Session-scoped inference state and a local prompt-prefix cache so that
+follow-up calls within one analysis skip re-processing a shared prefix.
+"""
+import hashlib
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InferenceSession:
+    """
+    Inference state carried across calls of one analysis.
+
+    Backends that support it (Ollama) keep the model loaded for keep_alive
+    and continue from the returned context instead of re-reading the prefix.
+    """
+    session_id: str = field(default_factory=lambda: str(uuid.uuid4()))
+    keep_alive: str = "5m"
+    transcript: str = ""
+    contexts: Dict[str, Tuple[str, List[int]]] = field(default_factory=dict)  # model -> (transcript, context)
+    calls: int = 0
+    prefix_hits: int = 0
+    prefill_chars_saved: int = 0
+
+    def continue_with(self, prompt: str) -> str:
+        """Build a follow-up prompt that extends the exchange so far"""
+        if not self.transcript:
+            return prompt
+        return f"{self.transcript}\n\n{prompt}"
+
+    def record(self, model: str, prompt: str, response: str, context: Optional[List[int]] = None):
+        """Record a completed exchange"""
+        self.calls += 1
+        self.transcript = prompt + response
+        if context:
+            self.contexts[model] = (self.transcript, context)
+
+    def get_stats(self) -> Dict[str, int]:
+        """Get session reuse statistics"""
+        return {
+            "calls": self.calls,
+            "prefix_hits": self.prefix_hits,
+            "prefill_chars_saved": self.prefill_chars_saved
+        }
+
+
+class PromptPrefixCache:
+    """
+    LRU cache of backend context tokens keyed by a hash of (model, prompt prefix).
+
+    Only prefix lengths that have been stored are probed, so a lookup hashes
+    a handful of candidate prefixes rather than every possible one.
+    """
+
+    def __init__(self, max_entries: int = 256):
+        """Initialize prefix cache"""
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[str, int, List[int]]]" = OrderedDict()  # key -> (model, length, context)
+        self._lengths: Dict[str, Dict[int, int]] = {}  # model -> {prefix length: entry count}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(model: str, prefix: str) -> str:
+        """Hash a model and prompt prefix"""
+        return hashlib.sha256(f"{model}\x00{prefix}".encode("utf-8")).hexdigest()
+
+    def put(self, model: str, prefix: str, context: List[int]):
+        """Store context tokens for a prompt prefix"""
+        key = self._key(model, prefix)
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self._entries[key] = (model, len(prefix), context)
+            return
+
+        self._entries[key] = (model, len(prefix), context)
+        lengths = self._lengths.setdefault(model, {})
+        lengths[len(prefix)] = lengths.get(len(prefix), 0) + 1
+
+        if len(self._entries) > self.max_entries:
+            _, (old_model, old_length, _) = self._entries.popitem(last=False)
+            old_lengths = self._lengths[old_model]
+            old_lengths[old_length] -= 1
+            if not old_lengths[old_length]:
+                del old_lengths[old_length]
+
+    def match(self, model: str, prompt: str) -> Tuple[int, Optional[List[int]]]:
+        """
+        Find the longest cached prefix of a prompt.
+
+        Returns:
+            Tuple of (prefix length, context tokens), or (0, None) on miss
+        """
+        for length in sorted(self._lengths.get(model, {}), reverse=True):
+            if length > len(prompt):
+                continue
+            key = self._key(model, prompt[:length])
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return length, entry[2]
+
+        self.misses += 1
+        return 0, None
+
+    def get_stats(self) -> Dict[str, float]:
+        """Get cache statistics"""
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0
+        }
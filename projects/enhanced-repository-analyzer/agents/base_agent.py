@@ -13,6 +13,7 @@ from pathlib import Path
 from typing import Any, Dict, List, Optional, AsyncIterator, Set
 from datetime import datetime
 
+from core.analysis_manifest import AnalysisManifest, hash_file_content
 from core.cache_manager import CacheManager
 from core.pattern_registry import PatternRegistry, PatternMatch
 from core.streaming_walker import FileInfo
@@ -49,6 +50,9 @@ class BaseAnalyzerAgent(ABC):
     Provides common functionality for file processing and pattern matching.
     """
     
+    # Bump in subclasses whenever process_file output changes, so cached results are not reused
+    version: str = "1.0.0"
+    
     def __init__(self, 
                  name: str,
                  cache_manager: Optional[CacheManager] = None,
@@ -107,13 +111,21 @@ class BaseAnalyzerAgent(ABC):
     
     async def analyze_streaming(self, 
                               files: AsyncIterator[FileInfo],
-                              progress_callback: Optional[callable] = None) -> AsyncIterator[StreamingAnalysisResult]:
+                              progress_callback: Optional[callable] = None,
+                              manifest: Optional[AnalysisManifest] = None) -> AsyncIterator[StreamingAnalysisResult]:
         """
         Analyze files in streaming mode.
         
+        Results are cached by (agent name, agent version, extension, content
+        hash), so an edited file is re-analyzed and a renamed but unchanged file
+        is not. A cached result may come from another file with the same
+        content, so its path-bound fields are re-stamped from file_info.
+        
         Args:
             files: Async iterator of files to process
             progress_callback: Optional callback for progress updates
+            manifest: Optional repository manifest; unchanged files reuse their
+                recorded content hash instead of being read again
             
         Yields:
             Streaming analysis results as they complete
@@ -133,11 +145,13 @@ class BaseAnalyzerAgent(ABC):
                 cache_key = None
                 
                 if self.cache_manager:
-                    cache_key = f"{self.name}:{file_info.path}"
+                    content_hash = await self._get_content_hash(file_info, manifest)
+                    cache_key = self._content_cache_key(content_hash, file_info)
                     result_data = await self.cache_manager.get(cache_key)
                     
                     if result_data is not None:
                         self.cache_hits += 1
+                        result_data = self._restamp_cached_result(result_data, file_info)
                         processing_time = time.time() - start_time
                         
                         yield StreamingAnalysisResult(
@@ -190,6 +204,73 @@ class BaseAnalyzerAgent(ABC):
                     error=str(e)
                 )
     
+    def open_manifest(self, repo_path: Path) -> Optional[AnalysisManifest]:
+        """
+        Open the repository manifest next to the cache, or None without a cache.
+        
+        Args:
+            repo_path: Path to repository
+            
+        Returns:
+            Manifest to pass to analyze_streaming
+        """
+        if not self.cache_manager:
+            return None
+        return AnalysisManifest.for_repository(repo_path, self.cache_manager.disk_cache_dir)
+    
+    def _content_cache_key(self, content_hash: str, file_info: FileInfo) -> str:
+        """Build the content-addressed cache key; the extension decides the language"""
+        return f"{self.name}:{self.version}:{file_info.extension}:{content_hash}"
+    
+    def _restamp_cached_result(self, data: Dict[str, Any], file_info: FileInfo) -> Dict[str, Any]:
+        """
+        Point a cached result at the file that hit the cache.
+        
+        Args:
+            data: Cached analysis data, shared with other files of the same content
+            file_info: File information for the current file
+            
+        Returns:
+            Copy of data with file_path, file_size and match metadata updated
+        """
+        data = dict(data)
+        if 'file_path' in data:
+            data['file_path'] = str(file_info.path)
+        if 'file_size' in data:
+            data['file_size'] = file_info.size
+        if 'pattern_matches' in data:
+            matches = []
+            for match in data['pattern_matches']:
+                match = dict(match)
+                if 'file_path' in (match.get('metadata') or {}):
+                    match['metadata'] = {**match['metadata'], 'file_path': str(file_info.path)}
+                matches.append(match)
+            data['pattern_matches'] = matches
+        return data
+    
+    async def _get_content_hash(self, file_info: FileInfo, manifest: Optional[AnalysisManifest] = None) -> str:
+        """
+        Get the content hash of a file, reusing the manifest entry when unchanged.
+        
+        Args:
+            file_info: File information
+            manifest: Optional repository manifest
+            
+        Returns:
+            SHA-256 hex digest of the file contents
+        """
+        if manifest:
+            content_hash = manifest.lookup(file_info)
+            if content_hash:
+                return content_hash
+        
+        loop = asyncio.get_event_loop()
+        content_hash = await loop.run_in_executor(None, hash_file_content, file_info.path)
+        
+        if manifest:
+            manifest.record(file_info, content_hash)
+        return content_hash
+    
     def _can_process_file(self, file_info: FileInfo) -> bool:
         """Check if agent can process this file type"""
         if self.supported_extensions and file_info.extension not in self.supported_extensions:
@@ -311,6 +392,7 @@ class BaseAnalyzerAgent(ABC):
             'cache_hits': self.cache_hits,
             'cache_misses': self.cache_misses,
             'cache_hit_rate': cache_hit_rate,
+            'version': self.version,
             'supported_extensions': list(self.supported_extensions),
             'analysis_types': self.analysis_types
         }
@@ -9,7 +9,7 @@ import logging
 import time
 from collections import defaultdict
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 import tree_sitter_languages as tsl
 
 from agents.base_agent import BaseAnalyzerAgent, AnalysisResult
@@ -141,33 +141,30 @@ class StructureAgent(BaseAnalyzerAgent):
                 }
             }
             
-            # Analyze all files
-            for file_path in repo_path.rglob("*"):
-                if file_path.is_file() and file_path.suffix in self.supported_extensions:
-                    file_info = FileInfo(
-                        path=file_path,
-                        size=file_path.stat().st_size,
-                        mime_type=None,
-                        extension=file_path.suffix,
-                        relative_path=str(file_path.relative_to(repo_path))
-                    )
-                    
-                    analysis = await self.process_file(file_info)
-                    
-                    # Aggregate results
-                    language = self.language_map.get(file_path.suffix, 'unknown')
-                    lang_stats = structure_data['languages'][language]
-                    
-                    lang_stats['files'].append(str(file_path))
-                    lang_stats['total_lines'] += analysis.get('lines', 0)
-                    lang_stats['functions'] += analysis.get('function_count', 0)
-                    lang_stats['classes'] += analysis.get('class_count', 0)
-                    lang_stats['complexity'] += analysis.get('complexity', 0.0)
-                    
-                    if 'features' in analysis:
-                        lang_stats['features'].extend(analysis['features'])
-                    
-                    structure_data['file_structure']['total_files'] += 1
+            # Analyze all files; unchanged files are served from the
+            # content-addressed cache without being read again
+            manifest = self.open_manifest(repo_path)
+            async for result in self.analyze_streaming(self._iter_repository_files(repo_path), manifest=manifest):
+                analysis = result.data or {}
+                file_path = result.file_path
+                
+                # Aggregate results
+                language = self.language_map.get(file_path.suffix, 'unknown')
+                lang_stats = structure_data['languages'][language]
+                
+                lang_stats['files'].append(str(file_path))
+                lang_stats['total_lines'] += analysis.get('lines', 0)
+                lang_stats['functions'] += analysis.get('function_count', 0)
+                lang_stats['classes'] += analysis.get('class_count', 0)
+                lang_stats['complexity'] += analysis.get('complexity', 0.0)
+                
+                if 'features' in analysis:
+                    lang_stats['features'].extend(analysis['features'])
+                
+                structure_data['file_structure']['total_files'] += 1
+            
+            if manifest:
+                await asyncio.get_event_loop().run_in_executor(None, manifest.save, True)
             
             # Detect patterns
             structure_data['architecture_patterns'] = self._detect_architecture_patterns(repo_path)
@@ -198,6 +195,20 @@ class StructureAgent(BaseAnalyzerAgent):
                 errors=[str(e)]
             )
     
+    async def _iter_repository_files(self, repo_path: Path) -> AsyncIterator[FileInfo]:
+        """Yield every supported file under repo_path with its size and mtime"""
+        for file_path in repo_path.rglob("*"):
+            if file_path.is_file() and file_path.suffix in self.supported_extensions:
+                stat = file_path.stat()
+                yield FileInfo(
+                    path=file_path,
+                    size=stat.st_size,
+                    mime_type=None,
+                    extension=file_path.suffix,
+                    relative_path=str(file_path.relative_to(repo_path)),
+                    mtime_ns=stat.st_mtime_ns
+                )
+    
     async def process_file(self, file_info: FileInfo) -> Dict[str, Any]:
         """
         Process a single file for structure analysis.
@@ -81,6 +81,10 @@ async def lifespan(app: FastAPI):
         except:
             pass
     
+    # Flush batched cache metadata and release the database connection
+    if app_state['cache_manager']:
+        await app_state['cache_manager'].close()
+    
     logger.info("Enhanced Repository Analyzer API shutdown complete")
 
 app = FastAPI(
@@ -3,7 +3,8 @@ Core infrastructure modules for the Enhanced Repository Analyzer
 """
 
 from .streaming_walker import StreamingFileWalker, FileInfo, FileProcessingResult, BatchProcessingResult
-from .cache_manager import CacheManager, LRUCache
+from .cache_manager import CacheManager, LRUCache, MetadataJournal
+from .analysis_manifest import AnalysisManifest, hash_file_content
 from .pattern_registry import PatternRegistry, CompiledPattern, PatternMatch
 
 __all__ = [
@@ -13,6 +14,9 @@ __all__ = [
     'BatchProcessingResult',
     'CacheManager',
     'LRUCache',
+    'MetadataJournal',
+    'AnalysisManifest',
+    'hash_file_content',
     'PatternRegistry',
     'CompiledPattern',
     'PatternMatch'
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+AnalysisManifest - Repository-level file manifest for incremental analysis
+Remembers the content hash of every file so unchanged files are never re-read
+"""
+
+import hashlib
+import logging
+import sqlite3
+from pathlib import Path
+from typing import Dict, Optional, Set, Tuple
+
+from core.streaming_walker import FileInfo
+
+logger = logging.getLogger(__name__)
+
+# Read size used when hashing file contents
+HASH_CHUNK_SIZE = 1024 * 1024
+
+def hash_file_content(file_path: Path) -> str:
+    """
+    Compute the SHA-256 digest of a file's contents (blocking).
+
+    Args:
+        file_path: Path to the file
+
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+class AnalysisManifest:
+    """
+    Persistent map of relative path -> (size, mtime, content hash).
+
+    A file whose size and mtime match the manifest reuses the recorded
+    content hash, so a re-analysis only reads and hashes files that changed.
+    """
+
+    def __init__(self, manifest_path: Path):
+        """
+        Initialize the manifest, loading existing entries.
+
+        Args:
+            manifest_path: Path to the SQLite manifest database
+        """
+        self.manifest_path = manifest_path
+        self.entries: Dict[str, Tuple[int, int, str]] = {}
+        self._dirty: Dict[str, Tuple[int, int, str]] = {}
+        self._seen: Set[str] = set()
+
+        # Run statistics
+        self.reused = 0
+        self.rehashed = 0
+
+        self.manifest_path.parent.mkdir(parents=True, exist_ok=True)
+        self._load()
+
+    @classmethod
+    def for_repository(cls, repo_path: Path, cache_dir: Path) -> 'AnalysisManifest':
+        """Open the manifest for a repository inside a cache directory"""
+        repo_key = hashlib.sha256(str(Path(repo_path).resolve()).encode()).hexdigest()[:16]
+        return cls(cache_dir / f"manifest_{repo_key}.db")
+
+    def _load(self) -> None:
+        """Create the manifest table and load all entries into memory"""
+        conn = sqlite3.connect(self.manifest_path)
+        try:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS file_manifest (
+                    relative_path TEXT PRIMARY KEY,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    content_hash TEXT NOT NULL
+                )
+            ''')
+            conn.commit()
+
+            for relative_path, size, mtime_ns, content_hash in conn.execute(
+                "SELECT relative_path, size, mtime_ns, content_hash FROM file_manifest"
+            ):
+                self.entries[relative_path] = (size, mtime_ns, content_hash)
+        finally:
+            conn.close()
+
+    def lookup(self, file_info: FileInfo) -> Optional[str]:
+        """
+        Return the recorded content hash if the file is unchanged.
+
+        Args:
+            file_info: File information from the walker
+
+        Returns:
+            Content hash, or None if the file is new or modified
+        """
+        self._seen.add(file_info.relative_path)
+
+        entry = self.entries.get(file_info.relative_path)
+        if entry and file_info.mtime_ns and entry[0] == file_info.size and entry[1] == file_info.mtime_ns:
+            self.reused += 1
+            return entry[2]
+        return None
+
+    def record(self, file_info: FileInfo, content_hash: str) -> None:
+        """Record a freshly computed content hash for a file"""
+        entry = (file_info.size, file_info.mtime_ns, content_hash)
+        self.entries[file_info.relative_path] = entry
+        self._dirty[file_info.relative_path] = entry
+        self._seen.add(file_info.relative_path)
+        self.rehashed += 1
+
+    def save(self, prune: bool = False) -> None:
+        """
+        Persist changed entries in a single transaction.
+
+        Args:
+            prune: Drop entries for files not seen since the manifest was opened
+        """
+        removed = set(self.entries) - self._seen if prune else set()
+        if not self._dirty and not removed:
+            return
+
+        conn = sqlite3.connect(self.manifest_path)
+        try:
+            with conn:
+                conn.executemany(
+                    "INSERT OR REPLACE INTO file_manifest VALUES (?, ?, ?, ?)",
+                    [(path, *entry) for path, entry in self._dirty.items()]
+                )
+                conn.executemany(
+                    "DELETE FROM file_manifest WHERE relative_path = ?",
+                    [(path,) for path in removed]
+                )
+        finally:
+            conn.close()
+
+        for path in removed:
+            del self.entries[path]
+        self._dirty.clear()
+
+        logger.info(f"Manifest saved: {self.rehashed} files rehashed, {self.reused} reused, {len(removed)} pruned")
+
+    def get_statistics(self) -> Dict[str, int]:
+        """Get manifest statistics for the current run"""
+        return {
+            'entries': len(self.entries),
+            'reused': self.reused,
+            'rehashed': self.rehashed,
+            'pending_writes': len(self._dirty)
+        }
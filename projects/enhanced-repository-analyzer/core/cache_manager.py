@@ -49,6 +49,21 @@ class LRUCache:
             self.misses += 1
             return None
     
+    def get_nowait(self, key: str) -> Optional[Any]:
+        """
+        Get item without awaiting the lock.
+        
+        Safe from event-loop code because no other coroutine can run between
+        the lookup and the reorder.
+        """
+        value = self.cache.get(key)
+        if value is not None:
+            self.cache.move_to_end(key)
+            self.hits += 1
+            return value
+        self.misses += 1
+        return None
+    
     async def set(self, key: str, value: Any) -> None:
         """Set item in cache, evicting LRU item if needed"""
         async with self._lock:
@@ -92,6 +107,204 @@ class LRUCache:
             'total_requests': total
         }
 
+class MetadataJournal:
+    """
+    Write-behind journal for cache metadata.
+    
+    Inserts, access-count updates and deletes are recorded in memory and
+    flushed in one transaction over a single long-lived connection, either
+    periodically or when enough changes are pending.
+    """
+    
+    def __init__(self, db_path: Path, flush_interval: float = 5.0, max_pending: int = 1000):
+        """
+        Initialize the metadata journal.
+        
+        Args:
+            db_path: Path to SQLite database for metadata
+            flush_interval: Seconds between background flushes
+            max_pending: Number of pending changes that triggers an early flush
+        """
+        self.db_path = db_path
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        
+        # Pending changes, coalesced per key
+        self._inserts: Dict[str, Dict[str, Any]] = {}
+        self._accesses: Dict[str, List[Any]] = {}  # key -> [count, last_accessed]
+        self._deletes: set = set()
+        
+        self._db: Optional[aiosqlite.Connection] = None
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: Optional[asyncio.Task] = None
+        self._early_flush: Optional[asyncio.Task] = None
+        self.flushes = 0
+    
+    @property
+    def pending(self) -> int:
+        """Number of keys with unflushed changes"""
+        return len(self._inserts) + len(self._accesses) + len(self._deletes)
+    
+    def record_set(self, cache_key: str, size_bytes: int, tags: Optional[List[str]] = None) -> None:
+        """Record a new or replaced cache entry"""
+        now = datetime.now().isoformat()
+        self._accesses.pop(cache_key, None)
+        self._deletes.discard(cache_key)
+        self._inserts[cache_key] = {
+            'created_at': now,
+            'last_accessed': now,
+            'access_count': 1,
+            'size_bytes': size_bytes,
+            'tags': json.dumps(tags or [])
+        }
+        self._after_record()
+    
+    def record_access(self, cache_key: str) -> None:
+        """Record a cache hit"""
+        now = datetime.now().isoformat()
+        insert = self._inserts.get(cache_key)
+        if insert is not None:
+            insert['access_count'] += 1
+            insert['last_accessed'] = now
+        else:
+            access = self._accesses.setdefault(cache_key, [0, now])
+            access[0] += 1
+            access[1] = now
+        self._after_record()
+    
+    def record_delete(self, cache_key: str) -> None:
+        """Record removal of a cache entry"""
+        self._inserts.pop(cache_key, None)
+        self._accesses.pop(cache_key, None)
+        self._deletes.add(cache_key)
+        self._after_record()
+    
+    def _after_record(self) -> None:
+        """Start the background flusher and flush early under load"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # No loop: changes are flushed on the next explicit flush
+        
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = loop.create_task(self._flush_loop())
+        
+        if self.pending >= self.max_pending and (self._early_flush is None or self._early_flush.done()):
+            self._early_flush = loop.create_task(self.flush())
+    
+    async def _flush_loop(self) -> None:
+        """Periodically flush pending changes"""
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            await self.flush()
+    
+    async def _connection(self) -> aiosqlite.Connection:
+        """Get the long-lived database connection"""
+        if self._db is None:
+            self._db = await aiosqlite.connect(self.db_path)
+            await self._db.execute("PRAGMA journal_mode=WAL")
+            await self._db.execute("PRAGMA synchronous=NORMAL")
+        return self._db
+    
+    async def flush(self) -> None:
+        """Write all pending changes in a single transaction"""
+        async with self._flush_lock:
+            if not self.pending:
+                return
+            
+            inserts, self._inserts = self._inserts, {}
+            accesses, self._accesses = self._accesses, {}
+            deletes, self._deletes = self._deletes, set()
+            
+            db = None
+            try:
+                db = await self._connection()
+                await db.executemany(
+                    "DELETE FROM cache_metadata WHERE cache_key = ?",
+                    [(key,) for key in deletes]
+                )
+                await db.executemany('''
+                    INSERT OR REPLACE INTO cache_metadata 
+                    (cache_key, created_at, last_accessed, access_count, size_bytes, tags)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                ''', [
+                    (key, m['created_at'], m['last_accessed'], m['access_count'], m['size_bytes'], m['tags'])
+                    for key, m in inserts.items()
+                ])
+                await db.executemany('''
+                    UPDATE cache_metadata 
+                    SET last_accessed = ?, access_count = access_count + ?
+                    WHERE cache_key = ?
+                ''', [(last, count, key) for key, (count, last) in accesses.items()])
+                await db.commit()
+                self.flushes += 1
+                
+            except Exception as e:
+                logger.error(f"Error flushing cache metadata: {e}")
+                if db is not None:
+                    try:
+                        await db.rollback()
+                    except Exception:
+                        pass
+                self._requeue(inserts, accesses, deletes)
+    
+    def _requeue(self,
+                 inserts: Dict[str, Dict[str, Any]],
+                 accesses: Dict[str, List[Any]],
+                 deletes: set) -> None:
+        """
+        Put the changes of a failed flush back into the pending maps.
+        
+        Changes recorded while the flush was running are newer and win: a
+        newer set or delete replaces the failed change, and newer accesses
+        are added on top of it.
+        """
+        for key in deletes:
+            if key not in self._inserts and key not in self._accesses:
+                self._deletes.add(key)
+        
+        for key, metadata in inserts.items():
+            if key in self._inserts or key in self._deletes:
+                continue
+            newer = self._accesses.pop(key, None)
+            if newer is not None:
+                metadata['access_count'] += newer[0]
+                metadata['last_accessed'] = newer[1]
+            self._inserts[key] = metadata
+        
+        for key, (count, last) in accesses.items():
+            if key in self._inserts or key in self._deletes:
+                continue
+            newer = self._accesses.get(key)
+            if newer is not None:
+                newer[0] += count
+            else:
+                self._accesses[key] = [count, last]
+    
+    async def fetch(self, query: str, params: Tuple = ()) -> List[Tuple]:
+        """Flush pending changes, then run a read query on the shared connection"""
+        await self.flush()
+        db = await self._connection()
+        async with db.execute(query, params) as cursor:
+            return await cursor.fetchall()
+    
+    async def close(self) -> None:
+        """Flush remaining changes and close the connection"""
+        if self._flush_task is not None:
+            self._flush_task.cancel()
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+        
+        if self._early_flush is not None:
+            await asyncio.gather(self._early_flush, return_exceptions=True)
+            self._early_flush = None
+        
+        await self.flush()
+        
+        if self._db is not None:
+            await self._db.close()
+            self._db = None
+
 class CacheManager:
     """
     Multi-layer caching system with memory and disk persistence.
@@ -102,7 +315,8 @@ class CacheManager:
                  memory_size: int = 1000,
                  disk_cache_dir: Optional[Path] = None,
                  db_path: Optional[Path] = None,
-                 ttl_hours: int = 24):
+                 ttl_hours: int = 24,
+                 metadata_flush_interval: float = 5.0):
         """
         Initialize cache manager with multi-layer caching.
         
@@ -111,6 +325,7 @@ class CacheManager:
             disk_cache_dir: Directory for disk cache storage
             db_path: Path to SQLite database for metadata
             ttl_hours: Time-to-live for cached items in hours
+            metadata_flush_interval: Seconds between batched metadata writes
         """
         self.memory_cache = LRUCache(maxsize=memory_size)
         self.disk_cache_dir = disk_cache_dir or Path('.cache')
@@ -123,6 +338,7 @@ class CacheManager:
         
         # Initialize database synchronously
         self._init_database_sync()
+        self.metadata = MetadataJournal(self.db_path, flush_interval=metadata_flush_interval)
         
         # Cache statistics
         self.stats = {
@@ -217,6 +433,9 @@ class CacheManager:
         """
         Get item from cache, checking memory first, then disk.
         
+        Memory hits perform no I/O: the access is only recorded in the metadata
+        journal. Disk reads and unpickling run in a worker thread.
+        
         Args:
             cache_key: Key to retrieve
             
@@ -224,20 +443,20 @@ class CacheManager:
             Cached value or None if not found
         """
         # Check memory cache first
-        value = await self.memory_cache.get(cache_key)
+        value = self.memory_cache.get_nowait(cache_key)
         if value is not None:
             self.stats['memory_hits'] += 1
-            await self._update_metadata(cache_key)
+            self.metadata.record_access(cache_key)
             return value
         
         # Check disk cache
         try:
-            value = self.disk_cache.get(cache_key)
+            value = await asyncio.to_thread(self._disk_get, cache_key)
             if value is not None:
                 self.stats['disk_hits'] += 1
                 # Promote to memory cache
                 await self.memory_cache.set(cache_key, value)
-                await self._update_metadata(cache_key)
+                self.metadata.record_access(cache_key)
                 return value
         except Exception as e:
             logger.error(f"Error reading from disk cache: {e}")
@@ -259,14 +478,33 @@ class CacheManager:
         # Store in memory cache
         await self.memory_cache.set(cache_key, value)
         
-        # Store in disk cache with TTL
+        # Store in disk cache with TTL off the event loop
+        size_bytes = 0
         try:
-            self.disk_cache.set(cache_key, value, expire=self.ttl.total_seconds())
+            size_bytes = await asyncio.to_thread(self._disk_set, cache_key, value)
         except Exception as e:
             logger.error(f"Error writing to disk cache: {e}")
         
         # Update metadata
-        await self._store_metadata(cache_key, value, tags)
+        self.metadata.record_set(cache_key, size_bytes, tags)
+    
+    def _disk_get(self, cache_key: str) -> Optional[Any]:
+        """Read and unpickle a disk cache entry (blocking, runs in a thread)"""
+        payload = self.disk_cache.get(cache_key)
+        if payload is None:
+            return None
+        return pickle.loads(payload)
+    
+    def _disk_set(self, cache_key: str, value: Any) -> int:
+        """
+        Pickle and write a disk cache entry (blocking, runs in a thread).
+        
+        Returns:
+            Size of the pickled payload, used as the metadata size estimate
+        """
+        payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self.disk_cache.set(cache_key, payload, expire=self.ttl.total_seconds())
+        return len(payload)
     
     async def delete(self, cache_key: str) -> bool:
         """Delete item from all cache layers"""
@@ -274,17 +512,12 @@ class CacheManager:
         
         disk_deleted = False
         try:
-            disk_deleted = self.disk_cache.delete(cache_key)
+            disk_deleted = await asyncio.to_thread(self.disk_cache.delete, cache_key)
         except Exception as e:
             logger.error(f"Error deleting from disk cache: {e}")
         
         # Delete metadata
-        async with aiosqlite.connect(self.db_path) as db:
-            await db.execute(
-                "DELETE FROM cache_metadata WHERE cache_key = ?",
-                (cache_key,)
-            )
-            await db.commit()
+        self.metadata.record_delete(cache_key)
         
         return memory_deleted or disk_deleted
     
@@ -293,18 +526,16 @@ class CacheManager:
         expired_count = 0
         cutoff_time = datetime.now() - self.ttl
         
-        async with aiosqlite.connect(self.db_path) as db:
-            # Find expired keys
-            async with db.execute(
-                "SELECT cache_key FROM cache_metadata WHERE created_at < ?",
-                (cutoff_time.isoformat(),)
-            ) as cursor:
-                expired_keys = [row[0] for row in await cursor.fetchall()]
-            
-            # Delete expired items
-            for key in expired_keys:
-                if await self.delete(key):
-                    expired_count += 1
+        # Find expired keys
+        rows = await self.metadata.fetch(
+            "SELECT cache_key FROM cache_metadata WHERE created_at < ?",
+            (cutoff_time.isoformat(),)
+        )
+        
+        # Delete expired items
+        for (key,) in rows:
+            if await self.delete(key):
+                expired_count += 1
         
         self.stats['evictions'] += expired_count
         return expired_count
@@ -354,67 +585,43 @@ class CacheManager:
             logger.error(f"Error in cached analysis: {e}")
             raise
     
-    async def _store_metadata(self, cache_key: str, value: Any, tags: Optional[List[str]] = None):
-        """Store cache metadata in database"""
-        try:
-            # Estimate size
-            size_bytes = len(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
-            
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    INSERT OR REPLACE INTO cache_metadata 
-                    (cache_key, created_at, last_accessed, access_count, size_bytes, tags)
-                    VALUES (?, ?, ?, 1, ?, ?)
-                ''', (
-                    cache_key,
-                    datetime.now().isoformat(),
-                    datetime.now().isoformat(),
-                    size_bytes,
-                    json.dumps(tags or [])
-                ))
-                await db.commit()
-                
-        except Exception as e:
-            logger.error(f"Error storing cache metadata: {e}")
+    async def flush_metadata(self) -> None:
+        """Write pending metadata changes immediately"""
+        await self.metadata.flush()
     
-    async def _update_metadata(self, cache_key: str):
-        """Update access metadata for cache key"""
-        try:
-            async with aiosqlite.connect(self.db_path) as db:
-                await db.execute('''
-                    UPDATE cache_metadata 
-                    SET last_accessed = ?, access_count = access_count + 1
-                    WHERE cache_key = ?
-                ''', (datetime.now().isoformat(), cache_key))
-                await db.commit()
-                
-        except Exception as e:
-            logger.error(f"Error updating cache metadata: {e}")
+    async def close(self) -> None:
+        """Flush metadata and release database and disk cache handles"""
+        await self.metadata.close()
+        self.disk_cache.close()
     
     async def get_statistics(self) -> Dict[str, Any]:
         """Get comprehensive cache statistics"""
         memory_stats = self.memory_cache.get_stats()
         
         # Get disk cache stats
+        disk_size, disk_volume = await asyncio.to_thread(
+            lambda: (len(self.disk_cache), self.disk_cache.volume())
+        )
         disk_stats = {
-            'size': len(self.disk_cache),
-            'volume': self.disk_cache.volume(),
+            'size': disk_size,
+            'volume': disk_volume,
             'directory': str(self.disk_cache_dir)
         }
         
         # Get metadata stats
         metadata_stats = {}
         try:
-            async with aiosqlite.connect(self.db_path) as db:
-                async with db.execute(
-                    "SELECT COUNT(*), SUM(size_bytes), AVG(access_count) FROM cache_metadata"
-                ) as cursor:
-                    row = await cursor.fetchone()
-                    metadata_stats = {
-                        'total_entries': row[0] or 0,
-                        'total_size_mb': (row[1] or 0) / (1024 * 1024),
-                        'avg_access_count': row[2] or 0
-                    }
+            rows = await self.metadata.fetch(
+                "SELECT COUNT(*), SUM(size_bytes), AVG(access_count) FROM cache_metadata"
+            )
+            row = rows[0]
+            metadata_stats = {
+                'total_entries': row[0] or 0,
+                'total_size_mb': (row[1] or 0) / (1024 * 1024),
+                'avg_access_count': row[2] or 0,
+                'pending_writes': self.metadata.pending,
+                'flushes': self.metadata.flushes
+            }
         except Exception as e:
             logger.error(f"Error getting metadata stats: {e}")
         
@@ -5,10 +5,12 @@ Provides 60-80% I/O improvement through efficient streaming and concurrent proce
 """
 
 import asyncio
+import concurrent.futures
+import contextlib
 import os
-from collections import defaultdict
+import threading
 from pathlib import Path
-from typing import AsyncIterator, Dict, List, Optional, Set, Tuple, Any
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Set, Tuple, Any
 import logging
 from dataclasses import dataclass, field
 import time
@@ -16,6 +18,9 @@ import mimetypes
 
 logger = logging.getLogger(__name__)
 
+# Marks the end of a pipeline queue
+_END_OF_STREAM = object()
+
 @dataclass
 class FileInfo:
     """Information about a file for processing"""
@@ -24,6 +29,7 @@ class FileInfo:
     mime_type: Optional[str]
     extension: str
     relative_path: str
+    mtime_ns: int = 0
 
 @dataclass
 class FileProcessingResult:
@@ -50,17 +56,24 @@ class StreamingFileWalker:
     Uses type-based batching to minimize agent switching overhead.
     """
     
-    def __init__(self, max_concurrent: int = 4, batch_size: int = 50):
+    def __init__(self,
+                 max_concurrent: int = 4,
+                 batch_size: int = 50,
+                 queue_size: int = 64,
+                 scan_chunk_size: int = 256):
         """
         Initialize the streaming file walker.
         
         Args:
-            max_concurrent: Maximum number of concurrent file processors
-            batch_size: Number of files to process in each batch
+            max_concurrent: Maximum number of concurrent file processors per file type
+            batch_size: Maximum number of files to process in each batch
+            queue_size: Maximum number of scanned chunks buffered ahead of processing
+            scan_chunk_size: Maximum number of files handed over by the scanner thread at once
         """
         self.max_concurrent = max_concurrent
         self.batch_size = batch_size
-        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.queue_size = queue_size
+        self.scan_chunk_size = scan_chunk_size
         self.agent_registry: Dict[str, Any] = {}
         
         # File type groupings for efficient processing
@@ -88,6 +101,15 @@ class StreamingFileWalker:
             '*.pyc', '*.pyo', '*.so', '*.dylib', '*.dll',
             '.DS_Store', 'Thumbs.db', '*.swp', '*.swo'
         }
+        self._skip_suffixes = tuple(pattern.replace('*', '') for pattern in self.skip_patterns)
+        
+        # Precomputed lookups for the scanner hot path
+        self._extension_types = {
+            extension: file_type
+            for file_type, extensions in self.file_type_groups.items()
+            for extension in extensions
+        }
+        self._mime_types: Dict[str, Optional[str]] = {}
     
     def register_agent(self, file_type: str, agent: Any) -> None:
         """Register an agent for processing specific file types"""
@@ -95,7 +117,12 @@ class StreamingFileWalker:
     
     async def walk_repository(self, repo_path: Path) -> AsyncIterator[BatchProcessingResult]:
         """
-        Walk repository with single-pass traversal and concurrent processing.
+        Walk repository as a producer/consumer pipeline.
+        
+        Directory scanning runs in a worker thread and feeds a bounded queue;
+        type-specific workers drain it into batches and results are yielded in
+        completion order. Every queue is bounded, so a slow consumer throttles
+        the scanner instead of growing memory.
         
         Args:
             repo_path: Path to the repository root
@@ -103,101 +130,249 @@ class StreamingFileWalker:
         Yields:
             BatchProcessingResult for each processed batch
         """
+        result_queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_concurrent * 2)
+        dispatcher = asyncio.create_task(self._dispatch_files(repo_path, result_queue))
+        
+        try:
+            while True:
+                result = await result_queue.get()
+                if result is _END_OF_STREAM:
+                    break
+                yield result
+            
+            # Surface dispatcher failures once the stream has drained
+            await dispatcher
+        except Exception as e:
+            logger.error(f"Error during batch processing: {e}")
+        finally:
+            if not dispatcher.done():
+                dispatcher.cancel()
+                await asyncio.gather(dispatcher, return_exceptions=True)
+    
+    async def iter_files(self, repo_path: Path) -> AsyncIterator[FileInfo]:
+        """
+        Stream FileInfo entries for a repository as they are discovered.
+        
+        The scan runs in a thread and hands over directory-sized chunks through
+        a bounded queue, so the first entries are available immediately.
+        
+        Args:
+            repo_path: Path to the repository root
+            
+        Yields:
+            FileInfo for every file that passes the skip rules
+        """
+        loop = asyncio.get_running_loop()
+        chunk_queue: asyncio.Queue = asyncio.Queue(maxsize=self.queue_size)
+        stop_event = threading.Event()
         start_time = time.time()
-        file_batches = await self._group_files_by_type(repo_path)
+        file_count = 0
         
-        logger.info(f"Repository scan completed in {time.time() - start_time:.2f}s")
-        logger.info(f"Found {sum(len(files) for files in file_batches.values())} files in {len(file_batches)} categories")
+        scanner = loop.run_in_executor(
+            None, self._scan_into_queue, repo_path, chunk_queue, loop, stop_event
+        )
         
-        # Process batches concurrently using TaskGroup (Python 3.11+)
         try:
-            async with asyncio.TaskGroup() as tg:
-                tasks = []
-                for file_type, files in file_batches.items():
-                    if not files:
-                        continue
-                    
-                    # Process files in chunks to avoid memory issues
-                    for i in range(0, len(files), self.batch_size):
-                        batch = files[i:i + self.batch_size]
-                        task = tg.create_task(self._process_file_batch(file_type, batch))
-                        tasks.append(task)
-                
-                # Yield results as they complete
-                for task in tasks:
-                    result = await task
-                    if result:
-                        yield result
-                        
-        except* Exception as eg:
-            # Handle exception group from TaskGroup
-            for e in eg.exceptions:
-                logger.error(f"Error during batch processing: {e}")
+            while True:
+                chunk = await chunk_queue.get()
+                if chunk is _END_OF_STREAM:
+                    break
+                for file_info in chunk:
+                    file_count += 1
+                    yield file_info
+            
+            await scanner
+            logger.info(f"Repository scan completed in {time.time() - start_time:.2f}s ({file_count} files)")
+        finally:
+            # Unblocks the scanner thread if the consumer stopped early
+            stop_event.set()
     
-    async def _group_files_by_type(self, repo_path: Path) -> Dict[str, List[FileInfo]]:
+    async def _dispatch_files(self, repo_path: Path, result_queue: asyncio.Queue) -> None:
         """
-        Group files by type using efficient single-pass traversal.
-        Uses os.scandir for better performance than pathlib.rglob.
+        Route scanned files to per-type worker queues.
+        
+        Workers for a file type are started on the first file of that type.
+        Each type gets its own concurrency limit, so slow files of one type
+        never hold the permits fast types need.
         """
-        batches = defaultdict(list)
-        repo_path_str = str(repo_path)
+        type_queues: Dict[str, asyncio.Queue] = {}
+        workers: List[asyncio.Task] = []
         
-        def should_skip_file(name: str) -> bool:
-            """Check if file should be skipped"""
-            return any(name.endswith(pattern.replace('*', '')) for pattern in self.skip_patterns)
+        try:
+            async with contextlib.aclosing(self.iter_files(repo_path)) as files:
+                async for file_info in files:
+                    file_type = self._get_file_type(file_info.extension)
+                    
+                    queue = type_queues.get(file_type)
+                    if queue is None:
+                        queue = asyncio.Queue(maxsize=self.batch_size * 2)
+                        type_queues[file_type] = queue
+                        semaphore = asyncio.Semaphore(self.max_concurrent)
+                        for _ in range(self.max_concurrent):
+                            workers.append(asyncio.create_task(
+                                self._type_worker(file_type, queue, result_queue, semaphore)
+                            ))
+                    
+                    await queue.put(file_info)
+            
+            for queue in type_queues.values():
+                for _ in range(self.max_concurrent):
+                    await queue.put(_END_OF_STREAM)
+            
+            await asyncio.gather(*workers)
+        except Exception:
+            # The consumer is still reading; let it finish instead of hanging
+            await result_queue.put(_END_OF_STREAM)
+            raise
+        finally:
+            for worker in workers:
+                if not worker.done():
+                    worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+        
+        await result_queue.put(_END_OF_STREAM)
+    
+    async def _type_worker(self,
+                           file_type: str,
+                           queue: asyncio.Queue,
+                           result_queue: asyncio.Queue,
+                           semaphore: asyncio.Semaphore) -> None:
+        """
+        Consume files of one type, batching whatever is already queued.
         
-        def get_file_type(extension: str) -> str:
-            """Map file extension to file type category"""
-            for file_type, extensions in self.file_type_groups.items():
-                if extension in extensions:
-                    return file_type
-            return 'other'
+        A batch is flushed as soon as the queue runs dry, so small or slow
+        scans produce results immediately while busy ones fill up to
+        batch_size.
+        """
+        finished = False
         
-        # Use os.walk with topdown=True for efficient traversal
-        for root, dirs, files in os.walk(repo_path_str, topdown=True):
-            # Modify dirs in-place to skip unwanted directories
-            dirs[:] = [d for d in dirs if d not in self.skip_dirs]
+        while not finished:
+            item = await queue.get()
+            if item is _END_OF_STREAM:
+                break
+            
+            batch = [item]
+            while len(batch) < self.batch_size:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    break
+                if item is _END_OF_STREAM:
+                    finished = True
+                    break
+                batch.append(item)
             
-            root_path = Path(root)
-            relative_root = root_path.relative_to(repo_path)
+            result = await self._process_file_batch(file_type, batch, semaphore)
+            if result:
+                await result_queue.put(result)
+    
+    def _scan_into_queue(self,
+                         repo_path: Path,
+                         chunk_queue: asyncio.Queue,
+                         loop: asyncio.AbstractEventLoop,
+                         stop_event: threading.Event) -> None:
+        """Scanner thread body: push FileInfo chunks onto the event loop queue"""
+        
+        def put(item: Any) -> bool:
+            """Blocking put that gives up once the consumer has gone away"""
+            try:
+                future = asyncio.run_coroutine_threadsafe(chunk_queue.put(item), loop)
+            except RuntimeError:
+                return False  # Event loop closed
             
-            for file_name in files:
-                if should_skip_file(file_name):
-                    continue
-                
-                file_path = root_path / file_name
-                
+            while True:
                 try:
-                    # Get file info efficiently
-                    stat = file_path.stat()
-                    
-                    # Skip empty or huge files
-                    if stat.st_size == 0 or stat.st_size > 10 * 1024 * 1024:  # 10MB limit
-                        continue
-                    
-                    extension = file_path.suffix.lower()
-                    mime_type, _ = mimetypes.guess_type(str(file_path))
-                    
-                    file_info = FileInfo(
-                        path=file_path,
-                        size=stat.st_size,
-                        mime_type=mime_type,
-                        extension=extension,
-                        relative_path=str(relative_root / file_name)
-                    )
-                    
-                    file_type = get_file_type(extension)
-                    batches[file_type].append(file_info)
-                    
-                except (OSError, IOError) as e:
-                    logger.warning(f"Error accessing file {file_path}: {e}")
-                    continue
+                    future.result(timeout=0.1)
+                    return True
+                except concurrent.futures.TimeoutError:
+                    if stop_event.is_set():
+                        future.cancel()
+                        return False
+                except concurrent.futures.CancelledError:
+                    return False
+        
+        try:
+            chunk: List[FileInfo] = []
+            for file_info in self._scan_files(repo_path):
+                chunk.append(file_info)
+                if len(chunk) >= self.scan_chunk_size:
+                    if not put(chunk):
+                        return
+                    chunk = []
+            
+            if chunk and not put(chunk):
+                return
+        except Exception as e:
+            logger.error(f"Repository scan failed for {repo_path}: {e}")
         
-        return dict(batches)
+        put(_END_OF_STREAM)
+    
+    def _scan_files(self, repo_path: Path) -> Iterator[FileInfo]:
+        """
+        Lazily enumerate files using os.scandir with an explicit directory stack.
+        """
+        stack = [(str(repo_path), '')]
+        
+        while stack:
+            directory, relative_dir = stack.pop()
+            
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        name = entry.name
+                        relative_path = f"{relative_dir}{name}"
+                        
+                        try:
+                            if entry.is_dir(follow_symlinks=False):
+                                if name not in self.skip_dirs:
+                                    stack.append((entry.path, f"{relative_path}{os.sep}"))
+                                continue
+                            
+                            if not entry.is_file() or name.endswith(self._skip_suffixes):
+                                continue
+                            
+                            stat = entry.stat()
+                        except OSError as e:
+                            logger.warning(f"Error accessing file {entry.path}: {e}")
+                            continue
+                        
+                        # Skip empty or huge files
+                        if stat.st_size == 0 or stat.st_size > 10 * 1024 * 1024:  # 10MB limit
+                            continue
+                        
+                        extension = os.path.splitext(name)[1].lower()
+                        
+                        yield FileInfo(
+                            path=Path(entry.path),
+                            size=stat.st_size,
+                            mime_type=self._guess_mime_type(extension),
+                            extension=extension,
+                            relative_path=relative_path,
+                            mtime_ns=stat.st_mtime_ns
+                        )
+            except OSError as e:
+                logger.warning(f"Error scanning directory {directory}: {e}")
+    
+    def _get_file_type(self, extension: str) -> str:
+        """Map file extension to file type category"""
+        return self._extension_types.get(extension, 'other')
+    
+    def _guess_mime_type(self, extension: str) -> Optional[str]:
+        """Guess MIME type from extension, memoized per extension"""
+        try:
+            return self._mime_types[extension]
+        except KeyError:
+            mime_type = mimetypes.guess_type(f"file{extension}")[0] if extension else None
+            self._mime_types[extension] = mime_type
+            return mime_type
     
-    async def _process_file_batch(self, file_type: str, files: List[FileInfo]) -> Optional[BatchProcessingResult]:
+    async def _process_file_batch(self,
+                                  file_type: str,
+                                  files: List[FileInfo],
+                                  semaphore: asyncio.Semaphore) -> Optional[BatchProcessingResult]:
         """
-        Process a batch of files of the same type concurrently.
+        Process a batch of files of the same type concurrently, bounded by
+        that type's semaphore.
         """
         if not files:
             return None
@@ -218,7 +393,7 @@ class StreamingFileWalker:
                 errors=[f"No agent available for {file_type} files"]
             )
         
-        # Process files concurrently with semaphore for rate limiting
+        # Process files concurrently with the type's semaphore for rate limiting
         results = []
         errors = []
         
@@ -227,7 +402,7 @@ class StreamingFileWalker:
             file_start = time.time()
             
             try:
-                async with self.semaphore:
+                async with semaphore:
                     # Delegate to agent for actual processing
                     data = await agent.process_file(file_info)
                     
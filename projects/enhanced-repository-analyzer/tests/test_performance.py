@@ -14,6 +14,8 @@ from typing import List
 
 from core.streaming_walker import StreamingFileWalker, FileInfo
 from core.cache_manager import CacheManager
+from core.analysis_manifest import AnalysisManifest
+from agents.base_agent import BaseAnalyzerAgent
 from agents.structure_agent import StructureAgent
 
 @pytest.mark.performance
@@ -74,6 +76,50 @@ async def test_streaming_walker_performance(test_repository, performance_targets
     # Validate execution time is reasonable
     assert single_pass_time <= performance_targets['max_execution_time']
 
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_streaming_walker_completion_order():
+    """Results stream in completion order while the scan is still running"""
+    class SlowAgent:
+        async def process_file(self, file_info: FileInfo) -> dict:
+            await asyncio.sleep(0.2)
+            return {'path': file_info.relative_path}
+    
+    class FastAgent:
+        async def process_file(self, file_info: FileInfo) -> dict:
+            return {'path': file_info.relative_path}
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_path = Path(temp_dir)
+        for i in range(40):
+            (repo_path / f"module_{i}.py").write_text(f"x = {i}\n")
+        for i in range(5):
+            (repo_path / f"config_{i}.json").write_text("{}")
+        (repo_path / "node_modules").mkdir()
+        (repo_path / "node_modules" / "skipped.py").write_text("x = 0\n")
+        
+        walker = StreamingFileWalker(max_concurrent=4, batch_size=10)
+        walker.register_agent('python', SlowAgent())
+        walker.register_agent('config', FastAgent())
+        
+        start_time = time.perf_counter()
+        first_result_time = None
+        file_types = []
+        total_files = 0
+        
+        async for batch_result in walker.walk_repository(repo_path):
+            if first_result_time is None:
+                first_result_time = time.perf_counter() - start_time
+            file_types.append(batch_result.file_type)
+            total_files += batch_result.files_processed
+        
+        print(f"First result after {first_result_time * 1000:.1f}ms")
+        
+        # Fast config batches must not wait behind slow python batches
+        assert file_types[0] == 'config'
+        assert first_result_time < 0.2
+        assert total_files == 45
+
 @pytest.mark.performance
 @pytest.mark.asyncio
 async def test_cache_performance(temp_cache_dir):
@@ -116,6 +162,189 @@ async def test_cache_performance(temp_cache_dir):
     assert speedup >= 10, f"Cache speedup {speedup:.1f}x below 10x expectation"
     assert result1 == result2, "Cached result differs from original"
 
+@pytest.mark.benchmark
+@pytest.mark.asyncio
+async def test_cache_hit_throughput(temp_cache_dir):
+    """Compare memory-hit throughput with write-behind vs per-hit metadata commits"""
+    cache_manager = CacheManager(memory_size=100, disk_cache_dir=temp_cache_dir)
+    keys = [f"key_{i}" for i in range(100)]
+    for key in keys:
+        await cache_manager.set(key, {'value': key})
+    await cache_manager.flush_metadata()
+    
+    iterations = 2000
+    
+    # Before: every hit commits its metadata update, as the old per-hit connection did
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        await cache_manager.get(keys[i % len(keys)])
+        await cache_manager.flush_metadata()
+    per_hit_commit_rate = iterations / (time.perf_counter() - start_time)
+    
+    # After: hits are coalesced in memory and flushed in one transaction
+    start_time = time.perf_counter()
+    for i in range(iterations):
+        await cache_manager.get(keys[i % len(keys)])
+    await cache_manager.flush_metadata()
+    write_behind_rate = iterations / (time.perf_counter() - start_time)
+    
+    print(f"Per-hit commit: {per_hit_commit_rate:,.0f} hits/s")
+    print(f"Write-behind:   {write_behind_rate:,.0f} hits/s")
+    
+    stats = await cache_manager.get_statistics()
+    assert stats['performance']['memory_hits'] == 2 * iterations
+    assert stats['metadata']['avg_access_count'] == pytest.approx(1 + 2 * iterations / len(keys))
+    assert write_behind_rate >= 10 * per_hit_commit_rate
+    
+    await cache_manager.close()
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_incremental_reanalysis(temp_cache_dir):
+    """Re-analysis only processes files whose content changed"""
+    class CountingAgent(BaseAnalyzerAgent):
+        def __init__(self, cache_manager):
+            super().__init__(name="CountingAgent", cache_manager=cache_manager)
+            self.processed = []
+        
+        async def analyze(self, repo_path: Path):
+            raise NotImplementedError
+        
+        async def process_file(self, file_info: FileInfo) -> dict:
+            self.processed.append(file_info.relative_path)
+            return {'size': file_info.size}
+    
+    async def run_analysis(repo_path: Path, agent: CountingAgent) -> int:
+        manifest = AnalysisManifest.for_repository(repo_path, temp_cache_dir)
+        walker = StreamingFileWalker()
+        results = [r async for r in agent.analyze_streaming(walker.iter_files(repo_path), manifest=manifest)]
+        manifest.save(prune=True)
+        return len(results)
+    
+    cache_manager = CacheManager(memory_size=10, disk_cache_dir=temp_cache_dir / 'disk')
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_path = Path(temp_dir)
+        for i in range(100):
+            (repo_path / f"module_{i}.py").write_text(f"x = {i}\n")
+        
+        agent = CountingAgent(cache_manager)
+        assert await run_analysis(repo_path, agent) == 100
+        assert len(agent.processed) == 100
+        
+        # Edit one file and rename another without changing its content
+        (repo_path / "module_0.py").write_text("x = 'edited'\n")
+        (repo_path / "module_1.py").rename(repo_path / "renamed.py")
+        
+        agent.processed.clear()
+        assert await run_analysis(repo_path, agent) == 100
+        assert agent.processed == ["module_0.py"]
+    
+    await cache_manager.close()
+
+@pytest.mark.asyncio
+async def test_identical_content_is_restamped_per_file(temp_cache_dir):
+    """Files sharing content share a cache entry but keep their own path and language"""
+    class PathAgent(BaseAnalyzerAgent):
+        def __init__(self, cache_manager):
+            super().__init__(name="PathAgent", cache_manager=cache_manager)
+            self.processed = []
+        
+        async def analyze(self, repo_path: Path):
+            raise NotImplementedError
+        
+        async def process_file(self, file_info: FileInfo) -> dict:
+            self.processed.append(file_info.relative_path)
+            return {
+                'language': file_info.extension,
+                'file_path': str(file_info.path),
+                'file_size': file_info.size,
+                'pattern_matches': [{'pattern': 'p', 'metadata': {'file_path': str(file_info.path)}}]
+            }
+    
+    cache_manager = CacheManager(memory_size=10, disk_cache_dir=temp_cache_dir / 'disk')
+    agent = PathAgent(cache_manager)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_path = Path(temp_dir)
+        for name in ("original.js", "copy.js", "typed.ts"):
+            (repo_path / name).write_text("export const x = 1;\n")
+        
+        async def files():
+            for name in ("original.js", "copy.js", "typed.ts"):
+                path = repo_path / name
+                yield FileInfo(path=path, size=path.stat().st_size, mime_type=None,
+                               extension=path.suffix, relative_path=name)
+        
+        results = {r.file_path.name: r async for r in agent.analyze_streaming(files())}
+        
+        # Same content under another extension is a different language, so it misses
+        assert agent.processed == ["original.js", "typed.ts"]
+        assert results["copy.js"].analysis_type == 'cached'
+        assert results["typed.ts"].data['language'] == '.ts'
+        
+        copy_data = results["copy.js"].data
+        assert copy_data['file_path'] == str(repo_path / "copy.js")
+        assert copy_data['pattern_matches'][0]['metadata']['file_path'] == str(repo_path / "copy.js")
+        assert results["original.js"].data['file_path'] == str(repo_path / "original.js")
+    
+    await cache_manager.close()
+
+@pytest.mark.performance
+@pytest.mark.asyncio
+async def test_structure_analysis_reuses_manifest(temp_cache_dir):
+    """Repository analysis hashes unchanged files once and serves them from cache"""
+    cache_manager = CacheManager(memory_size=100, disk_cache_dir=temp_cache_dir / 'disk')
+    agent = StructureAgent(cache_manager=cache_manager)
+    
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repo_path = Path(temp_dir)
+        for i in range(20):
+            (repo_path / f"module_{i}.py").write_text(f"def f_{i}():\n    return {i}\n")
+        
+        first = await agent.analyze(repo_path)
+        assert first.success and first.data['file_structure']['total_files'] == 20
+        assert agent.cache_misses == 20
+        
+        second = await agent.analyze(repo_path)
+        assert agent.cache_misses == 20 and agent.cache_hits == 20
+        assert second.data['languages']['python']['functions'] == first.data['languages']['python']['functions']
+        
+        manifest = agent.open_manifest(repo_path)
+        assert len(manifest.entries) == 20
+    
+    await cache_manager.close()
+
+@pytest.mark.asyncio
+async def test_failed_metadata_flush_is_retried(temp_cache_dir):
+    """Changes from a failed flush are kept and merged with newer ones"""
+    cache_manager = CacheManager(memory_size=10, disk_cache_dir=temp_cache_dir / 'disk')
+    journal = cache_manager.metadata
+    for key in ('kept', 'accessed', 'deleted'):
+        await cache_manager.set(key, {'value': key})
+    await journal.flush()
+    
+    await cache_manager.get('accessed')
+    await cache_manager.delete('deleted')
+    await cache_manager.set('fresh', {'value': 'fresh'})
+    
+    real_connection = journal._connection
+    async def broken_connection():
+        # A newer access lands while the failing flush runs
+        journal.record_access('fresh')
+        raise OSError("database is locked")
+    journal._connection = broken_connection
+    await journal.flush()
+    journal._connection = real_connection
+    
+    assert set(journal._inserts) == {'fresh'} and journal._inserts['fresh']['access_count'] == 2
+    assert set(journal._accesses) == {'accessed'} and journal._deletes == {'deleted'}
+    
+    rows = dict(await journal.fetch("SELECT cache_key, access_count FROM cache_metadata"))
+    assert rows == {'kept': 1, 'accessed': 2, 'fresh': 2}
+    
+    await cache_manager.close()
+
 @pytest.mark.performance
 @pytest.mark.asyncio
 async def test_semantic_analysis_accuracy(sample_python_code):
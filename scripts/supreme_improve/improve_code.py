@@ -227,9 +227,9 @@ class SupremeImproveOrchestrator:
             )
             recommendations.extend(additional_recommendations)
         
-        # Predict success probability for each recommendation
-        for recommendation in recommendations:
-            success_probability = self.improvement_tracker.predict_success_probability(recommendation)
+        # Predict success probability for all recommendations in one batch
+        success_probabilities = self.improvement_tracker.predict_many(recommendations)
+        for recommendation, success_probability in zip(recommendations, success_probabilities):
             recommendation.success_probability = success_probability
         
         # Sort by impact and success probability
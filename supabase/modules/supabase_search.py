@@ -6,8 +6,17 @@ Provides unified search across all Supabase-stored data
 
 import os
 import json
-from typing import List, Dict, Any, Optional
-from dataclasses import dataclass
+import time
+import heapq
+import asyncio
+import inspect
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Callable
+from dataclasses import dataclass, field
+
+# Reciprocal-rank fusion constant (Cormack et al.); damps the head of each list
+RRF_K = 60
 
 @dataclass
 class SearchResult:
@@ -19,8 +28,22 @@ class SearchResult:
     score: float
     metadata: Dict[str, Any]
 
+@dataclass
+class FederatedSearchResponse:
+    results: List[SearchResult]
+    fused_scores: Dict[str, float]
+    sources_succeeded: List[str]
+    sources_failed: Dict[str, str]
+    elapsed_ms: int
+    cached: bool = False
+    source_timings_ms: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def partial(self) -> bool:
+        return bool(self.sources_failed)
+
 class SupabaseSearch:
-    def __init__(self):
+    def __init__(self, source_timeout: float = 2.0, cache_ttl: float = 30.0, cache_size: int = 256):
         self.connection_string = os.getenv('DATABASE_URL')
         self.tables = {
             'research': 'aai_research_docs',
@@ -31,26 +54,142 @@ class SupabaseSearch:
             'rule_compliance': 'aai_rule_compliance'
         }
         
+        # Sources queried by search_all; each takes (query, limit) and returns
+        # results ordered by descending score. Sync callables run in a thread.
+        self.sources: Dict[str, Callable[[str, int], Any]] = {
+            'research': self.search_research,
+            'examples': self.search_examples,
+            'ideas': self.search_ideas,
+            'rule_compliance': self.search_rule_compliance
+        }
+        self.source_timeout = source_timeout
+        self.cache_ttl = cache_ttl
+        self.cache_size = cache_size
+        self._result_cache: "OrderedDict[tuple, tuple]" = OrderedDict()
+        # Own pool so a timed-out query never blocks asyncio.run() shutdown
+        self._executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="supabase-search")
+        
     def search_all(self, query: str, limit: int = 10) -> List[SearchResult]:
-        """Search across all content types"""
-        results = []
+        """Search across all content types (sync wrapper around search_all_async)"""
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.search_all_async(query, limit)).results
+        raise RuntimeError(
+            "search_all() cannot run inside an event loop; await search_all_async() instead"
+        )
+    
+    async def search_all_async(self, query: str, limit: int = 10) -> FederatedSearchResponse:
+        """
+        Query every source concurrently and fuse the ranked lists.
+        
+        Sources that fail or exceed source_timeout are left out and reported
+        in sources_failed, so a slow table never holds up the whole search.
+        Complete responses are cached for cache_ttl seconds.
+        """
+        cache_key = (" ".join(query.lower().split()), limit, tuple(self.sources))
+        cached = self._cache_get(cache_key)
+        if cached is not None:
+            return cached
         
-        # Search research documents
-        results.extend(self.search_research(query, limit))
+        start_time = time.perf_counter()
+        names = list(self.sources)
+        outcomes = await asyncio.gather(
+            *(self._query_source(name, query, limit) for name in names),
+            return_exceptions=True
+        )
         
-        # Search code examples
-        results.extend(self.search_examples(query, limit))
+        ranked_lists = []
+        succeeded, failed, timings = [], {}, {}
+        for name, outcome in zip(names, outcomes):
+            if isinstance(outcome, BaseException):
+                failed[name] = "timeout" if isinstance(outcome, asyncio.TimeoutError) else str(outcome) or type(outcome).__name__
+                continue
+            results, timings[name] = outcome
+            succeeded.append(name)
+            ranked_lists.append(results)
         
-        # Search ideas
-        results.extend(self.search_ideas(query, limit))
+        fused, fused_scores = self._fuse_ranked_lists(ranked_lists, limit)
+        response = FederatedSearchResponse(
+            results=fused,
+            fused_scores=fused_scores,
+            sources_succeeded=succeeded,
+            sources_failed=failed,
+            elapsed_ms=int((time.perf_counter() - start_time) * 1000),
+            source_timings_ms=timings
+        )
         
-        # Search rule compliance
-        results.extend(self.search_rule_compliance(query, limit))
+        if not response.partial:
+            self._cache_put(cache_key, response)
+        return response
+    
+    async def _query_source(self, name: str, query: str, limit: int):
+        """Run one source under the per-source timeout; returns (results, ms)"""
+        source = self.sources[name]
+        start_time = time.perf_counter()
+        if inspect.iscoroutinefunction(source):
+            call = source(query, limit)
+        else:
+            call = asyncio.get_running_loop().run_in_executor(self._executor, source, query, limit)
+        results = await asyncio.wait_for(call, timeout=self.source_timeout)
+        return results, int((time.perf_counter() - start_time) * 1000)
+    
+    def _fuse_ranked_lists(self, ranked_lists: List[List[SearchResult]], limit: int):
+        """
+        Reciprocal-rank fusion over per-source lists.
         
-        # Sort by relevance score
-        results.sort(key=lambda x: x.score, reverse=True)
+        Lists are consumed through a k-way heap merge in rank order; a result
+        accumulates 1/(RRF_K + rank) for every rank it is returned at. Results
+        are keyed by "source:id", since ids are only unique within a table.
+        Raw score breaks ties, since scores from different tables are not
+        on a comparable scale.
+        """
+        streams = [
+            ((rank, -result.score, list_index, result) for rank, result in enumerate(results, start=1))
+            for list_index, results in enumerate(ranked_lists)
+        ]
         
-        return results[:limit]
+        fused_scores: Dict[str, float] = {}
+        best: Dict[str, SearchResult] = {}
+        for rank, _, _, result in heapq.merge(*streams, key=lambda item: item[:3]):
+            key = f"{result.source}:{result.id}"
+            fused_scores[key] = fused_scores.get(key, 0.0) + 1.0 / (RRF_K + rank)
+            if key not in best or result.score > best[key].score:
+                best[key] = result
+        
+        top_keys = heapq.nlargest(limit, fused_scores, key=lambda key: (fused_scores[key], best[key].score))
+        return [best[key] for key in top_keys], {key: fused_scores[key] for key in top_keys}
+    
+    def _cache_get(self, key: tuple) -> Optional[FederatedSearchResponse]:
+        entry = self._result_cache.get(key)
+        if entry is None:
+            return None
+        expires_at, response = entry
+        if time.monotonic() >= expires_at:
+            del self._result_cache[key]
+            return None
+        self._result_cache.move_to_end(key)
+        return FederatedSearchResponse(
+            results=list(response.results),
+            fused_scores=dict(response.fused_scores),
+            sources_succeeded=list(response.sources_succeeded),
+            sources_failed={},
+            elapsed_ms=0,
+            cached=True,
+            source_timings_ms={}
+        )
+    
+    def _cache_put(self, key: tuple, response: FederatedSearchResponse):
+        if self.cache_ttl <= 0:
+            return
+        self._result_cache[key] = (time.monotonic() + self.cache_ttl, response)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > self.cache_size:
+            self._result_cache.popitem(last=False)
+    
+    def clear_cache(self):
+        """Drop cached search results (call after writes to the searched tables)"""
+        self._result_cache.clear()
     
     def search_research(self, query: str, limit: int = 10) -> List[SearchResult]:
         """Search research documents using full-text search"""
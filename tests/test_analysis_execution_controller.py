@@ -0,0 +1,215 @@
+"""
+Tests for the adaptive execution controller behind AnalysisOrchestrator
+Per-agent AIMD limits, delayed jittered retries and append-only checkpoints
+"""
+
+import asyncio
+import importlib.util
+import json
+import random
+import sys
+from pathlib import Path
+
+_MODULES_DIR = Path(__file__).parent.parent / "brain" / "modules"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _MODULES_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+controller_module = _load("analysis_execution_controller")
+analyze_orchestrator = _load("analyze_orchestrator")
+AIMDLimiter = controller_module.AIMDLimiter
+ExecutionController = controller_module.ExecutionController
+AnalysisTask = analyze_orchestrator.AnalysisTask
+
+
+def _tasks(agent, count):
+    return [AnalysisTask(id=f"{agent}-{i}", agent_name=agent, command="", focus_area=agent) for i in range(count)]
+
+
+def test_limit_grows_with_fast_successes_and_halves_once_per_window():
+    limiter = AIMDLimiter(initial_limit=2, max_limit=8, latency_floor=0.0)
+    now = 0.0
+    for _ in range(40):
+        while limiter.acquire():
+            pass
+        # Release every slot, each a fast success
+        for _ in range(limiter.in_flight):
+            limiter.release(now, now + 0.01, True)
+        now += 0.01
+    assert limiter.limit == 8
+
+    # A burst of failures from attempts started in the same window cuts once
+    started = now
+    for _ in range(4):
+        assert limiter.acquire()
+    for _ in range(4):
+        limiter.release(started, now + 1.0, False)
+    assert limiter.limit == 4
+    assert limiter.stats["decreases"] == 1
+    assert limiter.error_rate > 0.5
+
+    # Slow successes count as congestion too
+    assert limiter.acquire()
+    limiter.release(now + 2.0, now + 3.0, True)
+    assert limiter.limit == 2
+
+
+def test_failing_agent_type_does_not_throttle_others():
+    async def scenario():
+        controller = ExecutionController(
+            max_retries=3, base_delay=0.05, max_delay=0.05,
+            limiter_options={"initial_limit": 2, "max_limit": 4}, rng=random.Random(0)
+        )
+        in_flight = {"flaky": 0, "steady": 0}
+        peak = {"flaky": 0, "steady": 0}
+        finished = []
+
+        async def attempt(task):
+            agent = task.agent_name
+            in_flight[agent] += 1
+            peak[agent] = max(peak[agent], in_flight[agent])
+            try:
+                await asyncio.sleep(0.005)
+                if agent == "flaky":
+                    raise RuntimeError("529 overloaded")
+                finished.append(task.id)
+                return {"score": 1.0}
+            finally:
+                in_flight[agent] -= 1
+
+        tasks = _tasks("flaky", 4) + _tasks("steady", 12)
+        await controller.run(tasks, attempt)
+        return controller, tasks, peak, finished
+
+    controller, tasks, peak, finished = asyncio.run(scenario())
+
+    assert all(t.status == "failed" and t.retry_count == 3 for t in tasks[:4])
+    assert all(t.status == "completed" and t.result == {"score": 1.0} for t in tasks[4:])
+    assert len(finished) == 12
+    stats = controller.get_stats()
+    assert stats["agents"]["flaky"]["limit"] == 1
+    assert stats["agents"]["steady"]["limit"] > 2
+    assert stats["retries_scheduled"] == 8 and stats["attempts"] == 24
+    assert peak["flaky"] <= 2 and peak["steady"] <= 4
+
+
+def test_retries_wait_on_the_delay_queue_not_in_line():
+    async def scenario():
+        controller = ExecutionController(max_retries=2, base_delay=0.2, max_delay=0.2,
+                                         limiter_options={"initial_limit": 1}, rng=random.Random(3))
+        order = []
+
+        async def attempt(task):
+            order.append(task.id)
+            if task.id == "a-0" and task.retry_count == 0:
+                raise RuntimeError("transient")
+            return {}
+
+        tasks = _tasks("a", 3)
+        await controller.run(tasks, attempt)
+        return order, tasks
+
+    order, tasks = asyncio.run(scenario())
+    # The failed task retries after the others instead of blocking its slot
+    assert order == ["a-0", "a-1", "a-2", "a-0"]
+    assert [t.status for t in tasks] == ["completed"] * 3
+
+
+def test_resume_replays_only_unfinished_tasks(tmp_path, monkeypatch):
+    orchestrator = analyze_orchestrator.AnalysisOrchestrator()
+    orchestrator.checkpoint_file = tmp_path / "checkpoint.jsonl"
+    orchestrator.checkpoint_log = controller_module.CheckpointLog(orchestrator.checkpoint_file)
+    orchestrator.target_path = str(tmp_path)
+    executed = []
+    interrupt = True
+
+    async def fake_analysis(task):
+        executed.append(task.id)
+        if task.id == "arch-1" and interrupt:
+            await asyncio.sleep(0.01)
+            raise KeyboardInterrupt
+        return {"agent": task.agent_name, "score": 0.9}
+
+    monkeypatch.setattr(orchestrator, "execute_real_analysis", fake_analysis)
+    focus, depth = analyze_orchestrator.AnalysisFocus.QUALITY, analyze_orchestrator.AnalysisDepth.DEEP
+
+    # The run dies while the architecture agent is still working
+    try:
+        asyncio.run(orchestrator.analyze(str(tmp_path), focus, depth))
+    except KeyboardInterrupt:
+        pass
+    lines = orchestrator.checkpoint_file.read_text().splitlines()
+    assert [json.loads(line)["status"] for line in lines] == [
+        "pending", "pending", "in_progress", "in_progress", "completed"
+    ]
+    with open(orchestrator.checkpoint_file, "a") as f:
+        f.write('{"id": "arch-1", "sta')
+
+    executed.clear()
+    interrupt = False
+    result = asyncio.run(orchestrator.analyze(str(tmp_path), focus, depth, resume=True))
+
+    assert executed == ["arch-1"]
+    assert result["summary"] == {"total_agents": 2, "successful": 2, "failed": 0}
+    assert set(result["findings"]) == {"code_quality", "architecture"}
+    records = [json.loads(line) for line in orchestrator.checkpoint_file.read_text().splitlines()]
+    assert records[-1]["id"] == "arch-1" and records[-1]["status"] == "completed"
+    assert records[-1]["command"].startswith("SuperClaude /analyze --architecture")
+
+
+def test_cancelled_run_returns_its_slots():
+    async def scenario():
+        controller = ExecutionController(limiter_options={"initial_limit": 2}, rng=random.Random(0))
+        started = asyncio.Event()
+
+        async def hang(task):
+            started.set()
+            await asyncio.sleep(60)
+
+        run = asyncio.ensure_future(controller.run(_tasks("a", 4), hang))
+        await started.wait()
+        run.cancel()
+        try:
+            await run
+        except asyncio.CancelledError:
+            pass
+        assert controller.limiters["a"].in_flight == 0
+
+        async def quick(task):
+            return {"ok": True}
+
+        tasks = await controller.run(_tasks("a", 4), quick)
+        return controller, tasks
+
+    controller, tasks = asyncio.run(scenario())
+    assert [t.status for t in tasks] == ["completed"] * 4
+    assert controller.get_stats()["delayed"] == 0
+
+
+def test_overlapping_runs_share_limits_without_failing():
+    async def scenario():
+        controller = ExecutionController(max_retries=2, base_delay=0.01, max_delay=0.01,
+                                         limiter_options={"initial_limit": 1, "max_limit": 1},
+                                         rng=random.Random(0))
+        in_flight = peak = 0
+
+        async def attempt(task):
+            nonlocal in_flight, peak
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            return {}
+
+        runs = await asyncio.gather(*[controller.run([task], attempt) for task in _tasks("a", 5)])
+        return [t for run in runs for t in run], peak
+
+    tasks, peak = asyncio.run(scenario())
+    assert [t.status for t in tasks] == ["completed"] * 5
+    assert peak == 1
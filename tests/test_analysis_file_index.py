@@ -0,0 +1,129 @@
+"""
+Tests for the shared file index behind AnalysisOrchestrator analyses
+One walk per session, one read per file and single-pass keyword scans
+"""
+
+import asyncio
+import importlib.util
+import sys
+import time
+from pathlib import Path
+
+_MODULES_DIR = Path(__file__).parent.parent / "brain" / "modules"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _MODULES_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+analysis_file_index = _load("analysis_file_index")
+analyze_orchestrator = _load("analyze_orchestrator")
+AnalysisFileIndex = analysis_file_index.AnalysisFileIndex
+
+SNIPPETS = [
+    "PASSWORD = 'hunter2'\n",
+    "client = Client(api_key=load())\n",
+    "for a in range(3):\n    for b in range(3):\n        for c in range(3):\n            for d in b: pass\n",
+    "from os import *\nTOKEN = None\n",
+    "def helper():\n    return 'secret'\n",
+    "value = 1\n",
+]
+
+
+def _project(root, packages=6, modules=12):
+    for p in range(packages):
+        package = root / "src" / f"pkg_{p}"
+        package.mkdir(parents=True)
+        (package / "__init__.py").write_text("")
+        for m in range(modules):
+            (package / f"module_{m}.py").write_text(SNIPPETS[(p + m) % len(SNIPPETS)] * (m + 1))
+        (package / "widget.js").write_text("function widget() {}\n")
+    (root / "tests").mkdir()
+    (root / "tests" / "test_main.py").write_text("def test_main():\n    assert True\n")
+    (root / "main.py").write_text("print('token')\n")
+    (root / "requirements.txt").write_text("aiofiles\n")
+    (root / ".git").mkdir()
+    (root / ".git" / "hooks.py").write_text("password = 1\n")
+
+
+def _reference_security(target):
+    """The per-keyword rglob and re-read scan the index replaces"""
+    findings = []
+    for pattern in analyze_orchestrator.SECURITY_KEYWORDS:
+        for file_path in Path(target).rglob("*.py"):
+            if ".git" in file_path.parts:
+                continue
+            if pattern in file_path.read_text().lower():
+                findings.append(f"{file_path}: Potential hardcoded {pattern} detected")
+    return findings
+
+
+def test_all_analyses_share_one_walk_and_one_read_per_file(tmp_path, monkeypatch):
+    _project(tmp_path)
+    orchestrator = analyze_orchestrator.AnalysisOrchestrator()
+    orchestrator.target_path = str(tmp_path)
+    scandirs = []
+    real_scandir = analysis_file_index.os.scandir
+    monkeypatch.setattr(analysis_file_index.os, "scandir", lambda p: scandirs.append(p) or real_scandir(p))
+
+    async def run_all():
+        setup = await orchestrator.setup_analysis(str(tmp_path))
+        results = await asyncio.gather(
+            orchestrator.analyze_code_quality(),
+            orchestrator.analyze_security(),
+            orchestrator.analyze_performance(),
+            orchestrator.analyze_architecture(),
+            orchestrator.analyze_integration(),
+        )
+        return setup, results
+
+    start_time = time.perf_counter()
+    setup, (quality, security, performance, architecture, integration) = asyncio.run(run_all())
+    elapsed = time.perf_counter() - start_time
+
+    index = orchestrator.file_index
+    stats = index.get_stats()
+    print(f"five analyses over {stats['files']} files: {elapsed * 1000:.2f}ms, {stats}")
+    assert stats["walks"] == 1
+    assert len(scandirs) == len(set(scandirs))
+    assert not any(".git" in Path(p).parts for p in scandirs)
+    assert stats["reads"] == len(index.files("*.py"))
+
+    assert setup["python_files"] == 6 * 13 + 2 and setup["javascript_files"] == 6
+    assert security["findings"] == _reference_security(tmp_path)
+    assert security["issues_found"] == len(security["findings"])
+    assert any("Wildcard imports" in f for f in performance["findings"])
+    assert any("nested loops" in f for f in performance["findings"])
+    assert len(quality["findings"]) == 0 and quality["score"] == 1.0
+    assert architecture["findings"] == []
+    assert integration["findings"] == []
+
+
+def test_keyword_scan_reports_overlapping_keywords(tmp_path):
+    path = tmp_path / "settings.py"
+    path.write_text("CONFIG = {'API_KEY': env('x')}\n")
+    index = AnalysisFileIndex(tmp_path)
+    index.build()
+
+    found = asyncio.run(index.find_keywords(path, ["password", "secret", "key", "token", "api_key"]))
+    assert found == {"key", "api_key"}
+
+
+def test_large_files_are_scanned_through_a_memory_map(tmp_path):
+    big = tmp_path / "big.py"
+    big.write_text("x = 1\n" * 50000 + "Secret = 'abc'\n")
+    (tmp_path / "small.py").write_text("token = 2\n")
+    index = AnalysisFileIndex(tmp_path, mmap_threshold=64 * 1024, max_cache_bytes=128 * 1024)
+    index.build()
+
+    async def scan():
+        return [await index.find_keywords(p, ["secret", "token"]) for p in index.files("*.py")]
+
+    assert sorted(map(sorted, asyncio.run(scan()))) == [["secret"], ["token"]]
+    stats = index.get_stats()
+    assert stats["mapped_scans"] == 1 and stats["reads"] == 1
+    assert stats["cached_bytes"] <= 128 * 1024
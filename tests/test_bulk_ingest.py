@@ -0,0 +1,176 @@
+"""
+Tests for the SupabaseCache bulk ingest pipeline
+Runs against a SQLite stand-in for the PostgREST upsert endpoint
+"""
+
+import asyncio
+import importlib.util
+import json
+import sqlite3
+import time
+from pathlib import Path
+
+_MODULE_PATH = Path(__file__).parent.parent / "brain" / "modules" / "bulk_ingest.py"
+_spec = importlib.util.spec_from_file_location("bulk_ingest", _MODULE_PATH)
+bulk_ingest = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(bulk_ingest)
+
+BulkIngestPipeline = bulk_ingest.BulkIngestPipeline
+
+
+class SQLiteUpsertEndpoint:
+    """cache_items table behind a simulated network round trip"""
+
+    def __init__(self, path, round_trip_ms=5.0, per_record_ms=0.0, fail_every=0, unavailable=False):
+        self.db = sqlite3.connect(str(path))
+        self.db.execute("CREATE TABLE IF NOT EXISTS cache_items (id TEXT PRIMARY KEY, key TEXT, value TEXT, tags TEXT)")
+        self.round_trip_ms = round_trip_ms
+        self.per_record_ms = per_record_ms
+        self.fail_every = fail_every
+        self.unavailable = unavailable
+        self.requests = 0
+        self.batch_sizes = []
+
+    async def upsert(self, batch):
+        self.requests += 1
+        if self.unavailable:
+            raise ConnectionError("backend unavailable")
+
+        await asyncio.sleep((self.round_trip_ms + self.per_record_ms * len(batch)) / 1000)
+        self.db.executemany(
+            "INSERT INTO cache_items (id, key, value, tags) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(id) DO UPDATE SET key = excluded.key, value = excluded.value, tags = excluded.tags",
+            [(r["id"], r["key"], json.dumps(r["value"]), json.dumps(r["tags"])) for r in batch]
+        )
+        self.db.commit()
+        self.batch_sizes.append(len(batch))
+
+        # Timeout after commit: the client sees an error for a write that landed
+        if self.fail_every and self.requests % self.fail_every == 0:
+            raise TimeoutError("response lost")
+
+    def count(self):
+        return self.db.execute("SELECT COUNT(*) FROM cache_items").fetchone()[0]
+
+
+def _records(count, start=0):
+    return [
+        {"id": f"item-{i}", "key": f"memory_{i}", "value": {"text": f"memory {i}"}, "tags": ["#memory"]}
+        for i in range(start, start + count)
+    ]
+
+
+def test_bulk_sync_is_bounded_by_throughput_not_round_trips(tmp_path):
+    endpoint = SQLiteUpsertEndpoint(tmp_path / "cache.db", round_trip_ms=5.0, per_record_ms=0.002)
+    pipeline = BulkIngestPipeline(endpoint.upsert, str(tmp_path / "spill.jsonl"), target_latency_ms=50)
+
+    async def run():
+        start_time = time.perf_counter()
+        await pipeline.put_many(_records(20000))
+        await pipeline.close()
+        return time.perf_counter() - start_time
+
+    elapsed = asyncio.run(run())
+    fixed_batches_estimate = 20000 / 10 * 0.005
+
+    print(f"20,000 records: {elapsed:.2f}s in {endpoint.requests} requests "
+          f"(fixed batches of 10: ~{fixed_batches_estimate:.0f}s in 2000 requests)")
+    assert endpoint.count() == 20000
+    assert endpoint.requests < 200
+    assert max(endpoint.batch_sizes) > 100
+    assert elapsed < fixed_batches_estimate / 4
+
+
+def test_batch_size_shrinks_when_latency_exceeds_target(tmp_path):
+    endpoint = SQLiteUpsertEndpoint(tmp_path / "cache.db", round_trip_ms=1.0, per_record_ms=1.0)
+    pipeline = BulkIngestPipeline(
+        endpoint.upsert, str(tmp_path / "spill.jsonl"), initial_batch_size=200, target_latency_ms=40, max_in_flight=2
+    )
+
+    async def run():
+        await pipeline.put_many(_records(2000))
+        await pipeline.close()
+
+    asyncio.run(run())
+    assert endpoint.count() == 2000
+    assert pipeline.batch_size < 80
+
+
+def test_retries_are_idempotent(tmp_path):
+    endpoint = SQLiteUpsertEndpoint(tmp_path / "cache.db", round_trip_ms=1.0, fail_every=3)
+    pipeline = BulkIngestPipeline(
+        endpoint.upsert, str(tmp_path / "spill.jsonl"), retry_base_delay=0.001, max_batch_size=100
+    )
+
+    async def run():
+        await pipeline.put_many(_records(3000))
+        await pipeline.close()
+
+    asyncio.run(run())
+    stats = pipeline.get_stats()
+    assert stats["retries"] > 0 and stats["spilled"] == 0
+    assert stats["sent"] == 3000
+    assert endpoint.count() == 3000
+
+
+def test_unavailable_backend_spills_and_replays(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    down = SQLiteUpsertEndpoint(tmp_path / "cache.db", unavailable=True)
+    pipeline = BulkIngestPipeline(down.upsert, str(spill), max_retries=1, retry_base_delay=0.001)
+
+    async def spill_records():
+        await pipeline.put_many(_records(500))
+        await pipeline.close()
+
+    asyncio.run(spill_records())
+    stats = pipeline.get_stats()
+    assert stats["spilled"] == 500 and not stats["backend_available"]
+    # Once marked down, batches skip the backend entirely
+    assert down.requests < 500 / 10
+    assert len(spill.read_text().splitlines()) == 500
+
+    up = SQLiteUpsertEndpoint(tmp_path / "cache.db", round_trip_ms=1.0)
+    replay = BulkIngestPipeline(up.upsert, str(spill))
+
+    async def replay_records():
+        await replay.start()
+        await replay.put_many(_records(100, start=450))
+        await replay.close()
+
+    asyncio.run(replay_records())
+    assert replay.stats["replayed"] == 500
+    assert up.count() == 550
+    assert not spill.exists()
+
+
+def test_replay_quarantines_corrupt_lines_and_recovers_interrupted_replay(tmp_path):
+    spill = tmp_path / "spill.jsonl"
+    replaying = tmp_path / "spill.jsonl.replay"
+    records = _records(4)
+
+    # Left by a replay that crashed before re-queueing; the last line is torn
+    replaying.write_text(
+        json.dumps(records[0]) + "\n" + json.dumps({**records[1], "value": {"text": "old"}}) + "\n" + '{"id": "item-'
+    )
+    spill.write_text(
+        json.dumps({**records[1], "value": {"text": "new"}}) + "\n" + "not json\n" +
+        json.dumps({"key": "no id"}) + "\n" + json.dumps(records[2]) + "\n"
+    )
+
+    up = SQLiteUpsertEndpoint(tmp_path / "cache.db", round_trip_ms=1.0)
+    pipeline = BulkIngestPipeline(up.upsert, str(spill))
+
+    async def replay_records():
+        await pipeline.start()
+        await pipeline.close()
+
+    asyncio.run(replay_records())
+    assert pipeline.stats["replayed"] == 3 and pipeline.stats["quarantined"] == 3
+    assert up.count() == 3
+    # The spill is newer than the interrupted replay, so its version wins
+    value = up.db.execute("SELECT value FROM cache_items WHERE id = 'item-1'").fetchone()[0]
+    assert json.loads(value) == {"text": "new"}
+
+    corrupt = (tmp_path / "spill.jsonl.corrupt").read_text().splitlines()
+    assert corrupt == ['{"id": "item-', "not json", '{"key": "no id"}']
+    assert not spill.exists() and not replaying.exists()
@@ -0,0 +1,126 @@
+"""
+Tests for the dependency-aware delegation executor
+Streaming order, concurrency caps and cancellation of failed dependents
+"""
+
+import asyncio
+import sys
+import types
+from pathlib import Path
+
+_PACKAGE_DIR = Path(__file__).parent.parent / "agents" / "orchestration"
+# Bare package, so the MCP-dependent primary agent is not imported
+_package = types.ModuleType("orchestration")
+_package.__path__ = [str(_PACKAGE_DIR)]
+sys.modules.setdefault("orchestration", _package)
+
+from orchestration.delegation_executor import DelegationExecutor
+from orchestration.models import AgentSpecialization, DelegationStatus, TaskDelegation, TaskResult
+
+
+def _delegation(subtask, agent=AgentSpecialization.GITHUB, dependencies=(), priority=5):
+    return TaskDelegation(
+        task_id=f"sess_{subtask}",
+        task_description=subtask,
+        assigned_agent=agent,
+        confidence=0.8,
+        reasoning="test",
+        estimated_complexity=3,
+        priority=priority,
+        dependencies=list(dependencies)
+    )
+
+
+def _runner(durations, failures=(), log=None):
+    async def run(delegation):
+        if log is not None:
+            log.append(("start", delegation.task_id))
+        await asyncio.sleep(durations.get(delegation.task_id, 0.01))
+        return TaskResult(
+            task_id=delegation.task_id,
+            agent_type=delegation.assigned_agent,
+            success=delegation.task_id not in failures,
+            execution_time_seconds=0.01,
+            confidence_achieved=0.8
+        )
+    return run
+
+
+def test_dependents_start_as_soon_as_their_own_dependencies_finish():
+    delegations = [
+        _delegation("subtask_1", AgentSpecialization.GITHUB),
+        _delegation("subtask_2", AgentSpecialization.SLACK),
+        _delegation("subtask_11", AgentSpecialization.FILESYSTEM, dependencies=["subtask_1"]),
+    ]
+    log = []
+    executor = DelegationExecutor(_runner({"sess_subtask_2": 0.3}, log=log), max_parallel_tasks=3)
+
+    order = [result.task_id for result in asyncio.run(executor.run(delegations))]
+
+    # subtask_11 waits only for subtask_1, not for the slow subtask_2
+    assert order == ["sess_subtask_1", "sess_subtask_11", "sess_subtask_2"]
+    assert all(d.status == DelegationStatus.COMPLETED for d in delegations)
+
+
+def test_global_and_per_agent_caps():
+    delegations = [_delegation(f"gh_{i}", AgentSpecialization.GITHUB) for i in range(4)]
+    delegations += [_delegation(f"sl_{i}", AgentSpecialization.SLACK) for i in range(4)]
+    executor = DelegationExecutor(
+        _runner({}), max_parallel_tasks=3, agent_limits={AgentSpecialization.GITHUB: 1}, default_agent_limit=2
+    )
+
+    results = asyncio.run(executor.run(delegations))
+
+    assert len(results) == 8 and all(r.success for r in results)
+    assert executor.peak_running == 3
+
+
+def test_failure_cancels_transitive_dependents_only():
+    delegations = [
+        _delegation("subtask_1"),
+        _delegation("subtask_2", dependencies=["subtask_1"]),
+        _delegation("subtask_3", dependencies=["subtask_2"]),
+        _delegation("subtask_4"),
+        _delegation("subtask_5", dependencies=["subtask_5b"]),
+        _delegation("subtask_5b", dependencies=["subtask_5"]),
+    ]
+    log = []
+    executor = DelegationExecutor(_runner({}, failures={"sess_subtask_1"}, log=log))
+
+    results = {r.task_id: r for r in asyncio.run(executor.run(delegations))}
+
+    assert len(results) == 6
+    assert not results["sess_subtask_1"].success
+    assert results["sess_subtask_4"].success
+    for task_id in ("sess_subtask_2", "sess_subtask_3", "sess_subtask_5", "sess_subtask_5b"):
+        assert results[task_id].metadata["status"] == "cancelled"
+        assert ("start", task_id) not in log
+    assert delegations[2].status == DelegationStatus.CANCELLED
+
+
+def test_closing_stream_early_cancels_running_tasks():
+    delegations = [_delegation("fast"), _delegation("slow", AgentSpecialization.SLACK)]
+    cancelled = []
+
+    async def run(delegation):
+        try:
+            await asyncio.sleep(0.01 if delegation.task_id == "sess_fast" else 5)
+        except asyncio.CancelledError:
+            cancelled.append(delegation.task_id)
+            raise
+        return TaskResult(
+            task_id=delegation.task_id,
+            agent_type=delegation.assigned_agent,
+            success=True,
+            execution_time_seconds=0.01,
+            confidence_achieved=0.8
+        )
+
+    async def consume_first():
+        stream = DelegationExecutor(run).stream(delegations)
+        first = await stream.__anext__()
+        await stream.aclose()
+        return first
+
+    assert asyncio.run(consume_first()).task_id == "sess_fast"
+    assert cancelled == ["sess_slow"]
@@ -0,0 +1,175 @@
+"""
+Tests for the example embedding index behind ExampleRecommendationEngine
+One embedding per example, one per query, persisted and updated incrementally
+"""
+
+import importlib.util
+import json
+import math
+import time
+from pathlib import Path
+
+import numpy as np
+
+_MODULES_DIR = Path(__file__).parent.parent / "brain" / "modules"
+
+
+def _load(name, filename):
+    spec = importlib.util.spec_from_file_location(name, _MODULES_DIR / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+example_embedding_index = _load("example_embedding_index", "example_embedding_index.py")
+ExampleEmbeddingIndex = example_embedding_index.ExampleEmbeddingIndex
+
+VOCABULARY = ["python", "api", "async", "react", "database", "redis", "auth", "websocket", "fastapi", "sql"]
+
+
+class CountingEmbedder:
+    """Bag-of-words embedding over a fixed vocabulary"""
+
+    def __init__(self):
+        self.calls = 0
+
+    def generate_embeddings(self, text):
+        self.calls += 1
+        words = text.lower().split()
+        return [float(words.count(term)) for term in VOCABULARY]
+
+
+def _naive_cosine(a, b):
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+
+def _examples(count, seed=3):
+    rng = np.random.default_rng(seed)
+    return {
+        f"example-{i}": {
+            "description": " ".join(rng.choice(VOCABULARY, size=int(rng.integers(2, 6)))),
+            "tags": [str(rng.choice(VOCABULARY))]
+        }
+        for i in range(count)
+    }
+
+
+def _text(data):
+    return f"{data['description']} {' '.join(data['tags'])}"
+
+
+def test_ranking_matches_pairwise_cosine(tmp_path):
+    embedder = CountingEmbedder()
+    index = ExampleEmbeddingIndex(tmp_path / "embeddings.npz", embedder.generate_embeddings)
+    examples = _examples(300)
+    index.sync({example_id: _text(data) for example_id, data in examples.items()})
+    distinct_texts = len({_text(data) for data in examples.values()})
+    assert embedder.calls == distinct_texts
+
+    query = "python async api"
+    expected = sorted(
+        ((example_id, _naive_cosine(embedder.generate_embeddings(_text(data)), embedder.generate_embeddings(query)))
+         for example_id, data in examples.items()),
+        key=lambda x: x[1], reverse=True
+    )
+    expected = [(i, s) for i, s in expected if s >= 0.3]
+
+    embedder.calls = 0
+    ranked = index.query(query, threshold=0.3)
+    assert embedder.calls == 1
+    assert {i for i, _ in ranked} == {i for i, _ in expected}
+    assert np.allclose([s for _, s in ranked], [s for _, s in expected], atol=1e-6)
+
+    top = index.query(query, limit=5)
+    assert [s for _, s in top] == [s for _, s in index.query(query)[:5]]
+
+
+def test_index_persists_and_updates_incrementally(tmp_path):
+    path = tmp_path / "embeddings.npz"
+    embedder = CountingEmbedder()
+    index = ExampleEmbeddingIndex(path, embedder.generate_embeddings)
+    texts = {"a": "python api", "b": "react websocket", "c": "redis database"}
+    index.sync(texts)
+    assert embedder.calls == 3
+
+    reopened_embedder = CountingEmbedder()
+    reopened = ExampleEmbeddingIndex(path, reopened_embedder.generate_embeddings)
+    assert not reopened.sync(texts)
+    assert reopened_embedder.calls == 0
+
+    # One changed, one removed, one added, one duplicating an existing text
+    texts = {"a": "python api async", "c": "redis database", "d": "sql auth", "e": "redis database"}
+    assert reopened.sync(texts)
+    assert reopened_embedder.calls == 2
+    assert sorted(reopened.ids) == ["a", "c", "d", "e"]
+    assert reopened.query("sql auth", limit=1)[0][0] == "d"
+
+    reopened.add("f", "fastapi python")
+    assert ExampleEmbeddingIndex(path, embedder.generate_embeddings).query("fastapi", limit=1)[0][0] == "f"
+
+
+def test_recommendation_engine_embeds_query_once(tmp_path):
+    engine_module = _load("example_recommendation_engine", "example-recommendation-engine.py")
+    embedder = CountingEmbedder()
+    engine = engine_module.ExampleRecommendationEngine()
+    engine.examples_dir = tmp_path
+    engine.metadata_file = tmp_path / "metadata.json"
+    engine.embedding_generator = embedder
+    engine.embedding_index = ExampleEmbeddingIndex(tmp_path / "embeddings.npz", embedder.generate_embeddings)
+
+    examples = _examples(2000, seed=9)
+    engine.metadata_file.write_text(json.dumps({"examples": examples}))
+    requirements = {"technologies": ["python", "async"], "apis": ["api"]}
+
+    similar = engine.find_similar_examples(requirements)
+    first_calls = embedder.calls
+    assert first_calls == len({_text(d) for d in examples.values()}) + 1
+
+    start_time = time.perf_counter()
+    for _ in range(20):
+        assert engine.find_similar_examples(requirements) == similar
+    elapsed = (time.perf_counter() - start_time) / 20
+
+    print(f"find_similar_examples over 2000 examples: {elapsed * 1000:.2f}ms, 1 embedding call")
+    assert embedder.calls == first_calls + 20
+    assert similar and all(s["similarity"] >= 0.7 for s in similar)
+    assert [s["similarity"] for s in similar] == sorted((s["similarity"] for s in similar), reverse=True)
+
+    engine.add_example("new", {"description": "python async api", "tags": []})
+    assert embedder.calls == first_calls + 20 + 1
+    assert engine.find_similar_examples(requirements, limit=1)[0]["similarity"] > 0.99
+
+
+def test_recommendation_engine_falls_back_until_the_index_syncs(tmp_path):
+    engine_module = _load("example_recommendation_engine", "example-recommendation-engine.py")
+    embedder = CountingEmbedder()
+    available = {"embed": False}
+
+    def flaky_embed(text):
+        if not available["embed"]:
+            raise ConnectionError("embedding service unavailable")
+        return embedder.generate_embeddings(text)
+
+    engine = engine_module.ExampleRecommendationEngine()
+    engine.examples_dir = tmp_path
+    engine.metadata_file = tmp_path / "metadata.json"
+    engine.embedding_index = ExampleEmbeddingIndex(tmp_path / "embeddings.npz", flaky_embed)
+
+    examples = {"match": {"description": "python async api", "tags": []},
+                "other": {"description": "react websocket", "tags": ["auth"]}}
+    engine.metadata_file.write_text(json.dumps({"examples": examples}))
+    requirements = {"technologies": ["python", "async"], "apis": ["api"]}
+
+    # The failed sync leaves an empty index, so ranking uses word overlap
+    similar = engine.find_similar_examples(requirements, threshold=0.5)
+    assert [(s["id"], s["similarity"]) for s in similar] == [("match", 1.0)]
+    assert len(engine.embedding_index) == 0
+
+    # The next load retries the sync and switches to the embedding index
+    available["embed"] = True
+    similar = engine.find_similar_examples(requirements, threshold=0.5)
+    assert len(engine.embedding_index) == 2
+    assert [s["id"] for s in similar] == ["match"] and similar[0]["similarity"] > 0.99
+    assert embedder.calls == 3
@@ -0,0 +1,111 @@
+"""
+Tests for the R1 reasoning ExecutionPlan
+Concurrent phases, per-phase timings and latency-budget degradation
+"""
+
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import pytest
+
+_PLAN_PATH = Path(__file__).parent.parent / "agents" / "r1_reasoning" / "execution_plan.py"
+_spec = importlib.util.spec_from_file_location("execution_plan", _PLAN_PATH)
+execution_plan = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(execution_plan)
+
+ExecutionPlan = execution_plan.ExecutionPlan
+
+
+def _phase(seconds, result):
+    async def step():
+        await asyncio.sleep(seconds)
+        return result
+    return step
+
+
+def test_phases_run_concurrently_and_record_timings():
+    plan = ExecutionPlan()
+
+    async def run():
+        return await plan.run_concurrently({
+            "confidence": {"step": _phase(0.1, 0.8)},
+            "alternatives": {"step": _phase(0.1, ["a"]), "essential": False, "default": []},
+            "limitations": {"step": _phase(0.05, ["l"])},
+        })
+
+    start_time = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start_time
+
+    assert results == {"confidence": 0.8, "alternatives": ["a"], "limitations": ["l"]}
+    assert elapsed < 0.2
+    breakdown = plan.get_breakdown()
+    assert breakdown["degraded_phases"] == [] and breakdown["latency_budget_ms"] is None
+    assert 90 <= breakdown["phases_ms"]["confidence"] < 200
+    assert 40 <= breakdown["phases_ms"]["limitations"] < 150
+
+
+def test_optional_phase_is_cut_off_when_the_budget_runs_out():
+    plan = ExecutionPlan(latency_budget_ms=200)
+
+    async def run():
+        return await plan.run_concurrently({
+            "confidence": {"step": _phase(0.05, 0.9)},
+            "alternatives": {"step": _phase(5, ["late"]), "essential": False, "default": []},
+        })
+
+    start_time = time.perf_counter()
+    results = asyncio.run(run())
+    elapsed = time.perf_counter() - start_time
+
+    assert results == {"confidence": 0.9, "alternatives": []}
+    assert elapsed < 1.0
+    assert plan.degraded_phases == ["alternatives"]
+    assert 150 <= plan.phase_timings_ms["alternatives"] <= 400
+    assert plan.phase_timings_ms["confidence"] >= 40
+
+
+def test_exhausted_budget_skips_optional_phases_but_runs_essential_ones():
+    plan = ExecutionPlan(latency_budget_ms=100)
+
+    async def run():
+        chain = await plan.run("main_chain", _phase(0.15, "chain"))
+        later = await plan.run_concurrently({
+            "follow_up": {"step": _phase(0.05, ["q"])},
+            "alternatives": {"step": _phase(0.01, ["a"]), "essential": False, "default": []},
+            "tool_call": {"step": _phase(0.01, {"ok": True}), "essential": False, "default": None},
+        })
+        return chain, later
+
+    chain, later = asyncio.run(run())
+
+    # The essential phase overran the budget and still completed
+    assert chain == "chain" and plan.remaining_ms() == 0
+    assert later == {"follow_up": ["q"], "alternatives": [], "tool_call": None}
+    assert sorted(plan.degraded_phases) == ["alternatives", "tool_call"]
+
+    breakdown = plan.get_breakdown()
+    assert breakdown["phases_ms"]["alternatives"] == 0 and breakdown["phases_ms"]["tool_call"] == 0
+    assert breakdown["phases_ms"]["main_chain"] >= 140
+    assert breakdown["phases_ms"]["follow_up"] >= 40
+    assert breakdown["total_ms"] >= breakdown["phases_ms"]["main_chain"] + breakdown["phases_ms"]["follow_up"]
+
+
+def test_timeouts_raised_inside_phases_are_not_degraded():
+    plan = ExecutionPlan(latency_budget_ms=1000)
+
+    async def timed_out_request():
+        await asyncio.sleep(0.01)
+        raise asyncio.TimeoutError("ollama request timed out")
+
+    async def run(**spec):
+        return await plan.run("phase", timed_out_request, **spec)
+
+    with pytest.raises(asyncio.TimeoutError, match="ollama"):
+        asyncio.run(run())
+    with pytest.raises(asyncio.TimeoutError, match="ollama"):
+        asyncio.run(run(essential=False, default=[]))
+    assert plan.degraded_phases == []
+    assert plan.phase_timings_ms["phase"] >= 5
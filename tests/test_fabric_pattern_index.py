@@ -0,0 +1,78 @@
+"""
+Tests for FabricIntegrator local pattern discovery
+Parallel parsing, the mtime-keyed on-disk index and secondary indexes
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+from pathlib import Path
+
+_PACKAGE_DIR = Path(__file__).parent.parent / "agents" / "tool-selection"
+_spec = importlib.util.spec_from_file_location(
+    "tool_selection", _PACKAGE_DIR / "__init__.py", submodule_search_locations=[str(_PACKAGE_DIR)]
+)
+tool_selection = importlib.util.module_from_spec(_spec)
+sys.modules["tool_selection"] = tool_selection
+_spec.loader.exec_module(tool_selection)
+
+from tool_selection.fabric_integrator import FabricIntegrator
+from tool_selection.models import PromptContext
+
+
+def _make_fabric_tree(root: Path, count: int) -> Path:
+    patterns_dir = root / "fabric" / "patterns"
+    for i in range(count):
+        name = f"analyze_item_{i}" if i % 2 else f"write_item_{i}"
+        pattern_dir = patterns_dir / name
+        pattern_dir.mkdir(parents=True)
+        (pattern_dir / "system.md").write_text(f"\n# IDENTITY {name}\n\nSteps...")
+    return root / "fabric"
+
+
+def _integrator(tmp_path: Path, fabric_path: Path) -> FabricIntegrator:
+    integrator = FabricIntegrator(cache_dir=str(tmp_path / "cache"))
+    integrator.local_fabric_path = fabric_path
+    integrator.http_available = False
+    return integrator
+
+
+def test_rediscovery_only_reparses_changed_patterns(tmp_path):
+    fabric_path = _make_fabric_tree(tmp_path, 40)
+
+    async def run():
+        first = await _integrator(tmp_path, fabric_path)._discover_local_patterns()
+        assert len(first) == 40
+
+        edited = fabric_path / "patterns" / "analyze_item_3" / "system.md"
+        edited.write_text("Updated identity")
+        stat = edited.stat()
+        os.utime(edited, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+        integrator = _integrator(tmp_path, fabric_path)
+        second = await integrator._discover_local_patterns()
+        assert integrator.local_index_stats == {"reused": 39, "parsed": 1, "removed": 0}
+        assert {p.name: p.description for p in second}["analyze_item_3"] == "Updated identity"
+
+    asyncio.run(run())
+
+
+def test_secondary_indexes(tmp_path):
+    fabric_path = _make_fabric_tree(tmp_path, 10)
+
+    async def run():
+        integrator = _integrator(tmp_path, fabric_path)
+        await integrator.discover_patterns(refresh_cache=True)
+
+        analysis = await integrator.get_patterns_for_context(PromptContext.ANALYSIS)
+        assert {p.name for p in analysis} == {f"analyze_item_{i}" for i in range(1, 10, 2)}
+        assert len(integrator.get_patterns_by_category("creation")) == 5
+        assert [p.name for p in integrator.get_patterns_by_tag("write_item_4")] == ["write_item_4"]
+
+        # A fresh integrator serves the same indexes from the pattern cache
+        cached = _integrator(tmp_path, fabric_path)
+        await cached.discover_patterns()
+        assert len(await cached.get_patterns_for_context(PromptContext.CREATION)) == 5
+
+    asyncio.run(run())
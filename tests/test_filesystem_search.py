@@ -0,0 +1,111 @@
+"""
+Tests for streaming file search in the filesystem agent
+Background scandir walks, chunked content scans and early termination
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.specialized import filesystem_search
+from agents.specialized.filesystem_agent import FilesystemAgent
+from agents.specialized.filesystem_search import FileSearch, contains_text
+from agents.specialized.resource_pool import ResourcePoolManager
+
+
+def _tree(root, dirs=20, files=25):
+    for d in range(dirs):
+        directory = root / f"dir_{d}" / "nested"
+        directory.mkdir(parents=True)
+        for f in range(files):
+            body = "filler line\n" * 200
+            if (d * files + f) % 50 == 0:
+                body += "NEEDLE marker\n"
+            (directory / f"file_{f}.txt").write_text(body)
+        (directory / "image.png").write_bytes(b"needle")
+
+
+def _collect(search):
+    async def run():
+        return [hit async for hit in search]
+    return asyncio.run(run())
+
+
+def test_chunked_scan_finds_matches_across_chunk_boundaries(tmp_path):
+    path = tmp_path / "data.txt"
+    path.write_bytes(b"a" * 1000 + b"NeEdLe" + b"b" * 1000)
+    # Chunk boundaries split the needle at every offset
+    for chunk_size in range(1, 12):
+        assert contains_text(path, "needle", chunk_size=chunk_size)
+    assert not contains_text(path, "needles", chunk_size=7)
+
+    path.write_text("prefix " * 500 + "Grüße aus Köln", encoding="utf-8")
+    assert contains_text(path, "GRÜSSE AUS", chunk_size=16) is False
+    assert contains_text(path, "GRÜßE AUS", chunk_size=16)
+    assert not contains_text(path, "köln!", chunk_size=16)
+
+
+def test_content_search_matches_rglob_scan(tmp_path):
+    _tree(tmp_path)
+    search = FileSearch(tmp_path, "*.txt", content_query="needle", extensions={".txt"}, read_concurrency=4)
+    hits = _collect(search)
+
+    expected = sorted(
+        str(p) for p in tmp_path.rglob("*.txt") if "needle" in p.read_text().lower()
+    )
+    assert sorted(str(h.path) for h in hits) == expected
+    assert all(h.content_match and not h.is_dir for h in hits)
+    assert search.stats["files_scanned"] == 500
+    assert not search.stats["truncated"] and not search.stats["timed_out"]
+
+    # Names alone, directories included, as rglob returns them
+    names = _collect(FileSearch(tmp_path, "nested"))
+    assert len(names) == 20 and all(h.is_dir for h in names)
+    assert _collect(FileSearch(tmp_path, "*.png", recursive=False)) == []
+
+
+def test_search_stops_at_max_results_and_deadline(tmp_path, monkeypatch):
+    _tree(tmp_path)
+    search = FileSearch(tmp_path, "*.txt", content_query="filler", extensions={".txt"}, max_results=5)
+    hits = _collect(search)
+    assert len(hits) == 5 and search.stats["truncated"]
+    assert search.stats["files_scanned"] < 500
+
+    real_contains = filesystem_search.contains_text
+
+    def slow_contains(*args, **kwargs):
+        time.sleep(0.05)
+        return real_contains(*args, **kwargs)
+
+    monkeypatch.setattr(filesystem_search, "contains_text", slow_contains)
+    search = FileSearch(tmp_path, "*.txt", content_query="needle", extensions={".txt"},
+                        deadline_seconds=0.2, read_concurrency=2)
+    start_time = time.perf_counter()
+    hits = _collect(search)
+    elapsed = time.perf_counter() - start_time
+
+    assert search.stats["timed_out"] and search.stats["files_scanned"] < 500
+    assert elapsed < 1.0
+
+
+def test_agent_search_reports_truncation(tmp_path):
+    _tree(tmp_path, dirs=4, files=25)
+    agent = FilesystemAgent(base_path=str(tmp_path), resource_pools=ResourcePoolManager())
+
+    result = asyncio.run(agent.execute_task(
+        "Search files matching *.txt",
+        {"path": ".", "pattern": "*.txt", "content_search": True, "content_query": "needle"}
+    ))
+    assert result["success"]
+    matches = result["result"]["matches"]
+    assert sorted(m["name"] for m in matches) == ["file_0.txt", "file_0.txt"]
+    assert all(m["content_match"] and m["is_file"] for m in matches)
+    assert result["result"]["truncated"] is False
+
+    result = asyncio.run(agent.execute_task(
+        "Search files matching *.txt", {"path": ".", "pattern": "*.txt", "max_results": 7}
+    ))
+    assert result["result"]["match_count"] == 7 and result["result"]["truncated"]
@@ -0,0 +1,187 @@
+"""
+Tests for the git-backed code health history
+Incremental per-commit snapshots, SQLite persistence and NumPy trend fits
+"""
+
+import asyncio
+import importlib.util
+import os
+import subprocess
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+_PACKAGE_DIR = Path(__file__).parent.parent / "brain" / "modules" / "supreme_analyze"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+git_health_history = _load("git_health_history")
+GitHealthHistory = git_health_history.GitHealthHistory
+
+pytestmark = pytest.mark.skipif(
+    subprocess.run(["git", "--version"], capture_output=True).returncode != 0, reason="git not available"
+)
+
+SMALL = "x = 1\n"
+LARGE = "x = 1\n" * 4000  # > 20KB
+
+
+class Repo:
+    """Throwaway git repository with commits spaced a day apart"""
+
+    def __init__(self, path):
+        self.path = path
+        self.path.mkdir()
+        self.day = 0
+        self.start = datetime.now() - timedelta(days=200)
+        self.git("init", "-q")
+        self.git("config", "user.email", "dev@example.com")
+        self.git("config", "user.name", "dev")
+
+    def git(self, *args):
+        date = (self.start + timedelta(days=self.day)).strftime("%Y-%m-%dT%H:%M:%S")
+        env = {**os.environ, "GIT_AUTHOR_DATE": date, "GIT_COMMITTER_DATE": date}
+        return subprocess.run(["git", *args], cwd=self.path, env=env, check=True, capture_output=True).stdout.decode()
+
+    def commit(self, write=None, delete=()):
+        for name, content in (write or {}).items():
+            path = self.path / name
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+        for name in delete:
+            self.git("rm", "-q", name)
+        self.day += 1
+        self.git("add", "-A")
+        self.git("commit", "-q", "--allow-empty", "-m", f"day {self.day}")
+        return self.git("rev-parse", "HEAD").strip()
+
+    def full_scan(self, sha, prefix=""):
+        """Health recomputed from the whole tree at sha"""
+        listing = self.git("ls-tree", "-r", "-l", sha, "--", prefix or ".")
+        files = []
+        for line in listing.splitlines():
+            meta, path = line.split("\t", 1)
+            if git_health_history.is_tracked(path):
+                files.append((path, int(meta.split()[3])))
+        return git_health_history.health_from_counts(
+            len(files),
+            sum(size > git_health_history.LARGE_FILE_BYTES for _, size in files),
+            sum(git_health_history.is_test_file(path) for path, _ in files)
+        )
+
+
+def _random_history(repo, commits=30):
+    import random
+    rng = random.Random(11)
+    existing = set()
+    for i in range(commits):
+        write = {}
+        for _ in range(rng.randint(1, 3)):
+            name = rng.choice(["src/app.py", "src/util.py", "src/test_app.py", "web/main.js",
+                               "web/big.js", "docs/readme.md", f"src/mod_{i}.py", "src/tests/test_util.py"])
+            write[name] = rng.choice([SMALL, LARGE])
+        delete = [name for name in sorted(existing - set(write)) if rng.random() < 0.1]
+        repo.commit(write, delete)
+        existing = (existing | set(write)) - set(delete)
+
+
+def test_snapshots_match_full_tree_scans(tmp_path):
+    repo = Repo(tmp_path / "repo")
+    _random_history(repo)
+    history = GitHealthHistory(tmp_path / "health.db")
+
+    for target, prefix in [(repo.path, ""), (repo.path / "src", "src/")]:
+        snapshots = history.history(target)
+        shas = repo.git("rev-list", "--reverse", "HEAD", *(["--", prefix] if prefix else [])).split()
+        assert [s["sha"] for s in snapshots] == shas
+        for snapshot in snapshots:
+            expected = repo.full_scan(snapshot["sha"], prefix)
+            assert {k: snapshot[k] for k in expected} == pytest.approx(expected)
+
+
+def test_refresh_only_processes_new_commits(tmp_path):
+    repo = Repo(tmp_path / "repo")
+    _random_history(repo, commits=10)
+    history = GitHealthHistory(tmp_path / "health.db")
+
+    assert history.refresh(repo.path) == 10
+    assert history.refresh(repo.path) == 0
+
+    # State survives reopening the database
+    reopened = GitHealthHistory(tmp_path / "health.db")
+    assert reopened.refresh(repo.path) == 0
+    head = repo.commit({"src/new.py": LARGE})
+    assert reopened.refresh(repo.path) == 1
+    assert reopened.stats["files_updated"] == 1
+    assert reopened.history(repo.path)[-1]["sha"] == head
+    assert reopened.history(repo.path)[-1]["files_analyzed"] == repo.full_scan(head)["files_analyzed"]
+
+    # Rewriting history rebuilds the scope
+    repo.git("reset", "-q", "--hard", "HEAD~2")
+    rewritten = repo.commit({"src/other.py": SMALL})
+    assert reopened.refresh(repo.path) == 10
+    assert reopened.stats["rebuilds"] == 1
+    assert reopened.history(repo.path)[-1]["sha"] == rewritten
+
+    assert history.history(tmp_path) is None
+
+
+def test_current_health_counts_working_tree_changes(tmp_path):
+    repo = Repo(tmp_path / "repo")
+    _random_history(repo, commits=8)
+    history = GitHealthHistory(tmp_path / "health.db")
+
+    (repo.path / "src" / "app.py").write_text(LARGE)
+    (repo.path / "src" / "untracked_test.py").write_text(SMALL)
+    (repo.path / "web" / "main.js").unlink(missing_ok=True)
+
+    files = list(repo.path.rglob("*.py")) + list(repo.path.rglob("*.js"))
+    expected = git_health_history.health_from_counts(
+        len(files),
+        sum(f.stat().st_size > git_health_history.LARGE_FILE_BYTES for f in files),
+        sum("test" in f.name.lower() for f in files)
+    )
+    assert history.current_health(repo.path) == pytest.approx(expected)
+
+
+def test_timeline_fits_trend_over_git_history(tmp_path):
+    sys.path.insert(0, str(_PACKAGE_DIR))
+    timeline_module = _load("code_health_timeline")
+
+    repo = Repo(tmp_path / "repo")
+    # Ten small files, then one more large file every ten days
+    repo.commit({f"src/mod_{i}.py": SMALL for i in range(10)})
+    for i in range(6):
+        repo.day += 9
+        repo.commit({f"src/big_{i}.py": LARGE})
+
+    timeline = timeline_module.CodeHealthTimeline(base_path=str(tmp_path / "aai"))
+    result = asyncio.run(timeline.analyze_timeline(str(repo.path), "session"))
+
+    assert len(result.historical_trend) == 7
+    assert result.historical_trend[-1].debt_ratio == pytest.approx(6 / 16)
+    assert result.current_health.files_analyzed == 16
+    assert len(result.predictions) == timeline.prediction_horizon_months
+
+    # Scores fall roughly 0.1 per month of real time
+    slope = timeline._calculate_trend(
+        [h.overall_score for h in result.historical_trend], [h.timestamp for h in result.historical_trend]
+    )
+    assert -0.2 < slope < -0.05
+    assert result.predictions[0].predicted_score == pytest.approx(result.current_health.overall_score + slope)
+
+    # Outside git there is no made-up history
+    plain = tmp_path / "plain"
+    plain.mkdir()
+    (plain / "a.py").write_text(SMALL)
+    result = asyncio.run(timeline.analyze_timeline(str(plain), "session-2"))
+    assert result.historical_trend == []
+    assert result.current_health.files_analyzed == 1
@@ -0,0 +1,145 @@
+"""
+Tests for ImprovementTracker predictions
+One persistent connection, an in-memory pattern index and batch scoring
+"""
+
+import itertools
+import json
+import random
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brain.modules.supreme_improve import improvement_tracker as tracker_module
+from brain.modules.supreme_improve.improvement_tracker import ImprovementTracker
+from brain.modules.supreme_improve.models import ImprovementOutcome, ImprovementRecommendation, QualityMetrics
+
+CATEGORIES = ["quality", "performance", "security"]
+PRIORITIES = ["high", "medium"]
+RISKS = ["low", "medium", "critical"]
+
+
+def _metrics(score):
+    return QualityMetrics(
+        maintainability_score=score, complexity_score=score, readability_score=score,
+        test_coverage=score, documentation_score=score, security_score=score,
+        performance_score=score, overall_score=score
+    )
+
+
+def _recommendation(i, category, priority, risk_level):
+    return ImprovementRecommendation(
+        id=f"rec-{i}", title=f"Recommendation {i}", description="", category=category,
+        priority=priority, effort_estimate="1 hour", risk_level=risk_level,
+        breaking_change_probability=0.2, expected_improvement=_metrics(10.0),
+        code_changes=[], validation_steps=[]
+    )
+
+
+def _outcome(i, rng):
+    return ImprovementOutcome(
+        recommendation_id=f"rec-{i}",
+        implemented=rng.random() < 0.9,
+        quality_after=_metrics(rng.choice([0.0, 80.0, 90.0])),
+        issues_introduced=rng.choice([[], [], ["regression"]]),
+        actual_vs_predicted_risk=rng.choice([0.0, 0.1, 0.5])
+    )
+
+
+def _reference_prediction(db_path, recommendation):
+    """The per-recommendation queries predictions were computed with before"""
+    conn = sqlite3.connect(db_path)
+    similar = [row[0] for row in conn.execute("""
+        SELECT success_rate FROM improvement_outcomes
+        WHERE category = ? AND priority = ? AND risk_level = ? AND implemented = 1
+        ORDER BY timestamp DESC, id DESC LIMIT 20
+    """, (recommendation.category, recommendation.priority, recommendation.risk_level))]
+    patterns = [
+        rate for details, rate in conn.execute("""
+            SELECT pattern_details, success_rate FROM success_patterns
+            WHERE sample_count >= 5 AND success_rate > 0.7 ORDER BY success_rate DESC
+        """)
+        if (json.loads(details)["category"], json.loads(details)["priority"], json.loads(details)["risk_level"])
+        == (recommendation.category, recommendation.priority, recommendation.risk_level)
+    ]
+    conn.close()
+
+    scores = similar + patterns
+    if not scores:
+        adjustment = {"low": 0.1, "medium": 0.0, "high": -0.1, "critical": -0.2}
+        return max(0.3, min(0.95, 0.7 + adjustment.get(recommendation.risk_level, 0)))
+    weights = [1.0 / (i + 1) for i in range(len(scores))]
+    return round(sum(s * w for s, w in zip(scores, weights)) / sum(weights), 3)
+
+
+def _all_recommendations():
+    return [
+        _recommendation(i, *key)
+        for i, key in enumerate(itertools.product(CATEGORIES, PRIORITIES, RISKS))
+    ]
+
+
+def test_incremental_index_matches_fresh_queries(tmp_path):
+    tracker = ImprovementTracker(str(tmp_path / "outcomes.db"))
+    rng = random.Random(4)
+    recommendations = _all_recommendations()
+
+    # Load the index on an empty database, then let track_outcome maintain it
+    assert tracker.predict_many(recommendations) == [
+        _reference_prediction(tracker.db_path, r) for r in recommendations
+    ]
+    for i in range(300):
+        recommendation = rng.choice(recommendations[:9])
+        assert tracker.track_outcome(recommendation, _outcome(i, rng), _metrics(50.0))["success"]
+        if i % 50 == 0:
+            tracker.predict_many(recommendations)
+
+    expected = [_reference_prediction(tracker.db_path, r) for r in recommendations]
+    assert tracker.predict_many(recommendations) == pytest.approx(expected)
+    assert [tracker.predict_success_probability(r) for r in recommendations] == pytest.approx(expected)
+
+    # A fresh tracker builds the same index from the database
+    assert ImprovementTracker(str(tmp_path / "outcomes.db")).predict_many(recommendations) == pytest.approx(expected)
+
+
+def test_writes_from_other_connections_refresh_the_index(tmp_path):
+    db_path = str(tmp_path / "outcomes.db")
+    tracker = ImprovementTracker(db_path)
+    other = ImprovementTracker(db_path)
+    recommendation = _recommendation(0, "security", "high", "low")
+    rng = random.Random(1)
+
+    before = tracker.predict_success_probability(recommendation)
+    assert before == pytest.approx(0.8)
+    other.track_outcome(recommendation, _outcome(0, rng), _metrics(50.0))
+    other.track_outcome(recommendation, _outcome(1, rng), _metrics(50.0))
+
+    assert tracker.predict_success_probability(recommendation) == _reference_prediction(db_path, recommendation)
+    assert tracker.predict_success_probability(recommendation) != before
+
+
+def test_batch_prediction_uses_one_connection(tmp_path, monkeypatch):
+    tracker = ImprovementTracker(str(tmp_path / "outcomes.db"))
+    rng = random.Random(9)
+    recommendations = _all_recommendations()
+    for i in range(500):
+        tracker.track_outcome(rng.choice(recommendations), _outcome(i, rng), _metrics(50.0))
+
+    connections = []
+    real_connect = sqlite3.connect
+    monkeypatch.setattr(tracker_module.sqlite3, "connect", lambda *a, **k: connections.append(a) or real_connect(*a, **k))
+
+    batch = [rng.choice(recommendations) for _ in range(500)]
+    start_time = time.perf_counter()
+    probabilities = tracker.predict_many(batch)
+    elapsed = time.perf_counter() - start_time
+
+    print(f"predict_many over 500 recommendations: {elapsed * 1000:.2f}ms")
+    assert connections == []
+    assert probabilities == [tracker.predict_success_probability(r) for r in batch]
+    assert tracker.predict_many([]) == []
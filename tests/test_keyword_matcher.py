@@ -0,0 +1,108 @@
+"""
+Tests for the Aho-Corasick keyword matcher used by PromptAnalyzer
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import random
+import sys
+import time
+from pathlib import Path
+
+_TOOL_SELECTION_DIR = Path(__file__).parent.parent / "agents" / "tool-selection"
+_spec = importlib.util.spec_from_file_location("keyword_matcher", _TOOL_SELECTION_DIR / "keyword_matcher.py")
+keyword_matcher = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(keyword_matcher)
+
+KeywordMatcher = keyword_matcher.KeywordMatcher
+
+
+def _load_prompt_analyzer():
+    """prompt_analyzer uses relative imports, so load tool-selection as a package"""
+    spec = importlib.util.spec_from_file_location(
+        "tool_selection", _TOOL_SELECTION_DIR / "__init__.py",
+        submodule_search_locations=[str(_TOOL_SELECTION_DIR)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["tool_selection"] = package
+    spec.loader.exec_module(package)
+    return importlib.import_module("tool_selection.prompt_analyzer")
+
+LEXICONS = {
+    "analysis": ["analyze", "review", "assess"],
+    "testing": ["test", "unit test", "assess"],
+    "urgency": ["asap", "no rush", "now"],
+    "domain": ["ci/cd", "react native", "api"],
+}
+
+
+def test_substring_mode_matches_naive_scan():
+    matcher = KeywordMatcher(LEXICONS, word_boundaries=False)
+    rng = random.Random(7)
+    words = ["analyze", "latest", "unit", "test", "know", "api", "rapid", "ci/cd", "react", "native", "assess", "x"]
+
+    for _ in range(200):
+        text = " ".join(rng.choice(words) for _ in range(rng.randint(1, 30)))
+        found = {label: [kw for kw, _ in hits] for label, hits in matcher.find(text).items()}
+        expected = {
+            label: [kw for kw in keywords if kw in text]
+            for label, keywords in LEXICONS.items()
+            if any(kw in text for kw in keywords)
+        }
+        assert found == expected
+
+
+def test_word_boundaries_and_first_hit_offsets():
+    matcher = KeywordMatcher(LEXICONS, word_boundaries=True)
+    hits = matcher.find("the latest unit test, as you know, should assess the api asap")
+
+    assert hits["testing"] == [("test", 20), ("unit test", 20), ("assess", 48)]
+    assert hits["analysis"] == [("assess", 48)]
+    assert hits["urgency"] == [("asap", 61)]
+    assert hits["domain"] == [("api", 56)]
+
+    # "now" inside "know" and "api" inside "rapid" are not whole words
+    assert "urgency" not in matcher.find("you know it")
+    assert "domain" not in matcher.find("rapid growth")
+    assert matcher.find("set up ci/cd.")["domain"] == [("ci/cd", 12)]
+
+
+def test_prompt_analyzer_matches_inflected_forms():
+    prompt_analyzer = _load_prompt_analyzer()
+    analyzer = prompt_analyzer.PromptAnalyzer()
+    PromptContext = prompt_analyzer.PromptContext
+
+    analysis = asyncio.run(analyzer.analyze_prompt("I am testing the new api"))
+    assert analysis.detected_context == PromptContext.TESTING
+    assert "test" in analysis.keywords_found
+
+    analysis = asyncio.run(analyzer.analyze_prompt("Deploying the service to staging"))
+    assert analysis.detected_context == PromptContext.DEPLOYMENT
+
+    # Whole-word matching stays available as an option
+    strict = prompt_analyzer.PromptAnalyzer(word_boundaries=True)
+    analysis = asyncio.run(strict.analyze_prompt("I am testing the new api"))
+    assert analysis.detected_context != PromptContext.TESTING
+
+
+def test_single_pass_scales_with_keyword_count():
+    rng = random.Random(3)
+    alphabet = "abcdefghijklmnopqrstuvwxyz"
+    keywords = ["".join(rng.choice(alphabet) for _ in range(rng.randint(4, 10))) for _ in range(2000)]
+    matcher = KeywordMatcher({"all": keywords})
+    text = " ".join(rng.choice(keywords[:50] + ["filler"] * 50) for _ in range(2000))
+
+    start_time = time.perf_counter()
+    for _ in range(5):
+        found = matcher.find(text)
+    automaton = time.perf_counter() - start_time
+
+    start_time = time.perf_counter()
+    for _ in range(5):
+        naive = [kw for kw in keywords if kw in text]
+    substring = time.perf_counter() - start_time
+
+    print(f"2000 keywords: automaton {automaton:.3f}s, substring scan {substring:.3f}s")
+    assert {kw for kw, _ in found["all"]} <= set(naive)
+    assert {kw for kw, _ in found["all"]} >= set(keywords[:50]) & set(text.split())
@@ -0,0 +1,90 @@
+"""
+Tests for the tool-selection learning store
+Appends, decayed aggregates and windowed trend queries
+"""
+
+import importlib.util
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pytest
+
+_STORE_PATH = Path(__file__).parent.parent / "agents" / "tool-selection" / "learning_store.py"
+_spec = importlib.util.spec_from_file_location("learning_store", _STORE_PATH)
+learning_store = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(learning_store)
+
+LearningStore = learning_store.LearningStore
+
+
+def _record(i, success=True, satisfaction=0.8, created_at=None, tools=("claude_analysis",)):
+    return {
+        "selection_id": f"lr_{i}",
+        "prompt_context": "analysis",
+        "tools_selected": list(tools),
+        "patterns_selected": ["analyze_claims"],
+        "execution_success": success,
+        "user_satisfaction": satisfaction,
+        "execution_time_actual": 3,
+        "confidence_accuracy": 0.9,
+        "created_at": (created_at or datetime.now()).isoformat()
+    }
+
+
+def test_append_cost_does_not_grow_with_history(tmp_path):
+    store = LearningStore(str(tmp_path / "learning.db"))
+
+    def append_rate(start, count):
+        start_time = time.perf_counter()
+        for i in range(start, start + count):
+            store.append(_record(i, success=i % 4 != 0), context_accuracy=0.85)
+        return time.perf_counter() - start_time
+
+    first = append_rate(0, 500)
+    for i in range(500, 20000, 1000):
+        append_rate(i, 1000)
+    last = append_rate(20500, 500)
+
+    print(f"500 appends: {first:.3f}s at 0 records, {last:.3f}s at 20,500 records")
+    assert last < first * 3
+    assert store.count() == 21000
+    store.close()
+
+
+def test_aggregates_survive_reopen_and_decay(tmp_path):
+    db_path = str(tmp_path / "learning.db")
+    store = LearningStore(db_path, half_life_days=1.0)
+    old = datetime.now() - timedelta(days=10)
+    for i in range(10):
+        store.append(_record(i, success=False, satisfaction=0.2, created_at=old), context_accuracy=0.7)
+    for i in range(10, 20):
+        store.append(_record(i, success=True, satisfaction=0.9), context_accuracy=0.9)
+    store.close()
+
+    reopened = LearningStore(db_path, half_life_days=1.0)
+    stats = reopened.get_aggregate(learning_store.TOOL, "claude_analysis")
+    assert stats["count"] == 20
+    assert stats["success_rate"] == pytest.approx(0.5)
+    # Ten-day-old failures carry ~1/1000 of the weight of today's successes
+    assert stats["decayed_success_rate"] > 0.99
+    assert reopened.get_aggregate(learning_store.CONTEXT, "analysis")["decayed_accuracy"] == pytest.approx(0.9, abs=0.01)
+    reopened.close()
+
+
+def test_windowed_trends_and_context_outcomes(tmp_path):
+    store = LearningStore(str(tmp_path / "learning.db"))
+    for i in range(10):
+        store.append(_record(i, success=False, satisfaction=0.3, tools=("slow_tool",)), context_accuracy=0.7)
+    for i in range(10, 20):
+        store.append(_record(i, success=True, satisfaction=0.9), context_accuracy=0.9)
+
+    assert store.window_stats(10)["success_rate"] == 1.0
+    assert store.window_stats(10, offset=10)["success_rate"] == 0.0
+    assert store.window_stats(10, context="research") is None
+
+    outcomes = store.context_outcomes("analysis", window=15)
+    assert outcomes["records"] == 15
+    assert outcomes["tool"]["claude_analysis"] == {"successes": 10, "failures": 0}
+    assert outcomes["tool"]["slow_tool"] == {"successes": 0, "failures": 5}
+    store.close()
@@ -0,0 +1,104 @@
+"""
+Prompt-prefix reuse tests for the Ollama inference client.
+
+Runs against a local Ollama-compatible stub whose prefill time grows with
+the number of prompt characters it has to process.
+"""
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents.r1_reasoning.config import R1ReasoningConfig
+from inference.ollama_client import OllamaClient
+from inference.prompt_cache import InferenceSession
+
+MODEL = "deepseek-r1:7b-8k"
+PREFILL_SECONDS_PER_CHAR = 0.00002
+
+
+async def _start_stub_server():
+    """Start an Ollama-compatible stub server on a free local port"""
+    received = []
+
+    async def tags(request):
+        return web.json_response({"models": [{"name": MODEL}]})
+
+    async def generate(request):
+        payload = await request.json()
+        received.append(payload)
+        await asyncio.sleep(len(payload["prompt"]) * PREFILL_SECONDS_PER_CHAR)
+        context = list(payload.get("context") or []) + [len(payload["prompt"])]
+        return web.json_response({"response": " Conclusion: done.", "context": context, "done": True})
+
+    app = web.Application()
+    app.router.add_get("/api/tags", tags)
+    app.router.add_post("/api/generate", generate)
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}", received
+
+
+async def _run_analysis(client: OllamaClient, session: InferenceSession = None) -> float:
+    """Main call plus a follow-up extending it, as analyze_document_query does"""
+    main_prompt = "Reason step by step about the query. " * 2000
+    follow_up = "Generate 2-3 alternative perspectives."
+
+    start_time = time.perf_counter()
+    await client.generate(prompt=main_prompt, model=MODEL, session=session)
+    prompt = session.continue_with(follow_up) if session else f"{main_prompt}\n\n{follow_up}"
+    await client.generate(prompt=prompt, model=MODEL, session=session)
+    return time.perf_counter() - start_time
+
+
+def test_session_reuses_prefix_and_saves_wall_time():
+    async def run():
+        runner, base_url, received = await _start_stub_server()
+        config = R1ReasoningConfig()
+        config.OLLAMA_BASE_URL = base_url
+
+        try:
+            async with OllamaClient(config) as client:
+                client.prefix_cache.max_entries = 0  # Baseline: no reuse at all
+                baseline = await _run_analysis(client)
+
+            async with OllamaClient(config) as client:
+                session = InferenceSession(keep_alive="10m")
+                reused = await _run_analysis(client, session)
+        finally:
+            await runner.cleanup()
+
+        follow_up_payload = received[-1]
+        assert follow_up_payload["keep_alive"] == "10m"
+        assert follow_up_payload["context"]
+        assert follow_up_payload["prompt"].strip() == "Generate 2-3 alternative perspectives."
+        assert session.get_stats()["prefix_hits"] == 1
+
+        print(f"Per-analysis wall time: {baseline:.3f}s without reuse, {reused:.3f}s with reuse")
+        assert reused < baseline * 0.75
+
+    asyncio.run(run())
+
+
+def test_prefix_cache_matches_longest_prefix():
+    from inference.prompt_cache import PromptPrefixCache
+
+    cache = PromptPrefixCache(max_entries=2)
+    cache.put(MODEL, "abc", [1])
+    cache.put(MODEL, "abcdef", [2])
+
+    assert cache.match(MODEL, "abcdefgh") == (6, [2])
+    assert cache.match(MODEL, "abcxyz") == (3, [1])
+    assert cache.match("other-model", "abcdef") == (0, None)
+
+    # Least recently matched entry is evicted
+    cache.put(MODEL, "zzz", [3])
+    assert cache.match(MODEL, "abcdefgh") == (3, [1])
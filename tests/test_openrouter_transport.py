@@ -0,0 +1,128 @@
+"""
+Tests for the OpenRouter transport, rate limiter and cost ledger
+Runs against a local mock OpenRouter server
+"""
+
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+
+import pytest
+from aiohttp import web
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brain.modules.openrouter.router_client import OpenRouterClient
+from brain.modules.openrouter.transport import TokenBucket
+from brain.modules.openrouter.cost_ledger import CostLedger
+
+
+async def _start_mock_openrouter():
+    """Start a mock OpenRouter server and count the TCP connections it sees"""
+    state = {"requests": 0, "peers": set()}
+
+    async def chat_completions(request):
+        state["requests"] += 1
+        state["peers"].add(request.transport.get_extra_info("peername"))
+        body = await request.json()
+        return web.json_response({
+            "choices": [{"message": {"content": json.dumps({"has_contradiction": False, "confidence": 0.9})}}],
+            "usage": {"total_tokens": 100},
+            "model": body["model"]
+        })
+
+    app = web.Application()
+    app.router.add_post("/api/v1/chat/completions", chat_completions)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}/api/v1", state
+
+
+def test_client_reuses_pooled_connection_and_appends_ledger(tmp_path):
+    async def run():
+        runner, base_url, state = await _start_mock_openrouter()
+        ledger_path = tmp_path / "costs.jsonl"
+        client = OpenRouterClient(api_key="test-key", base_url=base_url, cost_ledger_path=str(ledger_path))
+        try:
+            for _ in range(20):
+                result = await client.analyze_contradiction("Use MySQL", "We use Supabase")
+                assert result["has_contradiction"] is False
+        finally:
+            await client.close()
+            await runner.cleanup()
+
+        assert state["requests"] == 20
+        assert len(state["peers"]) == 1  # One keep-alive connection for every call
+        assert client.transport.sessions_created == 1
+
+        usage = client.get_daily_usage()
+        assert usage["request_count"] == 20
+        assert usage["total_tokens"] == 2000
+        assert len(ledger_path.read_text().splitlines()) == 20
+
+    asyncio.run(run())
+
+
+def test_cost_ledger_replays_only_new_entries(tmp_path):
+    ledger_path = tmp_path / "costs.jsonl"
+    ledger = CostLedger(str(ledger_path), aggregate_every=10)
+    for _ in range(25):
+        ledger.record("openai/gpt-4o-mini", 10, 0.001)
+    # Simulate a crash: 5 entries are in the ledger but not in the saved aggregates
+    ledger._file.close()
+    ledger._file = None
+
+    reopened = CostLedger(str(ledger_path), aggregate_every=10)
+    totals = reopened.daily_totals()
+    assert totals["requests"] == 25
+    assert totals["tokens"] == 250
+    assert totals["cost"] == pytest.approx(0.025)
+    reopened.close()
+
+
+
+def test_cost_ledger_is_shared_between_writers(tmp_path):
+    ledger_path = tmp_path / "costs.jsonl"
+    first = CostLedger(str(ledger_path), aggregate_every=100)
+    second = CostLedger(str(ledger_path), aggregate_every=100)
+    for _ in range(5):
+        first.record("openai/gpt-4o-mini", 10, 0.001)
+    second.record("openai/gpt-4o-mini", 10, 0.001)
+    first.record("openai/gpt-4o-mini", 10, 0.001)
+
+    # Nothing is truncated and both writers see each other's entries
+    assert len(ledger_path.read_text().splitlines()) == 7
+    assert first.daily_totals()["requests"] == 7
+    assert second.daily_totals()["requests"] == 7
+    first.close()
+    second.close()
+
+    # A writer that died mid-line leaves a torn tail; it is skipped, not cut off
+    with open(ledger_path, "ab") as f:
+        f.write(b'{"date": "2024-01-01", "tok')
+    reopened = CostLedger(str(ledger_path), aggregate_every=100)
+    assert reopened.daily_totals()["requests"] == 7
+    reopened.record("openai/gpt-4o-mini", 10, 0.001)
+    lines = ledger_path.read_text().splitlines()
+    assert len(lines) == 9 and lines[7] == '{"date": "2024-01-01", "tok'
+    assert reopened.skipped_lines == 1
+    reopened.close()
+
+    rebuilt = CostLedger(str(ledger_path), aggregate_every=100)
+    assert rebuilt.daily_totals()["requests"] == 8
+    assert rebuilt.daily_totals()["cost"] == pytest.approx(0.008)
+    rebuilt.close()
+
+def test_token_bucket_uses_monotonic_refill():
+    bucket = TokenBucket(rate_per_minute=600)  # 10 per second
+    for _ in range(600):
+        bucket.consume(1)
+    assert bucket.wait_time(1) == pytest.approx(0.1, abs=0.02)
+
+    bucket.updated_at = time.monotonic() - 1.0
+    assert bucket.wait_time(5) == 0.0
@@ -0,0 +1,147 @@
+"""
+Tests for the PRP gene index behind SmartPRPDNA
+Incremental extraction, parallel corpus builds and inverted-index queries
+"""
+
+import asyncio
+import importlib.util
+import os
+import sys
+import time
+from pathlib import Path
+
+_PACKAGE_DIR = Path(__file__).parent.parent / "brain" / "modules" / "supreme_prp"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _PACKAGE_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    # Registered so worker processes can unpickle the extraction function
+    sys.modules[name] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+prp_gene_index = _load("prp_gene_index")
+PRPGeneIndex = prp_gene_index.PRPGeneIndex
+
+TOPICS = ["websocket", "postgres", "stripe", "oauth", "kafka", "redis", "graphql", "terraform"]
+
+
+def _prp(topic, i, success=False):
+    return f"""# {topic} feature {i}
+
+## Purpose
+Ship {topic} support for service {i}.
+
+## Requirements
+- {topic} client with retries
+- Security considerations for {topic} credentials
+
+## Implementation
+Step 1 configure {topic}. Step 2 handle error cases from {topic}.
+
+## Validation
+Testing with pytest and code review of the {topic} integration.
+{"Tests passing and production ready." if success else ""}
+"""
+
+
+def _corpus(path, count):
+    path.mkdir(parents=True, exist_ok=True)
+    for i in range(count):
+        topic = TOPICS[i % len(TOPICS)]
+        (path / f"prp_{i:03d}.md").write_text(_prp(topic, i, success=i % 2 == 0))
+
+
+def test_sync_reextracts_only_changed_prps(tmp_path):
+    prps = tmp_path / "PRPs"
+    _corpus(prps, 30)
+    index = PRPGeneIndex(tmp_path / "genes.db", max_workers=1)
+
+    assert index.sync(prps) == {"extracted": 30, "unchanged": 0, "removed": 0}
+    assert index.sync(prps) == {"extracted": 0, "unchanged": 30, "removed": 0}
+
+    # A touched but unchanged file is re-hashed, not re-extracted
+    stat = (prps / "prp_001.md").stat()
+    os.utime(prps / "prp_001.md", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+    (prps / "prp_002.md").write_text(_prp("kubernetes", 2))
+    (prps / "prp_003.md").unlink()
+    genes_before = index.count()
+
+    reopened = PRPGeneIndex(tmp_path / "genes.db", max_workers=1)
+    assert reopened.sync(prps) == {"extracted": 1, "unchanged": 28, "removed": 1}
+    assert reopened.query("kubernetes")[0]["source_prp"] == "prp_002.md"
+    assert not any(g["source_prp"] == "prp_003.md" for g in reopened.query("oauth", limit=100))
+    assert reopened.count() < genes_before
+    orphans = reopened._conn.execute(
+        "SELECT COUNT(*) FROM gene_terms WHERE gene_id NOT IN (SELECT id FROM genes)"
+    ).fetchone()[0]
+    assert orphans == 0
+
+
+def test_parallel_extraction_matches_serial(tmp_path):
+    prps = tmp_path / "PRPs"
+    _corpus(prps, 60)
+
+    serial = PRPGeneIndex(tmp_path / "serial.db", max_workers=1)
+    parallel = PRPGeneIndex(tmp_path / "parallel.db", max_workers=4)
+    serial.sync(prps)
+    parallel.sync(prps)
+
+    strip = lambda genes: [{k: v for k, v in g.items() if k != "extracted_at"} for g in genes]
+    assert strip(parallel.genes()) == strip(serial.genes())
+    assert parallel.success_patterns() == serial.success_patterns()
+
+
+def test_queries_cover_the_whole_corpus_quickly(tmp_path):
+    prps = tmp_path / "PRPs"
+    _corpus(prps, 400)
+    (prps / "zz_late.md").write_text(_prp("cassandra", 999, success=True))
+    index = PRPGeneIndex(tmp_path / "genes.db")
+    index.sync(prps)
+
+    start_time = time.perf_counter()
+    for _ in range(50):
+        results = index.query("Add cassandra storage with retries", limit=10)
+    elapsed = (time.perf_counter() - start_time) / 50
+
+    print(f"gene query over {index.count()} genes: {elapsed * 1000:.2f}ms")
+    assert results[0]["source_prp"] == "zz_late.md"
+    assert results[0]["success_indicators"] == ["tests passing", "production ready"]
+    assert [r["score"] for r in results] == sorted((r["score"] for r in results), reverse=True)
+    assert all(r["type"] == "research" for r in index.query("cassandra credentials", gene_types=["research"]))
+    assert elapsed < 0.05
+
+
+def test_embedding_queries_rank_by_similarity(tmp_path):
+    prps = tmp_path / "PRPs"
+    _corpus(prps, 16)
+
+    def embed(text):
+        words = text.lower().split()
+        return [float(sum(topic in w for w in words)) for topic in TOPICS]
+
+    index = PRPGeneIndex(tmp_path / "genes.db", embed=embed, max_workers=1)
+    index.sync(prps)
+    results = index.query("kafka", limit=5, use_embeddings=True)
+    assert results and all("kafka" in r["content"].lower() for r in results)
+
+
+def test_smart_prp_dna_retrieves_patterns_from_index(tmp_path):
+    smart_prp_dna = _load("smart_prp_dna")
+    dna = smart_prp_dna.SmartPRPDNA(base_path=str(tmp_path))
+    _corpus(dna.prps_path, 40)
+
+    result = asyncio.run(dna.extract_dna("Realtime websocket notifications with error handling", "session"))
+
+    assert result.total_prps_analyzed == 40
+    assert result.patterns_extracted == dna.gene_index.count()
+    patterns = asyncio.run(dna._find_relevant_patterns("Realtime websocket notifications with error handling"))
+    assert patterns and all(0.0 <= p.success_rate <= 1.0 for p in patterns)
+    assert any(p.pattern_id == "implementation:error_handling" for p in patterns)
+    assert "websocket" in patterns[0].pattern_content.lower()
+
+    genes = asyncio.run(dna._extract_prp_genes())
+    assert len(genes.structure_genes) == dna.gene_index.count("structure")
+    assert genes.success_patterns.count("tests passing") == 20
@@ -0,0 +1,162 @@
+"""
+Tests for the shared resource pool used by specialized agents
+Leasing, concurrency limits, idle eviction and metrics
+"""
+
+import asyncio
+import importlib.util
+import sys
+from pathlib import Path
+
+import pytest
+
+_POOL_PATH = Path(__file__).parent.parent / "agents" / "specialized" / "resource_pool.py"
+_spec = importlib.util.spec_from_file_location("resource_pool", _POOL_PATH)
+resource_pool = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(resource_pool)
+
+ResourcePool = resource_pool.ResourcePool
+ResourcePoolManager = resource_pool.ResourcePoolManager
+
+
+class FakeClient:
+    created = 0
+
+    def __init__(self):
+        FakeClient.created += 1
+        self.closed = False
+
+    async def close(self):
+        self.closed = True
+
+
+async def _factory():
+    await asyncio.sleep(0.01)  # connection setup
+    return FakeClient()
+
+
+def test_shared_pool_reuses_one_client_under_a_concurrency_cap():
+    FakeClient.created = 0
+    pool = ResourcePool("http", _factory, max_size=1, max_concurrency=3, shared=True)
+    running = 0
+    peak = 0
+
+    async def call():
+        nonlocal running, peak
+        async with pool.lease() as client:
+            assert isinstance(client, FakeClient)
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+
+    async def burst():
+        for _ in range(3):
+            await asyncio.gather(*[call() for _ in range(10)])
+
+    asyncio.run(burst())
+
+    stats = pool.get_stats()
+    assert FakeClient.created == 1
+    assert peak == 3 and stats["peak_in_use"] == 3
+    assert stats["leases"] == 30 and stats["reused"] == 29
+    assert stats["waits"] > 0 and stats["in_use"] == 0
+
+
+def test_exclusive_pool_leases_distinct_resources_and_times_out():
+    pool = ResourcePool("mcp", _factory, max_size=2, max_concurrency=10)
+    assert pool.max_concurrency == 2
+
+    async def run():
+        first = await pool.acquire()
+        second = await pool.acquire()
+        assert first is not second
+        with pytest.raises(asyncio.TimeoutError):
+            await pool.acquire(timeout=0.05)
+        await pool.release(first)
+        assert await pool.acquire(timeout=0.05) is first
+
+    asyncio.run(run())
+
+
+def test_idle_eviction_keeps_warm_minimum_and_discards_broken_resources():
+    pool = ResourcePool("mcp", _factory, max_size=3, min_idle=1, idle_timeout_seconds=0.0)
+
+    async def run():
+        leased = [await pool.acquire() for _ in range(3)]
+        for resource in leased:
+            await pool.release(resource)
+        assert pool.get_stats()["size"] == 1
+        assert sum(r.closed for r in leased) == 2
+
+        with pytest.raises(ConnectionResetError):
+            async with pool.lease() as resource:
+                raise ConnectionResetError()
+        assert resource.closed
+        assert pool.get_stats()["evicted"] == 2
+
+    asyncio.run(run())
+
+
+def test_manager_shares_pools_per_backend_key():
+    manager = ResourcePoolManager()
+    key = ResourcePoolManager.backend_key("github", "secret-token")
+    assert key.startswith("github:") and "secret" not in key
+    assert ResourcePoolManager.backend_key("filesystem") == "filesystem"
+
+    pool = manager.register(key, _factory, shared=True)
+    assert manager.register(key, _factory, max_size=9) is pool
+
+    async def run():
+        async with manager.lease(key) as client:
+            assert isinstance(client, FakeClient)
+        async with manager.lease("unregistered") as nothing:
+            assert nothing is None
+        await manager.close()
+
+    asyncio.run(run())
+    assert manager.get_stats()[key]["leases"] == 1
+
+
+def test_pool_rebinds_to_a_new_event_loop():
+    pool = ResourcePool("http", _factory, shared=True)
+
+    async def lease_once():
+        async with pool.lease() as client:
+            return client
+
+    first = asyncio.run(lease_once())
+    second = asyncio.run(lease_once())
+    assert first is not second
+    assert pool.get_stats()["size"] == 1
+
+
+def test_agent_cleanup_leaves_the_shared_pool_to_its_manager():
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from agents.specialized import github_agent
+    from agents.specialized.resource_pool import ResourcePoolManager as AgentPoolManager
+
+    if not github_agent.HTTP_CLIENT_AVAILABLE:
+        pytest.skip("aiohttp not installed")
+
+    manager = AgentPoolManager()
+    first = github_agent.GitHubAgent(token="token", resource_pools=manager)
+    second = github_agent.GitHubAgent(token="token", resource_pools=manager)
+    assert first.pool_key == second.pool_key
+
+    async def run():
+        assert not first.get_agent_status()["session_ready"]
+        async with manager.lease(first.pool_key) as session:
+            pass
+        assert first.get_agent_status()["session_ready"]
+
+        await first.cleanup()
+        # The other agent keeps using the same open session
+        assert not session.closed and second.get_agent_status()["session_ready"]
+        async with manager.lease(second.pool_key) as reused:
+            assert reused is session
+
+        await manager.close()
+        assert session.closed and not second.get_agent_status()["session_ready"]
+
+    asyncio.run(run())
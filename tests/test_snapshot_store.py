@@ -0,0 +1,143 @@
+"""
+Tests for the content-addressed snapshot store behind SafetyMechanisms
+Deduplicated blobs, session manifests, atomic rollback and garbage collection
+"""
+
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from brain.modules.supreme_improve import snapshot_store as snapshot_store_module
+from brain.modules.supreme_improve.safety_mechanisms import SafetyMechanisms
+from brain.modules.supreme_improve.snapshot_store import SnapshotStore
+
+
+def _tree(root, count=50, payload=b"x" * 4096):
+    root.mkdir(parents=True, exist_ok=True)
+    files = []
+    for i in range(count):
+        path = root / f"module_{i}.py"
+        # Half the files share content
+        path.write_bytes(payload + str(i % (count // 2)).encode())
+        files.append(path)
+    return files
+
+
+def _blobs(store):
+    return [p for p in store.objects_dir.glob("*/*") if not p.name.startswith(".")]
+
+
+@pytest.mark.parametrize("link", ["copy", "reflink", "hardlink"])
+def test_backups_are_deduplicated_across_sessions(tmp_path, link):
+    store = SnapshotStore(tmp_path / "backups", link=link)
+    files = _tree(tmp_path / "src")
+
+    for session in ("s1", "s2", "s3"):
+        for path in files:
+            digest, blob = store.put(path)
+            store.record(session, path, digest)
+            assert blob.read_bytes() == path.read_bytes()
+
+    assert len(_blobs(store)) == 25
+    assert store.stats["stored"] == 25
+    assert store.stats["deduplicated"] == 125
+    assert len(store.load_manifest("s2")) == 50
+
+
+def test_session_rollback_restores_first_backup_of_each_file(tmp_path):
+    store = SnapshotStore(tmp_path / "backups")
+    files = _tree(tmp_path / "src", count=10)
+    originals = {path: path.read_bytes() for path in files}
+    os.chmod(files[0], 0o750)
+
+    for path in files:
+        digest, _ = store.put(path)
+        store.record("session", path, digest, os.stat(path).st_mode & 0o777)
+    for path in files:
+        path.write_bytes(b"modified")
+        # A later backup within the session does not move the restore point
+        digest, _ = store.put(path)
+        store.record("session", path, digest)
+
+    summary = store.rollback_session("session")
+    assert summary["success"] and len(summary["files_rolled_back"]) == 10
+    assert {path: path.read_bytes() for path in files} == originals
+    assert os.stat(files[0]).st_mode & 0o777 == 0o750
+
+
+def test_rollback_touches_nothing_when_a_blob_is_missing(tmp_path):
+    store = SnapshotStore(tmp_path / "backups")
+    files = _tree(tmp_path / "src", count=6)
+    for path in files:
+        digest, _ = store.put(path)
+        store.record("session", path, digest)
+        path.write_bytes(b"modified")
+
+    store.blob_path(store.load_manifest("session")[str(files[-1].resolve())]["digest"]).unlink()
+    summary = store.rollback_session("session")
+
+    assert not summary["success"]
+    assert all(path.read_bytes() == b"modified" for path in files)
+    assert not list((tmp_path / "src").glob(".*restore"))
+
+
+def test_garbage_collection_keeps_referenced_blobs(tmp_path):
+    store = SnapshotStore(tmp_path / "backups")
+    old, new = tmp_path / "old.py", tmp_path / "new.py"
+    old.write_text("old content")
+    new.write_text("new content")
+
+    store.record("old-session", old, store.put(old)[0])
+    store.record("new-session", new, store.put(new)[0])
+    stale = time.time() - 30 * 24 * 3600
+    os.utime(store.manifests_dir / "old-session.jsonl", (stale, stale))
+
+    # The expired manifest goes at once; its blob is still inside the grace period
+    assert store.collect_garbage(retention_days=7) == {"manifests_removed": 1, "blobs_removed": 0, "bytes_freed": 0}
+    assert store.collect_garbage(retention_days=7, grace_seconds=0)["blobs_removed"] == 1
+    assert store.blob_path(store.hash_file(new)) is not None
+    assert store.blob_path(store.hash_file(old)) is None
+
+
+@pytest.mark.skipif(not snapshot_store_module.ZSTD_AVAILABLE, reason="zstandard not installed")
+def test_compressed_blobs_round_trip(tmp_path):
+    store = SnapshotStore(tmp_path / "backups", compression="zstd")
+    path = tmp_path / "big.py"
+    path.write_text("print('hello')\n" * 10000)
+    digest, blob = store.put(path)
+    assert blob.suffix == ".zst" and blob.stat().st_size < path.stat().st_size
+
+    store.record("session", path, digest)
+    path.write_text("broken")
+    assert store.rollback_session("session")["success"]
+    assert path.read_text() == "print('hello')\n" * 10000
+
+
+def test_safety_mechanisms_session_rollback(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    safety = SafetyMechanisms()
+    files = _tree(tmp_path / "src", count=20)
+    originals = {str(path): path.read_text() for path in files}
+
+    with pytest.raises(RuntimeError):
+        with safety.safe_modification_session("run-1"):
+            for path in files:
+                assert safety.apply_change_safely(str(path), "value = 1\n")["success"]
+            raise RuntimeError("tests failed")
+
+    assert {str(path): path.read_text() for path in files} == originals
+
+    # A second run backs up identical content without storing it again
+    stored = safety.snapshot_store.stats["stored"]
+    with safety.safe_modification_session("run-2"):
+        for path in files[:5]:
+            safety.apply_change_safely(str(path), "value = 2\n")
+        assert safety.rollback_file(str(files[0]))
+    assert safety.snapshot_store.stats["stored"] == stored
+    assert files[0].read_text() == originals[str(files[0])]
+    assert files[1].read_text() == "value = 2\n"
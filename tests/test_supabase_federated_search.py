@@ -0,0 +1,137 @@
+"""
+Tests for the federated SupabaseSearch.search_all
+Sources are backed by a local SQLite fake of the Supabase tables
+"""
+
+import asyncio
+import sqlite3
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent / "supabase" / "modules"))
+
+from supabase_search import SupabaseSearch, SearchResult
+
+SOURCE_LATENCY = 0.2
+
+
+def _build_fake_db(path: Path):
+    """Create a small SQLite stand-in for the searchable Supabase tables"""
+    conn = sqlite3.connect(path)
+    conn.executescript("""
+        CREATE TABLE aai_research_docs (id TEXT, title TEXT, content TEXT, category TEXT, score REAL);
+        CREATE TABLE aai_code_examples (id TEXT, title TEXT, content TEXT, category TEXT, score REAL);
+        CREATE TABLE aai_ideas (id TEXT, title TEXT, content TEXT, category TEXT, score REAL);
+        CREATE TABLE aai_rule_compliance (id TEXT, title TEXT, content TEXT, category TEXT, score REAL);
+    """)
+    rows = {
+        "aai_research_docs": [("r1", "Supabase caching research", "supabase cache", "research", 0.9),
+                              ("r2", "Vector search notes", "supabase vectors", "research", 0.4)],
+        "aai_code_examples": [("e1", "Supabase client example", "supabase python", "database", 12.0),
+                              ("shared", "Supabase upsert", "supabase upsert", "database", 3.0)],
+        "aai_ideas": [("i1", "Supabase dashboard idea", "supabase ui", "ideas", 0.5),
+                      ("shared", "Supabase upsert", "supabase upsert", "ideas", 0.7)],
+        "aai_rule_compliance": [("c1", "RULE-001 supabase check", "supabase rule", "compliance", 0.95)],
+    }
+    for table, table_rows in rows.items():
+        conn.executemany(f"INSERT INTO {table} VALUES (?, ?, ?, ?, ?)", table_rows)
+    conn.commit()
+    conn.close()
+
+
+def _sqlite_source(db_path: Path, table: str, source: str, calls: list, delay: float = SOURCE_LATENCY):
+    """Full-text stand-in: LIKE match ordered by score, with simulated round-trip latency"""
+    def search(query: str, limit: int):
+        calls.append(source)
+        time.sleep(delay)
+        conn = sqlite3.connect(db_path)
+        try:
+            rows = conn.execute(
+                f"SELECT id, title, content, category, score FROM {table} "
+                "WHERE content LIKE ? ORDER BY score DESC LIMIT ?",
+                (f"%{query}%", limit)
+            ).fetchall()
+        finally:
+            conn.close()
+        return [SearchResult(id=r[0], title=r[1], content=r[2], source=source,
+                             category=r[3], score=r[4], metadata={}) for r in rows]
+    return search
+
+
+def _make_search(tmp_path: Path, calls: list, slow_source: str = None) -> SupabaseSearch:
+    db_path = tmp_path / "fake_supabase.db"
+    _build_fake_db(db_path)
+    search = SupabaseSearch(source_timeout=1.0, cache_ttl=30.0)
+    tables = {"research": "aai_research_docs", "examples": "aai_code_examples",
+              "ideas": "aai_ideas", "rule_compliance": "aai_rule_compliance"}
+    search.sources = {
+        name: _sqlite_source(db_path, table, name, calls, delay=5.0 if name == slow_source else SOURCE_LATENCY)
+        for name, table in tables.items()
+    }
+    return search
+
+
+def test_sources_are_queried_concurrently_and_fused(tmp_path):
+    calls = []
+    search = _make_search(tmp_path, calls)
+
+    response = asyncio.run(search.search_all_async("supabase", limit=5))
+
+    # Four sources at 0.2s each finish in roughly one round trip, not four
+    assert response.elapsed_ms < SOURCE_LATENCY * 1000 * 2
+    assert not response.partial
+    assert len(response.results) == 5
+
+    # First-ranked hits of each source lead, raw score breaking ties
+    assert [(r.source, r.id) for r in response.results[:4]] == [
+        ("examples", "e1"), ("rule_compliance", "c1"), ("research", "r1"), ("ideas", "shared")
+    ]
+    # The same id in two tables is two different rows, not one boosted hit
+    assert ("examples", "shared") == (response.results[4].source, response.results[4].id)
+    assert set(response.fused_scores) == {f"{r.source}:{r.id}" for r in response.results}
+
+
+def test_slow_source_yields_partial_results(tmp_path):
+    calls = []
+    search = _make_search(tmp_path, calls, slow_source="research")
+
+    start_time = time.perf_counter()
+    response = asyncio.run(search.search_all_async("supabase", limit=10))
+    elapsed = time.perf_counter() - start_time
+
+    assert elapsed < 2.0
+    assert response.partial
+    assert response.sources_failed == {"research": "timeout"}
+    assert {r.source for r in response.results} == {"examples", "ideas", "rule_compliance"}
+
+
+def test_repeated_query_is_served_from_cache(tmp_path):
+    calls = []
+    search = _make_search(tmp_path, calls)
+
+    first = asyncio.run(search.search_all_async("supabase", limit=5))
+    second = asyncio.run(search.search_all_async("  Supabase ", limit=5))
+
+    assert len(calls) == 4
+    assert second.cached
+    assert [r.id for r in second.results] == [r.id for r in first.results]
+
+    search.cache_ttl = 0
+    search.clear_cache()
+    asyncio.run(search.search_all_async("supabase", limit=5))
+    assert len(calls) == 8
+
+
+def test_sync_wrapper_refuses_to_run_inside_an_event_loop(tmp_path):
+    calls = []
+    search = _make_search(tmp_path, calls)
+    assert [r.id for r in search.search_all("supabase", limit=2)] == ["e1", "c1"]
+
+    async def call_from_loop():
+        return search.search_all("supabase")
+
+    with pytest.raises(RuntimeError, match="search_all_async"):
+        asyncio.run(call_from_loop())
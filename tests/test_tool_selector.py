@@ -0,0 +1,124 @@
+"""
+Tests for the ToolSelector response cache and stage latency histogram
+Cache hits, misses, invalidation and per-stage timings
+"""
+
+import asyncio
+import importlib
+import importlib.util
+import sys
+from pathlib import Path
+
+_TOOL_SELECTION_DIR = Path(__file__).parent.parent / "agents" / "tool-selection"
+
+
+def _load_tool_selection():
+    """tool-selection modules use relative imports, so load it as a package"""
+    spec = importlib.util.spec_from_file_location(
+        "tool_selection", _TOOL_SELECTION_DIR / "__init__.py",
+        submodule_search_locations=[str(_TOOL_SELECTION_DIR)]
+    )
+    package = importlib.util.module_from_spec(spec)
+    sys.modules["tool_selection"] = package
+    spec.loader.exec_module(package)
+    return package
+
+
+tool_selection = _load_tool_selection()
+tool_selector = importlib.import_module("tool_selection.tool_selector")
+fabric_integrator = importlib.import_module("tool_selection.fabric_integrator")
+learning_engine = importlib.import_module("tool_selection.learning_engine")
+models = importlib.import_module("tool_selection.models")
+
+StageLatencyHistogram = tool_selector.StageLatencyHistogram
+SelectionRequest = models.SelectionRequest
+
+PROMPT = "Please analyze the authentication module and review the API security"
+
+
+def _selector(tmp_path, **kwargs):
+    integrator = fabric_integrator.FabricIntegrator(cache_dir=str(tmp_path / "fabric"), enable_local_fabric=False)
+    # Built-in patterns only; no network in tests
+    integrator.http_available = False
+    return tool_selector.ToolSelector(fabric_integrator=integrator, **kwargs)
+
+
+def test_cache_hit_reuses_selection_and_echoes_the_new_prompt(tmp_path):
+    selector = _selector(tmp_path)
+
+    async def run():
+        first = await selector.select_tools(SelectionRequest(prompt=PROMPT, session_id="one"))
+        second = await selector.select_tools(SelectionRequest(prompt=PROMPT.upper(), session_id="two"))
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert selector.cache_stats["misses"] == 1 and selector.cache_stats["hits"] == 1
+
+    first_selection = first.selection_result.tool_selection
+    second_selection = second.selection_result.tool_selection
+    assert second_selection.selected_tools == first_selection.selected_tools
+    assert second_selection.selected_patterns == first_selection.selected_patterns
+
+    # Prompt and session fields belong to the request that hit the cache
+    assert second.selection_result.context_analysis.original_prompt == PROMPT.upper()
+    assert second_selection.prompt_snippet == PROMPT[:100].lower().strip()
+    assert second.session_id == second.selection_result.session_id == "two"
+    assert first.session_id == "one"
+
+
+def test_different_options_miss_the_cache(tmp_path):
+    selector = _selector(tmp_path)
+
+    async def run():
+        await selector.select_tools(SelectionRequest(prompt=PROMPT))
+        await selector.select_tools(SelectionRequest(prompt=PROMPT, max_selections=1))
+        await selector.select_tools(SelectionRequest(prompt=PROMPT + " quickly"))
+
+    asyncio.run(run())
+    assert selector.cache_stats["hits"] == 0 and selector.cache_stats["misses"] == 3
+    assert selector.get_selector_status()["cache"]["entries"] == 3
+
+
+def test_learning_updates_and_pattern_rediscovery_invalidate(tmp_path):
+    engine = learning_engine.SelectionLearningEngine(learning_data_dir=str(tmp_path / "learning"),
+                                                     enable_auto_learning=False)
+    selector = _selector(tmp_path, learning_engine=engine)
+
+    async def run():
+        response = await selector.select_tools(SelectionRequest(prompt=PROMPT))
+        await selector.select_tools(SelectionRequest(prompt=PROMPT))
+        assert selector.cache_stats["hits"] == 1
+
+        await engine.record_selection_outcome(response.selection_result, True, 0.9, 5)
+        await selector.select_tools(SelectionRequest(prompt=PROMPT))
+        assert selector.cache_stats["invalidations"] == 1 and selector.cache_stats["misses"] == 2
+
+        await selector.fabric_integrator.discover_patterns(refresh_cache=True)
+        await selector.select_tools(SelectionRequest(prompt=PROMPT))
+        assert selector.cache_stats["invalidations"] == 2 and selector.cache_stats["misses"] == 3
+
+    asyncio.run(run())
+
+
+def test_stage_latencies_are_recorded(tmp_path):
+    selector = _selector(tmp_path)
+
+    async def run():
+        for _ in range(3):
+            await selector.select_tools(SelectionRequest(prompt=PROMPT))
+
+    asyncio.run(run())
+    stages = selector.get_selector_status()["stage_latency"]
+    for stage in ("analyze_prompt", "fabric_patterns", "select_tools", "coordinate",
+                  "execution_plan", "confidence", "alternatives", "risk_factors",
+                  "recommendations", "warnings", "total"):
+        assert stages[stage]["count"] == 1
+    assert stages["cache_hit"]["count"] == 2
+
+    histogram = StageLatencyHistogram()
+    for duration_ms in (0.05, 0.3, 3, 3, 40, 2000):
+        histogram.record("stage", duration_ms)
+    snapshot = histogram.snapshot()["stage"]
+    assert snapshot["count"] == 6 and snapshot["max_ms"] == 2000
+    assert snapshot["buckets"] == {"<=0.1ms": 1, "<=0.5ms": 1, "<=5ms": 2, "<=50ms": 1, ">1000ms": 1}
+    assert snapshot["p50_ms"] == 5 and snapshot["p95_ms"] == float("inf")
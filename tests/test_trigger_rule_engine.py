@@ -0,0 +1,124 @@
+"""
+Tests for the compiled trigger rule engine
+Feature extraction, shared per-request features and rule statistics
+"""
+
+import asyncio
+import importlib.util
+import time
+from pathlib import Path
+
+import pytest
+
+_MODULES_DIR = Path(__file__).parent.parent / "brain" / "modules"
+
+
+def _load(name):
+    spec = importlib.util.spec_from_file_location(name, _MODULES_DIR / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+trigger_rule_engine = _load("trigger_rule_engine")
+TriggerRuleEngine = trigger_rule_engine.TriggerRuleEngine
+
+KEYWORD_RULE = "any(keyword in prompt.lower() for keyword in ['research', 'investigate', 'explore'])"
+
+
+def test_rules_declare_the_features_they_read():
+    engine = TriggerRuleEngine()
+    keyword_rule = engine.add_rule("research", KEYWORD_RULE)
+    command_rule = engine.add_rule("analyze", "command_type in ['analyze', 'review']")
+    learned_rule = engine.add_rule("learned", "confidence < 0.80 and user_has_history")
+
+    # Comprehension variables and functions are not features; prompt.lower() is hoisted
+    assert keyword_rule.features == {"prompt__lower"}
+    assert command_rule.features == {"command_type"}
+    assert learned_rule.features == {"confidence", "user_has_history"}
+    assert engine.required_features == {"prompt", "prompt__lower", "command_type", "confidence", "user_has_history"}
+
+
+def test_shared_features_are_computed_once_per_request():
+    engine = TriggerRuleEngine()
+    calls = {"history": 0, "patterns": 0}
+
+    def history(context):
+        calls["history"] += 1
+        return True
+
+    def patterns(context):
+        calls["patterns"] += 1
+        return {"similar_previous_task_found": True, "confidence": 0.6}
+
+    engine.register_feature("user_has_history", history)
+    engine.register_feature(("similar_previous_task_found", "confidence"), patterns)
+    engine.register_feature("unused", lambda context: pytest.fail("unneeded feature computed"))
+    for i in range(50):
+        engine.add_rule(f"pattern_{i}", f"confidence < 0.{60 + i} and user_has_history")
+    engine.add_rule("similar", "similar_previous_task_found")
+    engine.add_rule("research", KEYWORD_RULE)
+
+    matched, features = engine.evaluate({"prompt": "Investigate the cache", "command_type": "analyze"})
+
+    assert calls == {"history": 1, "patterns": 1}
+    assert features["prompt__lower"] == "investigate the cache"
+    assert "pattern_0" not in matched and "pattern_1" in matched
+    assert {"similar", "research"} <= set(matched)
+
+
+def test_unsafe_and_broken_conditions_are_rejected_or_contained():
+    engine = TriggerRuleEngine()
+
+    assert engine.add_rule("dunder", "prompt.__class__") is None
+    assert engine.add_rule("syntax", "command_type ==") is None
+    assert engine.get_stats()["compile_errors"] == 2
+
+    engine.add_rule("fails", "prompt.split()[5] == 'x'")
+    engine.add_rule("ok", "True")
+    matched, _ = engine.evaluate({"prompt": "short"})
+    assert list(matched) == ["ok"]
+    assert engine.rules["fails"].errors == 1
+
+
+def test_rule_statistics_track_hit_rate_and_time():
+    engine = TriggerRuleEngine()
+    engine.add_rule("analyze", "command_type == 'analyze'")
+    for command in ["analyze", "implement", "analyze", "research"]:
+        engine.evaluate({"command_type": command})
+
+    stats = engine.get_stats()
+    assert stats["requests"] == 4 and stats["rule_evaluations"] == 4
+    assert stats["rule_stats"]["analyze"]["hit_rate"] == pytest.approx(0.5)
+    assert stats["rule_stats"]["analyze"]["average_time_us"] > 0
+
+
+def test_enhancement_loader_evaluates_compiled_triggers():
+    async def run():
+        # The loader schedules its initialization, so import it inside a loop
+        loader = _load("unified_enhancement_loader").UnifiedEnhancementLoader()
+        result = await loader.evaluate_enhancement_triggers({
+            "command_type": "analyze",
+            "prompt": "Why compare and choose the best architecture step by step"
+        })
+
+        start_time = time.perf_counter()
+        for _ in range(1000):
+            await loader.evaluate_enhancement_triggers({"command_type": "implement", "prompt": "deploy the api server"})
+        elapsed = time.perf_counter() - start_time
+        return loader, result, elapsed
+
+    loader, result, elapsed = asyncio.run(run())
+    confidences = {t["name"]: t["confidence"] for t in result["activated_triggers"]}
+
+    print(f"1000 trigger evaluations in {elapsed * 1000:.1f}ms")
+    assert confidences["always_memory"] == 0.95
+    assert confidences["analyze_enhancement"] == 0.90
+    # why, compare, choose, best: four keyword matches
+    assert confidences["complex_reasoning_required"] == pytest.approx(0.90)
+    assert confidences["multi_step_workflow"] == pytest.approx(0.90)
+    assert "high_complexity" not in confidences and "implement_enhancement" not in confidences
+
+    stats = loader.trigger_engine.get_stats()
+    assert stats["required_features"] == ["command_type", "keyword_hits", "prompt_length", "prompt_words"]
+    assert stats["rule_stats"]["implement_enhancement"]["hits"] == 1000
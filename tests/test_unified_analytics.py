@@ -0,0 +1,200 @@
+"""
+Tests for UnifiedAnalytics storage
+Per-thread WAL connections, normalized join tables and incremental rollups
+"""
+
+import importlib.util
+import json
+import random
+import sqlite3
+import threading
+import time
+from collections import Counter
+from pathlib import Path
+
+import pytest
+
+_MODULE_PATH = Path(__file__).parent.parent / "brain" / "modules" / "unified-analytics.py"
+_spec = importlib.util.spec_from_file_location("unified_analytics", _MODULE_PATH)
+unified_analytics = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(unified_analytics)
+
+UnifiedAnalytics = unified_analytics.UnifiedAnalytics
+
+STATUSES = ["scaffolded", "in_progress", "blocked", "completed", "archived"]
+BLOCKERS = ["auth", "deploy", "schema", "rate limits"]
+
+
+def _naive_views(db_path):
+    """Dashboard and bottleneck figures recomputed from the raw mappings"""
+    conn = sqlite3.connect(db_path)
+    rows = conn.execute("SELECT status, success_score, blockers, template_ids FROM prp_project_mappings").fetchall()
+    conn.close()
+
+    completed = [score for status, score, _, _ in rows if status == "completed"]
+    blockers = Counter(b for _, _, blob, _ in rows if blob for b in json.loads(blob))
+    template_success = Counter()
+    for status, score, _, templates in rows:
+        if status == "completed" and score >= 0.8:
+            template_success.update(set(json.loads(templates)))
+    return {
+        "total": len(rows),
+        "completed": len(completed),
+        "avg_score": sum(completed) / len(completed) if completed else 0.0,
+        "stuck": Counter(status for status, _, _, _ in rows if status not in ("completed", "archived")),
+        "blockers": blockers,
+        "template_success": template_success
+    }
+
+
+def _random_history(analytics, rng, mappings=200, updates=400):
+    for i in range(mappings):
+        templates = rng.sample(["api", "web", "cli", "ml", "etl"], rng.randint(1, 3))
+        analytics.track_prp_to_project(f"prp-{i % 150}", f"project-{i % 120}", templates, ["supabase"])
+    for _ in range(updates):
+        analytics.update_project_status(
+            f"project-{rng.randrange(120)}",
+            rng.choice(STATUSES),
+            success_score=rng.choice([None, 0.5, 0.85, 0.95]),
+            blockers=rng.choice([None, [], rng.sample(BLOCKERS, rng.randint(1, 2))])
+        )
+
+
+def test_rollups_match_full_recomputation(tmp_path):
+    analytics = UnifiedAnalytics(str(tmp_path))
+    _random_history(analytics, random.Random(5))
+
+    expected = _naive_views(analytics.db_path)
+    dashboard = analytics.get_analytics_dashboard()
+    bottlenecks = analytics.identify_bottlenecks()
+
+    assert dashboard["overview"]["total_projects"] == expected["total"]
+    assert dashboard["overview"]["completed_projects"] == expected["completed"]
+    assert dashboard["overview"]["avg_success_score"] == pytest.approx(expected["avg_score"])
+    assert {s["status"]: s["count"] for s in bottlenecks["stuck_projects"]} == expected["stuck"]
+    assert {b["blocker"]: b["count"] for b in bottlenecks["common_blockers"]} == expected["blockers"]
+
+    successes = {t["template_id"]: round(t["success_rate"] * t["usage_count"]) for t in dashboard["template_performance"]}
+    assert {k: v for k, v in successes.items() if v} == expected["template_success"]
+
+    # A full rebuild agrees with the incrementally maintained rollups
+    analytics.rebuild_rollups()
+    rebuilt = analytics.get_analytics_dashboard()
+    assert rebuilt["overview"].pop("avg_success_score") == pytest.approx(dashboard["overview"].pop("avg_success_score"))
+    assert rebuilt == dashboard
+    assert analytics.identify_bottlenecks() == bottlenecks
+
+
+def test_template_recommendations_rank_by_successful_usage(tmp_path):
+    analytics = UnifiedAnalytics(str(tmp_path))
+    analytics.track_prp_to_project("prp-1", "p1", ["api", "web"], [])
+    analytics.track_prp_to_project("prp-2", "p2", ["api"], [])
+    analytics.track_prp_to_project("prp-3", "p3", ["cli"], [])
+    analytics.update_project_status("p1", "completed", success_score=0.9)
+    analytics.update_project_status("p2", "completed", success_score=0.85)
+    analytics.update_project_status("p3", "completed", success_score=0.5)
+
+    assert analytics.get_template_recommendations("Build a REST service", ["python"]) == ["api", "web"]
+    assert analytics.get_template_recommendations("", []) == []
+
+    # Reopening a project retracts its contribution
+    analytics.update_project_status("p1", "in_progress")
+    assert analytics.get_template_recommendations("Build a REST service", ["python"]) == ["api"]
+
+
+def test_connections_are_per_thread_and_in_wal_mode(tmp_path):
+    analytics = UnifiedAnalytics(str(tmp_path))
+    assert analytics._connection().execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    assert analytics._connection() is analytics._connection()
+
+    errors = []
+
+    def writer(worker):
+        try:
+            for i in range(25):
+                analytics.track_prp_to_project(f"prp-{worker}-{i}", f"project-{worker}-{i}", ["api"], [])
+                analytics.update_project_status(f"project-{worker}-{i}", "completed", success_score=0.9)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(w,)) for w in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(analytics._connections) == 5
+    assert analytics.get_analytics_dashboard()["overview"]["completed_projects"] == 100
+    analytics.close()
+
+
+def test_existing_database_is_migrated_from_json_columns(tmp_path):
+    db_path = tmp_path / "brain" / "analytics.db"
+    db_path.parent.mkdir()
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE prp_project_mappings (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, prp_id TEXT NOT NULL, project_id TEXT NOT NULL,
+            template_ids TEXT, integration_ids TEXT, created_date TEXT NOT NULL, status TEXT NOT NULL,
+            success_score REAL, completion_time TEXT, blockers TEXT, lessons_learned TEXT,
+            UNIQUE(prp_id, project_id)
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE template_metrics (
+            id INTEGER PRIMARY KEY AUTOINCREMENT, template_id TEXT UNIQUE NOT NULL,
+            usage_count INTEGER DEFAULT 0, success_count INTEGER DEFAULT 0,
+            total_completion_time REAL DEFAULT 0, common_blockers TEXT,
+            improvement_suggestions TEXT, last_updated TEXT NOT NULL
+        )
+    """)
+    conn.executemany(
+        "INSERT INTO prp_project_mappings (prp_id, project_id, template_ids, integration_ids, created_date, status, success_score, blockers) "
+        "VALUES (?, ?, ?, '[]', '2025-01-01', ?, ?, ?)",
+        [
+            ("a", "p1", '["api"]', "completed", 0.9, '["auth"]'),
+            ("b", "p2", '["api"]', "blocked", 0.0, '["auth", "deploy"]'),
+        ]
+    )
+    conn.execute("INSERT INTO template_metrics (template_id, usage_count, last_updated) VALUES ('api', 2, '2025-01-01')")
+    conn.commit()
+    conn.close()
+
+    analytics = UnifiedAnalytics(str(tmp_path))
+    bottlenecks = analytics.identify_bottlenecks()
+
+    assert bottlenecks["common_blockers"][0] == {"blocker": "auth", "count": 2}
+    assert bottlenecks["stuck_projects"] == [{"status": "blocked", "count": 1}]
+    assert analytics.get_analytics_dashboard()["template_performance"][0]["success_rate"] == 0.5
+    assert analytics.get_template_recommendations("Build an API", []) == ["api"]
+
+
+def test_dashboard_reads_do_not_grow_with_history(tmp_path):
+    analytics = UnifiedAnalytics(str(tmp_path))
+    conn = analytics._connection()
+
+    def timed_dashboard():
+        start_time = time.perf_counter()
+        for _ in range(50):
+            analytics.get_analytics_dashboard()
+            analytics.identify_bottlenecks()
+        return (time.perf_counter() - start_time) / 50
+
+    analytics.track_prp_to_project("prp-0", "project-0", ["api"], [])
+    small = timed_dashboard()
+
+    with conn:
+        for i in range(1, 20000):
+            conn.execute(
+                "INSERT INTO prp_project_mappings (prp_id, project_id, template_ids, integration_ids, created_date, status, success_score, blockers) "
+                "VALUES (?, ?, '[]', '[]', ?, ?, 0.9, ?)",
+                (f"prp-{i}", f"project-{i}", f"2025-01-01T00:00:{i:05d}", STATUSES[i % 5], json.dumps(["auth"]))
+            )
+            conn.execute("INSERT INTO mapping_blockers (mapping_id, position, blocker) VALUES (?, 0, 'auth')", (i + 1,))
+    analytics.rebuild_rollups()
+    large = timed_dashboard()
+
+    print(f"dashboard + bottlenecks: {small * 1000:.2f}ms at 1 project, {large * 1000:.2f}ms at 20,000")
+    assert analytics.get_analytics_dashboard()["overview"]["total_projects"] == 20000
+    assert large < max(small * 5, 0.005)